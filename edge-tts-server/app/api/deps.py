@@ -1,8 +1,16 @@
 """API 의존성 주입"""
 
-from typing import Generator
+import hmac
+import ipaddress
+from functools import lru_cache
+from typing import Dict, Generator, List, Optional, Tuple, Union
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
+from app.core.config import settings
+from app.services import deadline
+from app.services.admission import AdmissionRejected, admission
+from app.services.memory_cache import memory_cache
+from app.services.shared_cache import audio_cache
 from app.services.tts_service import TTSService, tts_service
 
 
@@ -14,9 +22,120 @@ def get_tts_service() -> Generator[TTSService, None, None]:
         TTSService: TTS 서비스 인스턴스
     """
     try:
-        yield tts_service
+        service = tts_service
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"TTS 서비스 초기화 실패: {str(e)}"
         )
+    # 엔드포인트에서 발생한 예외(400 등)는 그대로 전달되도록 yield는 try 밖에 둠
+    yield service
+
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(proxies: Tuple[str, ...]) -> Optional[List[IPNetwork]]:
+    """TRUSTED_PROXIES 를 네트워크 목록으로 (``*`` 이면 None = 모두 신뢰)"""
+    if "*" in proxies:
+        return None
+    return [ipaddress.ip_network(proxy.strip(), strict=False) for proxy in proxies]
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    if not settings.trusted_proxies:
+        return False
+    networks = _trusted_networks(tuple(settings.trusted_proxies))
+    if networks is None:
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    클라이언트 주소. 직접 연결한 쪽이 ``TRUSTED_PROXIES`` 의 프록시면 X-Forwarded-For 를
+    오른쪽부터 따라가 처음 나오는 신뢰하지 않는 주소를, 없으면 X-Real-IP 를 씁니다.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(host):
+        return host
+    forwarded = [
+        hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()
+    ]
+    for hop in reversed(forwarded):
+        if not _is_trusted_proxy(hop):
+            return hop
+    if forwarded:
+        return forwarded[0]  # 모든 hop 이 신뢰하는 프록시
+    return request.headers.get("x-real-ip", "").strip() or host
+
+
+def get_client_key(
+    request: Request,
+    x_api_key: Optional[str] = Header(default=None)
+) -> str:
+    """
+    합성 예산을 나누는 클라이언트 식별자.
+
+    ``ADMISSION_KEY_BUDGETS`` 에 등록된 API 키만 키로 구분하고, 그 밖의 키(임의로 바꿔
+    보내면 예산을 새로 받게 됨)나 키가 없는 요청은 클라이언트 주소로 구분합니다.
+    
+    Returns:
+        str: 클라이언트 식별자
+    """
+    if x_api_key and x_api_key in settings.admission_key_budgets:
+        return f"key:{x_api_key}"
+    return f"ip:{get_client_ip(request)}"
+
+
+async def admit_synthesis(client: str, text: str, rate: str, cache_key: str) -> Dict[str, float]:
+    """
+    비용 기반 허용 검사를 통과시키고, 거절되면 HTTP 오류로 바꿉니다.
+    
+    Raises:
+        HTTPException: 요청 하나가 너무 길면 400, 예산 초과면 429 (Retry-After 포함),
+            데드라인이 지났거나 예산을 기다리면 넘기게 되면 504
+    """
+    try:
+        deadline.check("admission")
+        return await admission.admit(
+            client, text, rate,
+            cached=memory_cache.contains(cache_key) or audio_cache.contains(cache_key),
+            max_defer=deadline.remaining()
+        )
+    except deadline.DeadlineExceeded as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    except AdmissionRejected as e:
+        if e.reason == "too_long":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if e.reason == "deadline":
+            deadline.deadline_stats.cancel("admission")
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after or 1)))}
+        )
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    진단 엔드포인트용 관리자 token 을 확인합니다.
+    
+    Raises:
+        HTTPException: ``ADMIN_TOKEN`` 이 설정되지 않았으면 404 (엔드포인트를 숨김),
+            token 이 없거나 다르면 401
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(
+        x_admin_token.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="관리자 token 이 필요합니다"
+        )
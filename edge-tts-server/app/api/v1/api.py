@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import tts, voices, stream
+from app.api.v1.endpoints import clips, debug, jobs, metrics, tracks, tts, voices, stream
 
 api_router = APIRouter()
 
@@ -19,8 +19,38 @@ api_router.include_router(
     tags=["TTS - 실시간 스트리밍"]
 )
 
+api_router.include_router(
+    jobs.router,
+    prefix="/tts",
+    tags=["TTS - 비동기 작업"]
+)
+
+api_router.include_router(
+    clips.router,
+    prefix="/tts",
+    tags=["TTS - 짧은 URL"]
+)
+
+api_router.include_router(
+    tracks.router,
+    prefix="/tts",
+    tags=["TTS - 여러 줄 트랙"]
+)
+
 api_router.include_router(
     voices.router,
     prefix="/voices",
     tags=["Voices"]
 )
+
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+api_router.include_router(
+    debug.router,
+    prefix="/debug",
+    tags=["Debug"]
+)
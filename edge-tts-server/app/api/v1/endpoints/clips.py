@@ -0,0 +1,104 @@
+"""짧은 서명 TTS URL 엔드포인트"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.api.deps import admit_synthesis, get_client_key, get_tts_service
+from app.core.logging import get_logger
+from app.models.schemas import ClipResponse, TTSRequest
+from app.services.audio_formats import get_format, negotiate_format
+from app.services.clips import clip_registry
+from app.services.streaming import buffered_stream
+from app.services.tts_service import TTSService
+
+router = APIRouter()
+# API 프리픽스 없이 서버 루트에 붙는 짧은 URL (/a/{token})
+short_router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.post("/clips", response_model=ClipResponse)
+async def register_clip(request: TTSRequest) -> ClipResponse:
+    """
+    합성 조건을 등록하고 짧은 서명 URL 경로를 반환합니다.
+
+    같은 조건은 항상 같은 token 을 받으므로 URL 을 캐시 키로 쓸 수 있습니다.
+
+    Args:
+        request: TTS 요청 데이터
+
+    Returns:
+        ClipResponse: token, 오디오 경로, 캐시 키
+    """
+    audio_format = negotiate_format(request.output_format, None)
+    clip = await clip_registry.register(
+        request.text, request.voice, request.rate, request.volume, request.pitch,
+        audio_format
+    )
+    return ClipResponse(path=f"/a/{clip['token']}", **clip)
+
+
+@short_router.get("/a/{token}", include_in_schema=False)
+async def get_clip_audio(
+    token: str,
+    http_request: Request,
+    dl: bool = False,
+    if_none_match: Optional[str] = Header(default=None),
+    client: str = Depends(get_client_key),
+    tts_service: TTSService = Depends(get_tts_service)
+) -> Response:
+    """
+    짧은 URL 의 오디오를 반환합니다 (캐시에 있으면 캐시, 없으면 합성).
+
+    Args:
+        token: 서명된 클립 token
+        http_request: HTTP 요청 (클라이언트 연결 끊김 확인)
+        dl: 1 이면 파일 다운로드(attachment), 아니면 바로 재생(inline)
+        if_none_match: If-None-Match 헤더 (일치하면 304)
+        client: 합성 예산을 나누는 클라이언트 식별자
+        tts_service: TTS 서비스 의존성
+
+    Returns:
+        StreamingResponse: 오디오 응답
+    """
+    clip = await clip_registry.resolve(token)
+    if clip is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="등록되지 않았거나 서명이 맞지 않는 URL 입니다."
+        )
+
+    etag = f'"{clip["cache_key"]}"'
+    cache_headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": etag,
+    }
+    if if_none_match and etag in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    await admit_synthesis(client, clip["text"], clip["rate"], clip["cache_key"])
+    audio_format = get_format(clip["output_format"])
+    audio_generator = tts_service.synthesize_text(
+        text=clip["text"],
+        voice=clip["voice"],
+        rate=clip["rate"],
+        volume=clip["volume"],
+        pitch=clip["pitch"],
+        output_format=audio_format
+    )
+    disposition = "attachment" if dl else "inline"
+    return StreamingResponse(
+        buffered_stream(
+            audio_generator, label="clip", is_disconnected=http_request.is_disconnected
+        ),
+        media_type=audio_format.media_type,
+        headers={
+            **cache_headers,
+            "Content-Disposition": f"{disposition}; filename=audio.{audio_format.extension}",
+            "X-Output-Format": audio_format.name,
+            "X-Voice": clip["voice"],
+            "Access-Control-Allow-Origin": "*"
+        }
+    )
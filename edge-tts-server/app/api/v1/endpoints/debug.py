@@ -0,0 +1,72 @@
+"""이벤트 루프 진단 엔드포인트 (관리자 token 필요)"""
+
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import require_admin
+from app.core.config import settings
+from app.models.schemas import LoopDiagnosticsUpdate
+from app.services import diagnostics
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/loop")
+async def get_loop_diagnostics() -> Dict[str, Any]:
+    """
+    이 워커의 루프 지연, 최근 루프 멈춤과 그 순간의 스택, 경로별 wall/on-CPU 시간을 조회합니다.
+
+    Returns:
+        dict: 워커 pid 와 진단 스냅샷
+    """
+    return {"pid": os.getpid(), **diagnostics.snapshot()}
+
+
+@router.post("/loop")
+async def update_loop_diagnostics(request: LoopDiagnosticsUpdate) -> Dict[str, Any]:
+    """
+    이 워커의 루프 멈춤 감지와 요청 시간 집계를 켜거나 끕니다.
+
+    Args:
+        request: 바꿀 설정 (생략한 항목은 그대로)
+
+    Returns:
+        dict: 워커 pid 와 변경 후 진단 스냅샷
+    """
+    diagnostics.configure(blocking=request.blocking, request_timing=request.request_timing)
+    return {"pid": os.getpid(), **diagnostics.snapshot()}
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def get_profile(
+    seconds: float = Query(5.0, gt=0, description="표본 추출 시간 (초)"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="표본 간격 (밀리초)")
+) -> PlainTextResponse:
+    """
+    이 워커의 이벤트 루프 스레드 스택을 ``seconds`` 동안 표본 추출합니다.
+
+    응답은 flamegraph.pl / speedscope 가 읽는 collapsed stack 형식입니다.
+
+    curl -H "X-Admin-Token: $ADMIN_TOKEN" \
+      "http://localhost:8000/api/v1/debug/profile?seconds=10" > profile.folded
+
+    Args:
+        seconds: 표본 추출 시간 (초, 최대 PROFILE_MAX_SECONDS)
+        interval_ms: 표본 간격 (밀리초)
+
+    Returns:
+        PlainTextResponse: ``스택 표본수`` 줄 목록
+    """
+    if seconds > settings.profile_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"프로파일 시간은 최대 {settings.profile_max_seconds:g}초입니다"
+        )
+    try:
+        folded = await diagnostics.profile(seconds, interval_ms / 1000)
+    except diagnostics.ProfileInProgress as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return PlainTextResponse(folded, headers={"X-Worker-Pid": str(os.getpid())})
@@ -0,0 +1,196 @@
+"""비동기 합성 작업 엔드포인트"""
+
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.api.deps import admit_synthesis, get_client_key, get_tts_service
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.schemas import TTSJobRequest, TTSJobStatus
+from app.services.audio_formats import negotiate_format
+from app.services.jobs import (
+    Job,
+    JobCallbackRejected,
+    JobQueueFull,
+    job_audio_path,
+    job_manager,
+)
+from app.services.shared_cache import audio_cache
+from app.services.streaming import buffered_stream
+from app.services.tts_service import TTSService, synthesis_cache_key
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+# 대기 중인 작업의 오디오를 요청하면 시작될 때까지 기다려 주는 최대 시간 (초)
+_QUEUED_WAIT_SECONDS = 10.0
+_QUEUED_POLL_INTERVAL = 0.05
+
+
+def _job_status(job: Job) -> TTSJobStatus:
+    return TTSJobStatus(
+        **job.public(),
+        status_url=f"{settings.api_v1_prefix}/tts/jobs/{job.id}",
+        audio_url=job_audio_path(job.id),
+    )
+
+
+async def _find_job(job_id: str) -> Job:
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"작업을 찾을 수 없습니다: {job_id}"
+        )
+    return job
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED, response_model=TTSJobStatus)
+async def create_job(
+    request: TTSJobRequest,
+    client: str = Depends(get_client_key)
+) -> JSONResponse:
+    """
+    합성 작업을 큐에 넣고 작업 id 를 바로 반환합니다.
+
+    curl -X POST "http://localhost:8000/api/v1/tts/jobs" \
+      -H "Content-Type: application/json" \
+      -d '{"text": "긴 가사...", "callback_url": "http://localhost:9000/done"}'
+
+    Args:
+        request: 작업 요청 데이터 (TTS 요청 + 선택적 callback_url)
+        client: 합성 예산을 나누는 클라이언트 식별자
+
+    Returns:
+        JSONResponse: 202 와 작업 상태 (Location: 상태 조회 경로)
+    """
+    if not audio_cache.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="오디오 캐시가 꺼져 있어 작업 API 를 사용할 수 없습니다."
+        )
+
+    audio_format = negotiate_format(request.output_format, None)
+    cache_key = synthesis_cache_key(
+        request.text, request.voice, request.rate, request.volume, request.pitch,
+        audio_format
+    )
+    await admit_synthesis(client, request.text, request.rate, cache_key)
+
+    try:
+        job = await job_manager.submit(
+            text=request.text,
+            voice=request.voice,
+            rate=request.rate,
+            volume=request.volume,
+            pitch=request.pitch,
+            output_format=audio_format,
+            callback_url=request.callback_url
+        )
+    except JobCallbackRejected as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+
+    logger.info("합성 작업 접수", job_id=job.id, text_length=len(request.text))
+    body = _job_status(job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=body.model_dump(),
+        headers={"Location": body.status_url}
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=TTSJobStatus)
+async def get_job(job_id: str) -> TTSJobStatus:
+    """
+    작업 상태를 조회합니다.
+
+    Args:
+        job_id: 작업 id
+
+    Returns:
+        TTSJobStatus: 작업 상태
+    """
+    return _job_status(await _find_job(job_id))
+
+
+@router.get("/jobs/{job_id}/audio")
+async def get_job_audio(
+    job_id: str,
+    http_request: Request,
+    if_none_match: Optional[str] = Header(default=None),
+    tts_service: TTSService = Depends(get_tts_service)
+) -> Response:
+    """
+    작업 결과 오디오를 반환합니다.
+
+    결과는 바뀌지 않으므로 오래 캐시할 수 있고, 실행 중인 작업은 기록 중인 오디오를
+    따라 읽으며 바로 스트리밍합니다. 대기 중인 작업은 시작될 때까지 잠깐 기다리고,
+    캐시에서 밀려난 결과는 같은 조건으로 다시 합성합니다.
+
+    Args:
+        job_id: 작업 id
+        http_request: HTTP 요청 (클라이언트 연결 끊김 확인)
+        if_none_match: If-None-Match 헤더 (일치하면 304)
+        tts_service: TTS 서비스 의존성
+
+    Returns:
+        StreamingResponse: 오디오 응답
+    """
+    job = await _find_job(job_id)
+    # 작업 URL 을 받자마자 열어도 되도록, 대기 중이면 시작될 때까지 잠깐 기다림
+    deadline = time.monotonic() + _QUEUED_WAIT_SECONDS
+    while job.status == "queued" and time.monotonic() < deadline:
+        await asyncio.sleep(_QUEUED_POLL_INTERVAL)
+        job = await _find_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"작업이 실패했습니다: {job.error}"
+        )
+    if job.status == "queued":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="작업이 아직 대기 중입니다. 잠시 후 다시 요청하세요.",
+            headers={"Retry-After": "1"}
+        )
+
+    etag = f'"{job.cache_key}"'
+    cache_headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": etag,
+    }
+    if if_none_match and etag in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    audio_format = job.audio_format
+    audio_generator = tts_service.synthesize_text(
+        text=job.text,
+        voice=job.voice,
+        rate=job.rate,
+        volume=job.volume,
+        pitch=job.pitch,
+        output_format=audio_format
+    )
+    return StreamingResponse(
+        buffered_stream(
+            audio_generator, label="job", is_disconnected=http_request.is_disconnected
+        ),
+        media_type=audio_format.media_type,
+        headers={
+            **cache_headers,
+            "Content-Disposition": f"inline; filename={job.id}.{audio_format.extension}",
+            "X-Job-Status": job.status,
+            "X-Output-Format": audio_format.name,
+            "Access-Control-Allow-Origin": "*"
+        }
+    )
@@ -0,0 +1,20 @@
+"""런타임 지표 엔드포인트"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics() -> Dict[str, Any]:
+    """
+    서버 런타임 지표를 조회합니다.
+    
+    Returns:
+        dict: 서브시스템별 지표 스냅샷 (스트리밍 버퍼, 로깅 큐 등)
+    """
+    return metrics.snapshot()
@@ -1,12 +1,18 @@
 """스트리밍 TTS 엔드포인트"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_tts_service
+from app.api.deps import admit_synthesis, get_client_key, get_tts_service
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.models.schemas import TTSRequest
-from app.services.tts_service import TTSService
+from app.services.audio_formats import negotiate_format
+from app.services.streaming import buffered_stream
+from app.services.textnorm import normalize_tts_text
+from app.services.tts_service import TTSService, synthesis_cache_key
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -15,10 +21,14 @@ logger = get_logger(__name__)
 @router.get("/stream")
 async def stream_tts_get(
     text: str,
+    http_request: Request,
     voice: str = "ko-KR-SunHiNeural",
     rate: str = "+0%", 
     volume: str = "+0%",
     pitch: str = "+0Hz",
+    output_format: Optional[str] = None,
+    accept: Optional[str] = Header(default=None),
+    client: str = Depends(get_client_key),
     tts_service: TTSService = Depends(get_tts_service)
 ) -> StreamingResponse:
     """
@@ -28,10 +38,14 @@ async def stream_tts_get(
     
     Args:
         text: 변환할 텍스트
+        http_request: HTTP 요청 (클라이언트 연결 끊김 확인)
         voice: 음성 선택
         rate: 말하기 속도 
         volume: 볼륨
         pitch: 음높이
+        output_format: 출력 포맷 (생략 시 Accept 헤더로 결정)
+        accept: Accept 헤더
+        client: 합성 예산을 나누는 클라이언트 식별자
         tts_service: TTS 서비스 의존성
         
     Returns:
@@ -44,28 +58,55 @@ async def stream_tts_get(
             voice=voice
         )
         
+        # POST 요청 모델과 같은 정규형으로 맞춤 (줄바꿈, NFC, 전각 문자, 앞뒤 공백)
+        text = normalize_tts_text(text)
+        if not text:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="텍스트는 비어있을 수 없습니다"
+            )
+        
         # 텍스트 길이 검사
-        if len(text) > 5000:
+        if len(text) > settings.max_text_length:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="텍스트가 너무 깁니다. 최대 5000자까지 지원됩니다."
+                detail=f"텍스트가 너무 깁니다. 최대 {settings.max_text_length}자까지 지원됩니다."
             )
         
+        # 출력 포맷 결정 (output_format 파라미터 > Accept 헤더 > 기본 MP3)
+        try:
+            audio_format = negotiate_format(output_format, accept)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        cache_key = synthesis_cache_key(text, voice, rate, volume, pitch, audio_format)
+        
+        # 추정 오디오 길이로 클라이언트 예산 차감 (부족하면 잠깐 지연 또는 거절)
+        await admit_synthesis(client, text, rate, cache_key)
+        
         # TTS 변환 실행
         audio_generator = tts_service.synthesize_text(
             text=text,
             voice=voice,
             rate=rate,
             volume=volume,
-            pitch=pitch
+            pitch=pitch,
+            output_format=audio_format
         )
         
         return StreamingResponse(
-            audio_generator,
-            media_type="audio/mpeg",
+            buffered_stream(
+                audio_generator, label="stream", is_disconnected=http_request.is_disconnected
+            ),
+            media_type=audio_format.media_type,
             headers={
-                "Content-Disposition": "inline; filename=audio.mp3",
+                "Content-Disposition": f"inline; filename=audio.{audio_format.extension}",
                 "Cache-Control": "no-cache",
+                "ETag": f'"{cache_key}"',
+                "Vary": "Accept",
+                "X-Output-Format": audio_format.name,
                 "X-Voice": voice,
                 "X-Text-Length": str(len(text)),
                 "Access-Control-Allow-Origin": "*",
@@ -90,6 +131,9 @@ async def stream_tts_get(
 @router.post("/stream") 
 async def stream_tts(
     request: TTSRequest,
+    http_request: Request,
+    accept: Optional[str] = Header(default=None),
+    client: str = Depends(get_client_key),
     tts_service: TTSService = Depends(get_tts_service)
 ) -> StreamingResponse:
     """
@@ -99,6 +143,9 @@ async def stream_tts(
     
     Args:
         request: TTS 요청 데이터
+        http_request: HTTP 요청 (클라이언트 연결 끊김 확인)
+        accept: Accept 헤더 (output_format 생략 시 포맷 협상에 사용)
+        client: 합성 예산을 나누는 클라이언트 식별자
         tts_service: TTS 서비스 의존성
         
     Returns:
@@ -112,27 +159,43 @@ async def stream_tts(
         )
         
         # 텍스트 길이 검사
-        if len(request.text) > 5000:
+        if len(request.text) > settings.max_text_length:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="텍스트가 너무 깁니다. 최대 5000자까지 지원됩니다."
+                detail=f"텍스트가 너무 깁니다. 최대 {settings.max_text_length}자까지 지원됩니다."
             )
         
+        # 출력 포맷 결정 (output_format 필드 > Accept 헤더 > 기본 MP3)
+        audio_format = negotiate_format(request.output_format, accept)
+        cache_key = synthesis_cache_key(
+            request.text, request.voice, request.rate, request.volume, request.pitch,
+            audio_format
+        )
+        
+        # 추정 오디오 길이로 클라이언트 예산 차감 (부족하면 잠깐 지연 또는 거절)
+        await admit_synthesis(client, request.text, request.rate, cache_key)
+        
         # TTS 변환 실행
         audio_generator = tts_service.synthesize_text(
             text=request.text,
             voice=request.voice,
             rate=request.rate,
             volume=request.volume,
-            pitch=request.pitch
+            pitch=request.pitch,
+            output_format=audio_format
         )
         
         return StreamingResponse(
-            audio_generator,
-            media_type="audio/mpeg",
+            buffered_stream(
+                audio_generator, label="stream", is_disconnected=http_request.is_disconnected
+            ),
+            media_type=audio_format.media_type,
             headers={
-                "Content-Disposition": "inline; filename=audio.mp3",
+                "Content-Disposition": f"inline; filename=audio.{audio_format.extension}",
                 "Cache-Control": "no-cache",
+                "ETag": f'"{cache_key}"',
+                "Vary": "Accept",
+                "X-Output-Format": audio_format.name,
                 "X-Voice": request.voice,
                 "X-Text-Length": str(len(request.text)),
                 "Access-Control-Allow-Origin": "*",
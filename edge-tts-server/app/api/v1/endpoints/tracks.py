@@ -0,0 +1,90 @@
+"""여러 줄 트랙 엔드포인트"""
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import admit_synthesis, get_client_key, get_tts_service
+from app.core.logging import get_logger
+from app.models.schemas import TTSTrackRequest
+from app.services.audio_formats import DEFAULT_FORMAT, get_format
+from app.services.memory_cache import memory_cache
+from app.services.shared_cache import audio_cache
+from app.services.streaming import buffered_stream
+from app.services.tracks import track_cache_key
+from app.services.tts_service import TTSService, synthesis_cache_key
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.post("/track")
+async def synthesize_track(
+    request: TTSTrackRequest,
+    http_request: Request,
+    client: str = Depends(get_client_key),
+    tts_service: TTSService = Depends(get_tts_service)
+) -> StreamingResponse:
+    """
+    줄마다 합성한 MP3 클립을 재인코딩 없이 이어 붙인 한 트랙을 반환합니다.
+
+    캐시에 있는 줄은 다시 합성하지 않고, 조립한 트랙도 캐시에 저장합니다.
+
+    curl -X POST "http://localhost:8000/api/v1/tts/track" \
+      -H "Content-Type: application/json" \
+      -d '{"lines": ["첫 번째 줄", "두 번째 줄"], "gap_ms": 400}' \
+      --output track.mp3
+
+    Args:
+        request: 트랙 요청 데이터
+        http_request: HTTP 요청 (클라이언트 연결 끊김 확인)
+        client: 합성 예산을 나누는 클라이언트 식별자
+        tts_service: TTS 서비스 의존성
+
+    Returns:
+        StreamingResponse: MP3 트랙 응답
+    """
+    audio_format = get_format(request.output_format) if request.output_format else DEFAULT_FORMAT
+    line_keys = [
+        synthesis_cache_key(line, request.voice, request.rate, request.volume, request.pitch,
+                            audio_format) if line else None
+        for line in request.lines
+    ]
+    cache_key = track_cache_key(line_keys, request.gap_ms)
+    logger.info(
+        "트랙 요청 수신",
+        lines=len(request.lines),
+        voice=request.voice,
+        gap_ms=request.gap_ms
+    )
+
+    # 캐시에 없는 줄만 upstream 비용이 들므로 그만큼만 예산에서 차감
+    pending = [
+        line for line, key in zip(request.lines, line_keys)
+        if key and not (memory_cache.contains(key) or audio_cache.contains(key))
+    ]
+    if pending:
+        await admit_synthesis(client, "\n".join(pending), request.rate, cache_key)
+
+    audio_generator = tts_service.synthesize_track(
+        lines=request.lines,
+        voice=request.voice,
+        rate=request.rate,
+        volume=request.volume,
+        pitch=request.pitch,
+        output_format=audio_format,
+        gap_ms=request.gap_ms
+    )
+    return StreamingResponse(
+        buffered_stream(
+            audio_generator, label="track", is_disconnected=http_request.is_disconnected
+        ),
+        media_type=audio_format.media_type,
+        headers={
+            "Content-Disposition": f"inline; filename=track.{audio_format.extension}",
+            "Cache-Control": "no-cache",
+            "ETag": f'"{cache_key}"',
+            "X-Output-Format": audio_format.name,
+            "X-Voice": request.voice,
+            "X-Track-Lines": str(len(request.lines))
+        }
+    )
@@ -1,6 +1,6 @@
 """애플리케이션 설정 관리"""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -12,11 +12,69 @@ class Settings(BaseSettings):
     host: str = Field(default="0.0.0.0", description="서버 호스트")
     port: int = Field(default=8000, description="서버 포트")
     debug: bool = Field(default=False, description="디버그 모드")
-    
+    workers: int = Field(
+        default=1,
+        description="워커 프로세스 수 (2 이상이면 캐시와 단일 비행을 디스크로 공유)"
+    )
+    keepalive_timeout: int = Field(
+        default=75,
+        description="유휴 keep-alive 연결 유지 시간 (초, nginx upstream keepalive_timeout 보다 길게)"
+    )
+    warmup_voice_catalog: bool = Field(
+        default=True,
+        description="준비(readiness) 전에 음성 목록 캐시를 미리 채울지 여부"
+    )
+    warmup_timeout: float = Field(
+        default=10.0,
+        description="시작 준비 작업 단계별 제한 시간 (초, 초과해도 준비 완료로 전환)"
+    )
+
     # 로깅 설정
     log_level: str = Field(default="INFO", description="로그 레벨")
     log_format: str = Field(default="json", description="로그 포맷 (json/text)")
-    
+    log_async: bool = Field(
+        default=True,
+        description="백그라운드 writer 스레드로 로그를 비동기 출력할지 여부"
+    )
+    log_queue_size: int = Field(
+        default=10000,
+        description="비동기 로그 큐 크기 (가득 차면 새 레코드는 버려짐)"
+    )
+    log_batch_size: int = Field(
+        default=256,
+        description="writer 스레드가 한 번에 출력하는 최대 레코드 수"
+    )
+    log_sample_rates: Dict[str, int] = Field(
+        default={"오디오 청크 전송": 100},
+        description="이벤트별 샘플링 비율 (N건 중 1건만 기록)"
+    )
+
+    # 이벤트 루프 진단 (워커마다, app/services/loop_monitor.py)
+    admin_token: str = Field(
+        default="",
+        description="/api/v1/debug 엔드포인트의 X-Admin-Token (비우면 엔드포인트를 막음)"
+    )
+    loop_lag_interval_ms: float = Field(
+        default=50.0,
+        description="이벤트 루프 지연 측정 간격 (밀리초)"
+    )
+    loop_blocking_detection: bool = Field(
+        default=False,
+        description="시작할 때부터 루프 멈춤 감지(스택 기록)를 켤지 여부"
+    )
+    loop_blocking_threshold_ms: float = Field(
+        default=100.0,
+        description="스택을 기록하는 최소 루프 멈춤 시간 (밀리초)"
+    )
+    request_timing: bool = Field(
+        default=False,
+        description="시작할 때부터 요청별 wall/on-CPU 시간 집계를 켤지 여부"
+    )
+    profile_max_seconds: float = Field(
+        default=60.0,
+        description="스택 표본 프로파일 한 번의 최대 시간 (초)"
+    )
+
     # CORS 설정
     allowed_origins: List[str] = Field(
         default=["chrome-extension://*", "http://localhost:3000"],
@@ -32,7 +90,198 @@ class Settings(BaseSettings):
         default=5000,
         description="최대 텍스트 길이"
     )
+    track_max_lines: int = Field(
+        default=200,
+        description="트랙 하나로 이어 붙이는 최대 줄 수"
+    )
     
+    upstream_pool_size: int = Field(
+        default=2,
+        description="워커마다 미리 연결해 두는 upstream WebSocket 수 (0이면 요청마다 새로 연결)"
+    )
+    upstream_session_max_lifetime: float = Field(
+        default=30.0,
+        description="미리 연결한 upstream 세션을 쓰지 않고 버리기까지의 최대 수명 (초)"
+    )
+    upstream_session_reuse: bool = Field(
+        default=False,
+        description="정상 종료된 upstream 세션을 다음 합성에 다시 쓸지 여부"
+    )
+    upstream_wss_url: Optional[str] = Field(
+        default=None,
+        description="upstream WebSocket URL 대체 (테스트/벤치마크용 대역 서버, 인증 헤더 없음)"
+    )
+
+    # 합성 백엔드 (app/services/backends.py)
+    tts_backends: str = Field(
+        default="edge",
+        description="우선순위 순서의 합성 백엔드 목록 (쉼표 구분: edge, synthetic, local)"
+    )
+    tts_backend_cooldown: float = Field(
+        default=30.0,
+        description="실패한 백엔드를 다음 백엔드 뒤로 미루는 시간 (초)"
+    )
+    synthetic_realtime_factor: float = Field(
+        default=0.1,
+        description="synthetic 백엔드가 오디오 1초를 만드는 데 쓰는 시간 (초, 0이면 대기 없음)"
+    )
+    synthetic_first_audio_ms: float = Field(
+        default=150.0,
+        description="synthetic 백엔드의 첫 오디오까지 지연 (밀리초)"
+    )
+    local_tts_command: str = Field(
+        default="espeak-ng",
+        description="local 백엔드의 음성 합성 실행 파일"
+    )
+    local_tts_encoder: str = Field(
+        default="",
+        description="local 백엔드의 MP3 인코더 실행 파일 (비우면 lame, ffmpeg 순으로 찾음)"
+    )
+
+    # 비용 기반 요청 허용 (워커마다, 단위: 추정 오디오 초)
+    admission_enabled: bool = Field(
+        default=True,
+        description="클라이언트별 오디오 길이 예산으로 합성 요청을 제한할지 여부"
+    )
+    admission_budget_per_minute: float = Field(
+        default=600.0,
+        description="클라이언트(API 키 또는 IP)별 분당 합성 오디오 예산 (초)"
+    )
+    admission_burst_seconds: float = Field(
+        default=900.0,
+        description="한 번에 쓸 수 있는 최대 예산이자 요청 하나의 최대 추정 오디오 길이 (초)"
+    )
+    admission_max_defer: float = Field(
+        default=2.0,
+        description="예산이 부족할 때 거절하지 않고 기다려 주는 최대 시간 (초)"
+    )
+    admission_key_budgets: Dict[str, float] = Field(
+        default={},
+        description="API 키(X-API-Key)별 분당 예산 재정의 (초, 여기 있는 키만 키별 예산을 받음)"
+    )
+    trusted_proxies: List[str] = Field(
+        default=[],
+        description="X-Forwarded-For / X-Real-IP 를 믿을 프록시 주소 또는 CIDR 목록 (\"*\" 이면 모두)"
+    )
+    
+    # 비동기 합성 작업 (워커마다)
+    job_workers: int = Field(
+        default=2,
+        description="합성 작업을 동시에 실행하는 백그라운드 워커 수"
+    )
+    job_queue_size: int = Field(
+        default=100,
+        description="대기 작업 최대 수 (가득 차면 503)"
+    )
+    job_timeout: float = Field(
+        default=300.0,
+        description="작업 하나의 최대 합성 시간 (초)"
+    )
+    job_ttl: float = Field(
+        default=24 * 3600.0,
+        description="끝난 작업 기록 보관 시간 (초)"
+    )
+    job_dir: str = Field(
+        default="/tmp/edge-tts-server/jobs",
+        description="워커 간에 공유하는 작업 기록 디렉토리"
+    )
+    job_callback_hosts: List[str] = Field(
+        default=["localhost", "127.0.0.1"],
+        description="완료 알림(webhook)을 보낼 수 있는 호스트 목록"
+    )
+    
+    # 짧은 서명 TTS URL (/a/{token})
+    clip_store_path: str = Field(
+        default="",
+        description="클립 레지스트리 SQLite 파일 (비우면 메모리만, 멀티 워커에서는 지정 권장)"
+    )
+    clip_url_secret: str = Field(
+        default="",
+        description="짧은 URL 서명 비밀 키 (비우면 SQLite 파일에 생성해 공유)"
+    )
+    clip_store_max_entries: int = Field(
+        default=100000,
+        description="메모리에 유지하는 최대 클립 수"
+    )
+    clip_ttl: float = Field(
+        default=30 * 24 * 3600.0,
+        description="마지막 사용 후 SQLite 에서 지우기까지의 시간 (초)"
+    )
+    
+    # 스트리밍 버퍼 설정
+    stream_high_watermark: int = Field(
+        default=256 * 1024,
+        description="스트림 버퍼가 이 크기 이상이면 upstream 읽기 일시 중지 (바이트)"
+    )
+    stream_low_watermark: int = Field(
+        default=64 * 1024,
+        description="스트림 버퍼가 이 크기 이하로 비면 upstream 읽기 재개 (바이트)"
+    )
+    stream_stall_timeout: float = Field(
+        default=30.0,
+        description="클라이언트가 읽지 않는 상태로 허용하는 최대 시간 (초)"
+    )
+    stream_coalesce_bytes: int = Field(
+        default=16 * 1024,
+        description="작은 청크를 모아 한 번에 쓰는 목표 크기 (바이트)"
+    )
+    stream_coalesce_wait_ms: float = Field(
+        default=10.0,
+        description="청크를 모으기 위해 기다리는 최대 시간 (ms)"
+    )
+    stream_disconnect_poll_interval: float = Field(
+        default=0.5,
+        description="스트리밍 중 클라이언트 연결 끊김을 확인하는 간격 (초, 0이면 확인 안 함)"
+    )
+    stream_disconnect_policy: str = Field(
+        default="finish",
+        description="연결이 끊긴 스트림의 upstream 합성 처리 (cancel: 바로 취소, finish: 충분히 진행됐으면 캐시용으로 완료)"
+    )
+    stream_disconnect_finish_ratio: float = Field(
+        default=0.5,
+        description="finish 정책에서 백그라운드로 완료할 최소 합성 진행률 (0~1)"
+    )
+    stream_disconnect_max_background: int = Field(
+        default=8,
+        description="워커마다 동시에 백그라운드로 완료하는 최대 합성 수 (넘으면 취소)"
+    )
+    
+    # 공유 캐시 설정 (워커 간 공유)
+    audio_cache_enabled: bool = Field(
+        default=True,
+        description="디스크 오디오 캐시와 워커 간 단일 비행 사용 여부"
+    )
+    audio_cache_dir: str = Field(
+        default="/tmp/edge-tts-server/cache",
+        description="오디오 캐시와 음성 목록을 저장하는 디렉토리"
+    )
+    audio_cache_max_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        description="오디오 캐시 최대 크기 (바이트, 넘으면 오래된 클립부터 삭제)"
+    )
+    audio_cache_evict_interval: float = Field(
+        default=30.0,
+        description="오디오 캐시 용량 정리 최소 간격 (초)"
+    )
+    voice_catalog_ttl: float = Field(
+        default=6 * 3600.0,
+        description="음성 목록 캐시 유효 시간 (초)"
+    )
+
+    # 메모리 오디오 캐시 (워커마다, 디스크 캐시 앞단)
+    memory_cache_enabled: bool = Field(
+        default=True,
+        description="인기 클립을 메모리 arena 에 두고 적중 시 복사 없이(전송이 끝날 때까지 대여) 내보낼지 여부"
+    )
+    memory_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="워커마다 미리 잡는 메모리 arena 크기 (바이트 예산)"
+    )
+    memory_cache_page_size: int = Field(
+        default=1024 * 1024,
+        description="arena 페이지 크기 (바이트, 이보다 큰 클립은 메모리에 두지 않음)"
+    )
+
     # API 설정
     api_v1_prefix: str = Field(default="/api/v1", description="API v1 프리픽스")
     title: str = Field(default="Edge TTS Server", description="API 제목")
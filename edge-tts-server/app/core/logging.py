@@ -1,62 +1,272 @@
-"""로깅 설정"""
+"""로깅 설정
 
+structlog 이벤트는 호출한 스레드(이벤트 루프)에서 레벨 필터링, 샘플링, 지연 필드
+계산까지만 수행하고, JSON/콘솔 렌더링과 stdout 쓰기는 백그라운드 writer 스레드가
+배치 단위로 처리합니다. 오디오 스트리밍 중에도 블로킹 쓰기가 루프를 멈추지 않습니다.
+"""
+
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Any, Dict
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, TextIO
 
 import structlog
 from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class lazy:
+    """
+    로그 필드 값을 지연 계산하는 래퍼.
+
+    레벨 필터와 샘플링을 통과한 이벤트에서만 ``func(*args)`` 가 호출되므로,
+    비활성 레벨의 로그 호출은 필드 계산 비용을 치르지 않습니다.
+
+    예: ``logger.debug("오디오 청크 전송", chunk_size=lazy(len, data))``
+    """
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def __call__(self) -> Any:
+        return self.func(*self.args)
+
+
+def resolve_lazy_fields(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """``lazy`` 로 감싼 필드 값을 계산합니다."""
+    for key, value in event_dict.items():
+        if isinstance(value, lazy):
+            event_dict[key] = value()
+    return event_dict
+
+
+class EventSampler:
+    """
+    고빈도 이벤트를 이벤트 이름별로 N건 중 1건만 남기는 structlog 프로세서.
+
+    남긴 이벤트에는 ``sample_rate`` 필드를 붙여 실제 발생 건수를 역산할 수 있게 합니다.
+    """
+
+    def __init__(self, rates: Dict[str, int]):
+        self._rates = {event: rate for event, rate in rates.items() if rate > 1}
+        self._counts: Counter = Counter()
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        event = event_dict.get("event")
+        rate = self._rates.get(event)
+        if rate is None:
+            return event_dict
+
+        # 스레드 간 경합으로 카운트가 약간 어긋나도 샘플링 목적상 문제 없음
+        seen = self._counts[event]
+        self._counts[event] = seen + 1
+        if seen % rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+def _add_record_timestamp(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """writer 스레드에서 LogRecord 생성 시각을 ISO 타임스탬프로 기록합니다."""
+    record = event_dict.get("_record")
+    if record is not None:
+        event_dict["timestamp"] = datetime.fromtimestamp(
+            record.created, tz=timezone.utc
+        ).isoformat()
+    return event_dict
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    레코드를 큐에 넣기만 하는 핸들러.
+
+    큐가 가득 차면 이벤트 루프를 막는 대신 레코드를 버리고 ``dropped`` 를 증가시킵니다.
+    렌더링은 writer 스레드에서 하므로 ``prepare`` 는 레코드를 그대로 넘깁니다.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingLogWriter(threading.Thread):
+    """큐에 쌓인 레코드를 한 번에 최대 ``batch_size`` 건씩 렌더링해 한 번의 write로 출력합니다."""
 
+    _STOP = object()
 
-def configure_logging() -> None:
+    def __init__(
+        self,
+        log_queue: "queue.Queue[Any]",
+        formatter: logging.Formatter,
+        stream: TextIO,
+        batch_size: int,
+    ):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.formatter = formatter
+        self.stream = stream
+        self.batch_size = batch_size
+        self.batches_written = 0
+
+    def run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._write(batch):
+                return
+
+    def _write(self, batch: List[Any]) -> bool:
+        lines = []
+        running = True
+        for record in batch:
+            if record is self._STOP:
+                running = False
+                continue
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                # 렌더링에 실패한 레코드 하나 때문에 배치 전체를 잃지 않도록 건너뜀
+                continue
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except Exception:
+                pass
+            self.batches_written += 1
+        return running
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """남은 레코드를 모두 쓰고 스레드를 종료합니다."""
+        self.queue.put(self._STOP)
+        self.join(timeout)
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_writer: Optional[BatchingLogWriter] = None
+
+
+def configure_logging(stream: Optional[TextIO] = None) -> None:
     """로깅 설정을 구성합니다."""
-    
-    # 기본 로깅 설정
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
-        format="%(message)s",
-        stream=sys.stdout,
-    )
-    
-    # structlog 설정
+    shutdown_logging()
+
+    stream = stream or sys.stdout
+    level = getattr(logging, settings.log_level.upper())
+
+    # 호출 스레드에서 실행되는 프로세서 (레벨 필터는 wrapper_class가 담당)
+    shared_processors = [
+        EventSampler(settings.log_sample_rates),
+        resolve_lazy_fields,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        # 예외/스택 정보는 발생한 스레드에서만 얻을 수 있으므로 여기서 문자열로 변환
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+    ]
+
     if settings.log_format == "json":
         # JSON 포맷 (프로덕션용)
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.processors.JSONRenderer()
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
-        )
+        renderer = structlog.processors.JSONRenderer()
     else:
         # 텍스트 포맷 (개발용)
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.dev.ConsoleRenderer(colors=True)
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
+        renderer = structlog.dev.ConsoleRenderer(colors=True)
+
+    # writer 스레드(또는 동기 핸들러)에서 실행되는 렌더링 단계
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            _add_record_timestamp,
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.UnicodeDecoder(),
+            renderer,
+        ],
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+        ],
+    )
+
+    structlog.configure(
+        processors=shared_processors
+        + [structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        # 비활성 레벨의 메서드는 아무 일도 하지 않는 함수로 대체됨
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        cache_logger_on_first_use=True,
+    )
+
+    global _queue_handler, _writer
+    if settings.log_async:
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=settings.log_queue_size)
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        _writer = BatchingLogWriter(
+            log_queue, formatter, stream, settings.log_batch_size
         )
+        _writer.start()
+        handler: logging.Handler = _queue_handler
+    else:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+
+    root_logger = logging.getLogger()
+    for existing in root_logger.handlers[:]:
+        root_logger.removeHandler(existing)
+    root_logger.addHandler(handler)
+    root_logger.setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """비동기 writer 스레드를 정리하고 남은 로그를 모두 출력합니다."""
+    global _queue_handler, _writer
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def get_logging_stats() -> Dict[str, int]:
+    """비동기 로깅 파이프라인 상태를 반환합니다."""
+    if _queue_handler is None or _writer is None:
+        return {"queued": 0, "dropped": 0, "batches_written": 0}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "batches_written": _writer.batches_written,
+    }
+
+
+atexit.register(shutdown_logging)
+metrics.register("logging", get_logging_stats)
 
 
 def get_logger(name: str) -> structlog.BoundLogger:
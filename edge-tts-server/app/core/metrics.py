@@ -0,0 +1,26 @@
+"""런타임 지표 수집
+
+각 서브시스템은 ``metrics.register(name, provider)`` 로 스냅샷 함수를 등록하고,
+``GET /api/v1/metrics`` 는 등록된 모든 스냅샷을 모아 JSON으로 반환합니다.
+"""
+
+from typing import Any, Callable, Dict
+
+
+class MetricsRegistry:
+    """지표 스냅샷 제공자 레지스트리"""
+
+    def __init__(self) -> None:
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+        """이름으로 스냅샷 제공자를 등록합니다. 같은 이름은 덮어씁니다."""
+        self._providers[name] = provider
+
+    def snapshot(self) -> Dict[str, Any]:
+        """등록된 모든 제공자의 현재 값을 반환합니다."""
+        return {name: provider() for name, provider in self._providers.items()}
+
+
+# 전역 지표 레지스트리
+metrics = MetricsRegistry()
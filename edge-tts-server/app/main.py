@@ -1,5 +1,6 @@
 """FastAPI 애플리케이션 메인 모듈"""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -8,9 +9,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.v1.api import api_router
+from app.api.v1.endpoints import clips
 from app.core.config import settings
-from app.core.logging import configure_logging, get_logger
+from app.core.logging import configure_logging, get_logger, shutdown_logging
 from app.models.schemas import HealthResponse
+from app.services.deadline import DeadlineMiddleware
+from app.services.diagnostics import request_timer, start_diagnostics, stop_diagnostics
+from app.services.jobs import job_manager
+from app.services.loop_monitor import RequestTimingMiddleware
+from app.services.upstream import upstream_pool
+from app.services.warmup import readiness, warm_up
 
 
 @asynccontextmanager
@@ -20,11 +28,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     configure_logging()
     logger = get_logger(__name__)
     logger.info("Edge TTS Server 시작", version=settings.version)
+    start_diagnostics()
+    # 무거운 모듈 import 와 캐시 준비는 요청을 받으면서 백그라운드로 진행 (/ready 로 확인)
+    warmup_task = asyncio.create_task(warm_up())
+    job_manager.start()
     
     yield
     
     # 종료 시 실행
+    warmup_task.cancel()
+    await job_manager.stop()
+    await upstream_pool.close()
+    await stop_diagnostics()
     logger.info("Edge TTS Server 종료")
+    shutdown_logging()
 
 
 # FastAPI 애플리케이션 생성
@@ -46,9 +63,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 게이트웨이가 넘긴 남은 시간(X-Deadline-Ms)을 요청 데드라인으로 설정
+app.add_middleware(DeadlineMiddleware)
+# 요청별 wall/on-CPU 시간 (REQUEST_TIMING 또는 /api/v1/debug/loop 로 켰을 때만 측정)
+app.add_middleware(RequestTimingMiddleware, timer=request_timer)
 
 # API 라우터 등록
 app.include_router(api_router, prefix=settings.api_v1_prefix)
+# 짧은 서명 TTS URL (/a/{token})
+app.include_router(clips.short_router)
 
 
 @app.get("/", response_model=HealthResponse)
@@ -63,7 +86,7 @@ async def root() -> HealthResponse:
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
-    """헬스 체크 엔드포인트"""
+    """헬스 체크 엔드포인트 (liveness: 프로세스가 요청을 받을 수 있으면 성공)"""
     return HealthResponse(
         status="healthy",
         service=settings.title,
@@ -71,6 +94,15 @@ async def health_check() -> HealthResponse:
     )
 
 
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """준비 상태 엔드포인트 (readiness: 시작 준비 작업이 끝나야 200, 그 전에는 503)"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if readiness.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if readiness.ready else "starting", **readiness.snapshot()},
+    )
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
     """HTTP 예외 핸들러"""
@@ -88,7 +120,8 @@ async def http_exception_handler(request, exc: HTTPException):
             "error": exc.detail,
             "status_code": exc.status_code,
             "path": str(request.url.path)
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -116,10 +149,13 @@ async def general_exception_handler(request, exc: Exception):
 if __name__ == "__main__":
     import uvicorn
     
+    # reload 모드는 단일 프로세스로만 동작하므로 워커 수를 무시
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=None if settings.debug else settings.workers,
+        timeout_keep_alive=settings.keepalive_timeout,
         log_level=settings.log_level.lower()
     )
@@ -3,6 +3,10 @@
 from typing import List, Optional
 from pydantic import BaseModel, Field, validator
 
+from app.core.config import settings
+from app.services.audio_formats import AUDIO_FORMATS
+from app.services.textnorm import normalize_prosody, normalize_tts_text
+
 
 class TTSRequest(BaseModel):
     """TTS 요청 모델"""
@@ -11,7 +15,7 @@ class TTSRequest(BaseModel):
         ..., 
         description="변환할 텍스트", 
         min_length=1, 
-        max_length=5000,
+        max_length=settings.max_text_length,
         example="안녕하세요, 테스트입니다"
     )
     voice: str = Field(
@@ -20,34 +24,40 @@ class TTSRequest(BaseModel):
         example="ko-KR-SunHiNeural"
     )
     rate: str = Field(
-        default="0%", 
+        default="+0%", 
         description="말하기 속도 (예: 0%, -50%, +50%)",
         example="0%"
     )
     volume: str = Field(
-        default="0%", 
+        default="+0%", 
         description="볼륨 (예: 0%, -50%, +50%)",
         example="0%"
     )
     pitch: str = Field(
-        default="0Hz", 
+        default="+0Hz", 
         description="음높이 (예: 0Hz, -50Hz, +50Hz)",
         example="0Hz"
     )
+    output_format: Optional[str] = Field(
+        default=None,
+        description="출력 포맷 (mp3-48k, mp3-32k, webm-opus, ogg-opus). 생략 시 Accept 헤더로 결정",
+        example="mp3-48k"
+    )
     
     @validator('text')
     def validate_text(cls, v):
-        if not v.strip():
+        # 줄바꿈, NFC, 전각 문자, 앞뒤 공백을 정규화 (캐시 키와 같은 정규형)
+        v = normalize_tts_text(v)
+        if not v:
             raise ValueError('텍스트는 비어있을 수 없습니다')
-        return v.strip()
+        return v
     
     @validator('rate')
     def validate_rate(cls, v):
         if not v.endswith('%'):
             raise ValueError('속도는 %로 끝나야 합니다 (예: 0%, -50%, +50%)')
-        # 0%를 +0%로 자동 변환
-        if v == '0%':
-            return '+0%'
+        # 0% → +0%, 50% → +50% 처럼 부호를 붙인 정규형으로 변환
+        v = normalize_prosody(v)
         if not v.startswith(('+', '-')):
             raise ValueError('속도는 + 또는 -로 시작해야 합니다 (예: 0%, -50%, +50%)')
         return v
@@ -56,9 +66,8 @@ class TTSRequest(BaseModel):
     def validate_volume(cls, v):
         if not v.endswith('%'):
             raise ValueError('볼륨은 %로 끝나야 합니다 (예: 0%, -50%, +50%)')
-        # 0%를 +0%로 자동 변환
-        if v == '0%':
-            return '+0%'
+        # 0% → +0%, 50% → +50% 처럼 부호를 붙인 정규형으로 변환
+        v = normalize_prosody(v)
         if not v.startswith(('+', '-')):
             raise ValueError('볼륨은 + 또는 -로 시작해야 합니다 (예: 0%, -50%, +50%)')
         return v
@@ -67,12 +76,122 @@ class TTSRequest(BaseModel):
     def validate_pitch(cls, v):
         if not v.endswith('Hz'):
             raise ValueError('음높이는 Hz로 끝나야 합니다 (예: 0Hz, -50Hz, +50Hz)')
-        # 0Hz를 +0Hz로 자동 변환
-        if v == '0Hz':
-            return '+0Hz'
+        # 0Hz → +0Hz, 50Hz → +50Hz 처럼 부호를 붙인 정규형으로 변환
+        v = normalize_prosody(v)
         if not v.startswith(('+', '-')):
             raise ValueError('음높이는 + 또는 -로 시작해야 합니다 (예: 0Hz, -50Hz, +50Hz)')
         return v
+    
+    @validator('output_format')
+    def validate_output_format(cls, v):
+        if v is not None and v not in AUDIO_FORMATS:
+            raise ValueError(f'지원하지 않는 출력 포맷입니다 (지원: {", ".join(AUDIO_FORMATS)})')
+        return v
+
+
+class TTSTrackRequest(BaseModel):
+    """여러 줄 트랙 요청 모델 (줄마다 합성한 MP3 를 재인코딩 없이 이어 붙임)"""
+    
+    lines: List[str] = Field(
+        ...,
+        description="줄 목록 (빈 줄은 줄 간격을 한 번 더 넣음)",
+        min_length=1,
+        max_length=settings.track_max_lines,
+        example=["첫 번째 줄입니다", "두 번째 줄입니다", "", "다음 연입니다"]
+    )
+    voice: str = Field(
+        default="ko-KR-SunHiNeural",
+        description="음성 선택",
+        example="ko-KR-SunHiNeural"
+    )
+    rate: str = Field(default="+0%", description="말하기 속도 (예: 0%, -50%, +50%)")
+    volume: str = Field(default="+0%", description="볼륨 (예: 0%, -50%, +50%)")
+    pitch: str = Field(default="+0Hz", description="음높이 (예: 0Hz, -50Hz, +50Hz)")
+    gap_ms: int = Field(
+        default=300,
+        description="줄 사이 무음 길이 (밀리초, 프레임 길이 단위로 반올림)",
+        ge=0,
+        le=10000
+    )
+    output_format: Optional[str] = Field(
+        default=None,
+        description="출력 포맷 (mp3-48k, mp3-32k). 생략 시 mp3-48k",
+        example="mp3-48k"
+    )
+    
+    @validator('lines')
+    def validate_lines(cls, v):
+        # 줄마다 합성 요청과 같은 정규형으로 변환 (빈 줄은 그대로 둠)
+        v = [normalize_tts_text(line) for line in v]
+        if not any(v):
+            raise ValueError('모든 줄이 비어 있습니다')
+        if any(len(line) > settings.max_text_length for line in v):
+            raise ValueError(f'줄 하나는 {settings.max_text_length}자를 넘을 수 없습니다')
+        return v
+    
+    @validator('rate')
+    def validate_rate(cls, v):
+        return TTSRequest.validate_rate(v)
+    
+    @validator('volume')
+    def validate_volume(cls, v):
+        return TTSRequest.validate_volume(v)
+    
+    @validator('pitch')
+    def validate_pitch(cls, v):
+        return TTSRequest.validate_pitch(v)
+    
+    @validator('output_format')
+    def validate_output_format(cls, v):
+        if v is not None and (v not in AUDIO_FORMATS or AUDIO_FORMATS[v].extension != "mp3"):
+            mp3_formats = ", ".join(name for name, fmt in AUDIO_FORMATS.items() if fmt.extension == "mp3")
+            raise ValueError(f'트랙은 MP3 포맷만 지원합니다 (지원: {mp3_formats})')
+        return v
+
+
+class TTSJobRequest(TTSRequest):
+    """비동기 합성 작업 요청 모델"""
+    
+    callback_url: Optional[str] = Field(
+        default=None,
+        description="완료/실패 시 상태 JSON 을 POST 할 URL (허용된 호스트만)",
+        example="http://localhost:9000/tts-done"
+    )
+
+
+class TTSJobStatus(BaseModel):
+    """비동기 합성 작업 상태 모델"""
+    
+    id: str = Field(..., description="작업 id")
+    status: str = Field(..., description="작업 상태 (queued, running, done, failed)")
+    voice: str = Field(..., description="음성")
+    output_format: str = Field(..., description="출력 포맷")
+    text_length: int = Field(..., description="텍스트 길이")
+    cache_key: str = Field(..., description="합성 캐시 키 (오디오 ETag)")
+    audio_bytes: int = Field(0, description="지금까지 합성된 오디오 크기 (바이트)")
+    error: Optional[str] = Field(None, description="실패 사유")
+    created_at: float = Field(..., description="접수 시각 (epoch 초)")
+    started_at: Optional[float] = Field(None, description="시작 시각 (epoch 초)")
+    finished_at: Optional[float] = Field(None, description="종료 시각 (epoch 초)")
+    status_url: str = Field(..., description="상태 조회 경로")
+    audio_url: str = Field(..., description="결과 오디오 경로 (변하지 않으므로 캐시 가능)")
+
+
+class ClipResponse(BaseModel):
+    """짧은 서명 URL 등록 응답 모델"""
+    
+    token: str = Field(..., description="서명된 클립 token")
+    path: str = Field(..., description="오디오 경로 (서버 루트 기준, 예: /a/{token})")
+    cache_key: str = Field(..., description="합성 캐시 키 (오디오 ETag)")
+
+
+class LoopDiagnosticsUpdate(BaseModel):
+    """이벤트 루프 진단 설정 변경 요청 모델 (생략한 항목은 그대로)"""
+    
+    blocking: Optional[bool] = Field(None, description="루프 멈춤 감지(스택 기록) 켜기/끄기")
+    request_timing: Optional[bool] = Field(
+        None, description="요청별 wall/on-CPU 시간 집계 켜기/끄기 (켜면 집계를 초기화)"
+    )
 
 
 class VoiceInfo(BaseModel):
@@ -0,0 +1,342 @@
+"""합성 비용 모델과 비용 기반 요청 허용(admission)
+
+텍스트 길이 상한만으로는 5자 요청과 4999자 요청이 같은 취급을 받습니다. 여기서는
+요청마다 만들어질 오디오 길이(초)를 추정하고, 클라이언트별로 "분당 오디오 초" 예산을
+토큰 버킷으로 관리합니다.
+
+- 비용 추정: 문자 종류(한글 음절, 라틴 문자, 숫자, 문장부호)별 초당 발화량과 prosody
+  ``rate`` (``+50%`` 면 1.5배 빠르게 읽으므로 길이는 1/1.5)로 오디오 길이를 계산합니다.
+- 보정: 합성이 끝날 때마다 실제 오디오 길이(경계 메타데이터)와 합성 소요 시간을 기록하고,
+  주 문자 종류별 실제/추정 비율과 합성 시간 = 고정 지연 + 실시간 배수 x 오디오 길이 를
+  최근 표본으로 다시 맞춥니다.
+- 허용: 예산이 남으면 바로 허용, 잠깐 기다리면 되는 경우는 ``admission_max_defer`` 까지
+  지연 후 허용, 그 이상이면 ``Retry-After`` 와 함께 거절합니다. 요청에 데드라인이 있으면
+  그보다 오래 지연시키지 않고 바로 거절합니다. 한 요청의 추정 길이가
+  버킷 용량을 넘으면 텍스트 길이와 관계없이 너무 긴 요청으로 거절합니다.
+
+버킷은 워커 프로세스마다 따로 관리됩니다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+# 주 문자 종류별 기본 발화 시간 (초/문자, 보정 전 초기값)
+_DEFAULT_SECONDS_PER_UNIT: Dict[str, float] = {
+    "hangul": 0.16,
+    "latin": 0.07,
+    "digit": 0.25,
+    "other": 0.12,
+}
+_PAUSE_SECONDS = 0.25  # 문장부호 하나당 쉼
+_PAUSE_CHARACTERS = frozenset(".,!?;:…。、！？\n")
+_MIN_AUDIO_SECONDS = 0.5
+
+# 보정 표본이 이만큼 쌓여야 기본값 대신 보정값을 씀
+_MIN_CALIBRATION_SAMPLES = 8
+
+
+class AdmissionRejected(Exception):
+    """예산 초과 또는 너무 긴 요청"""
+
+    def __init__(self, reason: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class TextFeatures:
+    """비용 추정에 쓰는 텍스트 특징"""
+
+    hangul: int = 0
+    latin: int = 0
+    digit: int = 0
+    other: int = 0
+    pauses: int = 0
+
+    @property
+    def script(self) -> str:
+        """가장 많은 문자 종류 (보정 그룹)"""
+        counts = {"hangul": self.hangul, "latin": self.latin, "digit": self.digit, "other": self.other}
+        return max(counts, key=counts.__getitem__)
+
+
+def text_features(text: str) -> TextFeatures:
+    features = TextFeatures()
+    for char in text:
+        if "가" <= char <= "힣" or "ㄱ" <= char <= "ㆎ":
+            features.hangul += 1
+        elif char.isascii() and char.isalpha():
+            features.latin += 1
+        elif char.isdigit():
+            features.digit += 1
+        elif char in _PAUSE_CHARACTERS:
+            features.pauses += 1
+        elif not char.isspace():
+            features.other += 1
+    return features
+
+
+def rate_factor(rate: str) -> float:
+    """prosody rate (예: ``+25%``, ``-50%``) 를 읽는 속도 배수로 바꿉니다."""
+    try:
+        percent = float(rate.strip().rstrip("%") or 0)
+    except ValueError:
+        return 1.0
+    return max(0.1, 1.0 + percent / 100.0)
+
+
+class CostModel:
+    """문자 구성과 속도로 오디오 길이/합성 시간을 추정하고 실제 기록으로 보정합니다."""
+
+    def __init__(self, window: int = 256) -> None:
+        self.seconds_per_unit = dict(_DEFAULT_SECONDS_PER_UNIT)
+        self._samples: Deque[Tuple[str, float, float, float]] = deque(maxlen=window)
+        self._scale: Dict[str, float] = {}
+        self.synthesis_overhead = 0.5  # 초
+        self.realtime_factor = 0.1  # 오디오 1초당 합성 시간 (초)
+        self.observations = 0
+
+    def _raw_audio_seconds(self, features: TextFeatures, rate: str) -> float:
+        spoken = (
+            features.hangul * self.seconds_per_unit["hangul"]
+            + features.latin * self.seconds_per_unit["latin"]
+            + features.digit * self.seconds_per_unit["digit"]
+            + features.other * self.seconds_per_unit["other"]
+            + features.pauses * _PAUSE_SECONDS
+        )
+        return max(_MIN_AUDIO_SECONDS, spoken / rate_factor(rate))
+
+    def estimate(self, text: str, rate: str) -> Dict[str, float]:
+        """추정 오디오 길이(초)와 합성 시간(초)"""
+        features = text_features(text)
+        audio_seconds = self._raw_audio_seconds(features, rate) * self._scale.get(features.script, 1.0)
+        return {
+            "audio_seconds": audio_seconds,
+            "synthesis_seconds": self.synthesis_overhead + self.realtime_factor * audio_seconds,
+        }
+
+    def observe(self, text: str, rate: str, audio_seconds: float, synthesis_seconds: float) -> None:
+        """합성 1회의 실제 오디오 길이와 소요 시간을 기록하고 보정값을 갱신합니다."""
+        if audio_seconds <= 0:
+            return
+        features = text_features(text)
+        predicted = self._raw_audio_seconds(features, rate)
+        self._samples.append((features.script, predicted, audio_seconds, synthesis_seconds))
+        self.observations += 1
+        self._refit()
+
+    def _refit(self) -> None:
+        by_script: Dict[str, Tuple[float, float, int]] = {}
+        for script, predicted, actual, _ in self._samples:
+            total_predicted, total_actual, count = by_script.get(script, (0.0, 0.0, 0))
+            by_script[script] = (total_predicted + predicted, total_actual + actual, count + 1)
+        self._scale = {
+            script: total_actual / total_predicted
+            for script, (total_predicted, total_actual, count) in by_script.items()
+            if count >= _MIN_CALIBRATION_SAMPLES and total_predicted > 0
+        }
+
+        # 합성 시간 = 고정 지연 + 실시간 배수 x 오디오 길이 (최소제곱)
+        if len(self._samples) < _MIN_CALIBRATION_SAMPLES:
+            return
+        xs = [sample[2] for sample in self._samples]
+        ys = [sample[3] for sample in self._samples]
+        n = len(xs)
+        mean_x = sum(xs) / n
+        mean_y = sum(ys) / n
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        if variance <= 1e-9:
+            return
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+        self.realtime_factor = max(0.0, slope)
+        self.synthesis_overhead = max(0.0, mean_y - self.realtime_factor * mean_x)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "observations": self.observations,
+            "samples": len(self._samples),
+            "seconds_per_unit": self.seconds_per_unit,
+            "script_scale": {script: round(scale, 3) for script, scale in self._scale.items()},
+            "synthesis_overhead_s": round(self.synthesis_overhead, 3),
+            "realtime_factor": round(self.realtime_factor, 4),
+        }
+
+
+class TokenBucket:
+    """분당 오디오 초 예산"""
+
+    def __init__(self, per_minute: float, capacity: float) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, cost: float) -> float:
+        """``cost`` 만큼 쓰려면 기다려야 하는 시간 (초)"""
+        self.refill()
+        return max(0.0, (cost - self.tokens) / self.rate) if self.rate > 0 else float("inf")
+
+
+class AdmissionController:
+    """클라이언트/API 키별 토큰 버킷으로 합성 요청을 허용, 지연, 거절합니다."""
+
+    def __init__(
+        self,
+        cost_model: CostModel,
+        budget_per_minute: float,
+        burst_seconds: float,
+        max_defer: float,
+        key_budgets: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+    ) -> None:
+        self.cost_model = cost_model
+        self.budget_per_minute = budget_per_minute
+        self.burst_seconds = burst_seconds
+        self.max_defer = max_defer
+        self.key_budgets = key_budgets or {}
+        self.enabled = enabled
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._last_prune = time.monotonic()
+        self.admitted = 0
+        self.deferred = 0
+        self.rejected = 0
+        self.rejected_deadline = 0
+        self.too_long = 0
+        self.free = 0
+        self.defer_seconds = 0.0
+
+    def _bucket(self, client: str) -> TokenBucket:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            api_key = client[len("key:"):] if client.startswith("key:") else None
+            per_minute = self.key_budgets.get(api_key, self.budget_per_minute) if api_key else self.budget_per_minute
+            capacity = self.burst_seconds * per_minute / self.budget_per_minute
+            bucket = self._buckets[client] = TokenBucket(per_minute, capacity)
+            self._maybe_prune()
+        return bucket
+
+    def _maybe_prune(self) -> None:
+        # 다 채워진 버킷은 새로 만든 것과 같으므로 주기적으로 버림
+        now = time.monotonic()
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        for client, bucket in list(self._buckets.items()):
+            bucket.refill()
+            if bucket.tokens >= bucket.capacity:
+                del self._buckets[client]
+
+    async def admit(
+        self,
+        client: str,
+        text: str,
+        rate: str,
+        cached: bool = False,
+        max_defer: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """
+        요청 하나를 허용합니다. 예산이 잠깐 부족하면 기다렸다가 허용합니다.
+
+        Args:
+            client: API 키 또는 클라이언트 주소
+            text: 합성할 텍스트
+            rate: prosody 속도
+            cached: 디스크 캐시에 이미 있는 요청이면 upstream 비용이 없으므로 차감하지 않음
+            max_defer: 요청 데드라인까지 남은 시간 (이보다 오래 지연시키지 않음)
+
+        Returns:
+            dict: 추정 오디오 길이, 합성 시간, 지연 시간
+
+        Raises:
+            AdmissionRejected: 예산 초과, 버킷 용량보다 긴 요청, 또는 지연하면 데드라인을 넘김
+        """
+        estimate = self.cost_model.estimate(text, rate)
+        estimate["deferred_s"] = 0.0
+        if not self.enabled:
+            return estimate
+        if cached:
+            self.free += 1
+            return estimate
+
+        cost = estimate["audio_seconds"]
+        bucket = self._bucket(client)
+        if cost > bucket.capacity:
+            self.too_long += 1
+            raise AdmissionRejected(
+                "too_long",
+                f"텍스트가 너무 깁니다. 예상 오디오 길이 {cost:.0f}초가 "
+                f"요청당 한도 {bucket.capacity:.0f}초를 넘습니다.",
+            )
+
+        wait = bucket.wait_for(cost)
+        if max_defer is not None and self.max_defer >= wait > max_defer:
+            self.rejected_deadline += 1
+            raise AdmissionRejected(
+                "deadline",
+                f"합성 예산을 기다리면({wait:.1f}초) 요청 제한 시간을 넘습니다.",
+                retry_after=wait,
+            )
+        if wait > self.max_defer:
+            self.rejected += 1
+            raise AdmissionRejected(
+                "over_budget",
+                f"합성 예산(분당 오디오 {bucket.rate * 60:.0f}초)을 초과했습니다. "
+                f"{wait:.0f}초 후 다시 시도하세요.",
+                retry_after=wait,
+            )
+
+        # 지연되는 요청도 순서를 지키도록 먼저 차감(음수 허용)하고 기다림
+        bucket.tokens -= cost
+        if wait > 0:
+            self.deferred += 1
+            self.defer_seconds += wait
+            estimate["deferred_s"] = wait
+            logger.info("합성 요청 지연", client=client, wait_s=round(wait, 3),
+                        audio_seconds=round(cost, 1))
+            await asyncio.sleep(wait)
+        self.admitted += 1
+        return estimate
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "budget_audio_seconds_per_minute": self.budget_per_minute,
+            "burst_audio_seconds": self.burst_seconds,
+            "max_defer_s": self.max_defer,
+            "clients": len(self._buckets),
+            "admitted": self.admitted,
+            "deferred": self.deferred,
+            "defer_seconds_total": round(self.defer_seconds, 3),
+            "rejected": self.rejected,
+            "rejected_deadline": self.rejected_deadline,
+            "too_long": self.too_long,
+            "cache_free": self.free,
+            "model": self.cost_model.snapshot(),
+        }
+
+
+cost_model = CostModel()
+admission = AdmissionController(
+    cost_model,
+    budget_per_minute=settings.admission_budget_per_minute,
+    burst_seconds=settings.admission_burst_seconds,
+    max_defer=settings.admission_max_defer,
+    key_budgets=settings.admission_key_budgets,
+    enabled=settings.admission_enabled,
+)
+metrics.register("admission", admission.snapshot)
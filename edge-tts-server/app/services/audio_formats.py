@@ -0,0 +1,163 @@
+"""오디오 출력 포맷 정의와 협상
+
+edge-tts는 ``speech.config`` 메시지에 ``audio-24khz-48kbitrate-mono-mp3`` 를 고정으로
+보내므로, 다른 포맷이 요청된 경우 현재 태스크의 컨텍스트 변수에 upstream 포맷을 지정하고
+websocket 전송 시 해당 메시지의 ``outputFormat`` 값만 바꿔 보냅니다.
+"""
+
+import contextvars
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.metrics import metrics
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """클라이언트에 노출하는 출력 포맷"""
+
+    name: str
+    edge_format: str
+    media_type: str
+    extension: str
+    bitrate: int  # 공칭 비트레이트 (bps), Opus는 추정치
+
+
+AUDIO_FORMATS: Dict[str, AudioFormat] = {
+    fmt.name: fmt
+    for fmt in (
+        AudioFormat("mp3-48k", "audio-24khz-48kbitrate-mono-mp3", "audio/mpeg", "mp3", 48000),
+        AudioFormat("mp3-32k", "audio-16khz-32kbitrate-mono-mp3", "audio/mpeg", "mp3", 32000),
+        AudioFormat("webm-opus", "webm-24khz-16bit-24kbps-mono-opus", "audio/webm", "webm", 24000),
+        AudioFormat("ogg-opus", "ogg-24khz-16bit-mono-opus", "audio/ogg", "ogg", 32000),
+    )
+}
+
+DEFAULT_FORMAT = AUDIO_FORMATS["mp3-48k"]
+
+# Accept 헤더의 미디어 타입별 후보 (앞쪽이 우선)
+_MEDIA_TYPE_FORMATS: Dict[str, List[AudioFormat]] = {}
+for _fmt in AUDIO_FORMATS.values():
+    _MEDIA_TYPE_FORMATS.setdefault(_fmt.media_type, []).append(_fmt)
+
+
+def get_format(name: str) -> AudioFormat:
+    """포맷 이름으로 포맷을 찾습니다."""
+    try:
+        return AUDIO_FORMATS[name]
+    except KeyError:
+        supported = ", ".join(AUDIO_FORMATS)
+        raise ValueError(f"지원하지 않는 출력 포맷입니다: {name} (지원: {supported})")
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media_type:
+            ranges.append((media_type.lower(), q))
+    return ranges
+
+
+def negotiate_format(
+    output_format: Optional[str] = None, accept: Optional[str] = None
+) -> AudioFormat:
+    """
+    응답 포맷을 결정합니다.
+
+    명시적인 ``output_format`` 이 우선하고, 없으면 ``Accept`` 헤더에서 q 값이 가장 높은
+    구체적 오디오 타입을 고릅니다. 와일드카드나 알 수 없는 타입만 있으면 기본 MP3입니다.
+
+    Raises:
+        ValueError: 지원하지 않는 ``output_format``
+    """
+    if output_format:
+        return get_format(output_format)
+    if not accept:
+        return DEFAULT_FORMAT
+
+    best: Optional[AudioFormat] = None
+    best_q = 0.0
+    for media_type, q in _parse_accept(accept):
+        candidates = _MEDIA_TYPE_FORMATS.get(media_type)
+        # 같은 q 값이면 먼저 나온(기본 MP3 포함) 포맷을 유지
+        if candidates and q > best_q:
+            best, best_q = candidates[0], q
+    return best or DEFAULT_FORMAT
+
+
+# 현재 태스크에서 upstream에 요청할 edge-tts 포맷 (기본 포맷이면 None)
+edge_output_format: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "edge_output_format", default=None
+)
+
+_EDGE_DEFAULT_OUTPUT = f'"outputFormat":"{DEFAULT_FORMAT.edge_format}"'
+
+
+def install_edge_output_format_hook() -> None:
+    """edge-tts의 ``speech.config`` 전송에서 출력 포맷을 바꾸는 훅을 설치합니다."""
+    import aiohttp
+
+    original = aiohttp.ClientWebSocketResponse.send_str
+    if getattr(original, "_output_format_hook", False):
+        return
+
+    async def send_str(self: Any, data: str, *args: Any, **kwargs: Any) -> Any:
+        requested = edge_output_format.get()
+        if requested and "Path:speech.config" in data:
+            data = data.replace(_EDGE_DEFAULT_OUTPUT, f'"outputFormat":"{requested}"')
+        return await original(self, data, *args, **kwargs)
+
+    send_str._output_format_hook = True  # type: ignore[attr-defined]
+    aiohttp.ClientWebSocketResponse.send_str = send_str  # type: ignore[assignment]
+
+
+class FormatMetrics:
+    """포맷별 전송량과 기본 MP3 대비 절감량"""
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, fmt: AudioFormat, audio_bytes: int, audio_seconds: float) -> None:
+        totals = self._totals.setdefault(
+            fmt.name, {"requests": 0, "bytes": 0, "audio_seconds": 0.0}
+        )
+        totals["requests"] += 1
+        totals["bytes"] += audio_bytes
+        totals["audio_seconds"] += audio_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        default_bps = DEFAULT_FORMAT.bitrate / 8
+        formats = {}
+        saved_total = 0.0
+        for name, totals in self._totals.items():
+            seconds = totals["audio_seconds"]
+            bytes_per_second = totals["bytes"] / seconds if seconds else 0.0
+            saved = default_bps * seconds - totals["bytes"] if seconds else 0.0
+            saved_total += saved
+            formats[name] = {
+                "requests": int(totals["requests"]),
+                "bytes": int(totals["bytes"]),
+                "audio_seconds": round(seconds, 3),
+                "bytes_per_second": round(bytes_per_second, 1),
+                "saved_bytes_per_second": round(default_bps - bytes_per_second, 1)
+                if seconds else 0.0,
+                "saved_bytes": int(saved),
+            }
+        return {
+            "default_format": DEFAULT_FORMAT.name,
+            "default_bytes_per_second": default_bps,
+            "saved_bytes_total": int(saved_total),
+            "formats": formats,
+        }
+
+
+format_metrics = FormatMetrics()
+metrics.register("audio_formats", format_metrics.snapshot)
@@ -0,0 +1,522 @@
+"""
+TTS 합성 백엔드와 우선순위 기반 장애 대응(failover)
+
+``TTSService`` 는 합성과 음성 목록을 백엔드에 맡깁니다. 백엔드는 ``edge_tts.Communicate.stream``
+과 같은 모양의 청크(``{"type": "audio", "data": ...}`` 와 경계 메타데이터)를 내고,
+``edge_tts.list_voices`` 와 같은 모양의 음성 목록을 돌려줍니다.
+
+- ``edge``: Microsoft Edge 읽기 서비스 (미리 연결한 세션 풀, 없으면 ``Communicate``)
+- ``synthetic``: 네트워크 없이 결정적인 무음 MP3 프레임을 정해진 실시간 배수로 만드는 엔진.
+  벤치마크, 부하 테스트, 테스트를 외부 서비스 없이 돌릴 때 씀
+- ``local``: 설치돼 있으면 ``espeak-ng`` 로 합성하고 ``lame``/``ffmpeg`` 로 MP3 인코딩
+
+``TTS_BACKENDS`` 에 적은 순서가 우선순위입니다. 합성이 첫 오디오 전에 실패하면 다음 백엔드로
+넘어가고, 실패한 백엔드는 ``TTS_BACKEND_COOLDOWN`` 초 동안 뒤로 미룹니다. 백엔드마다 오디오가
+다르므로 첫 번째가 아닌 백엔드의 결과는 다른 캐시 키로 저장합니다 (``synthesis_cache_key``).
+"""
+
+import asyncio
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Protocol
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.admission import CostModel, rate_factor
+from app.services.audio_formats import (
+    AUDIO_FORMATS,
+    DEFAULT_FORMAT,
+    AudioFormat,
+    edge_output_format,
+    install_edge_output_format_hook,
+)
+from app.services.mp3 import parse_header, silent_frame
+from app.services.shared_cache import voice_catalog
+from app.services.upstream import UpstreamSessionError, upstream_pool
+
+logger = get_logger(__name__)
+
+# edge-tts 메타데이터 offset/duration 단위 (100ns)
+TICKS_PER_SECOND = 10_000_000
+
+_MP3_FORMATS = frozenset(name for name, fmt in AUDIO_FORMATS.items() if fmt.extension == "mp3")
+# MP3 포맷별 프레임 헤더 (MPEG-2 Layer III, mono, CRC 없음) 와 표본율
+_MP3_HEADERS = {
+    "mp3-48k": bytes((0xFF, 0xF3, 0x64, 0xC4)),  # 24 kHz, 48 kbps
+    "mp3-32k": bytes((0xFF, 0xF3, 0x48, 0xC4)),  # 16 kHz, 32 kbps
+}
+
+_edge_tts: Optional[Any] = None
+
+
+def load_edge_tts() -> Any:
+    """
+    edge_tts 모듈을 불러오고 출력 포맷 훅을 설치합니다.
+
+    edge_tts 는 aiohttp 를 함께 불러와 import 비용이 앱 전체 import 의 상당 부분을
+    차지하므로, 앱 시작 시가 아니라 준비 작업(warmup) 또는 첫 합성 요청에서 불러옵니다.
+    """
+    global _edge_tts
+    if _edge_tts is None:
+        import edge_tts
+
+        install_edge_output_format_hook()
+        _edge_tts = edge_tts
+    return _edge_tts
+
+
+async def edge_tts_module() -> Any:
+    """이벤트 루프를 막지 않도록 첫 import 는 스레드에서 실행합니다."""
+    if _edge_tts is not None:
+        return _edge_tts
+    return await asyncio.to_thread(load_edge_tts)
+
+
+class BackendUnavailable(Exception):
+    """백엔드를 쓸 수 없음 (설치되지 않음, 지원하지 않는 포맷, 실행 실패)"""
+
+
+@dataclass(frozen=True)
+class BackendCapabilities:
+    """백엔드가 지원하는 기능"""
+
+    formats: FrozenSet[str]  # 출력 포맷 이름
+    prosody: bool  # rate/volume/pitch 반영
+    boundaries: bool  # 문장/단어 경계 메타데이터 (실제 오디오 길이)
+    offline: bool  # 네트워크 없이 동작
+
+
+class TTSBackend(Protocol):
+    """합성 백엔드 인터페이스"""
+
+    name: str
+    capabilities: BackendCapabilities
+
+    @property
+    def available(self) -> bool:
+        """설치/설정돼 있어 쓸 수 있는지"""
+
+    def synthesize(
+        self, text: str, voice: str, rate: str, volume: str, pitch: str,
+        output_format: AudioFormat
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """``edge_tts.Communicate.stream`` 과 같은 모양의 청크를 냅니다."""
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        """``edge_tts.list_voices`` 와 같은 모양의 음성 목록"""
+
+
+class EdgeBackend:
+    """Microsoft Edge 읽기 서비스"""
+
+    name = "edge"
+    capabilities = BackendCapabilities(
+        formats=frozenset(AUDIO_FORMATS), prosody=True, boundaries=True, offline=False
+    )
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    async def synthesize(
+        self, text: str, voice: str, rate: str, volume: str, pitch: str,
+        output_format: AudioFormat
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """미리 연결된 세션 풀로 합성하고, 풀을 쓸 수 없으면 Communicate 로 대체합니다."""
+        if upstream_pool.started:
+            try:
+                async for chunk in upstream_pool.synthesize(
+                    text, voice, rate, volume, pitch, output_format.edge_format
+                ):
+                    yield chunk
+                return
+            except UpstreamSessionError as e:
+                logger.warning("upstream 세션 풀 합성 실패, 새 연결로 대체", error=str(e))
+
+        # 기본 포맷이 아니면 upstream speech.config의 출력 포맷을 교체
+        edge_output_format.set(
+            None if output_format is DEFAULT_FORMAT else output_format.edge_format
+        )
+
+        # edge-tts로 음성 생성 (텍스트 전처리 없이 원본 그대로 사용)
+        edge_tts = await edge_tts_module()
+        communicate = edge_tts.Communicate(
+            text=text,
+            voice=voice,
+            rate=rate,
+            volume=volume,
+            pitch=pitch
+        )
+        async for chunk in communicate.stream():
+            yield chunk
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        # 워커 간 공유 캐시 사용
+        edge_tts = await edge_tts_module()
+        return await voice_catalog.get(edge_tts.list_voices)
+
+
+# 합성 엔진이 내놓는 음성 (edge 음성 이름을 그대로 받음)
+_SYNTHETIC_VOICES = (
+    ("ko-KR-SunHiNeural", "Female", "ko-KR"),
+    ("ko-KR-InJoonNeural", "Male", "ko-KR"),
+    ("en-US-AriaNeural", "Female", "en-US"),
+    ("en-US-GuyNeural", "Male", "en-US"),
+    ("ja-JP-NanamiNeural", "Female", "ja-JP"),
+)
+
+
+class SyntheticBackend:
+    """
+    결정적인 합성 엔진 (네트워크 없음).
+
+    같은 텍스트와 속도는 항상 같은 길이의 무음 MP3 프레임이 됩니다. 길이는 보정 전 비용
+    모델의 추정값이고, 첫 오디오까지 ``first_audio`` 초, 이후 오디오 1초당
+    ``realtime_factor`` 초에 걸쳐 청크를 냅니다. 단어마다 경계 메타데이터도 냅니다.
+
+    Args:
+        realtime_factor: 오디오 1초를 만드는 데 걸리는 시간 (초, 0이면 기다리지 않음)
+        first_audio: 첫 오디오까지 지연 (초)
+        chunk_frames: 청크 하나의 프레임 수
+    """
+
+    name = "synthetic"
+    capabilities = BackendCapabilities(
+        formats=_MP3_FORMATS, prosody=False, boundaries=True, offline=True
+    )
+
+    def __init__(self, realtime_factor: float, first_audio: float, chunk_frames: int = 20) -> None:
+        self.realtime_factor = realtime_factor
+        self.first_audio = first_audio
+        self.chunk_frames = max(1, chunk_frames)
+        # 보정하지 않는 비용 모델 (실제 합성 기록과 무관하게 결정적)
+        self._lengths = CostModel()
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def audio_seconds(self, text: str, rate: str) -> float:
+        return self._lengths.estimate(text, rate)["audio_seconds"]
+
+    async def synthesize(
+        self, text: str, voice: str, rate: str, volume: str, pitch: str,
+        output_format: AudioFormat
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if output_format.name not in _MP3_HEADERS:
+            raise BackendUnavailable(f"synthetic 엔진이 지원하지 않는 포맷입니다: {output_format.name}")
+        header = parse_header(_MP3_HEADERS[output_format.name])
+        seconds = self.audio_seconds(text, rate)
+        total = max(1, round(seconds / header.duration))
+        frame = silent_frame(header)
+
+        words = text.split()
+        word_ticks = int(total * header.duration * TICKS_PER_SECOND / max(1, len(words)))
+        for index, word in enumerate(words):
+            yield {
+                "type": "WordBoundary",
+                "offset": index * word_ticks,
+                "duration": word_ticks,
+                "text": word,
+            }
+
+        if self.first_audio > 0:
+            await asyncio.sleep(self.first_audio)
+        sent = 0
+        while sent < total:
+            count = min(self.chunk_frames, total - sent)
+            if self.realtime_factor > 0:
+                await asyncio.sleep(count * header.duration * self.realtime_factor)
+            sent += count
+            yield {"type": "audio", "data": frame * count}
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "Name": f"Synthetic Voice ({name})",
+                "ShortName": name,
+                "Gender": gender,
+                "Locale": locale,
+                "VoiceTag": {"ContentCategories": ["Synthetic"], "VoicePersonalities": []},
+            }
+            for name, gender, locale in _SYNTHETIC_VOICES
+        ]
+
+
+_ESPEAK_VOICE_LINE = re.compile(r"^\s*\d+\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+class LocalBackend:
+    """
+    로컬 엔진: ``espeak-ng`` 로 WAV 를 만들고 ``lame`` 또는 ``ffmpeg`` 로 MP3 인코딩.
+
+    둘 중 하나라도 없으면 쓸 수 없는 백엔드로 남습니다. edge 음성 이름은 언어 코드
+    (``ko-KR-SunHiNeural`` → ``ko``)로 바꿔 씁니다.
+
+    Args:
+        command: espeak-ng 실행 파일 이름/경로
+        encoder: 인코더 실행 파일 이름/경로 (비우면 lame, ffmpeg 순으로 찾음)
+    """
+
+    name = "local"
+
+    def __init__(self, command: str, encoder: str = "") -> None:
+        self.command = shutil.which(command) if command else None
+        candidates = [encoder] if encoder else ["lame", "ffmpeg"]
+        self.encoder = next((path for path in map(shutil.which, candidates) if path), None)
+        self.capabilities = BackendCapabilities(
+            formats=_MP3_FORMATS if self.available else frozenset(),
+            prosody=True,
+            boundaries=False,
+            offline=True,
+        )
+
+    @property
+    def available(self) -> bool:
+        return self.command is not None and self.encoder is not None
+
+    def _espeak_args(self, voice: str, rate: str, volume: str, pitch: str) -> List[str]:
+        language = voice[len("espeak-"):] if voice.startswith("espeak-") else voice.split("-")[0]
+        speed = round(175 * rate_factor(rate))  # espeak-ng 기본 175 wpm
+        amplitude = round(100 * rate_factor(volume))  # 기본 100
+        try:
+            hz = int(pitch.rstrip("Hz") or 0)
+        except ValueError:
+            hz = 0
+        return [
+            self.command, "--stdout", "-v", language,
+            "-s", str(speed), "-a", str(min(200, amplitude)), "-p", str(max(0, min(99, 50 + hz // 2))),
+        ]
+
+    def _encoder_args(self, output_format: AudioFormat) -> List[str]:
+        sample_rate = parse_header(_MP3_HEADERS[output_format.name]).sample_rate
+        kbps = output_format.bitrate // 1000
+        if self.encoder.endswith("ffmpeg"):
+            return [
+                self.encoder, "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+                "-ac", "1", "-ar", str(sample_rate), "-b:a", f"{kbps}k",
+                "-write_xing", "0", "-id3v2_version", "0", "-f", "mp3", "pipe:1",
+            ]
+        return [
+            self.encoder, "--quiet", "-t", "-m", "m", "--cbr", "-b", str(kbps),
+            "--resample", str(sample_rate / 1000), "-", "-",
+        ]
+
+    async def synthesize(
+        self, text: str, voice: str, rate: str, volume: str, pitch: str,
+        output_format: AudioFormat
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if not self.available:
+            raise BackendUnavailable("espeak-ng 또는 MP3 인코더(lame, ffmpeg)가 없습니다")
+        if output_format.name not in _MP3_HEADERS:
+            raise BackendUnavailable(f"local 엔진이 지원하지 않는 포맷입니다: {output_format.name}")
+
+        speaker = await asyncio.create_subprocess_exec(
+            *self._espeak_args(voice, rate, volume, pitch),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        wav, error = await speaker.communicate(text.encode("utf-8"))
+        if speaker.returncode != 0 or not wav:
+            raise BackendUnavailable(
+                f"espeak-ng 실패 ({speaker.returncode}): {error.decode(errors='replace')[:200]}"
+            )
+
+        encoder = await asyncio.create_subprocess_exec(
+            *self._encoder_args(output_format),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        async def feed() -> None:
+            try:
+                encoder.stdin.write(wav)
+                await encoder.stdin.drain()
+            finally:
+                encoder.stdin.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                data = await encoder.stdout.read(16 * 1024)
+                if not data:
+                    break
+                yield {"type": "audio", "data": data}
+            await feeder
+            if await encoder.wait() != 0:
+                raise BackendUnavailable(f"MP3 인코더 실패 ({encoder.returncode})")
+        finally:
+            feeder.cancel()
+            if encoder.returncode is None:
+                encoder.kill()
+                await encoder.wait()
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        if not self.available:
+            raise BackendUnavailable("espeak-ng 가 없습니다")
+        process = await asyncio.create_subprocess_exec(
+            self.command, "--voices",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        output, _ = await process.communicate()
+        voices = []
+        for line in output.decode(errors="replace").splitlines()[1:]:
+            match = _ESPEAK_VOICE_LINE.match(line)
+            if match is None:
+                continue
+            language, gender, _ = match.groups()
+            voices.append({
+                "Name": f"espeak-ng {language}",
+                "ShortName": f"espeak-{language}",
+                "Gender": "Female" if gender.endswith("F") else "Male",
+                "Locale": language,
+                "VoiceTag": {"ContentCategories": ["Local"], "VoicePersonalities": []},
+            })
+        return voices
+
+
+@dataclass
+class BackendStats:
+    """백엔드 하나의 사용 기록"""
+
+    requests: int = 0
+    served: int = 0
+    failures: int = 0
+    failovers: int = 0  # 이 백엔드가 실패해 다음 백엔드로 넘긴 횟수
+    cooldown_until: float = 0.0
+
+
+class BackendRouter:
+    """
+    우선순위 순서의 백엔드 목록과 실패한 백엔드를 잠시 뒤로 미루는 장애 대응.
+
+    Args:
+        backends: 우선순위 순서의 백엔드 (첫 번째가 기본 백엔드)
+        cooldown: 실패한 백엔드를 뒤로 미루는 시간 (초)
+    """
+
+    def __init__(self, backends: List[TTSBackend], cooldown: float) -> None:
+        if not backends:
+            raise ValueError("TTS 백엔드가 하나 이상 필요합니다")
+        self.backends = backends
+        self.cooldown = cooldown
+        self.stats: Dict[str, BackendStats] = {backend.name: BackendStats() for backend in backends}
+
+    @property
+    def primary(self) -> TTSBackend:
+        return self.backends[0]
+
+    def get(self, name: str) -> Optional[TTSBackend]:
+        return next((backend for backend in self.backends if backend.name == name), None)
+
+    def cooling(self, backend: TTSBackend) -> bool:
+        return self.stats[backend.name].cooldown_until > time.monotonic()
+
+    @property
+    def degraded(self) -> bool:
+        """기본 백엔드가 최근 실패해 뒤로 밀려 있는지"""
+        return self.cooling(self.primary)
+
+    def candidates(self, output_format: AudioFormat) -> List[TTSBackend]:
+        """
+        이 포맷을 낼 수 있는 백엔드를 시도할 순서대로 돌려줍니다 (최근 실패한 백엔드는 뒤로).
+
+        Raises:
+            BackendUnavailable: 이 포맷을 낼 수 있는 백엔드가 없음
+        """
+        usable = [
+            backend for backend in self.backends
+            if backend.available and output_format.name in backend.capabilities.formats
+        ]
+        if not usable:
+            raise BackendUnavailable(f"이 포맷을 합성할 수 있는 백엔드가 없습니다: {output_format.name}")
+        return sorted(usable, key=self.cooling)
+
+    def started(self, backend: TTSBackend) -> None:
+        self.stats[backend.name].requests += 1
+
+    def succeeded(self, backend: TTSBackend) -> None:
+        stats = self.stats[backend.name]
+        stats.served += 1
+        stats.cooldown_until = 0.0
+
+    def failed(self, backend: TTSBackend, error: BaseException) -> None:
+        stats = self.stats[backend.name]
+        stats.failures += 1
+        stats.cooldown_until = time.monotonic() + self.cooldown
+        logger.warning(
+            "TTS 백엔드 실패",
+            backend=backend.name,
+            error=f"{type(error).__name__}: {error}",
+            cooldown_s=self.cooldown,
+        )
+
+    def failover(self, backend: TTSBackend, to: TTSBackend) -> None:
+        self.stats[backend.name].failovers += 1
+        logger.info("다음 TTS 백엔드로 대체", failed=backend.name, backend=to.name)
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        """우선순위 순서로 음성 목록을 가져옵니다 (실패하면 다음 백엔드)."""
+        usable = sorted((b for b in self.backends if b.available), key=self.cooling)
+        if not usable:
+            raise BackendUnavailable("음성 목록을 가져올 수 있는 백엔드가 없습니다")
+        for index, backend in enumerate(usable):
+            try:
+                return await backend.list_voices()
+            except Exception as e:
+                self.failed(backend, e)
+                if index + 1 == len(usable):
+                    raise
+                self.failover(backend, usable[index + 1])
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "order": [backend.name for backend in self.backends],
+            "degraded": self.degraded,
+            "backends": {
+                backend.name: {
+                    "available": backend.available,
+                    "capabilities": {
+                        **asdict(backend.capabilities),
+                        "formats": sorted(backend.capabilities.formats),
+                    },
+                    **{
+                        key: value for key, value in asdict(self.stats[backend.name]).items()
+                        if key != "cooldown_until"
+                    },
+                    "cooldown_s": round(max(0.0, self.stats[backend.name].cooldown_until - now), 3),
+                }
+                for backend in self.backends
+            },
+        }
+
+
+def create_backend(name: str) -> TTSBackend:
+    """설정 이름으로 백엔드를 만듭니다."""
+    if name == "edge":
+        return EdgeBackend()
+    if name == "synthetic":
+        return SyntheticBackend(
+            settings.synthetic_realtime_factor,
+            settings.synthetic_first_audio_ms / 1000,
+        )
+    if name == "local":
+        return LocalBackend(settings.local_tts_command, settings.local_tts_encoder)
+    raise ValueError(f"알 수 없는 TTS 백엔드입니다: {name} (지원: edge, synthetic, local)")
+
+
+def create_router() -> BackendRouter:
+    names = [name.strip() for name in settings.tts_backends.split(",") if name.strip()]
+    return BackendRouter([create_backend(name) for name in names], settings.tts_backend_cooldown)
+
+
+# 전역 백엔드 라우터
+backend_router = create_router()
+metrics.register("backends", backend_router.snapshot)
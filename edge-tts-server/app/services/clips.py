@@ -0,0 +1,164 @@
+"""짧은 서명 TTS URL (클립 레지스트리)
+
+텍스트 전체를 쿼리 문자열에 담은 URL 은 여러 줄 한국어 가사에서 수 KB 의 ``%XX`` 가 되고,
+일부 프록시의 URL 길이 제한에 걸리며 캐시 키로도 쓰기 어렵습니다. 대신 합성 조건을
+레지스트리에 등록하고 ``/a/{token}`` 형태의 짧은 URL 을 돌려줍니다.
+
+- token = id(합성 캐시 키에서 만든 12자) + 서명(HMAC-SHA256 앞 8자).
+  같은 조건은 항상 같은 URL 이 되고, 서명이 맞지 않는 token 은 조회하지 않습니다.
+- 저장소는 메모리 LRU 이고, ``CLIP_STORE_PATH`` 를 주면 SQLite 파일에도 기록해 재시작과
+  워커 간에 공유합니다 (서명 비밀 키도 같은 파일에 보관).
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.audio_formats import AudioFormat
+from app.services.tts_service import synthesis_cache_key
+
+logger = get_logger(__name__)
+
+_ID_BYTES = 9  # base64url 12자
+_SIGNATURE_BYTES = 6  # base64url 8자
+_ID_LENGTH = 12
+# 서명 전에 길이와 base64url 문자만 확인 (다른 문자는 ASCII 인코딩에서 실패함)
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{20}")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+class ClipRegistry:
+    """짧은 token → 합성 조건 저장소 (메모리 LRU + 선택적 SQLite)"""
+
+    def __init__(self, path: Optional[str], secret: str, max_entries: int, ttl: float) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._last_prune = 0.0
+        self.registered = 0
+        self.resolved = 0
+        self.misses = 0
+        self.bad_signatures = 0
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS clips "
+                "(id TEXT PRIMARY KEY, params TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._secret = (secret or self._shared_secret()).encode("utf-8")
+
+    def _shared_secret(self) -> str:
+        """설정된 비밀 키가 없으면 SQLite 에 하나 만들어 워커끼리 공유 (없으면 프로세스 전용)"""
+        generated = secrets.token_urlsafe(32)
+        if self._db is None:
+            if settings.workers > 1:
+                logger.warning("CLIP_URL_SECRET 과 CLIP_STORE_PATH 가 없어 워커마다 다른 서명 키를 씁니다")
+            return generated
+        self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('secret', ?)", (generated,))
+        return self._db.execute("SELECT value FROM meta WHERE key = 'secret'").fetchone()[0]
+
+    def _sign(self, clip_id: str) -> str:
+        return _b64(hmac.new(self._secret, clip_id.encode("ascii"), hashlib.sha256).digest()[:_SIGNATURE_BYTES])
+
+    def _remember(self, clip_id: str, params: Dict[str, Any]) -> None:
+        self._memory[clip_id] = params
+        self._memory.move_to_end(clip_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def register(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        volume: str,
+        pitch: str,
+        output_format: AudioFormat,
+    ) -> Dict[str, str]:
+        """합성 조건을 등록하고 token 과 캐시 키를 돌려줍니다 (같은 조건은 같은 token)."""
+        cache_key = synthesis_cache_key(text, voice, rate, volume, pitch, output_format)
+        clip_id = _b64(hashlib.sha256(cache_key.encode("ascii")).digest()[:_ID_BYTES])
+        params = {
+            "text": text, "voice": voice, "rate": rate, "volume": volume, "pitch": pitch,
+            "output_format": output_format.name, "cache_key": cache_key,
+        }
+        if clip_id not in self._memory and self._db is not None:
+            await asyncio.to_thread(self._store, clip_id, params)
+        self._remember(clip_id, params)
+        self.registered += 1
+        return {"token": clip_id + self._sign(clip_id), "cache_key": cache_key}
+
+    def _store(self, clip_id: str, params: Dict[str, Any]) -> None:
+        assert self._db is not None
+        now = time.time()
+        self._db.execute(
+            "INSERT INTO clips (id, params, last_used) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET last_used = excluded.last_used",
+            (clip_id, json.dumps(params, ensure_ascii=False), now),
+        )
+        if now - self._last_prune > 3600:
+            self._last_prune = now
+            self._db.execute("DELETE FROM clips WHERE last_used < ?", (now - self.ttl,))
+
+    async def resolve(self, token: str) -> Optional[Dict[str, Any]]:
+        """서명을 확인하고 합성 조건을 찾습니다. 형식이 틀리거나, 없거나, 서명이 틀리면 None."""
+        if not _TOKEN_PATTERN.fullmatch(token):
+            self.bad_signatures += 1
+            return None
+        clip_id, signature = token[:_ID_LENGTH], token[_ID_LENGTH:]
+        if not hmac.compare_digest(signature, self._sign(clip_id)):
+            self.bad_signatures += 1
+            return None
+        params = self._memory.get(clip_id)
+        if params is None and self._db is not None:
+            params = await asyncio.to_thread(self._load, clip_id)
+        if params is None:
+            self.misses += 1
+            return None
+        self._remember(clip_id, params)
+        self.resolved += 1
+        return params
+
+    def _load(self, clip_id: str) -> Optional[Dict[str, Any]]:
+        assert self._db is not None
+        row = self._db.execute("SELECT params FROM clips WHERE id = ?", (clip_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "store": self.path or "memory",
+            "memory_entries": len(self._memory),
+            "registered": self.registered,
+            "resolved": self.resolved,
+            "misses": self.misses,
+            "bad_signatures": self.bad_signatures,
+        }
+
+
+clip_registry = ClipRegistry(
+    settings.clip_store_path or None,
+    secret=settings.clip_url_secret,
+    max_entries=settings.clip_store_max_entries,
+    ttl=settings.clip_ttl,
+)
+metrics.register("clips", clip_registry.snapshot)
@@ -0,0 +1,177 @@
+"""
+요청 데드라인 전파
+
+MCP 게이트웨이는 도구마다 시간 예산을 정하고, 남은 시간을 ``X-Deadline-Ms`` 헤더(밀리초)로
+넘깁니다. 컨테이너마다 시계가 다를 수 있어 절대 시각이 아니라 남은 시간을 받으며, 받는 즉시
+이 워커의 monotonic 시각으로 바꿔 요청 컨텍스트(``request_deadline``)에 둡니다.
+
+- 도착했을 때 이미 남은 시간이 없으면 아무 작업 없이 504
+- 허용 검사(admission)는 남은 시간보다 오래 지연시키지 않음
+- upstream 합성은 청크 사이마다 남은 시간 안에서만 기다리고, 지나면 세션을 닫고 중단
+
+헤더가 없는 요청(브라우저, 짧은 URL, 비동기 작업)은 지금처럼 데드라인 없이 처리합니다.
+"""
+
+import asyncio
+import math
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional, TypeVar
+
+from starlette.responses import JSONResponse
+
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+DEADLINE_HEADER = "X-Deadline-Ms"
+_HEADER_KEY = DEADLINE_HEADER.lower().encode("latin-1")
+
+T = TypeVar("T")
+
+# 현재 요청의 데드라인 (time.monotonic 기준, 없으면 None)
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 데드라인이 지나 작업을 중단함"""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"요청 제한 시간이 지났습니다 ({stage})")
+        self.stage = stage
+
+
+class DeadlineStats:
+    """데드라인이 있는 요청 수와 단계별로 취소한 작업 수"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.invalid_headers = 0
+        self.expired_on_arrival = 0
+        self.cancelled: Dict[str, int] = {}
+
+    def cancel(self, stage: str) -> None:
+        self.cancelled[stage] = self.cancelled.get(stage, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "header": DEADLINE_HEADER,
+            "requests": self.requests,
+            "invalid_headers": self.invalid_headers,
+            "expired_on_arrival": self.expired_on_arrival,
+            "cancelled": dict(self.cancelled),
+            "cancelled_total": sum(self.cancelled.values()),
+        }
+
+
+def remaining() -> Optional[float]:
+    """현재 요청의 남은 시간 (초, 데드라인이 없으면 None)"""
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check(stage: str) -> None:
+    """
+    데드라인이 지났으면 취소로 집계하고 중단합니다.
+
+    Raises:
+        DeadlineExceeded: 남은 시간이 없음
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        deadline_stats.cancel(stage)
+        raise DeadlineExceeded(stage)
+
+
+async def bounded(source: AsyncIterator[T], stage: str) -> AsyncIterator[T]:
+    """
+    ``source`` 의 다음 항목을 남은 시간 안에서만 기다립니다.
+
+    데드라인이 없으면 그대로 내보냅니다. 지나면 ``source`` 를 닫아(upstream 세션 반납)
+    ``DeadlineExceeded`` 를 일으킵니다.
+    """
+    deadline = request_deadline.get()
+    if deadline is None:
+        async for item in source:
+            yield item
+        return
+
+    iterator = source.__aiter__()
+    produced = 0
+    try:
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(iterator.__anext__(), left)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                if deadline - time.monotonic() > 0:
+                    raise  # upstream 자체의 시간 초과
+                break
+            produced += 1
+            yield item
+        deadline_stats.cancel(stage)
+        logger.info("데드라인 초과로 작업 중단", stage=stage, produced_items=produced)
+        raise DeadlineExceeded(stage)
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class DeadlineMiddleware:
+    """
+    ``X-Deadline-Ms`` 헤더를 요청 컨텍스트의 데드라인으로 바꾸는 ASGI 미들웨어.
+
+    남은 시간이 0 이하로 도착한 요청은 엔드포인트를 실행하지 않고 504 로 응답합니다.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        value = next((v for k, v in scope["headers"] if k == _HEADER_KEY), None)
+        if value is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            budget_ms = float(value)
+        except ValueError:
+            budget_ms = math.nan
+        if not math.isfinite(budget_ms):
+            deadline_stats.invalid_headers += 1
+            await self.app(scope, receive, send)
+            return
+
+        deadline_stats.requests += 1
+        if budget_ms <= 0:
+            deadline_stats.expired_on_arrival += 1
+            response = JSONResponse(
+                status_code=504,
+                content={
+                    "error": "요청 제한 시간이 지났습니다 (도착 시점)",
+                    "status_code": 504,
+                    "path": scope.get("path", ""),
+                },
+            )
+            await response(scope, receive, send)
+            return
+        token = request_deadline.set(time.monotonic() + budget_ms / 1000)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
+
+
+# 전역 데드라인 지표
+deadline_stats = DeadlineStats()
+metrics.register("deadline", deadline_stats.snapshot)
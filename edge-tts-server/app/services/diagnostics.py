@@ -0,0 +1,100 @@
+"""
+이벤트 루프 진단 (워커마다)
+
+``app/services/loop_monitor.py`` (게이트웨이와 같은 파일)의 측정기를 설정으로 만들고 앱 생명주기에
+연결합니다. p99 가 튈 때 루프가 막힌 것(로깅, 검증, JSON 인코딩 등 동기 작업)인지 upstream 을
+기다린 것인지 구분하기 위한 도구입니다.
+
+- 루프 지연: 항상 측정, ``/api/v1/metrics`` 의 ``event_loop``
+- 루프 멈춤 스택, 요청별 wall/on-CPU 시간: ``LOOP_BLOCKING_DETECTION``, ``REQUEST_TIMING``
+  또는 ``POST /api/v1/debug/loop`` 로 켤 때만 동작 (끄면 스레드와 task factory 를 되돌림)
+- 스택 표본 프로파일: ``GET /api/v1/debug/profile`` 요청 동안만 표본 추출
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.loop_monitor import (
+    BlockingDetector,
+    LoopLagMonitor,
+    RequestTimer,
+    collapse_stacks,
+    sample_stacks,
+)
+
+logger = get_logger(__name__)
+
+
+class ProfileInProgress(Exception):
+    """이 워커에서 이미 프로파일을 수집하는 중"""
+
+
+loop_lag = LoopLagMonitor(interval=settings.loop_lag_interval_ms / 1000)
+blocking_detector = BlockingDetector(threshold=settings.loop_blocking_threshold_ms / 1000)
+request_timer = RequestTimer()
+_profile_lock = asyncio.Lock()
+
+
+def start_diagnostics() -> None:
+    """루프 지연 측정과, 설정으로 켠 진단을 시작합니다."""
+    loop_lag.start()
+    if settings.loop_blocking_detection:
+        blocking_detector.start()
+    if settings.request_timing:
+        request_timer.start()
+
+
+async def stop_diagnostics() -> None:
+    request_timer.stop()
+    blocking_detector.stop()
+    await loop_lag.stop()
+
+
+def configure(blocking: Optional[bool] = None, request_timing: Optional[bool] = None) -> None:
+    """멈춤 감지와 요청 시간 집계를 켜거나 끕니다 (None 이면 그대로)."""
+    if blocking is True:
+        blocking_detector.start()
+    elif blocking is False:
+        blocking_detector.stop()
+    if request_timing is True:
+        request_timer.reset()
+        request_timer.start()
+    elif request_timing is False:
+        request_timer.stop()
+    logger.info(
+        "이벤트 루프 진단 설정 변경",
+        blocking=blocking_detector.enabled,
+        request_timing=request_timer.enabled
+    )
+
+
+def snapshot() -> Dict[str, Any]:
+    """루프 지연, 멈춤 스택, 경로별 wall/on-CPU 시간"""
+    return {
+        "event_loop": loop_lag.stats(),
+        "blocking": blocking_detector.stats(),
+        "request_timing": request_timer.stats(),
+    }
+
+
+async def profile(seconds: float, interval: float) -> str:
+    """
+    ``seconds`` 동안 루프 스레드의 스택을 표본 추출해 collapsed stack 형식으로 돌려줍니다.
+
+    Raises:
+        ProfileInProgress: 이 워커에서 다른 프로파일을 수집하는 중
+    """
+    if _profile_lock.locked():
+        raise ProfileInProgress("이 워커에서 이미 프로파일을 수집하는 중입니다")
+    async with _profile_lock:
+        loop_thread = threading.get_ident()
+        logger.info("스택 표본 프로파일 시작", seconds=seconds, interval_ms=interval * 1000)
+        samples = await asyncio.to_thread(sample_stacks, loop_thread, seconds, interval)
+        return collapse_stacks(samples)
+
+
+metrics.register("event_loop", loop_lag.stats)
@@ -0,0 +1,137 @@
+"""
+클라이언트 연결 끊김 처리
+
+청취자가 재생 중에 탭을 닫으면 응답 스트림(``BufferedAudioStream``)이 끝나고, 그 뒤에서
+돌던 upstream 합성을 어떻게 할지 정해야 합니다.
+
+- ``cancel``: 바로 합성을 취소하고 upstream 세션(WebSocket)을 닫음
+- ``finish``: upstream 합성이 ``stream_disconnect_finish_ratio`` 이상 진행됐으면 백그라운드에서
+  끝까지 받아 디스크/메모리 캐시를 채움 (다음 요청이 다시 합성하지 않도록). 그보다 덜
+  진행됐으면 취소
+
+정책과 관계없이, 같은 합성을 따라 읽는 다른 요청(디스크 캐시 단일 비행의 follower)이 있으면
+항상 백그라운드에서 끝까지 받습니다. 취소하면 follower 들이 잘린 오디오를 받게 됩니다.
+
+캐시 적중(디스크/메모리)이나 다른 요청의 합성을 따라 읽는 스트림은 upstream 비용이 없으므로
+항상 바로 정리합니다. 진행률은 합성 직전에 비용 모델로 추정한 오디오 길이 대비 지금까지 받은
+오디오 바이트입니다.
+
+``synthesis_progress`` 는 스트림이 upstream 읽기 태스크를 만들기 전에 설정하는 컨텍스트
+변수로, ``TTSService`` 가 이 스트림을 위해 upstream 합성을 할 때 진행 상황을 기록합니다.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class SynthesisProgress:
+    """스트림 하나를 위한 upstream 합성 진행 상황"""
+
+    __slots__ = ("active", "expected_bytes", "received_bytes", "followers")
+
+    def __init__(self) -> None:
+        self.active = False
+        self.expected_bytes = 0
+        self.received_bytes = 0
+        # 다른 요청이 이 합성 결과를 따라 읽고 있는지 확인하는 함수 (디스크 캐시 리더가 설정)
+        self.followers: Optional[Callable[[], bool]] = None
+
+    def start(self, expected_bytes: float) -> None:
+        self.active = True
+        self.expected_bytes = max(0, int(expected_bytes))
+        self.received_bytes = 0
+
+    def add(self, size: int) -> None:
+        self.received_bytes += size
+
+    def finish(self) -> None:
+        self.active = False
+
+    def has_followers(self) -> bool:
+        return self.followers is not None and self.followers()
+
+    @property
+    def fraction(self) -> float:
+        if not self.expected_bytes:
+            return 0.0
+        return min(1.0, self.received_bytes / self.expected_bytes)
+
+
+# 현재 스트림의 합성 진행 상황 (스트림 밖에서 합성하면 None)
+synthesis_progress: ContextVar[Optional[SynthesisProgress]] = ContextVar(
+    "synthesis_progress", default=None
+)
+
+
+class DisconnectMetrics:
+    """끊긴 스트림 수, 회수한 upstream 세션 수, 백그라운드 완료 수"""
+
+    def __init__(self) -> None:
+        self.abandoned_streams = 0
+        self.detected: Dict[str, int] = {}
+        self.reclaimed_upstream_sessions = 0
+        self.background_started = 0
+        self.background_completed = 0
+        self.background_failed = 0
+        self.background_rejected = 0
+        self.finished_for_followers = 0
+        self._background: Set["asyncio.Task[None]"] = set()
+
+    def should_finish(self, progress: SynthesisProgress) -> bool:
+        """끊긴 스트림의 upstream 합성을 백그라운드에서 끝까지 받을지 결정합니다."""
+        if progress.has_followers():
+            # 정책, 진행률, 동시 수 상한과 관계없이 끝까지 받음 (다른 요청의 응답이 걸려 있음)
+            self.finished_for_followers += 1
+            return True
+        if settings.stream_disconnect_policy != "finish":
+            return False
+        if progress.fraction < settings.stream_disconnect_finish_ratio:
+            return False
+        if len(self._background) >= settings.stream_disconnect_max_background:
+            self.background_rejected += 1
+            return False
+        return True
+
+    def abandoned(self, detected_by: str) -> None:
+        self.abandoned_streams += 1
+        self.detected[detected_by] = self.detected.get(detected_by, 0) + 1
+
+    def reclaimed(self) -> None:
+        self.reclaimed_upstream_sessions += 1
+
+    def track(self, task: "asyncio.Task[None]") -> None:
+        """백그라운드로 넘긴 upstream 읽기 태스크를 끝날 때까지 붙잡아 둡니다."""
+        self.background_started += 1
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def background_done(self, ok: bool) -> None:
+        if ok:
+            self.background_completed += 1
+        else:
+            self.background_failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "policy": settings.stream_disconnect_policy,
+            "finish_ratio": settings.stream_disconnect_finish_ratio,
+            "poll_interval_s": settings.stream_disconnect_poll_interval,
+            "abandoned_streams": self.abandoned_streams,
+            "detected": dict(self.detected),
+            "reclaimed_upstream_sessions": self.reclaimed_upstream_sessions,
+            "background_active": len(self._background),
+            "background_started": self.background_started,
+            "background_completed": self.background_completed,
+            "background_failed": self.background_failed,
+            "background_rejected": self.background_rejected,
+            "finished_for_followers": self.finished_for_followers,
+        }
+
+
+# 전역 연결 끊김 지표
+disconnect_metrics = DisconnectMetrics()
+metrics.register("disconnect", disconnect_metrics.snapshot)
@@ -0,0 +1,302 @@
+"""비동기 합성 작업
+
+긴 텍스트를 GET URL 로 바로 합성하면 합성이 끝날 때까지 HTTP 연결 하나를 붙잡습니다.
+작업 API 는 요청을 큐에 넣고 작업 id 를 바로 돌려주며, 정해진 수의 백그라운드 워커가
+합성 결과를 디스크 오디오 캐시에 채웁니다.
+
+- 상태 조회: ``GET /api/v1/tts/jobs/{id}`` (queued → running → done/failed)
+- 완료 알림: 요청에 ``callback_url`` 이 있으면 상태 JSON 을 POST (허용된 호스트만)
+- 결과: ``GET /api/v1/tts/jobs/{id}/audio`` 는 내용이 바뀌지 않으므로 오래 캐시할 수 있음
+
+작업 기록은 ``JOB_DIR`` 에 JSON 으로도 남겨, 멀티 워커에서 다른 워커가 받은 작업도
+조회할 수 있습니다. 작업 파일 읽기/쓰기는 이벤트 루프를 막지 않도록 스레드에서 합니다.
+실행 중인 작업의 오디오는 캐시 단일 비행 경로로 기록 중인 파일을
+따라 읽으므로 완료 전에도 바로 받을 수 있습니다.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.audio_formats import AudioFormat, get_format
+from app.services.tts_service import synthesis_cache_key, tts_service
+
+logger = get_logger(__name__)
+
+_CALLBACK_ATTEMPTS = 3
+
+
+class JobQueueFull(Exception):
+    """작업 큐가 가득 참"""
+
+
+class JobCallbackRejected(ValueError):
+    """허용되지 않은 콜백 URL"""
+
+
+@dataclass
+class Job:
+    """합성 작업 하나"""
+
+    id: str
+    text: str
+    voice: str
+    rate: str
+    volume: str
+    pitch: str
+    output_format: str
+    cache_key: str
+    callback_url: Optional[str] = None
+    status: str = "queued"
+    error: Optional[str] = None
+    audio_bytes: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def audio_format(self) -> AudioFormat:
+        return get_format(self.output_format)
+
+    def public(self) -> Dict[str, Any]:
+        """상태 응답 (텍스트 원문은 길 수 있어 길이만)"""
+        data = asdict(self)
+        data["text_length"] = len(data.pop("text"))
+        data.pop("callback_url")
+        return data
+
+
+class JobManager:
+    """제한된 큐와 백그라운드 워커로 합성 작업을 실행합니다."""
+
+    def __init__(self, directory: str, workers: int, queue_size: int, ttl: float) -> None:
+        self.directory = directory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._last_prune = 0.0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.callbacks_sent = 0
+        self.callbacks_failed = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _save(self, job: Job) -> None:
+        # 다른 워커 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        path = self._path(job.id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(job), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _discard(self, job_id: str) -> None:
+        try:
+            os.unlink(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        try:
+            with open(self._path(job_id), encoding="utf-8") as f:
+                return Job(**json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """메모리 또는 작업 디렉토리에서 작업을 찾습니다 (다른 워커가 받은 작업 포함)."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        if not job_id.isalnum():
+            return None
+        return await asyncio.to_thread(self._load, job_id)
+
+    async def submit(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        volume: str,
+        pitch: str,
+        output_format: AudioFormat,
+        callback_url: Optional[str] = None,
+    ) -> Job:
+        """
+        작업을 큐에 넣습니다.
+
+        Raises:
+            JobQueueFull: 큐가 가득 찬 경우
+            JobCallbackRejected: 콜백 호스트가 허용 목록에 없는 경우
+        """
+        if self._queue is None:
+            self.start()
+        if callback_url:
+            host = urlparse(callback_url).hostname
+            if urlparse(callback_url).scheme not in ("http", "https") or (
+                host not in settings.job_callback_hosts
+            ):
+                raise JobCallbackRejected(f"허용되지 않은 콜백 URL 입니다: {callback_url}")
+        job = Job(
+            id=secrets.token_hex(12),
+            text=text,
+            voice=voice,
+            rate=rate,
+            volume=volume,
+            pitch=pitch,
+            output_format=output_format.name,
+            cache_key=synthesis_cache_key(text, voice, rate, volume, pitch, output_format),
+            callback_url=callback_url,
+        )
+        if self._queue.full():
+            self.rejected += 1
+            raise JobQueueFull("합성 작업 큐가 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        # 워커가 running 으로 기록한 뒤에 queued 기록이 덮어쓰지 않도록 큐에 넣기 전에 기록
+        await asyncio.to_thread(self._save, job)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            # 기록하는 사이 다른 요청이 큐를 채움
+            self.rejected += 1
+            await asyncio.to_thread(self._discard, job.id)
+            raise JobQueueFull("합성 작업 큐가 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        self._jobs[job.id] = job
+        self.submitted += 1
+        await self._maybe_prune()
+        return job
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        await asyncio.to_thread(self._save, job)
+        try:
+            # 디스크 캐시로 합성 (같은 요청이 진행 중이면 그 결과를 따라 읽음)
+            async def drain() -> None:
+                async for chunk in tts_service.synthesize_text(
+                    text=job.text, voice=job.voice, rate=job.rate, volume=job.volume,
+                    pitch=job.pitch, output_format=job.audio_format,
+                ):
+                    job.audio_bytes += len(chunk)
+
+            await asyncio.wait_for(drain(), settings.job_timeout)
+            job.status = "done"
+            self.completed += 1
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "서버 종료로 작업이 취소되었습니다"
+            await asyncio.to_thread(self._save, job)
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+            self.failed += 1
+            logger.warning("합성 작업 실패", job_id=job.id, error=job.error)
+        job.finished_at = time.time()
+        await asyncio.to_thread(self._save, job)
+        logger.info("합성 작업 종료", job_id=job.id, status=job.status,
+                    audio_bytes=job.audio_bytes,
+                    seconds=round(job.finished_at - job.started_at, 3))
+        if job.callback_url:
+            await self._notify(job)
+
+    async def _notify(self, job: Job) -> None:
+        """완료 상태를 콜백 URL 로 POST 합니다 (실패하면 짧게 재시도)."""
+        import httpx
+
+        payload = {**job.public(), "audio_path": job_audio_path(job.id)}
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            for attempt in range(_CALLBACK_ATTEMPTS):
+                try:
+                    response = await client.post(job.callback_url, json=payload)
+                    response.raise_for_status()
+                    self.callbacks_sent += 1
+                    return
+                except httpx.HTTPError as e:
+                    if attempt == _CALLBACK_ATTEMPTS - 1:
+                        self.callbacks_failed += 1
+                        logger.warning("작업 콜백 실패", job_id=job.id, error=str(e))
+                        return
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def _maybe_prune(self) -> None:
+        """오래된 작업 기록을 정리합니다 (메모리와 작업 디렉토리)."""
+        now = time.time()
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+        await asyncio.to_thread(self._prune_files, now)
+
+    def _prune_files(self, now: float) -> None:
+        for entry in os.scandir(self.directory):
+            try:
+                if now - entry.stat().st_mtime > self.ttl:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "tracked": len(self._jobs),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "callbacks_sent": self.callbacks_sent,
+            "callbacks_failed": self.callbacks_failed,
+        }
+
+
+def job_audio_path(job_id: str) -> str:
+    """작업 결과 오디오의 API 경로"""
+    return f"{settings.api_v1_prefix}/tts/jobs/{job_id}/audio"
+
+
+job_manager = JobManager(
+    settings.job_dir,
+    workers=settings.job_workers,
+    queue_size=settings.job_queue_size,
+    ttl=settings.job_ttl,
+)
+metrics.register("jobs", job_manager.snapshot)
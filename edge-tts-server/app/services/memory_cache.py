@@ -0,0 +1,467 @@
+"""인기 클립용 메모리 오디오 캐시 (디스크 캐시 앞단)
+
+자주 요청되는 짧은 가사 클립은 디스크 캐시에서 읽는 것도 요청마다 파일 열기/읽기 시스템 호출과
+스레드 왕복이 듭니다. 이 계층은 워커 프로세스마다 미리 잡아 둔 하나의 익명 ``mmap`` 영역(arena)에
+클립을 보관하고, 적중하면 복사 없이 ``memoryview`` 조각을 그대로 응답으로 내보냅니다.
+
+- 슬랩 할당: arena 를 고정 크기 페이지로 나누고, 페이지를 크기 등급(약 1.25배 간격)별 칸으로
+  쪼개 씁니다. 클립 수가 많아도 파이썬 힙이 조각나지 않고, 비워진 페이지는 다른 등급이 다시 씁니다.
+- 교체 정책: 바이트 예산 기준 W-TinyLFU. 새 클립은 작은 window(LRU)에 들어가고, window 에서
+  밀려날 때 빈도 스케치로 주 영역(SLRU: probation/protected)의 희생 클립들보다 자주 쓰였는지
+  비교해 들일지 정합니다. 한 번만 쓰이는 클립이 인기 클립을 밀어내지 않습니다.
+- 대여(lease): 내보낸 ``memoryview`` 가 전송 중인 동안 클립이 밀려나도 칸은 대여가 끝난 뒤에
+  재사용합니다.
+
+워커마다 독립된 arena 입니다 (워커 간 공유는 디스크 캐시가 담당).
+"""
+
+import itertools
+import mmap
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+_MIN_CHUNK = 4096
+_CHUNK_GROWTH = 1.25
+_CHUNK_ALIGN = 64
+_WINDOW_RATIO = 0.01
+_PROTECTED_RATIO = 0.8
+_SKETCH_ROWS = 4
+_SKETCH_MAX_COUNT = 15
+# 자리가 없을 때 희생 후보로 살펴보는 차가운 쪽 클립 수
+_RECLAIM_SAMPLE = 32
+
+
+class SlabArena:
+    """하나의 ``mmap`` 버퍼를 페이지와 크기 등급별 칸으로 나눠 쓰는 할당기"""
+
+    def __init__(self, size: int, page_size: int) -> None:
+        self.page_size = page_size
+        self.pages = max(1, size // page_size)
+        self.size = self.pages * page_size
+        # 익명 mmap 은 실제로 쓰인 페이지만 메모리를 차지함
+        self._buffer = mmap.mmap(-1, self.size)
+        self.view = memoryview(self._buffer)
+        self.classes = self._size_classes(page_size)
+        self._free_pages: List[int] = list(range(self.pages - 1, -1, -1))
+        self._page_class: Dict[int, int] = {}
+        self._page_used: Dict[int, int] = {}
+        self._page_free: Dict[int, List[int]] = {}
+        # 등급별로 빈 칸이 있는 페이지
+        self._partial: List[Dict[int, None]] = [{} for _ in self.classes]
+
+    @staticmethod
+    def _size_classes(page_size: int) -> List[int]:
+        classes = []
+        size = _MIN_CHUNK
+        while size < page_size:
+            classes.append(size)
+            size = -(-int(size * _CHUNK_GROWTH) // _CHUNK_ALIGN) * _CHUNK_ALIGN
+        classes.append(page_size)
+        return classes
+
+    def class_of(self, length: int) -> Optional[int]:
+        """길이를 담을 수 있는 가장 작은 등급 번호 (페이지보다 크면 None)"""
+        for index, chunk in enumerate(self.classes):
+            if length <= chunk:
+                return index
+        return None
+
+    def allocate(self, size_class: int) -> Optional[int]:
+        """등급 칸 하나를 잡고 arena offset 을 반환합니다 (빈 칸과 빈 페이지가 없으면 None)."""
+        partial = self._partial[size_class]
+        if not partial:
+            if not self._free_pages:
+                return None
+            page = self._free_pages.pop()
+            chunk = self.classes[size_class]
+            base = page * self.page_size
+            self._page_class[page] = size_class
+            self._page_used[page] = 0
+            self._page_free[page] = [
+                base + i * chunk for i in range(self.page_size // chunk - 1, -1, -1)
+            ]
+            partial[page] = None
+        page = next(iter(partial))
+        free = self._page_free[page]
+        offset = free.pop()
+        self._page_used[page] += 1
+        if not free:
+            del partial[page]
+        return offset
+
+    def free(self, offset: int) -> None:
+        """칸을 돌려주고, 페이지가 모두 비면 페이지를 다른 등급이 쓸 수 있게 반환합니다."""
+        page = offset // self.page_size
+        size_class = self._page_class[page]
+        self._page_used[page] -= 1
+        if self._page_used[page] == 0:
+            del self._page_class[page], self._page_used[page], self._page_free[page]
+            self._partial[size_class].pop(page, None)
+            self._free_pages.append(page)
+            return
+        self._page_free[page].append(offset)
+        self._partial[size_class][page] = None
+
+    @property
+    def free_pages(self) -> int:
+        return len(self._free_pages)
+
+
+class FrequencySketch:
+    """4행 count-min 스케치 (TinyLFU 빈도 추정, 주기적으로 절반으로 감쇠)"""
+
+    def __init__(self, width: int) -> None:
+        self.width = 1 << max(10, (width - 1).bit_length())
+        self._mask = self.width - 1
+        self._rows = [bytearray(self.width) for _ in range(_SKETCH_ROWS)]
+        self._additions = 0
+        self._sample_size = 10 * self.width
+        self._halve = bytes(i >> 1 for i in range(256))
+        self.resets = 0
+
+    def indexes(self, key: str) -> List[int]:
+        """행별 칸 위치. 캐시 키는 sha256 hex 이므로 8자리씩 잘라 행마다 독립된 해시로 사용"""
+        return [int(key[i * 8:(i + 1) * 8], 16) & self._mask for i in range(_SKETCH_ROWS)]
+
+    def increment(self, indexes: List[int]) -> None:
+        for row, index in zip(self._rows, indexes):
+            if row[index] < _SKETCH_MAX_COUNT:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            for i, row in enumerate(self._rows):
+                self._rows[i] = bytearray(row.translate(self._halve))
+            self._additions //= 2
+            self.resets += 1
+
+    def frequency(self, indexes: List[int]) -> int:
+        rows = self._rows
+        return min(rows[0][indexes[0]], rows[1][indexes[1]], rows[2][indexes[2]], rows[3][indexes[3]])
+
+
+class _Entry:
+    __slots__ = ("key", "indexes", "offset", "length", "charge", "size_class", "segment", "pins",
+                 "evicted")
+
+    def __init__(
+        self, key: str, indexes: List[int], offset: int, length: int, charge: int, size_class: int
+    ) -> None:
+        self.key = key
+        self.indexes = indexes
+        self.offset = offset
+        self.length = length
+        self.charge = charge
+        self.size_class = size_class
+        self.segment = "window"
+        self.pins = 0
+        self.evicted = False
+
+
+class ClipLease:
+    """메모리 클립 대여. ``release()`` 전까지 칸이 재사용되지 않습니다."""
+
+    __slots__ = ("view", "_cache", "_entry")
+
+    def __init__(self, cache: "MemoryAudioCache", entry: _Entry) -> None:
+        self._cache = cache
+        self._entry = entry
+        self.view = cache.arena.view[entry.offset:entry.offset + entry.length]
+
+    def release(self) -> None:
+        if self._entry is not None:
+            self.view.release()
+            self._cache._unpin(self._entry)
+            self._entry = None
+
+
+class MemoryAudioCache:
+    """mmap arena 와 W-TinyLFU 로 관리하는 워커 로컬 오디오 캐시"""
+
+    def __init__(self, max_bytes: int, page_size: int, enabled: bool = True) -> None:
+        self.enabled = enabled and max_bytes >= page_size
+        self.arena: Optional[SlabArena] = None
+        self.max_item_bytes = page_size
+        self._window: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._probation: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._protected: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = {"window": 0, "probation": 0, "protected": 0}
+        # 페이지별로 칸을 쓰고 있는 클립 (밀려났지만 아직 대여 중인 클립 포함)
+        self._page_entries: Dict[int, Dict[int, _Entry]] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.admitted = 0
+        self.rejected_frequency = 0
+        self.rejected_size = 0
+        self.page_reclaims = 0
+        self.evictions = 0
+        self.deferred_frees = 0
+        self.pinned = 0
+        self.bytes_served = 0
+        if not self.enabled:
+            self.capacity = 0
+            return
+        self.arena = SlabArena(max_bytes, page_size)
+        self.capacity = self.arena.size
+        self.window_capacity = max(page_size, int(self.capacity * _WINDOW_RATIO))
+        self.main_capacity = self.capacity - self.window_capacity
+        self.protected_capacity = int(self.main_capacity * _PROTECTED_RATIO)
+        self.sketch = FrequencySketch(self.capacity // 16384)
+
+    # 조회
+
+    def contains(self, key: str) -> bool:
+        return self.enabled and self._find(key) is not None
+
+    def _find(self, key: str) -> Optional[_Entry]:
+        return self._window.get(key) or self._probation.get(key) or self._protected.get(key)
+
+    def lease(self, key: str) -> Optional[ClipLease]:
+        """클립이 있으면 대여해 반환합니다. 조회마다 빈도를 기록합니다 (없을 때도)."""
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        entry = self._find(key)
+        self.sketch.increment(entry.indexes if entry is not None else self.sketch.indexes(key))
+        if entry is None:
+            return None
+        self._touch(entry)
+        entry.pins += 1
+        self.pinned += 1
+        self.hits += 1
+        self.bytes_served += entry.length
+        return ClipLease(self, entry)
+
+    def _touch(self, entry: _Entry) -> None:
+        if entry.segment == "window":
+            self._window.move_to_end(entry.key)
+        elif entry.segment == "protected":
+            self._protected.move_to_end(entry.key)
+        else:
+            # probation 에서 다시 쓰이면 protected 로 승격
+            self._move(entry, "protected")
+            while self._bytes["protected"] > self.protected_capacity:
+                _, demoted = self._protected.popitem(last=False)
+                self._bytes["protected"] -= demoted.charge
+                self._link(demoted, "probation")
+
+    def _unpin(self, entry: _Entry) -> None:
+        entry.pins -= 1
+        self.pinned -= 1
+        if entry.evicted and entry.pins == 0:
+            self._free(entry)
+
+    # 저장
+
+    async def fill(self, key: str, source: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        ``source`` 를 그대로 내보내면서 모아 두었다가, 끝까지 전송되면 캐시에 넣습니다.
+
+        중간에 끊긴 스트림이나 한 칸보다 큰 클립은 넣지 않습니다.
+        """
+        if not self.enabled:
+            async for chunk in source:
+                yield chunk
+            return
+        chunks: Optional[List[bytes]] = []
+        size = 0
+        async for chunk in source:
+            if chunks is not None:
+                size += len(chunk)
+                if size > self.max_item_bytes:
+                    chunks = None
+                    self.rejected_size += 1
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        if chunks is not None:
+            self.put(key, chunks, size)
+
+    def put(self, key: str, chunks: Sequence[bytes], length: int) -> bool:
+        """클립을 arena 에 복사해 window 에 넣습니다. 들이지 못하면 False."""
+        if not self.enabled or self._find(key) is not None:
+            return False
+        size_class = self.arena.class_of(length)
+        if size_class is None:
+            self.rejected_size += 1
+            return False
+        indexes = self.sketch.indexes(key)
+        offset = self._allocate(indexes, size_class)
+        if offset is None:
+            return False
+
+        position = offset
+        for chunk in chunks:
+            self.arena.view[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        entry = _Entry(key, indexes, offset, length, self.arena.classes[size_class], size_class)
+        self._page_entries.setdefault(offset // self.arena.page_size, {})[offset] = entry
+        self._link(entry, "window")
+        self.admitted += 1
+
+        while self._bytes["window"] > self.window_capacity:
+            _, candidate = self._window.popitem(last=False)
+            self._bytes["window"] -= candidate.charge
+            self._admit_to_main(candidate)
+        return self._find(key) is not None
+
+    def _allocate(self, indexes: List[int], size_class: int) -> Optional[int]:
+        """
+        칸을 잡습니다. 물리적으로 남은 칸이 없으면 후보보다 덜 쓰인 클립을 밀어내 자리를 만듭니다.
+
+        차가운 쪽(probation → window → protected 의 LRU 순) 클립 몇 개를 살펴, 같은 등급의 가장
+        덜 쓰인 클립 하나 또는 페이지 전체(다른 등급 페이지를 넘겨받음) 중 빈도가 더 낮은 쪽을
+        밀어냅니다. 후보가 어느 쪽보다도 자주 쓰이지 않았으면 들이지 않습니다.
+        """
+        offset = self.arena.allocate(size_class)
+        if offset is not None:
+            return offset
+        frequency = self.sketch.frequency(indexes)
+        coldest_entry: Optional[_Entry] = None
+        entry_frequency = frequency
+        coldest_page: Optional[int] = None
+        page_frequency = frequency
+        seen_pages = set()
+        cold_order = itertools.chain(
+            self._probation.values(), self._window.values(), self._protected.values()
+        )
+        for entry in itertools.islice(cold_order, _RECLAIM_SAMPLE):
+            if entry.pins:
+                continue
+            if entry.size_class == size_class:
+                candidate_frequency = self.sketch.frequency(entry.indexes)
+                if candidate_frequency < entry_frequency:
+                    coldest_entry, entry_frequency = entry, candidate_frequency
+            page = entry.offset // self.arena.page_size
+            if page not in seen_pages:
+                seen_pages.add(page)
+                candidate_frequency = self._page_frequency(page)
+                if candidate_frequency < page_frequency:
+                    coldest_page, page_frequency = page, candidate_frequency
+
+        if coldest_page is not None and page_frequency < entry_frequency:
+            self.page_reclaims += 1
+            for entry in list(self._page_entries[coldest_page].values()):
+                self._evict(entry)
+        elif coldest_entry is not None:
+            self._evict(coldest_entry)
+        else:
+            self.rejected_frequency += 1
+            return None
+        return self.arena.allocate(size_class)
+
+    def _page_frequency(self, page: int) -> int:
+        """페이지 클립 중 가장 높은 빈도 (대여 중인 클립이 있으면 비울 수 없으므로 최대값 초과)"""
+        highest = 0
+        for entry in self._page_entries[page].values():
+            if entry.pins:
+                return _SKETCH_MAX_COUNT + 1
+            highest = max(highest, self.sketch.frequency(entry.indexes))
+        return highest
+
+    def _admit_to_main(self, candidate: _Entry) -> None:
+        """TinyLFU: 주 영역을 비워야 하면 희생 클립들보다 자주 쓰인 경우에만 들입니다."""
+        needed = self._bytes["probation"] + self._bytes["protected"] + candidate.charge
+        needed -= self.main_capacity
+        victims: List[_Entry] = []
+        if needed > 0:
+            candidate_frequency = self.sketch.frequency(candidate.indexes)
+            for entry in self._probation.values():
+                if needed <= 0:
+                    break
+                if self.sketch.frequency(entry.indexes) >= candidate_frequency:
+                    break
+                victims.append(entry)
+                needed -= entry.charge
+            if needed > 0:
+                self.rejected_frequency += 1
+                candidate.segment = "rejected"
+                self._release(candidate)
+                return
+        for victim in victims:
+            self._evict(victim)
+        self._link(candidate, "probation")
+
+    # 내부 목록 관리
+
+    def _segment(self, name: str) -> "OrderedDict[str, _Entry]":
+        return {"window": self._window, "probation": self._probation,
+                "protected": self._protected}[name]
+
+    def _link(self, entry: _Entry, segment: str) -> None:
+        entry.segment = segment
+        self._segment(segment)[entry.key] = entry
+        self._bytes[segment] += entry.charge
+
+    def _move(self, entry: _Entry, segment: str) -> None:
+        del self._segment(entry.segment)[entry.key]
+        self._bytes[entry.segment] -= entry.charge
+        self._link(entry, segment)
+
+    def _evict(self, entry: _Entry) -> None:
+        del self._segment(entry.segment)[entry.key]
+        self._bytes[entry.segment] -= entry.charge
+        self.evictions += 1
+        self._release(entry)
+
+    def _release(self, entry: _Entry) -> None:
+        entry.evicted = True
+        if entry.pins:
+            # 전송 중인 대여가 끝나면 칸을 돌려줌
+            self.deferred_frees += 1
+            return
+        self._free(entry)
+
+    def _free(self, entry: _Entry) -> None:
+        page = entry.offset // self.arena.page_size
+        entries = self._page_entries[page]
+        del entries[entry.offset]
+        if not entries:
+            del self._page_entries[page]
+        self.arena.free(entry.offset)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        entries = len(self._window) + len(self._probation) + len(self._protected)
+        stored = sum(
+            entry.length
+            for segment in (self._window, self._probation, self._protected)
+            for entry in segment.values()
+        )
+        return {
+            "enabled": True,
+            "capacity_bytes": self.capacity,
+            "page_size": self.arena.page_size,
+            "size_classes": len(self.arena.classes),
+            "free_pages": self.arena.free_pages,
+            "entries": entries,
+            "charged_bytes": sum(self._bytes.values()),
+            "stored_bytes": stored,
+            "segment_bytes": dict(self._bytes),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "bytes_served": self.bytes_served,
+            "admitted": self.admitted,
+            "rejected_frequency": self.rejected_frequency,
+            "rejected_size": self.rejected_size,
+            "page_reclaims": self.page_reclaims,
+            "evictions": self.evictions,
+            "pinned": self.pinned,
+            "deferred_frees": self.deferred_frees,
+            "sketch_resets": self.sketch.resets,
+        }
+
+
+memory_cache = MemoryAudioCache(
+    settings.memory_cache_max_bytes,
+    settings.memory_cache_page_size,
+    enabled=settings.memory_cache_enabled,
+)
+metrics.register("memory_cache", memory_cache.snapshot)
@@ -0,0 +1,272 @@
+"""
+MP3 프레임 단위 처리 (디코딩/재인코딩 없음)
+
+가사 한 줄씩 합성한 MP3 클립을 한 트랙으로 이어 붙이기 위한 도구입니다. MP3 는 독립된
+프레임(헤더 4바이트 + 오디오 데이터)의 나열이므로, 프레임 경계만 찾으면 바이트를 그대로
+이어 붙일 수 있습니다.
+
+- 프레임 헤더 해석 (MPEG 1/2/2.5, Layer I/II/III)과 동기를 잃었을 때 재동기화
+- 앞의 ID3v2 태그, 뒤의 ID3v1 태그, 첫 프레임 자리의 Xing/Info/VBRI 헤더(길이 정보) 제거.
+  이어 붙인 트랙에 첫 클립의 길이 정보가 남으면 플레이어가 길이를 잘못 표시함
+- 무음 프레임: 같은 형식의 헤더 + 0으로 채운 side info/오디오 데이터
+  (Layer III 의 ``part2_3_length`` 와 ``main_data_begin`` 이 0이므로 앞뒤 프레임의 bit
+  reservoir 를 참조하지 않는 무음)
+
+클립마다 인코더가 새로 시작하므로 첫 오디오 프레임의 ``main_data_begin`` 은 0이고, 클립 경계에서
+앞 클립의 데이터를 참조하지 않습니다.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+# 비트레이트 (kbps), 인덱스 0(free format)과 15(잘못된 값)는 지원하지 않음
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# 버전 비트 → (버전 표기, 표본율 목록). 01 은 예약값
+_VERSIONS = {
+    0b11: ("1", (44100, 48000, 32000)),
+    0b10: ("2", (22050, 24000, 16000)),
+    0b00: ("2.5", (11025, 12000, 8000)),
+}
+_LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+
+_INFO_TAGS = (b"Xing", b"Info")
+_VBRI_OFFSET = 36  # 프레임 시작에서 VBRI 태그까지 (헤더 4 + 32)
+
+
+class Mp3FormatError(ValueError):
+    """MP3 프레임으로 해석할 수 없거나 이어 붙일 수 없는 클립"""
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """MPEG 오디오 프레임 헤더 하나"""
+
+    version: str  # "1", "2", "2.5"
+    layer: int
+    bitrate: int  # bps
+    sample_rate: int
+    padding: bool
+    protected: bool  # CRC 16비트가 헤더 뒤에 있음
+    mono: bool
+    raw: bytes  # 헤더 4바이트
+
+    @property
+    def samples(self) -> int:
+        """프레임 하나의 표본 수"""
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != "1":
+            return 576
+        return 1152
+
+    @property
+    def length(self) -> int:
+        """헤더를 포함한 프레임 길이 (바이트)"""
+        if self.layer == 1:
+            return (12 * self.bitrate // self.sample_rate + self.padding) * 4
+        return self.samples // 8 * self.bitrate // self.sample_rate + self.padding
+
+    @property
+    def duration(self) -> float:
+        """프레임 하나의 재생 시간 (초)"""
+        return self.samples / self.sample_rate
+
+    @property
+    def side_info_size(self) -> int:
+        """Layer III side info 길이 (바이트, 다른 layer 는 0)"""
+        if self.layer != 3:
+            return 0
+        if self.version == "1":
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    def compatible(self, other: "FrameHeader") -> bool:
+        """이어 붙여도 되는 형식인지 (비트레이트는 프레임마다 달라도 됨)"""
+        return (
+            self.version == other.version
+            and self.layer == other.layer
+            and self.sample_rate == other.sample_rate
+            and self.mono == other.mono
+        )
+
+
+def parse_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """``offset`` 의 4바이트를 프레임 헤더로 해석합니다. 헤더가 아니면 None."""
+    if offset + 4 > len(data) or data[offset] != 0xFF:
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if b1 & 0xE0 != 0xE0:
+        return None
+    version = _VERSIONS.get((b1 >> 3) & 0b11)
+    layer = _LAYERS.get((b1 >> 1) & 0b11)
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0b11
+    if version is None or layer is None or sample_rate_index == 0b11:
+        return None
+    if bitrate_index in (0, 15):
+        return None
+    name, sample_rates = version
+    bitrates = _BITRATES[(1 if name == "1" else 2, layer)]
+    return FrameHeader(
+        version=name,
+        layer=layer,
+        bitrate=bitrates[bitrate_index] * 1000,
+        sample_rate=sample_rates[sample_rate_index],
+        padding=bool(b2 & 0b10),
+        protected=not (b1 & 0b1),
+        mono=(b3 >> 6) == 0b11,
+        raw=bytes(data[offset:offset + 4]),
+    )
+
+
+def id3v2_size(data: bytes, offset: int = 0) -> int:
+    """``offset`` 부터 이어지는 ID3v2 태그들의 전체 길이 (바이트, 없으면 0)"""
+    start = offset
+    while data[offset:offset + 3] == b"ID3" and offset + 10 <= len(data):
+        size = 0
+        for byte in data[offset + 6:offset + 10]:
+            size = (size << 7) | (byte & 0x7F)  # synchsafe 정수
+        footer = 10 if data[offset + 5] & 0x10 else 0
+        offset += 10 + size + footer
+    return min(offset, len(data)) - start
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """첫 프레임 자리의 Xing/Info/VBRI 헤더(오디오가 아닌 길이 정보 프레임)인지"""
+    tag_offset = offset + 4 + (2 if header.protected else 0) + header.side_info_size
+    if data[tag_offset:tag_offset + 4] in _INFO_TAGS:
+        return True
+    return data[offset + _VBRI_OFFSET:offset + _VBRI_OFFSET + 4] == b"VBRI"
+
+
+def _resync(data: bytes, offset: int) -> int:
+    """
+    ``offset`` 이후에서 프레임이 이어지는 위치를 찾습니다 (없으면 ``len(data)``).
+
+    오디오 데이터 안의 우연한 ``0xFF`` 를 헤더로 오인하지 않도록, 다음 프레임 헤더가 바로
+    이어지거나 데이터가 그 프레임에서 정확히 끝나는 위치만 인정합니다.
+    """
+    size = len(data)
+    while True:
+        offset = data.find(b"\xff", offset)
+        if offset < 0:
+            return size
+        header = parse_header(data, offset)
+        if header is not None:
+            end = offset + header.length
+            if end == size:
+                return offset
+            following = parse_header(data, end)
+            if following is not None and following.compatible(header):
+                return offset
+        offset += 1
+
+
+def iter_frames(data: bytes, offset: int = 0) -> Iterator[Tuple[int, FrameHeader]]:
+    """
+    ``offset`` 부터 (위치, 헤더) 를 차례로 내보냅니다.
+
+    프레임이 아닌 바이트(ID3v1 태그, 잘린 마지막 프레임, 중간의 쓰레기 값)는 건너뜁니다.
+    """
+    size = len(data)
+    while offset + 4 <= size:
+        header = parse_header(data, offset)
+        if header is not None and offset + header.length <= size:
+            yield offset, header
+            offset += header.length
+            continue
+        offset = _resync(data, offset + 1)
+
+
+@dataclass(frozen=True)
+class Mp3Clip:
+    """
+    태그와 길이 정보 프레임을 뺀 클립 하나의 오디오 프레임.
+
+    ``segments`` 는 원본 ``data`` 안의 오디오 프레임 구간 (대부분 하나)입니다.
+    """
+
+    data: bytes
+    header: Optional[FrameHeader]  # 첫 오디오 프레임 (오디오가 없으면 None)
+    frames: int
+    samples: int
+    segments: Tuple[Tuple[int, int], ...]
+
+    @property
+    def duration(self) -> float:
+        """재생 시간 (초)"""
+        return self.samples / self.header.sample_rate if self.header else 0.0
+
+    @property
+    def audio_bytes(self) -> int:
+        return sum(end - start for start, end in self.segments)
+
+    def chunks(self) -> Iterator[memoryview]:
+        """오디오 프레임 구간을 복사 없이 내보냅니다."""
+        view = memoryview(self.data)
+        for start, end in self.segments:
+            yield view[start:end]
+
+
+def parse_clip(data: bytes) -> Mp3Clip:
+    """
+    MP3 클립에서 오디오 프레임 구간을 찾습니다.
+
+    Raises:
+        Mp3FormatError: 클립 안에서 표본율, 채널 수 같은 형식이 바뀜
+    """
+    header: Optional[FrameHeader] = None
+    frames = 0
+    samples = 0
+    segments: List[List[int]] = []
+    for offset, frame in iter_frames(data, id3v2_size(data)):
+        if header is None:
+            if is_info_frame(data, offset, frame):
+                continue
+            header = frame
+        elif not frame.compatible(header):
+            raise Mp3FormatError("클립 안에서 MP3 프레임 형식이 바뀝니다")
+        frames += 1
+        samples += frame.samples
+        end = offset + frame.length
+        if segments and segments[-1][1] == offset:
+            segments[-1][1] = end
+        else:
+            segments.append([offset, end])
+    return Mp3Clip(data, header, frames, samples, tuple((s, e) for s, e in segments))
+
+
+@lru_cache(maxsize=32)
+def silent_frame(header: FrameHeader) -> bytes:
+    """``header`` 와 같은 형식의 무음 프레임 (CRC, padding 없음)"""
+    b1 = header.raw[1] | 0b1  # CRC 없음
+    b2 = header.raw[2] & ~0b11  # padding, private 비트 해제
+    frame = FrameHeader(
+        version=header.version,
+        layer=header.layer,
+        bitrate=header.bitrate,
+        sample_rate=header.sample_rate,
+        padding=False,
+        protected=False,
+        mono=header.mono,
+        raw=bytes((0xFF, b1, b2, header.raw[3])),
+    )
+    return frame.raw + bytes(frame.length - 4)
+
+
+def silence_frames(header: FrameHeader, seconds: float) -> int:
+    """``seconds`` 에 가장 가까운 무음 프레임 수"""
+    return max(0, int(seconds / header.duration + 0.5))
+
+
+def silence(header: FrameHeader, frames: int) -> bytes:
+    """``header`` 와 같은 형식의 무음 프레임 ``frames`` 개"""
+    return silent_frame(header) * frames
@@ -0,0 +1,383 @@
+"""워커 프로세스 간 공유 캐시
+
+멀티 워커(uvicorn ``--workers`` / gunicorn)로 실행해도 upstream 합성이 워커 수만큼 늘지 않도록
+오디오 캐시, 음성 목록, 단일 비행(single-flight) 조정을 로컬 파일 시스템으로 공유합니다.
+
+- 오디오 캐시: 캐시 키마다 파일 하나. ``.part`` 에 기록한 뒤 ``os.replace`` 로 원자적으로 게시
+- 단일 비행: ``<key>.lock`` 에 대한 배타적 ``flock`` 을 잡은 워커만 upstream 합성을 수행하고,
+  다른 요청(같은 워커 포함)은 리더가 쓰고 있는 ``.part`` 파일을 따라 읽으며 스트리밍.
+  따라 읽는 동안 ``<key>.follow`` 에 공유 ``flock`` 을 잡아, 리더의 클라이언트가 떠나도
+  follower 가 있으면 합성을 끝까지 마치게 함
+- 음성 목록: TTL이 있는 JSON 파일, 갱신은 ``flock`` 으로 한 워커만 수행
+
+``fcntl`` 이 없는 플랫폼(Windows)에서는 캐시가 비활성화됩니다.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.disconnect import synthesis_progress
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+_READ_BLOCK = 64 * 1024
+_FOLLOW_POLL_INTERVAL = 0.01
+_STALE_FILE_AGE = 3600.0
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _publish(fd: int, part_path: str, path: str) -> None:
+    """기록을 마친 ``.part`` 를 디스크에 내린 뒤 완성된 클립으로 게시"""
+    os.fsync(fd)
+    os.replace(part_path, path)
+
+
+def _discard(fd: int, part_path: str) -> None:
+    """완료되지 못한 ``.part`` 정리 (게시된 뒤라면 ``.part`` 는 이미 없음)"""
+    os.close(fd)
+    try:
+        os.unlink(part_path)
+    except FileNotFoundError:
+        pass
+
+
+class CacheFollowError(Exception):
+    """따라 읽던 리더 합성이 완료되지 못함"""
+
+
+class FileLock:
+    """``flock`` 기반 프로세스 간 잠금. 같은 프로세스 안의 다른 열린 파일과도 배타적입니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def try_acquire(self, shared: bool = False) -> bool:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    async def acquire(self, timeout: float, shared: bool = False) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire(shared):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(_FOLLOW_POLL_INTERVAL)
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class DiskAudioCache:
+    """워커 간에 공유되는 디스크 오디오 캐시 + 단일 비행 조정"""
+
+    def __init__(self, directory: str, max_bytes: int, enabled: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled and fcntl is not None
+        self.hits = 0
+        self.misses = 0
+        self.follows = 0
+        self.stores = 0
+        self.evictions = 0
+        self._last_eviction = 0.0
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, suffix: str = "") -> str:
+        subdir = os.path.join(self.directory, key[:2])
+        os.makedirs(subdir, exist_ok=True)
+        return os.path.join(subdir, key + suffix)
+
+    def contains(self, key: str) -> bool:
+        """완성된 클립이 캐시에 있는지 (디렉토리를 만들지 않고 확인)"""
+        return self.enabled and os.path.exists(os.path.join(self.directory, key[:2], key))
+
+    def has_followers(self, key: str) -> bool:
+        """다른 요청(다른 워커 포함)이 이 키의 합성을 따라 읽고 있는지"""
+        probe = FileLock(self._path(key, ".follow"))
+        if not probe.try_acquire():
+            return True
+        probe.release()
+        return False
+
+    async def get_or_synthesize(
+        self, key: str, synthesize: Callable[[], AsyncIterator[bytes]]
+    ) -> AsyncIterator[bytes]:
+        """
+        캐시된 오디오를 내보내거나, 없으면 한 워커만 합성하도록 조정합니다.
+
+        Args:
+            key: 합성 캐시 키
+            synthesize: upstream 합성 제너레이터를 만드는 함수
+        """
+        path = self._path(key)
+        while True:
+            if os.path.exists(path):
+                self.hits += 1
+                async for block in self._read_file(path):
+                    yield block
+                return
+
+            lock = FileLock(self._path(key, ".lock"))
+            if lock.try_acquire():
+                try:
+                    # 잠금을 얻는 사이 다른 워커가 게시했을 수 있음
+                    if os.path.exists(path):
+                        continue
+                    self.misses += 1
+                    async for chunk in self._synthesize_and_store(key, path, synthesize):
+                        yield chunk
+                    return
+                finally:
+                    lock.release()
+
+            # 다른 요청이 합성 중이면 그 결과를 따라 읽음
+            self.follows += 1
+            sent = 0
+            try:
+                async for block in self._follow(key, path, lock):
+                    sent += len(block)
+                    yield block
+                return
+            except CacheFollowError:
+                if sent:
+                    raise
+                # 아직 보낸 데이터가 없으면 직접 합성을 다시 시도
+                logger.warning("캐시 리더 합성 실패, 재시도", cache_key=key)
+
+    async def _read_file(self, path: str) -> AsyncIterator[bytes]:
+        with open(path, "rb") as f:
+            while True:
+                block = await asyncio.to_thread(f.read, _READ_BLOCK)
+                if not block:
+                    return
+                yield block
+
+    async def _synthesize_and_store(
+        self, key: str, path: str, synthesize: Callable[[], AsyncIterator[bytes]]
+    ) -> AsyncIterator[bytes]:
+        part_path = self._path(key, ".part")
+        fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        loop = asyncio.get_running_loop()
+        progress = synthesis_progress.get()
+        if progress is not None:
+            # 리더의 클라이언트가 떠났을 때 follower 가 있으면 합성을 끝까지 마치도록
+            progress.followers = lambda: self.has_followers(key)
+        # 디스크 쓰기와 fsync 는 기본 executor 스레드에서 (느린 디스크가 이벤트 루프를 막지 않도록)
+        pending: Optional["asyncio.Future[Any]"] = None
+        completed = False
+        try:
+            async for chunk in synthesize():
+                pending = loop.run_in_executor(None, _write_all, fd, chunk)
+                await pending
+                yield chunk
+            pending = loop.run_in_executor(None, _publish, fd, part_path, path)
+            await pending
+            completed = True
+            self.stores += 1
+        finally:
+            if pending is not None and not pending.done():
+                # 취소됐지만 스레드가 아직 fd 를 쓰는 중: 끝난 뒤에 닫음
+                pending.add_done_callback(lambda _: _discard(fd, part_path))
+            elif completed:
+                os.close(fd)
+            else:
+                _discard(fd, part_path)
+        self._maybe_evict()
+
+    async def _follow(self, key: str, path: str, lock: FileLock) -> AsyncIterator[bytes]:
+        """리더가 기록 중인 ``.part`` 파일을 따라 읽습니다."""
+        part_path = self._path(key, ".part")
+        follow_lock = FileLock(self._path(key, ".follow"))
+        f = None
+        try:
+            # 리더가 follower 여부를 확인하는 순간에만 배타 잠금을 잡으므로 곧 얻음
+            await follow_lock.acquire(timeout=1.0, shared=True)
+            while f is None:
+                try:
+                    f = open(part_path, "rb")
+                except FileNotFoundError:
+                    if os.path.exists(path):
+                        f = open(path, "rb")
+                        break
+                    if lock.try_acquire(shared=True):
+                        # 리더가 끝났는데 결과가 없음
+                        lock.release()
+                        if os.path.exists(path):
+                            continue
+                        raise CacheFollowError(key)
+                    await asyncio.sleep(_FOLLOW_POLL_INTERVAL)
+
+            while True:
+                block = f.read(_READ_BLOCK)
+                if block:
+                    yield block
+                    continue
+                if lock.try_acquire(shared=True):
+                    lock.release()
+                    # 잠금 해제 전 마지막으로 기록된 데이터까지 읽음
+                    block = f.read()
+                    if block:
+                        yield block
+                    if not os.path.exists(path):
+                        raise CacheFollowError(key)
+                    return
+                await asyncio.sleep(_FOLLOW_POLL_INTERVAL)
+        finally:
+            follow_lock.release()
+            if f is not None:
+                f.close()
+
+    def _maybe_evict(self) -> None:
+        now = time.monotonic()
+        if now - self._last_eviction < settings.audio_cache_evict_interval:
+            return
+        self._last_eviction = now
+        asyncio.get_running_loop().run_in_executor(None, self._evict)
+
+    def _evict(self) -> None:
+        """용량을 넘으면 오래 접근하지 않은 클립부터 지우고, 남은 임시 파일을 정리합니다."""
+        lock = FileLock(os.path.join(self.directory, ".evict.lock"))
+        if not lock.try_acquire():
+            return
+        try:
+            clips = []
+            now = time.time()
+            for entry in os.scandir(self.directory):
+                if not entry.is_dir():
+                    continue
+                for item in os.scandir(entry.path):
+                    stat = item.stat()
+                    if item.name.endswith((".part", ".lock", ".follow")):
+                        if now - stat.st_mtime > _STALE_FILE_AGE:
+                            self._remove_stale(item.path)
+                        continue
+                    clips.append((max(stat.st_atime, stat.st_mtime), stat.st_size, item.path))
+
+            total = sum(size for _, size, _ in clips)
+            if total <= self.max_bytes:
+                return
+            clips.sort()
+            for _, size, clip_path in clips:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(clip_path)
+                except FileNotFoundError:
+                    continue
+                total -= size
+                self.evictions += 1
+        finally:
+            lock.release()
+
+    def _remove_stale(self, path: str) -> None:
+        stale = FileLock(path)
+        if path.endswith((".lock", ".follow")) and not stale.try_acquire():
+            return
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        finally:
+            stale.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "follows": self.follows,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "pid": os.getpid(),
+        }
+
+
+class VoiceCatalogCache:
+    """워커 간에 공유되는 음성 목록 캐시 (TTL이 있는 JSON 파일)"""
+
+    def __init__(self, directory: str, ttl: float, enabled: bool = True):
+        self.path = os.path.join(directory, "voices.json")
+        self.lock_path = os.path.join(directory, "voices.lock")
+        self.ttl = ttl
+        self.enabled = enabled and fcntl is not None
+        self.refreshes = 0
+
+    def _read_fresh(self) -> Optional[List[Dict[str, Any]]]:
+        try:
+            if time.time() - os.path.getmtime(self.path) > self.ttl:
+                return None
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    async def get(
+        self, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """캐시된 음성 목록을 반환하고, 만료됐으면 한 워커만 upstream에서 갱신합니다."""
+        if not self.enabled:
+            return await fetch()
+
+        cached = self._read_fresh()
+        if cached is not None:
+            return cached
+
+        lock = FileLock(self.lock_path)
+        if not await lock.acquire(timeout=30.0):
+            return await fetch()
+        try:
+            cached = self._read_fresh()
+            if cached is not None:
+                return cached
+            voices = await fetch()
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(voices, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.refreshes += 1
+            return voices
+        finally:
+            lock.release()
+
+
+# 전역 공유 캐시 인스턴스
+audio_cache = DiskAudioCache(
+    settings.audio_cache_dir,
+    settings.audio_cache_max_bytes,
+    enabled=settings.audio_cache_enabled,
+)
+voice_catalog = VoiceCatalogCache(
+    settings.audio_cache_dir,
+    settings.voice_catalog_ttl,
+    enabled=settings.audio_cache_enabled,
+)
+metrics.register("audio_cache", audio_cache.snapshot)
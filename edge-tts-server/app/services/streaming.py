@@ -0,0 +1,395 @@
+"""백프레셔를 고려한 오디오 스트리밍 단계
+
+``TTSService.synthesize_text`` 와 ``StreamingResponse`` 사이에서 스트림별로 제한된 버퍼를
+유지합니다. 클라이언트가 느려 버퍼가 high watermark에 닿으면 upstream 읽기를 멈추고,
+low watermark 아래로 비워지면 다시 읽습니다. 멈춘 상태가 stall timeout을 넘기면
+upstream을 정리하고 스트림을 중단합니다. 작은 청크는 모아서 한 번에 씁니다.
+
+메모리 캐시가 내보내는 ``memoryview`` 청크는 빌린 메모리이므로, 소비자가 전송을 마치고
+다음 데이터를 요청할 때까지 upstream 을 더 읽지 않습니다 (그 전에 대여가 끝나지 않도록).
+
+클라이언트 연결이 끊기면(응답 쓰기 실패, 서버의 취소, 또는 주기적인 연결 확인) upstream
+합성을 정책에 따라 바로 취소하거나 백그라운드에서 끝까지 받아 캐시를 채웁니다
+(``app/services/disconnect.py``).
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.disconnect import SynthesisProgress, disconnect_metrics, synthesis_progress
+
+logger = get_logger(__name__)
+
+
+class StreamStalledError(Exception):
+    """클라이언트가 stall timeout 동안 데이터를 가져가지 않아 스트림을 중단함"""
+
+
+class StreamDisconnectedError(Exception):
+    """주기적인 연결 확인에서 클라이언트 연결이 끊긴 것을 발견함"""
+
+
+@dataclass
+class StreamStats:
+    """스트림 하나의 버퍼 상태"""
+
+    stream_id: int
+    label: str
+    buffered_bytes: int = 0
+    peak_buffered_bytes: int = 0
+    chunks_in: int = 0
+    bytes_in: int = 0
+    writes_out: int = 0
+    bytes_out: int = 0
+    pauses: int = 0
+    paused: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class StreamingMetrics:
+    """스트리밍 단계 전체 지표"""
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self.active: Dict[int, StreamStats] = {}
+        self.streams_started = 0
+        self.streams_completed = 0
+        self.streams_cancelled = 0
+        self.streams_stalled = 0
+        self.pauses_total = 0
+        self.chunks_in_total = 0
+        self.writes_out_total = 0
+
+    def open(self, label: str) -> StreamStats:
+        stats = StreamStats(stream_id=next(self._ids), label=label)
+        self.active[stats.stream_id] = stats
+        self.streams_started += 1
+        return stats
+
+    def close(self, stats: StreamStats, outcome: str) -> None:
+        self.active.pop(stats.stream_id, None)
+        self.chunks_in_total += stats.chunks_in
+        self.writes_out_total += stats.writes_out
+        if outcome == "completed":
+            self.streams_completed += 1
+        elif outcome == "stalled":
+            self.streams_stalled += 1
+        else:
+            self.streams_cancelled += 1
+
+    def snapshot(self, limit: int = 50) -> Dict[str, Any]:
+        now = time.monotonic()
+        active: List[Dict[str, Any]] = []
+        for stats in sorted(
+            self.active.values(), key=lambda s: s.buffered_bytes, reverse=True
+        )[:limit]:
+            item = asdict(stats)
+            item["age_s"] = round(now - item.pop("started_at"), 3)
+            active.append(item)
+        return {
+            "active_streams": len(self.active),
+            "buffered_bytes_total": sum(s.buffered_bytes for s in self.active.values()),
+            "paused_streams": sum(1 for s in self.active.values() if s.paused),
+            "streams_started": self.streams_started,
+            "streams_completed": self.streams_completed,
+            "streams_cancelled": self.streams_cancelled,
+            "streams_stalled": self.streams_stalled,
+            "pauses_total": self.pauses_total,
+            "chunks_in_total": self.chunks_in_total,
+            "writes_out_total": self.writes_out_total,
+            "active": active,
+        }
+
+
+streaming_metrics = StreamingMetrics()
+metrics.register("streaming", streaming_metrics.snapshot)
+
+
+class BufferedAudioStream:
+    """
+    upstream 오디오 제너레이터를 제한된 버퍼로 감싸는 비동기 이터레이터.
+
+    Args:
+        source: 오디오 청크를 내보내는 비동기 이터레이터
+        label: 지표에 표시할 스트림 이름
+        high_watermark: 이 크기 이상 쌓이면 upstream 읽기를 멈춤 (바이트)
+        low_watermark: 이 크기 이하로 비워지면 upstream 읽기를 재개 (바이트)
+        stall_timeout: 읽기가 멈춘 채로 이 시간이 지나면 스트림 중단 (초)
+        coalesce_bytes: 한 번에 내보낼 목표 크기 (바이트)
+        coalesce_wait: 목표 크기를 채우기 위해 기다리는 최대 시간 (초)
+        is_disconnected: 클라이언트 연결이 끊겼는지 확인하는 함수 (``Request.is_disconnected``)
+        disconnect_poll: 연결 확인 간격 (초, 0이면 확인하지 않음)
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[bytes],
+        label: str = "tts",
+        *,
+        high_watermark: Optional[int] = None,
+        low_watermark: Optional[int] = None,
+        stall_timeout: Optional[float] = None,
+        coalesce_bytes: Optional[int] = None,
+        coalesce_wait: Optional[float] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        disconnect_poll: Optional[float] = None,
+    ):
+        self._source = source
+        self.label = label
+        self.high_watermark = high_watermark or settings.stream_high_watermark
+        self.low_watermark = min(
+            low_watermark if low_watermark is not None else settings.stream_low_watermark,
+            self.high_watermark,
+        )
+        self.stall_timeout = stall_timeout or settings.stream_stall_timeout
+        self.coalesce_bytes = coalesce_bytes or settings.stream_coalesce_bytes
+        self.coalesce_wait = (
+            coalesce_wait
+            if coalesce_wait is not None
+            else settings.stream_coalesce_wait_ms / 1000
+        )
+        self._is_disconnected = is_disconnected
+        self.disconnect_poll = (
+            disconnect_poll
+            if disconnect_poll is not None
+            else settings.stream_disconnect_poll_interval
+        )
+
+        self._chunks: Deque[bytes] = deque()
+        self._data_ready = asyncio.Event()
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._returned = asyncio.Event()
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._producer: Optional["asyncio.Task[None]"] = None
+        self._disconnected = False
+        self._detached = False
+        self.progress = SynthesisProgress()
+        self.stats: Optional[StreamStats] = None
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[bytes]:
+        self.stats = streaming_metrics.open(self.label)
+        # upstream 읽기 태스크에서 합성하면 진행 상황이 이 스트림에 기록되도록 컨텍스트에 둠
+        token = synthesis_progress.set(self.progress)
+        try:
+            self._producer = asyncio.create_task(self._produce())
+        finally:
+            synthesis_progress.reset(token)
+        watcher = None
+        if self._is_disconnected is not None and self.disconnect_poll > 0:
+            watcher = asyncio.create_task(self._watch_disconnect())
+        outcome = "cancelled"
+        try:
+            first = True
+            while True:
+                data = await self._next_write(first)
+                if data is None:
+                    break
+                first = False
+                self.stats.writes_out += 1
+                self.stats.bytes_out += len(data)
+                yield data
+            outcome = "completed"
+        except StreamDisconnectedError:
+            outcome = "disconnected"
+        except StreamStalledError:
+            outcome = "stalled"
+            raise
+        except Exception:
+            outcome = "failed"
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            await self._shutdown(outcome)
+            streaming_metrics.close(self.stats, outcome)
+
+    async def _produce(self) -> None:
+        stats = self.stats
+        finished = False
+        try:
+            async for chunk in self._source:
+                if not chunk or self._detached:
+                    # 클라이언트가 떠난 뒤에는 캐시를 채우기 위해 끝까지 받기만 함
+                    continue
+                borrowed = isinstance(chunk, memoryview)
+                if borrowed:
+                    self._returned.clear()
+                self._chunks.append(chunk)
+                stats.chunks_in += 1
+                stats.bytes_in += len(chunk)
+                stats.buffered_bytes += len(chunk)
+                stats.peak_buffered_bytes = max(
+                    stats.peak_buffered_bytes, stats.buffered_bytes
+                )
+                self._data_ready.set()
+
+                if borrowed:
+                    await self._wait_returned()
+                elif stats.buffered_bytes >= self.high_watermark:
+                    await self._pause()
+            finished = True
+        except StreamStalledError as e:
+            self._error = e
+            self._chunks.clear()
+            stats.buffered_bytes = 0
+            logger.warning(
+                "클라이언트 정체로 스트림 중단",
+                stream_id=stats.stream_id,
+                label=self.label,
+                stall_timeout=self.stall_timeout,
+                bytes_out=stats.bytes_out,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._data_ready.set()
+            aclose = getattr(self._source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            if self._detached:
+                disconnect_metrics.background_done(finished)
+                logger.info(
+                    "끊긴 스트림의 합성을 백그라운드에서 마침" if finished
+                    else "끊긴 스트림의 백그라운드 합성 실패",
+                    stream_id=stats.stream_id,
+                    label=self.label,
+                    received_bytes=self.progress.received_bytes,
+                )
+
+    async def _pause(self) -> None:
+        """low watermark까지 비워질 때까지 upstream 읽기를 멈춥니다."""
+        stats = self.stats
+        stats.pauses += 1
+        stats.paused = True
+        streaming_metrics.pauses_total += 1
+        self._resume.clear()
+        try:
+            await asyncio.wait_for(self._resume.wait(), self.stall_timeout)
+        except asyncio.TimeoutError:
+            raise StreamStalledError(f"{self.stall_timeout}s 동안 클라이언트가 읽지 않음")
+        finally:
+            stats.paused = False
+
+    async def _wait_returned(self) -> None:
+        """빌린 ``memoryview`` 청크가 전송될 때까지 upstream 읽기를 멈춥니다."""
+        try:
+            await asyncio.wait_for(self._returned.wait(), self.stall_timeout)
+        except asyncio.TimeoutError:
+            raise StreamStalledError(f"{self.stall_timeout}s 동안 클라이언트가 읽지 않음")
+
+    async def _watch_disconnect(self) -> None:
+        """응답을 쓰지 않는 동안(upstream 대기, 일시 중지)에도 연결 끊김을 주기적으로 확인합니다."""
+        while True:
+            await asyncio.sleep(self.disconnect_poll)
+            if await self._is_disconnected():
+                self._disconnected = True
+                self._data_ready.set()
+                return
+
+    async def _next_write(self, first: bool) -> Optional[bytes]:
+        stats = self.stats
+        if not self._chunks:
+            # 이전에 내보낸 데이터는 모두 전송됨
+            self._returned.set()
+        while not self._chunks:
+            if self._disconnected:
+                raise StreamDisconnectedError()
+            if self._done:
+                if self._error is not None:
+                    raise self._error
+                return None
+            self._data_ready.clear()
+            await self._data_ready.wait()
+
+        # 첫 청크는 바로 보내고, 이후에는 작은 청크를 목표 크기까지 잠시 모음
+        if not first and self.coalesce_wait > 0:
+            deadline = asyncio.get_running_loop().time() + self.coalesce_wait
+            while stats.buffered_bytes < self.coalesce_bytes and not self._done:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0 or not self._resume.is_set():
+                    break
+                self._data_ready.clear()
+                try:
+                    await asyncio.wait_for(self._data_ready.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+        parts = []
+        size = 0
+        while self._chunks and size < self.coalesce_bytes:
+            chunk = self._chunks.popleft()
+            parts.append(chunk)
+            size += len(chunk)
+        stats.buffered_bytes -= size
+
+        if stats.buffered_bytes <= self.low_watermark:
+            self._resume.set()
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    async def _shutdown(self, outcome: str = "completed") -> None:
+        """upstream 읽기 태스크를 정리하고 버퍼를 비웁니다."""
+        producer = self._producer
+        running = producer is not None and not producer.done()
+        if outcome in ("cancelled", "disconnected") and self._abandon(outcome, running):
+            running = False
+        if running:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        self._chunks.clear()
+        if self.stats is not None:
+            self.stats.buffered_bytes = 0
+
+    def _abandon(self, outcome: str, running: bool) -> bool:
+        """
+        클라이언트가 떠난 스트림을 기록하고 upstream 합성을 어떻게 할지 정합니다.
+
+        Returns:
+            bool: 합성을 백그라운드에서 계속하면 True (읽기 태스크를 취소하지 않음)
+        """
+        progress = self.progress
+        synthesizing = running and progress.active
+        finish = synthesizing and disconnect_metrics.should_finish(progress)
+        disconnect_metrics.abandoned("poll" if outcome == "disconnected" else "server")
+        if synthesizing and not finish:
+            disconnect_metrics.reclaimed()
+        logger.info(
+            "클라이언트 연결 끊김",
+            stream_id=self.stats.stream_id,
+            label=self.label,
+            bytes_out=self.stats.bytes_out,
+            upstream_progress=round(progress.fraction, 3) if synthesizing else None,
+            action="finish" if finish else ("cancel" if synthesizing else "close"),
+        )
+        if finish:
+            self._detached = True
+            self._resume.set()
+            self._returned.set()
+            disconnect_metrics.track(self._producer)
+        return finish
+
+
+def buffered_stream(
+    source: AsyncIterator[bytes],
+    label: str = "tts",
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> BufferedAudioStream:
+    """설정값으로 ``BufferedAudioStream`` 을 만듭니다."""
+    return BufferedAudioStream(source, label, is_disconnected=is_disconnected)
@@ -0,0 +1,84 @@
+"""
+입력 텍스트 정규화 (게이트웨이와 TTS 서버 공용)
+
+``mcp-gateway/textnorm.py`` 와 ``edge-tts-server/app/services/textnorm.py`` 는 같은 파일입니다.
+두 서비스는 컨테이너 빌드 컨텍스트가 달라 파일을 복사해 두며, 내용이 같은지는
+``edge-tts-server/tests/test_textnorm.py`` 와 ``mcp-gateway/tests/test_shared_copies.py`` 가
+확인합니다. 한쪽만 고치지 마세요.
+
+사소하게 다른 입력이 캐시와 단일 비행에서 서로 다른 요청으로 취급되지 않도록 정규형을 만듭니다.
+
+- 줄바꿈: CRLF / CR → LF
+- BOM(U+FEFF) 제거
+- 전각 ASCII(U+FF01–U+FF5E, 문장부호·영숫자)와 전각 공백(U+3000) → 반각
+- 유니코드 NFC: 분해된 한글(NFD, 조합용 자모 U+1100…)을 완성형 음절(U+AC00–U+D7A3)로 합침
+- 각 줄 끝의 공백과 탭 제거
+- 운율 값: ``0%`` / ``+00%`` / ``-0%`` → ``+0%`` (부호를 항상 붙이고 앞자리 0 제거)
+
+로마자 변환 도구의 입력에는 결과를 바꾸지 않는 줄바꿈과 NFC 정규화만 적용합니다
+(``normalize_romanize_text``). 변환기는 공백, 탭, 전각 문자, BOM 을 그대로 출력하므로
+나머지 정규화를 적용하면 ``romanize_single`` 결과가 원문과 달라집니다.
+
+NFKC 는 쓰지 않습니다. 호환 자모(ㄱ U+3131)를 조합용 자모(U+1100)로 바꿔 로마자 변환기의
+자모 범위를 벗어나고, 원문에 있던 ``ㅋㅋ`` 같은 자모가 바뀌기 때문입니다.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+# 전각 ASCII → 반각 (U+FF01..U+FF5E → U+0021..U+007E), 전각 공백 → 공백, BOM 제거
+_WIDTH_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_WIDTH_TABLE[0x3000] = 0x20
+_WIDTH_TABLE[0xFEFF] = None
+
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_PROSODY = re.compile(r"^([+-]?)(\d+)(%|Hz)$")
+
+
+def normalize_text(text: str) -> str:
+    """
+    줄 구조를 유지한 정규형 (캐시 키용: 빈 줄과 줄 수는 그대로).
+
+    같은 정규형이면 합성 오디오와 가사(줄 단위 trim 뒤) 로마자 변환 결과가 같습니다.
+    """
+    if text.isascii():
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return _TRAILING_SPACE.sub("", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n").translate(_WIDTH_TABLE)
+    text = unicodedata.normalize("NFC", text)
+    return _TRAILING_SPACE.sub("", text)
+
+
+def normalize_romanize_text(text: str) -> str:
+    """로마자 변환 입력의 정규형 (CRLF / CR → LF, NFC 만 적용해 그 밖의 출력은 그대로)"""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFC", text)
+
+
+def normalize_tts_text(text: str) -> str:
+    """합성용 정규형 (``normalize_text`` + 앞뒤 공백 제거)"""
+    return normalize_text(text).strip()
+
+
+def normalize_prosody(value: str) -> str:
+    """
+    속도/볼륨/음높이 값의 정규형 (``0%`` → ``+0%``, ``+05Hz`` → ``+5Hz``).
+
+    형식에 맞지 않는 값은 그대로 돌려주며, 검증은 호출하는 쪽이 합니다.
+    """
+    match = _PROSODY.match(value.strip())
+    if match is None:
+        return value
+    sign, number, unit = match.groups()
+    amount = int(number)
+    return f"{'-' if sign == '-' and amount else '+'}{amount}{unit}"
+
+
+def canonical_hash(*parts: str) -> str:
+    """정규화된 값들의 안정적인 해시 (sha256 hex, 구분자 U+001F)"""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
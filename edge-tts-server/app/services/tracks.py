@@ -0,0 +1,115 @@
+"""
+여러 줄 가사 트랙 조립
+
+가사 한 줄씩 합성(또는 캐시에서 읽은) MP3 클립을 디코딩/재인코딩 없이 프레임 단위로 이어
+붙이고, 줄 사이에 무음 프레임을 넣어 한 트랙을 만듭니다 (``app/services/mp3.py``).
+조립한 트랙도 줄별 캐시 키와 간격으로 만든 키로 오디오 캐시에 저장되므로, 같은 트랙은 다시
+조립하지 않습니다.
+
+- 줄 사이: ``gap`` 초에 가장 가까운 무음 프레임 수
+- 빈 줄: 간격을 한 번 더 넣음 (연과 연 사이). 트랙 앞뒤의 빈 줄은 무시
+- 오디오가 없는 클립(문장부호만 있는 줄 등)은 건너뜀
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.metrics import metrics
+from app.services.mp3 import FrameHeader, Mp3FormatError, parse_clip, silence, silence_frames
+from app.services.textnorm import canonical_hash
+
+
+def track_cache_key(line_keys: List[Optional[str]], gap_ms: int) -> str:
+    """
+    줄별 합성 캐시 키(빈 줄은 None)와 줄 간격으로 트랙 캐시 키를 만듭니다.
+
+    줄 캐시 키에 음성, 운율, 출력 포맷이 들어 있으므로 트랙 키도 그 조건을 모두 구분합니다.
+    """
+    return canonical_hash("track", str(gap_ms), *(key or "" for key in line_keys))
+
+
+class TrackMetrics:
+    """조립한 트랙 수와 이어 붙인 클립, 무음 프레임, 출력 길이"""
+
+    def __init__(self) -> None:
+        self.tracks = 0
+        self.failed = 0
+        self.clips = 0
+        self.empty_clips = 0
+        self.frames = 0
+        self.silent_frames = 0
+        self.bytes = 0
+        self.audio_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "tracks": self.tracks,
+            "failed": self.failed,
+            "clips": self.clips,
+            "empty_clips": self.empty_clips,
+            "frames": self.frames,
+            "silent_frames": self.silent_frames,
+            "bytes": self.bytes,
+            "audio_seconds": round(self.audio_seconds, 3),
+        }
+
+
+async def join_clips(
+    clips: AsyncIterator[Optional[bytes]], gap: float
+) -> AsyncIterator[bytes]:
+    """
+    MP3 클립을 차례로 받아 한 트랙의 프레임으로 이어 붙입니다.
+
+    Args:
+        clips: 줄마다 클립 전체 바이트 (빈 줄은 None)
+        gap: 줄 사이 무음 길이 (초)
+
+    Yields:
+        bytes: 클립의 오디오 프레임 구간(``memoryview``, 복사 없음) 또는 무음 프레임
+
+    Raises:
+        Mp3FormatError: 클립 안에서, 또는 클립마다 표본율/채널 수가 다름
+    """
+    template: Optional[FrameHeader] = None
+    pending_gaps = 0
+    completed = False
+    try:
+        async for data in clips:
+            if data is None:
+                pending_gaps += 1
+                continue
+            clip = parse_clip(data)
+            if clip.header is None:
+                track_metrics.empty_clips += 1
+                continue
+            if template is None:
+                template = clip.header
+                pending_gaps = 0
+            else:
+                if not clip.header.compatible(template):
+                    raise Mp3FormatError("클립마다 MP3 형식(표본율, 채널 수)이 다릅니다")
+                frames = silence_frames(template, gap) * (pending_gaps + 1)
+                pending_gaps = 0
+                if frames:
+                    padding = silence(template, frames)
+                    track_metrics.silent_frames += frames
+                    track_metrics.frames += frames
+                    track_metrics.bytes += len(padding)
+                    track_metrics.audio_seconds += frames * template.duration
+                    yield padding
+            track_metrics.clips += 1
+            track_metrics.frames += clip.frames
+            track_metrics.bytes += clip.audio_bytes
+            track_metrics.audio_seconds += clip.duration
+            for chunk in clip.chunks():
+                yield chunk
+        completed = True
+    finally:
+        if completed:
+            track_metrics.tracks += 1
+        else:
+            track_metrics.failed += 1
+
+
+# 전역 트랙 조립 지표
+track_metrics = TrackMetrics()
+metrics.register("tracks", track_metrics.snapshot)
@@ -1,16 +1,54 @@
 """TTS 서비스 비즈니스 로직"""
 
-import asyncio
-from typing import AsyncGenerator, Dict, List, Optional
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional
 
-import edge_tts
-from app.core.config import settings
-from app.core.logging import get_logger
+from app.core.logging import get_logger, lazy
 from app.models.schemas import VoiceInfo
+from app.services import deadline
+from app.services.admission import cost_model
+from app.services.audio_formats import DEFAULT_FORMAT, AudioFormat, format_metrics
+from app.services.backends import TICKS_PER_SECOND, TTSBackend, backend_router
+from app.services.disconnect import synthesis_progress
+from app.services.memory_cache import memory_cache
+from app.services.shared_cache import audio_cache
+from app.services.textnorm import canonical_hash, normalize_prosody, normalize_tts_text
+from app.services.tracks import join_clips, track_cache_key
 
 logger = get_logger(__name__)
 
 
+def synthesis_cache_key(
+    text: str,
+    voice: str,
+    rate: str,
+    volume: str,
+    pitch: str,
+    output_format: AudioFormat = DEFAULT_FORMAT,
+    backend: Optional[str] = None,
+) -> str:
+    """
+    합성 결과를 식별하는 캐시 키를 만듭니다.
+
+    같은 텍스트라도 출력 포맷이 다르면 다른 오디오이므로 포맷 이름을 키에 포함합니다.
+    텍스트와 운율 값은 정규형으로 바꾼 뒤 해시하므로 CRLF/LF, NFC/NFD, ``0%``/``+0%``
+    처럼 사소하게 다른 요청은 같은 키가 됩니다.
+
+    백엔드(생략 시 기본 백엔드)마다 오디오가 다르므로 edge 가 아닌 백엔드는 이름을 키에
+    포함합니다. edge 키는 백엔드를 나누기 전과 같습니다.
+    """
+    backend = backend or backend_router.primary.name
+    return canonical_hash(
+        normalize_tts_text(text),
+        voice,
+        normalize_prosody(rate),
+        normalize_prosody(volume),
+        normalize_prosody(pitch),
+        output_format.name,
+        *(() if backend == "edge" else (backend,)),
+    )
+
+
 class TTSService:
     """TTS 서비스 클래스"""
     
@@ -23,7 +61,8 @@ class TTSService:
         voice: str,
         rate: str = "0%",
         volume: str = "0%",
-        pitch: str = "0Hz"
+        pitch: str = "0Hz",
+        output_format: AudioFormat = DEFAULT_FORMAT
     ) -> AsyncGenerator[bytes, None]:
         """
         텍스트를 음성으로 변환합니다.
@@ -34,10 +73,145 @@ class TTSService:
             rate: 말하기 속도
             volume: 볼륨
             pitch: 음높이
+            output_format: 출력 오디오 포맷
             
         Yields:
-            bytes: 오디오 데이터 청크
+            bytes: 오디오 데이터 청크 (메모리 캐시 적중 시 arena 의 memoryview,
+                다음 청크를 요청하기 전까지만 유효)
+        """
+        # 캐시 키와 upstream 이 같은 정규형을 보도록 먼저 정규화
+        text = normalize_tts_text(text)
+        rate, volume, pitch = (normalize_prosody(v) for v in (rate, volume, pitch))
+        backends = backend_router.candidates(output_format)
+        keys = [
+            synthesis_cache_key(text, voice, rate, volume, pitch, output_format, backend.name)
+            for backend in backends
+        ]
+        # 어느 백엔드든 이미 캐시된 결과가 있으면 합성하지 않음 (백엔드가 하나면 _cached 가 확인)
+        cached = next(
+            (
+                index for index, key in enumerate(keys)
+                if memory_cache.contains(key) or audio_cache.contains(key)
+            ),
+            None,
+        ) if len(backends) > 1 else None
+        if cached:
+            backends.insert(0, backends.pop(cached))
+            keys.insert(0, keys.pop(cached))
+
+        for index, (backend, key) in enumerate(zip(backends, keys)):
+            started = False
+            try:
+                async for chunk in self._cached(
+                    key,
+                    lambda backend=backend: self._synthesize_upstream(
+                        text, voice, rate, volume, pitch, output_format, backend
+                    ),
+                ):
+                    started = True
+                    yield chunk
+                return
+            except deadline.DeadlineExceeded:
+                raise
+            except Exception:
+                # 오디오를 보내기 시작했으면 다른 백엔드의 오디오로 이어 붙일 수 없음
+                if started or index + 1 == len(backends):
+                    raise
+                backend_router.failover(backend, backends[index + 1])
+
+    async def synthesize_track(
+        self,
+        lines: List[str],
+        voice: str,
+        rate: str = "0%",
+        volume: str = "0%",
+        pitch: str = "0Hz",
+        output_format: AudioFormat = DEFAULT_FORMAT,
+        gap_ms: int = 300
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        여러 줄을 줄마다 합성(또는 캐시에서 읽어)하고 MP3 프레임 단위로 이어 붙입니다.
+
+        재인코딩 없이 클립의 프레임을 그대로 잇고 줄 사이에 무음 프레임을 넣으며, 조립한
+        트랙도 캐시에 저장합니다 (``app/services/tracks.py``).
+
+        Args:
+            lines: 줄 목록 (빈 줄은 간격을 한 번 더 넣음)
+            voice: 음성 선택
+            rate: 말하기 속도
+            volume: 볼륨
+            pitch: 음높이
+            output_format: 출력 오디오 포맷 (MP3 만 가능)
+            gap_ms: 줄 사이 무음 길이 (밀리초)
+
+        Yields:
+            bytes: 트랙 오디오 청크
+
+        Raises:
+            ValueError: MP3 가 아닌 출력 포맷
         """
+        if output_format.extension != "mp3":
+            raise ValueError(f"트랙은 MP3 포맷만 지원합니다: {output_format.name}")
+        rate, volume, pitch = (normalize_prosody(v) for v in (rate, volume, pitch))
+        lines = [normalize_tts_text(line) for line in lines]
+        key = track_cache_key(
+            [
+                synthesis_cache_key(line, voice, rate, volume, pitch, output_format) if line else None
+                for line in lines
+            ],
+            gap_ms,
+        )
+
+        async def clips() -> AsyncGenerator[Optional[bytes], None]:
+            for line in lines:
+                if not line:
+                    yield None
+                    continue
+                # 메모리 캐시의 대여 청크는 다음 청크 전까지만 유효하므로 클립 단위로 복사
+                yield b"".join([
+                    bytes(chunk)
+                    async for chunk in self.synthesize_text(
+                        line, voice, rate, volume, pitch, output_format
+                    )
+                ])
+
+        async for chunk in self._cached(key, lambda: join_clips(clips(), gap_ms / 1000)):
+            yield chunk
+
+    async def _cached(
+        self, key: str, synthesize: Callable[[], AsyncIterator[bytes]]
+    ) -> AsyncGenerator[bytes, None]:
+        """메모리 캐시, 디스크 캐시(단일 비행) 순으로 찾고, 없으면 ``synthesize`` 로 만들어 채웁니다."""
+        # 인기 클립은 메모리 arena 에서 복사 없이 내보냄 (전송이 끝날 때까지 대여)
+        lease = memory_cache.lease(key)
+        if lease is not None:
+            try:
+                yield lease.view
+            finally:
+                lease.release()
+            return
+
+        if audio_cache.enabled:
+            # 같은 요청은 워커와 관계없이 한 번만 upstream에서 합성
+            source = audio_cache.get_or_synthesize(key, synthesize)
+        else:
+            source = synthesize()
+        async for chunk in memory_cache.fill(key, source):
+            yield chunk
+
+    async def _synthesize_upstream(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        volume: str,
+        pitch: str,
+        output_format: AudioFormat,
+        backend: TTSBackend
+    ) -> AsyncGenerator[bytes, None]:
+        """백엔드에 직접 합성을 요청합니다."""
+        # 응답 스트림을 위한 합성이면 진행률을 기록 (연결이 끊겼을 때 계속할지 판단)
+        progress = synthesis_progress.get()
         try:
             self.logger.info(
                 "TTS 요청 시작",
@@ -45,38 +219,82 @@ class TTSService:
                 voice=voice,
                 rate=rate,
                 volume=volume,
-                pitch=pitch
+                pitch=pitch,
+                output_format=output_format.name,
+                backend=backend.name
             )
             
-            # edge-tts로 음성 생성 (텍스트 전처리 없이 원본 그대로 사용)
-            communicate = edge_tts.Communicate(
-                text=text,
-                voice=voice,
-                rate=rate,
-                volume=volume,
-                pitch=pitch
-            )
+            # 호출자가 이미 포기한 요청은 upstream 세션을 쓰지 않음
+            deadline.check("upstream_start")
+            if progress is not None:
+                expected_seconds = cost_model.estimate(text, rate)["audio_seconds"]
+                progress.start(expected_seconds * output_format.bitrate / 8)
             
-            # 스트리밍으로 오디오 데이터 전송
-            async for chunk in communicate.stream():
+            # 스트리밍으로 오디오 데이터 전송 (데드라인이 지나면 세션을 닫고 중단)
+            backend_router.started(backend)
+            started = time.perf_counter()
+            audio_bytes = 0
+            audio_ticks = 0
+            async for chunk in deadline.bounded(
+                self._upstream_chunks(text, voice, rate, volume, pitch, output_format, backend),
+                "upstream",
+            ):
                 if chunk["type"] == "audio":
                     self.logger.debug(
                         "오디오 청크 전송",
-                        chunk_size=len(chunk["data"])
+                        chunk_size=lazy(len, chunk["data"])
                     )
+                    audio_bytes += len(chunk["data"])
+                    if progress is not None:
+                        progress.add(len(chunk["data"]))
                     yield chunk["data"]
+                elif "offset" in chunk:
+                    # 문장/단어 경계 메타데이터로 실제 오디오 길이 추정
+                    audio_ticks = max(audio_ticks, chunk["offset"] + chunk["duration"])
+            
+            audio_seconds = (
+                audio_ticks / TICKS_PER_SECOND
+                if audio_ticks
+                else audio_bytes * 8 / output_format.bitrate
+            )
+            format_metrics.record(output_format, audio_bytes, audio_seconds)
+            backend_router.succeeded(backend)
+            # 실제 오디오 길이와 합성 시간으로 비용 모델 보정 (대체 백엔드의 기록은 제외)
+            if backend is backend_router.primary:
+                cost_model.observe(text, rate, audio_seconds, time.perf_counter() - started)
             
             self.logger.info("TTS 요청 완료")
             
+        except deadline.DeadlineExceeded:
+            raise
         except Exception as e:
+            backend_router.failed(backend, e)
             self.logger.error(
                 "TTS 변환 중 오류 발생",
                 error=str(e),
                 text_length=len(text),
-                voice=voice
+                voice=voice,
+                backend=backend.name
             )
             raise
+        finally:
+            if progress is not None:
+                progress.finish()
     
+    async def _upstream_chunks(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        volume: str,
+        pitch: str,
+        output_format: AudioFormat,
+        backend: TTSBackend
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """백엔드의 청크(오디오, 경계 메타데이터)를 그대로 내보냅니다."""
+        async for chunk in backend.synthesize(text, voice, rate, volume, pitch, output_format):
+            yield chunk
+
     async def get_available_voices(self) -> List[VoiceInfo]:
         """
         사용 가능한 음성 목록을 가져옵니다.
@@ -87,8 +305,8 @@ class TTSService:
         try:
             self.logger.info("음성 목록 조회 시작")
             
-            # edge-tts에서 음성 목록 가져오기 (비동기 함수)
-            voices_data = await edge_tts.list_voices()
+            # 우선순위 순서의 백엔드에서 음성 목록 가져오기
+            voices_data = await backend_router.list_voices()
             
             # VoiceInfo 모델로 변환
             voices = []
@@ -0,0 +1,423 @@
+"""edge-tts upstream 세션 풀
+
+``edge_tts.Communicate`` 는 합성 요청마다 새 aiohttp 세션을 만들고 DNS 조회, TCP/TLS
+연결, WebSocket 업그레이드를 모두 다시 거친 뒤에야 첫 오디오를 받습니다. 짧은 가사 한 줄은
+이 핸드셰이크가 첫 오디오까지 시간의 대부분입니다.
+
+이 모듈은 업그레이드까지 끝난 WebSocket 을 미리 몇 개 열어 두고(pre-warm) 요청이 오면
+바로 ``speech.config`` 와 SSML 을 보냅니다.
+
+- 하나의 aiohttp 세션/커넥터를 풀이 소유하므로 DNS 캐시가 요청 간에 유지됩니다.
+- 유휴 세션은 ``max_lifetime`` 이 지나거나 닫혀 있으면 버리고 백그라운드에서 다시 채웁니다.
+- 미리 열어 둔 세션이 첫 오디오 전에 끊기면(서버가 유휴 연결을 닫은 경우) 새 연결로
+  한 번 재시도합니다. 그래도 실패하면 호출자가 ``Communicate`` 로 대체합니다.
+- ``reuse`` 를 켜면 ``turn.end`` 까지 정상 종료된 세션을 풀로 되돌려 다음 요청에 씁니다.
+  upstream 이 한 연결의 여러 턴을 보장하지 않으므로 기본값은 꺼짐입니다.
+
+접속 대상은 :class:`UpstreamEndpoint` 로 바꿀 수 있어, 테스트와 벤치마크는 로컬 대역
+WebSocket 서버(``benchmarks/fake_edge_ws.py``)를 씁니다.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+_SPEECH_CONFIG = (
+    "X-Timestamp:{timestamp}\r\n"
+    "Content-Type:application/json; charset=utf-8\r\n"
+    "Path:speech.config\r\n\r\n"
+    '{{"context":{{"synthesis":{{"audio":{{"metadataoptions":{{'
+    '"sentenceBoundaryEnabled":"true","wordBoundaryEnabled":"false"}},'
+    '"outputFormat":"{output_format}"}}}}}}}}\r\n'
+)
+
+# edge-tts 가 한 번의 SSML 로 보내는 최대 텍스트 크기 (바이트)
+_MAX_SSML_TEXT_BYTES = 4096
+
+
+class UpstreamSessionError(Exception):
+    """풀 세션으로 합성하지 못함 (호출자는 ``Communicate`` 로 대체)"""
+
+
+@dataclass
+class UpstreamEndpoint:
+    """WebSocket 접속 대상"""
+
+    url: Callable[[], str]
+    headers: Callable[[], Dict[str, str]]
+    ssl: Any = None
+
+
+def edge_endpoint() -> UpstreamEndpoint:
+    """Microsoft Edge 읽기 서비스 (edge_tts 와 같은 URL, 헤더, TLS 설정)"""
+    from edge_tts import communicate as edge
+
+    return UpstreamEndpoint(
+        url=lambda: (
+            f"{edge.WSS_URL}&ConnectionId={edge.connect_id()}"
+            f"&Sec-MS-GEC={edge.DRM.generate_sec_ms_gec()}"
+            f"&Sec-MS-GEC-Version={edge.SEC_MS_GEC_VERSION}"
+        ),
+        headers=lambda: edge.DRM.headers_with_muid(edge.WSS_HEADERS),
+        ssl=edge._SSL_CTX,
+    )
+
+
+def static_endpoint(url: str) -> UpstreamEndpoint:
+    """고정 URL (로컬 대역 서버 등, 인증 헤더 없음)"""
+    return UpstreamEndpoint(url=lambda: url, headers=dict)
+
+
+class UpstreamSession:
+    """업그레이드가 끝난 upstream WebSocket 하나"""
+
+    def __init__(self, ws: Any, handshake_ms: float) -> None:
+        self.ws = ws
+        self.handshake_ms = handshake_ms
+        self.created = time.monotonic()
+        self.turns = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+    def healthy(self, max_lifetime: float) -> bool:
+        return not self.ws.closed and self.ws.exception() is None and self.age < max_lifetime
+
+    async def close(self) -> None:
+        if not self.ws.closed:
+            await self.ws.close()
+
+
+class UpstreamSessionPool:
+    """미리 연결해 둔 upstream WebSocket 풀"""
+
+    def __init__(
+        self,
+        endpoint: Callable[[], UpstreamEndpoint],
+        size: int = 2,
+        max_lifetime: float = 30.0,
+        health_interval: float = 1.0,
+        connect_timeout: float = 10.0,
+        receive_timeout: float = 60.0,
+        reuse: bool = False,
+    ) -> None:
+        self._endpoint_factory = endpoint
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.health_interval = health_interval
+        self.connect_timeout = connect_timeout
+        self.receive_timeout = receive_timeout
+        self.reuse = reuse
+        self._endpoint: Optional[UpstreamEndpoint] = None
+        self._http: Optional[Any] = None
+        self._idle: Deque[UpstreamSession] = deque()
+        self._connecting = 0
+        self._refill = asyncio.Event()
+        self._maintainer: Optional[asyncio.Task] = None
+        self._stats: Dict[str, float] = {
+            "connects": 0,
+            "connect_failures": 0,
+            "warm_hits": 0,
+            "cold_connects": 0,
+            "reused": 0,
+            "expired": 0,
+            "stale_retries": 0,
+            "failures": 0,
+            "handshake_ms_total": 0.0,
+            "first_audio_ms_total": 0.0,
+            "first_audio_count": 0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._http is not None
+
+    async def start(self) -> None:
+        """풀 세션을 만들고 백그라운드 보충 작업을 시작합니다 (edge_tts import 이후)."""
+        if self.started:
+            return
+        import aiohttp
+
+        self._endpoint = self._endpoint_factory()
+        # 풀이 커넥터를 소유하므로 DNS 캐시와 TLS 컨텍스트가 요청 간에 유지됨
+        connector = aiohttp.TCPConnector(ttl_dns_cache=300, limit=0)
+        self._http = aiohttp.ClientSession(
+            connector=connector,
+            trust_env=True,
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=self.connect_timeout, sock_read=self.receive_timeout
+            ),
+        )
+        self._maintainer = asyncio.create_task(self._maintain())
+        self._refill.set()
+
+    async def close(self) -> None:
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+            self._maintainer = None
+        while self._idle:
+            await self._idle.popleft().close()
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def _connect(self) -> UpstreamSession:
+        assert self._http is not None and self._endpoint is not None
+        started = time.perf_counter()
+        try:
+            ws = await self._http.ws_connect(
+                self._endpoint.url(),
+                compress=15,
+                headers=self._endpoint.headers(),
+                ssl=self._endpoint.ssl,
+            )
+        except Exception:
+            self._stats["connect_failures"] += 1
+            raise
+        handshake_ms = (time.perf_counter() - started) * 1000
+        self._stats["connects"] += 1
+        self._stats["handshake_ms_total"] += handshake_ms
+        return UpstreamSession(ws, handshake_ms)
+
+    async def _discard_unhealthy(self) -> None:
+        for session in list(self._idle):
+            if not session.healthy(self.max_lifetime):
+                self._idle.remove(session)
+                self._stats["expired"] += 1
+                await session.close()
+
+    async def _top_up(self) -> None:
+        missing = self.size - len(self._idle) - self._connecting
+        if missing <= 0:
+            return
+        self._connecting += missing
+        try:
+            results = await asyncio.gather(
+                *(self._connect() for _ in range(missing)), return_exceptions=True
+            )
+        finally:
+            self._connecting -= missing
+        for result in results:
+            if isinstance(result, UpstreamSession):
+                if len(self._idle) >= self.size:
+                    await result.close()  # 보충 중에 재사용 세션이 돌아와 이미 가득 참
+                else:
+                    self._idle.append(result)
+            else:
+                logger.warning("upstream 세션 미리 연결 실패", error=str(result))
+
+    async def _maintain(self) -> None:
+        """유휴 세션 상태를 확인하고 빈 자리를 다시 채웁니다."""
+        backoff = self.health_interval
+        while True:
+            try:
+                await asyncio.wait_for(self._refill.wait(), self.health_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._refill.clear()
+            await self._discard_unhealthy()
+            failures = self._stats["connect_failures"]
+            await self._top_up()
+            if self._stats["connect_failures"] > failures:
+                # upstream 장애 중에는 연결 시도를 점점 늦춤
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            else:
+                backoff = self.health_interval
+
+    async def acquire(self, fresh: bool = False) -> tuple:
+        """(세션, 미리 연결된 세션인지) 를 돌려줍니다. ``fresh`` 면 유휴 세션을 쓰지 않습니다."""
+        while self._idle and not fresh:
+            session = self._idle.popleft()
+            if session.healthy(self.max_lifetime):
+                self._refill.set()
+                return session, True
+            self._stats["expired"] += 1
+            await session.close()
+        self._refill.set()
+        self._stats["cold_connects"] += 1
+        return await self._connect(), False
+
+    async def release(self, session: UpstreamSession, clean: bool) -> None:
+        if (
+            self.reuse
+            and clean
+            and session.healthy(self.max_lifetime)
+            and len(self._idle) < self.size
+        ):
+            self._stats["reused"] += 1
+            self._idle.append(session)
+            return
+        await session.close()
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        volume: str,
+        pitch: str,
+        output_format: str,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        풀 세션으로 합성합니다. ``edge_tts.Communicate.stream`` 과 같은 모양의 청크를 냅니다.
+
+        Raises:
+            UpstreamSessionError: 오디오를 하나도 보내기 전에 실패한 경우 (대체 경로 사용 가능)
+        """
+        if not self.started:
+            raise UpstreamSessionError("upstream 세션 풀이 시작되지 않았습니다")
+        from edge_tts import communicate as edge
+
+        config = edge.TTSConfig(voice, rate, volume, pitch, "SentenceBoundary")
+        parts = list(
+            edge.split_text_by_byte_length(
+                edge.escape(edge.remove_incompatible_characters(text)), _MAX_SSML_TEXT_BYTES
+            )
+        )
+        started = time.perf_counter()
+        first_audio = True
+        produced = False
+        offset_compensation = 0
+        for part in parts:
+            ssml = edge.mkssml(config, part)
+            last_end = 0
+            for attempt in range(2):
+                session: Optional[UpstreamSession] = None
+                warm = False
+                sent_any = False
+                clean = False
+                try:
+                    # 연결 실패도 첫 오디오 전 실패이므로 아래에서 UpstreamSessionError 로 바꿈
+                    session, warm = await self.acquire(fresh=attempt > 0)
+                    if warm:
+                        self._stats["warm_hits"] += 1
+                    async for chunk in self._turn(session, ssml, output_format, edge):
+                        sent_any = True
+                        if chunk["type"] == "audio":
+                            if first_audio:
+                                first_audio = False
+                                self._stats["first_audio_count"] += 1
+                                self._stats["first_audio_ms_total"] += (
+                                    time.perf_counter() - started
+                                ) * 1000
+                        else:
+                            chunk["offset"] += offset_compensation
+                            last_end = max(last_end, chunk["offset"] + chunk["duration"])
+                        produced = True
+                        yield chunk
+                    clean = True
+                    break
+                except (Exception, asyncio.CancelledError) as e:
+                    if isinstance(e, asyncio.CancelledError) or sent_any:
+                        if not isinstance(e, asyncio.CancelledError):
+                            self._stats["failures"] += 1
+                        raise
+                    if warm and attempt == 0:
+                        # 유휴 중 서버가 닫은 연결일 수 있으므로 새 연결로 한 번 더
+                        self._stats["stale_retries"] += 1
+                        continue
+                    self._stats["failures"] += 1
+                    if produced:
+                        raise  # 앞 조각의 오디오를 이미 보냈으므로 대체 경로로 다시 시작할 수 없음
+                    raise UpstreamSessionError(f"{type(e).__name__}: {e}") from e
+                finally:
+                    if session is not None:
+                        await self.release(session, clean)
+            offset_compensation = max(offset_compensation, last_end)
+
+    async def _turn(
+        self, session: UpstreamSession, ssml: str, output_format: str, edge: Any
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """speech.config + SSML 을 보내고 turn.end 까지 오디오/메타데이터를 냅니다."""
+        import aiohttp
+
+        ws = session.ws
+        await ws.send_str(
+            _SPEECH_CONFIG.format(timestamp=edge.date_to_string(), output_format=output_format)
+        )
+        await ws.send_str(
+            edge.ssml_headers_plus_data(edge.connect_id(), edge.date_to_string(), ssml)
+        )
+        session.turns += 1
+        while True:
+            message = await ws.receive(timeout=self.receive_timeout)
+            if message.type == aiohttp.WSMsgType.TEXT:
+                encoded = message.data.encode("utf-8")
+                headers, data = edge.get_headers_and_data(encoded, encoded.find(b"\r\n\r\n"))
+                path = headers.get(b"Path")
+                if path == b"audio.metadata":
+                    for meta in _parse_metadata(data, edge.unescape):
+                        yield meta
+                elif path == b"turn.end":
+                    return
+                elif path not in (b"response", b"turn.start"):
+                    raise ValueError(f"알 수 없는 upstream 메시지: {path!r}")
+            elif message.type == aiohttp.WSMsgType.BINARY:
+                if len(message.data) < 2:
+                    raise ValueError("헤더 길이가 없는 upstream 바이너리 메시지")
+                # 앞 2바이트가 헤더 길이 (edge_tts 와 같은 방식으로 파싱)
+                header_length = int.from_bytes(message.data[:2], "big")
+                if header_length > len(message.data):
+                    raise ValueError("upstream 바이너리 메시지 헤더 길이가 데이터보다 큼")
+                headers, data = edge.get_headers_and_data(message.data, header_length)
+                if headers.get(b"Path") != b"audio":
+                    raise ValueError("upstream 바이너리 메시지 Path 가 audio 가 아님")
+                if data:
+                    yield {"type": "audio", "data": data}
+            else:
+                raise ConnectionError(f"upstream 연결 종료 ({message.type.name})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        connects = stats.pop("connects")
+        handshake_total = stats.pop("handshake_ms_total")
+        first_total = stats.pop("first_audio_ms_total")
+        first_count = stats.pop("first_audio_count")
+        return {
+            "enabled": self.started,
+            "size": self.size,
+            "idle": len(self._idle),
+            "idle_ages_s": [round(session.age, 1) for session in self._idle],
+            "reuse": self.reuse,
+            "connects": connects,
+            **stats,
+            "avg_handshake_ms": round(handshake_total / connects, 1) if connects else None,
+            "avg_first_audio_ms": round(first_total / first_count, 1) if first_count else None,
+        }
+
+
+upstream_pool = UpstreamSessionPool(
+    endpoint=(
+        (lambda: static_endpoint(settings.upstream_wss_url))
+        if settings.upstream_wss_url
+        else edge_endpoint
+    ),
+    size=settings.upstream_pool_size,
+    max_lifetime=settings.upstream_session_max_lifetime,
+    reuse=settings.upstream_session_reuse,
+)
+metrics.register("upstream_pool", upstream_pool.snapshot)
+
+
+def _parse_metadata(data: bytes, unescape: Callable[[str], str]) -> List[Dict[str, Any]]:
+    chunks = []
+    for meta in json.loads(data)["Metadata"]:
+        if meta["Type"] in ("WordBoundary", "SentenceBoundary"):
+            chunks.append({
+                "type": meta["Type"],
+                "offset": meta["Data"]["Offset"],
+                "duration": meta["Data"]["Duration"],
+                "text": unescape(meta["Data"]["text"]["Text"]),
+            })
+    return chunks
@@ -0,0 +1,80 @@
+"""시작 준비 작업과 준비 상태(readiness)
+
+프로세스가 떠서 요청을 받을 수 있으면 liveness(``/health``)는 바로 성공하지만,
+readiness(``/ready``)는 무거운 모듈 import 와 캐시 준비가 끝난 뒤에 성공으로 바뀝니다.
+로드 밸런서/오케스트레이터는 readiness 를 보고 트래픽을 보내므로, 새 인스턴스가 첫
+요청에서 import 비용을 치르지 않습니다.
+
+준비 단계는 실패하거나 제한 시간을 넘겨도 기록만 하고 준비 완료로 전환합니다
+(upstream 이 잠시 안 돼도 디스크 캐시 적중 요청은 처리할 수 있으므로).
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.services.backends import backend_router, edge_tts_module
+from app.services.tts_service import tts_service
+from app.services.upstream import upstream_pool
+
+logger = get_logger(__name__)
+
+
+class Readiness:
+    """시작 시각부터 준비 완료까지의 단계별 소요 시간"""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.ready_at: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    async def run_step(self, name: str, step: Callable[[], Awaitable[Any]], timeout: float) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(step(), timeout)
+            outcome: Dict[str, Any] = {"ok": True}
+        except Exception as e:
+            outcome = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            logger.warning("시작 준비 단계 실패", step=name, error=outcome["error"])
+        outcome["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.steps[name] = outcome
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "uptime_s": round(time.monotonic() - self.started, 3),
+            "ready_after_s": (
+                round(self.ready_at - self.started, 3) if self.ready_at is not None else None
+            ),
+            "steps": dict(self.steps),
+        }
+
+
+readiness = Readiness()
+metrics.register("startup", readiness.snapshot)
+
+
+async def warm_up() -> None:
+    """edge_tts import, upstream 세션 풀, 음성 목록 캐시를 준비한 뒤 준비 완료로 전환합니다."""
+    # edge 백엔드를 쓰지 않으면 (synthetic, local 만 설정) edge 준비 단계는 건너뜀
+    if backend_router.get("edge") is not None:
+        await readiness.run_step("edge_tts_import", edge_tts_module, settings.warmup_timeout)
+        if settings.upstream_pool_size > 0:
+            # 연결은 백그라운드에서 채워지며 준비 완료를 기다리게 하지 않음
+            await readiness.run_step("upstream_pool", upstream_pool.start, settings.warmup_timeout)
+    if settings.warmup_voice_catalog:
+        await readiness.run_step(
+            "voice_catalog", tts_service.get_available_voices, settings.warmup_timeout
+        )
+    readiness.mark_ready()
+    logger.info("시작 준비 완료", **readiness.snapshot())
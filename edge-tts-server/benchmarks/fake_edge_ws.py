@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+edge-tts upstream 대역 WebSocket 서버
+
+Microsoft Edge 읽기 서비스의 합성 프로토콜(``speech.config`` → SSML → ``turn.start`` /
+오디오 바이너리 / ``audio.metadata`` / ``turn.end``)만 흉내 냅니다. 세션 풀 벤치마크와
+수동 테스트에서 ``UPSTREAM_WSS_URL=ws://127.0.0.1:8765/edge`` 로 연결해 씁니다.
+
+- ``--handshake-ms`` : WebSocket 업그레이드 전에 기다리는 시간 (TLS + 업그레이드 지연 흉내)
+- ``--first-audio-ms``: SSML 을 받은 뒤 첫 오디오까지 기다리는 시간 (합성 지연 흉내)
+- ``--idle-timeout`` : 이 시간 동안 아무 요청이 없으면 서버가 연결을 닫음
+- ``--single-turn``  : 한 연결에서 한 번만 합성하고 닫음
+
+사용법:
+    python benchmarks/fake_edge_ws.py --port 8765 --handshake-ms 120
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from typing import Any, Dict
+
+from aiohttp import WSMsgType, web
+
+_OUTPUT_FORMAT = re.compile(r'"outputFormat":"([^"]+)"')
+_SSML_TEXT = re.compile(r"<prosody[^>]*>(.*)</prosody>", re.S)
+
+
+def _text_message(path: str, request_id: str, body: str = "") -> str:
+    return f"X-RequestId:{request_id}\r\nContent-Type:application/json\r\nPath:{path}\r\n\r\n{body}"
+
+
+def _audio_message(request_id: str, data: bytes, content_type: str = "audio/mpeg") -> bytes:
+    # 스트림 끝의 빈 오디오 메시지에는 Content-Type 이 없음 (실제 서비스와 같음)
+    content_type_header = f"Content-Type:{content_type}\r\n" if content_type else ""
+    header = f"X-RequestId:{request_id}\r\n{content_type_header}Path:audio\r\n".encode()
+    return len(header).to_bytes(2, "big") + header + data
+
+
+def create_app(options: Dict[str, Any]) -> web.Application:
+    """대역 서버 앱 (``options``: handshake_ms, first_audio_ms, chunks, chunk_bytes,
+    idle_timeout, single_turn)"""
+    stats = {"connections": 0, "turns": 0}
+
+    async def edge(request: web.Request) -> web.WebSocketResponse:
+        await asyncio.sleep(options["handshake_ms"] / 1000)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        stats["connections"] += 1
+        output_format = "audio-24khz-48kbitrate-mono-mp3"
+        while True:
+            try:
+                message = await ws.receive(timeout=options["idle_timeout"])
+            except asyncio.TimeoutError:
+                break
+            if message.type != WSMsgType.TEXT:
+                break
+            if "Path:speech.config" in message.data:
+                match = _OUTPUT_FORMAT.search(message.data)
+                output_format = match.group(1) if match else output_format
+                continue
+            if "Path:ssml" not in message.data:
+                continue
+            request_id = message.data.split("X-RequestId:", 1)[1].split("\r\n", 1)[0]
+            text_match = _SSML_TEXT.search(message.data)
+            text = text_match.group(1) if text_match else ""
+            stats["turns"] += 1
+
+            await ws.send_str(_text_message("turn.start", request_id, "{}"))
+            await asyncio.sleep(options["first_audio_ms"] / 1000)
+            content_type = "audio/mpeg" if "mp3" in output_format else "audio/webm"
+            for _ in range(options["chunks"]):
+                await ws.send_bytes(
+                    _audio_message(request_id, b"\xff\xf3" + b"\x00" * (options["chunk_bytes"] - 2),
+                                   content_type)
+                )
+            duration = options["chunks"] * options["chunk_bytes"] * 8 * 10_000_000 // 48000
+            metadata = {"Metadata": [{
+                "Type": "SentenceBoundary",
+                "Data": {"Offset": 1_000_000, "Duration": duration, "text": {"Text": text}},
+            }]}
+            await ws.send_str(_text_message("audio.metadata", request_id, json.dumps(metadata)))
+            await ws.send_bytes(_audio_message(request_id, b"", ""))
+            await ws.send_str(_text_message("turn.end", request_id, "{}"))
+            if options["single_turn"]:
+                break
+        await ws.close()
+        return ws
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_get("/edge", edge)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+async def start_fake_server(port: int = 0, **overrides: Any) -> tuple:
+    """대역 서버를 현재 루프에서 띄우고 (runner, ws URL, stats) 를 돌려줍니다."""
+    options = {
+        "handshake_ms": 100.0,
+        "first_audio_ms": 20.0,
+        "chunks": 8,
+        "chunk_bytes": 1024,
+        "idle_timeout": 60.0,
+        "single_turn": False,
+        **overrides,
+    }
+    app = create_app(options)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"ws://127.0.0.1:{bound_port}/edge", app["stats"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="edge-tts upstream 대역 WebSocket 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--handshake-ms", type=float, default=100.0)
+    parser.add_argument("--first-audio-ms", type=float, default=20.0)
+    parser.add_argument("--chunks", type=int, default=8, help="합성 1회당 오디오 메시지 수")
+    parser.add_argument("--chunk-bytes", type=int, default=1024)
+    parser.add_argument("--idle-timeout", type=float, default=60.0)
+    parser.add_argument("--single-turn", action="store_true")
+    args = parser.parse_args()
+    options = {
+        "handshake_ms": args.handshake_ms,
+        "first_audio_ms": args.first_audio_ms,
+        "chunks": args.chunks,
+        "chunk_bytes": args.chunk_bytes,
+        "idle_timeout": args.idle_timeout,
+        "single_turn": args.single_turn,
+    }
+    print(f"🎙️  대역 upstream: ws://127.0.0.1:{args.port}/edge")
+    web.run_app(create_app(options), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+로깅 파이프라인 스트리밍 처리량 벤치마크
+
+가짜 Communicate로 TTSService.synthesize_text 를 구동하면서 로깅 모드별
+청크 처리량과 이벤트 루프 최대 지연을 비교합니다.
+
+- off   : WARNING 레벨 (청크 로그 비활성)
+- sync  : DEBUG 레벨, 샘플링 없이 호출 스레드에서 직접 stdout 쓰기 (기존 방식)
+- async : DEBUG 레벨, 샘플링 + 백그라운드 writer 스레드 배치 쓰기
+
+structlog 로거는 첫 사용 시 캐시되므로 모드마다 별도 프로세스에서 실행합니다.
+
+사용법:
+    python benchmarks/logging_bench.py
+    python benchmarks/logging_bench.py --streams 16 --chunks 5000 --sink-latency-ms 0.2
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 모드와 관계없이 매 청크가 합성 경로를 지나도록 디스크/메모리 오디오 캐시를 끔
+# (켜 두면 이전 실행이 남긴 캐시 적중을 측정하게 됨)
+BENCH_ENV = {"AUDIO_CACHE_ENABLED": "false", "MEMORY_CACHE_ENABLED": "false"}
+
+MODES = {
+    "off": {"LOG_LEVEL": "WARNING", "LOG_ASYNC": "false"},
+    "sync": {"LOG_LEVEL": "DEBUG", "LOG_ASYNC": "false", "LOG_SAMPLE_RATES": "{}"},
+    "async": {"LOG_LEVEL": "DEBUG", "LOG_ASYNC": "true"},
+}
+
+
+class SlowSink(io.TextIOBase):
+    """write 호출마다 지정한 시간만큼 블로킹하는 출력 (가득 찬 stdout 파이프 모사)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return len(s)
+
+
+class FakeCommunicate:
+    """고정 크기 오디오 청크를 즉시 내보내는 edge_tts.Communicate 대역"""
+
+    chunks = 1000
+    chunk_size = 4096
+
+    def __init__(self, text, voice, rate="+0%", volume="+0%", pitch="+0Hz", **kwargs):
+        self.text = text
+
+    async def stream(self):
+        data = b"\xff" * self.chunk_size
+        for _ in range(self.chunks):
+            await asyncio.sleep(0)
+            yield {"type": "audio", "data": data}
+
+
+async def _measure_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    loop = asyncio.get_running_loop()
+    worst = 0.0
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - start - interval)
+    return worst
+
+
+async def _run_streams(service, streams: int) -> int:
+    async def consume(i: int) -> int:
+        total = 0
+        async for chunk in service.synthesize_text(text=f"벤치마크 {i}", voice="ko-KR-SunHiNeural"):
+            total += len(chunk)
+        return total
+
+    results = await asyncio.gather(*(consume(i) for i in range(streams)))
+    return sum(results)
+
+
+def run_child(args: argparse.Namespace) -> None:
+    os.environ.update({**BENCH_ENV, **MODES[args.mode]})
+    sys.path.insert(0, ROOT)
+
+    import edge_tts
+
+    FakeCommunicate.chunks = args.chunks
+    FakeCommunicate.chunk_size = args.chunk_size
+    edge_tts.Communicate = FakeCommunicate
+
+    from app.core.logging import configure_logging, shutdown_logging
+    from app.services.tts_service import TTSService
+
+    sink = SlowSink(args.sink_latency_ms / 1000)
+    configure_logging(sink)
+
+    async def main() -> dict:
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_measure_lag(stop))
+        start = time.perf_counter()
+        total_bytes = await _run_streams(TTSService(), args.streams)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        worst_lag = await lag_task
+        return {
+            "mode": args.mode,
+            "elapsed_s": round(elapsed, 4),
+            "chunks_per_s": round(args.streams * args.chunks / elapsed),
+            "mb_per_s": round(total_bytes / elapsed / 1e6, 2),
+            "max_loop_lag_ms": round(worst_lag * 1000, 2),
+        }
+
+    result = asyncio.run(main())
+    shutdown_logging()
+    result["sink_writes"] = sink.writes
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로깅 모드별 스트리밍 처리량 벤치마크")
+    parser.add_argument("--mode", choices=sorted(MODES), help="단일 모드만 실행 (내부용)")
+    parser.add_argument("--streams", type=int, default=8, help="동시 스트림 수")
+    parser.add_argument("--chunks", type=int, default=2000, help="스트림당 청크 수")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="청크 크기 (바이트)")
+    parser.add_argument(
+        "--sink-latency-ms", type=float, default=0.05,
+        help="출력 write 1회당 블로킹 시간 (ms)"
+    )
+    args = parser.parse_args()
+
+    if args.mode:
+        run_child(args)
+        return
+
+    print(f"{'mode':<6} {'chunks/s':>10} {'MB/s':>8} {'max lag(ms)':>12} {'writes':>8}")
+    for mode in ("off", "sync", "async"):
+        cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode,
+               "--streams", str(args.streams), "--chunks", str(args.chunks),
+               "--chunk-size", str(args.chunk_size),
+               "--sink-latency-ms", str(args.sink_latency_ms)]
+        output = subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=ROOT)
+        r = json.loads(output.stdout.strip().splitlines()[-1])
+        print(f"{r['mode']:<6} {r['chunks_per_s']:>10} {r['mb_per_s']:>8} "
+              f"{r['max_loop_lag_ms']:>12} {r['sink_writes']:>8}")
+
+
+if __name__ == "__main__":
+    main()
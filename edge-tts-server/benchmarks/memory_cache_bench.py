@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+메모리 오디오 캐시 벤치마크 (디스크 캐시만 vs 메모리 계층)
+
+디스크 캐시에 클립을 미리 채워 둔 뒤, 엔드포인트와 같은 경로
+(``tts_service.synthesize_text`` → ``buffered_stream``)로 인기도가 치우친(Zipf) 요청을 높은
+동시성으로 보내 처리량, 지연, CPU 시간을 비교합니다. upstream 합성은 일어나지 않습니다.
+
+모드:
+- disk   : 디스크 캐시만 (요청마다 파일 열기 + 스레드에서 읽기)
+- memory : 메모리 arena 계층을 앞에 둠 (적중하면 memoryview 를 그대로 내보냄)
+
+디스크 쪽은 OS 페이지 캐시에 올라간 상태라 실제 디스크 I/O 는 없습니다 (가장 유리한 조건).
+
+사용법:
+    python benchmarks/memory_cache_bench.py
+    python benchmarks/memory_cache_bench.py --requests 50000 --concurrency 128 --clips 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.services import tts_service as tts_module  # noqa: E402
+from app.services.memory_cache import MemoryAudioCache  # noqa: E402
+from app.services.shared_cache import DiskAudioCache  # noqa: E402
+from app.services.streaming import buffered_stream  # noqa: E402
+from app.services.tts_service import synthesis_cache_key  # noqa: E402
+
+VOICE = "ko-KR-SunHiNeural"
+
+
+def clip_text(index: int) -> str:
+    return f"가사 {index} 번째 줄"
+
+
+def populate(cache: DiskAudioCache, clips: int, min_bytes: int, max_bytes: int) -> int:
+    rng = random.Random(7)
+    total = 0
+    for index in range(clips):
+        key = synthesis_cache_key(clip_text(index), VOICE, "+0%", "+0%", "+0Hz")
+        size = rng.randint(min_bytes, max_bytes)
+        with open(cache._path(key), "wb") as f:
+            f.write(os.urandom(size))
+        total += size
+    return total
+
+
+async def run_mode(mode: str, directory: str, args: argparse.Namespace) -> Dict[str, float]:
+    tts_module.audio_cache = DiskAudioCache(directory, max_bytes=1 << 40)
+    tts_module.memory_cache = MemoryAudioCache(
+        args.memory_mb * 1024 * 1024, args.page_kb * 1024, enabled=mode == "memory"
+    )
+    service = tts_module.TTSService()
+    rng = random.Random(11)
+    weights = [1 / (i + 1) ** args.zipf for i in range(args.clips)]
+    picks = rng.choices(range(args.clips), weights=weights, k=args.requests)
+    latencies: List[float] = []
+    sent = 0
+
+    async def one(index: int) -> None:
+        nonlocal sent
+        started = time.perf_counter()
+        async for chunk in buffered_stream(
+            service.synthesize_text(clip_text(index), VOICE, "+0%", "+0%", "+0Hz"),
+            label="bench",
+        ):
+            sent += len(chunk)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for index in picks:
+        queue.put_nowait(index)
+
+    async def worker() -> None:
+        while not queue.empty():
+            await one(queue.get_nowait())
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    latencies.sort()
+    snapshot = tts_module.memory_cache.snapshot()
+    if snapshot.get("enabled"):
+        print(f"   memory: {snapshot}", file=sys.stderr)
+    return {
+        "rps": args.requests / elapsed,
+        "mb_s": sent / elapsed / 1e6,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "cpu_ms_per_req": cpu / args.requests * 1000,
+        "hit_ratio": snapshot.get("hit_ratio", 0.0),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        total = populate(DiskAudioCache(directory, 1 << 40), args.clips,
+                         args.min_kb * 1024, args.max_kb * 1024)
+        rows = []
+        for mode in args.modes:
+            result = await run_mode(mode, directory, args)
+            rows.append(
+                f"{mode:<8} {result['rps']:>9.0f} {result['mb_s']:>8.1f} {result['p50']:>8.2f} "
+                f"{result['p99']:>8.2f} {result['cpu_ms_per_req']:>10.3f} {result['hit_ratio']:>8.3f}"
+            )
+
+    print(f"\n🧠 메모리 캐시 벤치마크 (클립 {args.clips}개 {total / 1e6:.1f} MB, 요청 {args.requests}개, "
+          f"동시 {args.concurrency}, Zipf {args.zipf}, arena {args.memory_mb} MB)")
+    header = (f"{'mode':<8} {'req/s':>9} {'MB/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'CPU ms/req':>10} {'hit':>8}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="메모리 오디오 캐시 벤치마크")
+    parser.add_argument("--modes", nargs="+", default=["disk", "memory"],
+                        choices=["disk", "memory"])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clips", type=int, default=1000)
+    parser.add_argument("--min-kb", type=int, default=16, help="클립 최소 크기 (약 3초 MP3)")
+    parser.add_argument("--max-kb", type=int, default=64, help="클립 최대 크기 (약 11초 MP3)")
+    parser.add_argument("--zipf", type=float, default=1.0, help="인기도 치우침 (클수록 소수 클립에 집중)")
+    parser.add_argument("--memory-mb", type=int, default=16)
+    parser.add_argument("--page-kb", type=int, default=1024)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
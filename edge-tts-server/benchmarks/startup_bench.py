@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+콜드 스타트 벤치마크 (liveness / readiness / 첫 성공 요청까지 시간)
+
+서버 프로세스를 새로 띄우고 프로세스 시작부터 다음 시점까지를 잽니다.
+
+- live  : ``/health`` 첫 200 (요청을 받을 수 있음)
+- ready : ``/ready`` 첫 200 (edge_tts import 와 음성 목록 캐시 준비 완료)
+- first : 첫 합성 요청 성공 (오디오 수신 완료)
+
+모드:
+- lazy  : 현재 구현 (edge_tts 는 준비 작업 또는 첫 요청에서 import)
+- eager : 앱 import 전에 edge_tts(aiohttp 포함)를 먼저 불러와 예전 모듈 수준 import 를 재현
+
+upstream 은 기본적으로 실제 edge_tts 모듈을 불러온 뒤 Communicate / list_voices 만 대역으로
+바꿔 네트워크 없이 측정합니다 (import 비용은 그대로 포함). ``--importtime`` 은
+``python -X importtime`` 으로 앱 import 에서 누적 시간이 큰 모듈을 보여 줍니다.
+
+사용법:
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py --runs 5 --modes lazy eager
+    python benchmarks/startup_bench.py --importtime --top 25
+"""
+
+import argparse
+import asyncio
+import importlib.abc
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeCommunicate:
+    """짧은 오디오 청크 몇 개를 내보내는 edge_tts.Communicate 대역"""
+
+    def __init__(self, text, voice, rate="+0%", volume="+0%", pitch="+0Hz", **kwargs):
+        self.text = text
+
+    async def stream(self):
+        for _ in range(4):
+            await asyncio.sleep(0)
+            yield {"type": "audio", "data": b"\xff\xf3" + b"\x00" * 1022}
+
+
+async def fake_list_voices():
+    return [{
+        "Name": "ko-KR-SunHiNeural", "ShortName": "ko-KR-SunHiNeural", "Gender": "Female",
+        "Locale": "ko-KR", "VoiceTag": {"ContentCategories": ["General"], "VoicePersonalities": ["Friendly"]},
+    }]
+
+
+class _FakeUpstreamFinder(importlib.abc.MetaPathFinder):
+    """실제 edge_tts 를 불러온 직후 네트워크 호출 부분만 대역으로 바꿉니다."""
+
+    def find_spec(self, name, path, target=None):
+        if name != "edge_tts":
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(name)
+        exec_module = spec.loader.exec_module
+
+        def patched_exec_module(module):
+            exec_module(module)
+            module.Communicate = FakeCommunicate
+            module.list_voices = fake_list_voices
+
+        spec.loader.exec_module = patched_exec_module
+        return spec
+
+
+def serve(args: argparse.Namespace) -> None:
+    """자식 프로세스: 서버 실행"""
+    sys.path.insert(0, ROOT)
+    if not args.real_upstream:
+        sys.meta_path.insert(0, _FakeUpstreamFinder())
+    if args.mode == "eager":
+        import edge_tts  # noqa: F401
+
+        from app.services.backends import load_edge_tts
+
+        load_edge_tts()
+
+    import uvicorn
+
+    uvicorn.run("app.main:app", host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure(mode: str, real_upstream: bool, timeout: float) -> Dict[str, Optional[float]]:
+    """서버를 한 번 띄우고 live / ready / first 시점을 잽니다 (ms)."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    cache_dir = tempfile.mkdtemp(prefix="startup-bench-")
+    cmd = [sys.executable, os.path.abspath(__file__), "--serve", "--mode", mode, "--port", str(port)]
+    if real_upstream:
+        cmd.append("--real-upstream")
+    env = {**os.environ, "AUDIO_CACHE_DIR": cache_dir, "LOG_LEVEL": "WARNING"}
+
+    marks: Dict[str, Optional[float]] = {"live": None, "ready": None, "first": None}
+    started = time.perf_counter()
+    process = subprocess.Popen(cmd, cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(timeout=timeout) as client:
+            while None in marks.values() and time.perf_counter() - started < timeout:
+                for name, request in (
+                    ("live", lambda: client.get(f"{base}/health")),
+                    ("ready", lambda: client.get(f"{base}/ready")),
+                    ("first", lambda: client.get(
+                        f"{base}/api/v1/tts/synthesize",
+                        params={"text": "안녕하세요", "voice": "ko-KR-SunHiNeural"},
+                    )),
+                ):
+                    if marks[name] is not None:
+                        continue
+                    try:
+                        response = request()
+                    except httpx.HTTPError:
+                        continue
+                    if response.status_code == 200 and (name != "first" or response.content):
+                        marks[name] = round((time.perf_counter() - started) * 1000, 1)
+                time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return marks
+
+
+def importtime_report(top: int) -> None:
+    """앱 import 의 모듈별 누적 시간 상위 목록"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # 헤더
+        rows.append((cumulative_us, self_us, parts[2].rstrip()))
+    total = next((row for row in rows if row[2].strip() == "app.main"), None)
+    print(f"\n📦 import app.main: {total[0] / 1000:.1f} ms" if total else "\n📦 import app.main")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="콜드 스타트 벤치마크")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="lazy", choices=["lazy", "eager"], help=argparse.SUPPRESS)
+    parser.add_argument("--modes", nargs="+", default=["eager", "lazy"], choices=["lazy", "eager"],
+                        help="비교할 모드")
+    parser.add_argument("--runs", type=int, default=3, help="모드별 반복 횟수 (중앙값 보고)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="실행 1회 제한 시간 (초)")
+    parser.add_argument("--real-upstream", action="store_true",
+                        help="대역 없이 실제 edge-tts 서비스로 합성 (인터넷 필요)")
+    parser.add_argument("--importtime", action="store_true", help="import 시간 상위 모듈만 출력")
+    parser.add_argument("--top", type=int, default=20, help="--importtime 출력 모듈 수")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+    if args.importtime:
+        importtime_report(args.top)
+        return
+
+    results: Dict[str, List[Dict[str, Optional[float]]]] = {}
+    for mode in args.modes:
+        results[mode] = [measure(mode, args.real_upstream, args.timeout) for _ in range(args.runs)]
+
+    def median(runs: List[Dict[str, Optional[float]]], key: str) -> str:
+        values = [run[key] for run in runs if run[key] is not None]
+        return f"{statistics.median(values):>9.1f}" if values else f"{'-':>9}"
+
+    header = f"{'mode':<7} {'live ms':>9} {'ready ms':>9} {'first ms':>9}"
+    print(f"\n⏱️  콜드 스타트 (중앙값, {args.runs}회, CPU {os.cpu_count()}개)")
+    print(header)
+    print("-" * len(header))
+    for mode, runs in results.items():
+        print(f"{mode:<7} {median(runs, 'live')} {median(runs, 'ready')} {median(runs, 'first')}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+upstream 세션 풀 벤치마크 (첫 오디오까지 시간)
+
+대역 edge-tts 서버(``fake_edge_ws.py``)를 같은 프로세스에서 띄우고 짧은 가사 줄을
+합성하며 요청 시작부터 첫 오디오 청크까지 시간(TTFA)과 전체 시간을 비교합니다.
+
+모드:
+- communicate : 기존 방식 (요청마다 ``edge_tts.Communicate``, 새 세션 + 핸드셰이크)
+- cold        : 세션 풀 경로, 미리 연결 없음 (요청마다 연결)
+- prewarm     : 미리 연결한 세션 사용 (``UPSTREAM_POOL_SIZE``)
+- reuse       : 미리 연결 + 정상 종료된 세션 재사용 (``UPSTREAM_SESSION_REUSE``)
+
+사용법:
+    python benchmarks/upstream_pool_bench.py
+    python benchmarks/upstream_pool_bench.py --handshake-ms 150 --requests 50 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_edge_ws import start_fake_server  # noqa: E402
+
+from app.services.upstream import UpstreamSessionPool, static_endpoint  # noqa: E402
+
+LINES = ["안녕하세요", "오늘 밤은 별이 빛나", "너를 보면 설레", "다시 만날 그날까지"]
+FORMAT = "audio-24khz-48kbitrate-mono-mp3"
+
+
+async def _one(stream) -> Dict[str, float]:
+    started = time.perf_counter()
+    first = None
+    async for chunk in stream:
+        if chunk["type"] == "audio" and first is None:
+            first = time.perf_counter()
+    done = time.perf_counter()
+    return {"ttfa": (first - started) * 1000, "total": (done - started) * 1000}
+
+
+async def run_mode(mode: str, url: str, args: argparse.Namespace) -> List[Dict[str, float]]:
+    pool = None
+    if mode == "communicate":
+        from edge_tts import communicate as edge
+
+        # 기존 경로를 대역 서버로 보냄 (뒤에 &ConnectionId=... 가 붙음)
+        edge.WSS_URL = f"{url}?TrustedClientToken=bench"
+
+        def stream(text: str):
+            return edge.Communicate(text, "ko-KR-SunHiNeural").stream()
+    else:
+        pool = UpstreamSessionPool(
+            endpoint=lambda: static_endpoint(url),
+            size=0 if mode == "cold" else args.pool_size,
+            max_lifetime=args.max_lifetime,
+            reuse=mode == "reuse",
+        )
+        await pool.start()
+        await asyncio.sleep(args.handshake_ms / 1000 * 2 + 0.1)  # 첫 보충 대기
+
+        def stream(text: str):
+            return pool.synthesize(text, "ko-KR-SunHiNeural", "+0%", "+0%", "+0Hz", FORMAT)
+
+    results: List[Dict[str, float]] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def worker(index: int) -> None:
+        async with semaphore:
+            results.append(await _one(stream(LINES[index % len(LINES)])))
+            await asyncio.sleep(args.gap_ms / 1000)
+
+    try:
+        await asyncio.gather(*(worker(i) for i in range(args.requests)))
+    finally:
+        if pool is not None:
+            snapshot = pool.snapshot()
+            await pool.close()
+            print(f"   {mode}: {snapshot}", file=sys.stderr)
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    runner, url, stats = await start_fake_server(
+        handshake_ms=args.handshake_ms, first_audio_ms=args.first_audio_ms
+    )
+    header = (f"{'mode':<12} {'TTFA p50':>9} {'TTFA p95':>9} {'total p50':>10} "
+              f"{'connections':>12}")
+    rows = []
+    try:
+        for mode in args.modes:
+            before = stats["connections"]
+            results = await run_mode(mode, url, args)
+            ttfa = sorted(r["ttfa"] for r in results)
+            total = sorted(r["total"] for r in results)
+            p95 = ttfa[min(len(ttfa) - 1, int(len(ttfa) * 0.95))]
+            rows.append(f"{mode:<12} {statistics.median(ttfa):>9.1f} {p95:>9.1f} "
+                        f"{statistics.median(total):>10.1f} {stats['connections'] - before:>12}")
+    finally:
+        await runner.cleanup()
+
+    print(f"\n⏱️  첫 오디오까지 시간 (ms, 요청 {args.requests}개, 동시 {args.concurrency}, "
+          f"핸드셰이크 {args.handshake_ms:.0f} ms, 합성 {args.first_audio_ms:.0f} ms)")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="upstream 세션 풀 벤치마크")
+    parser.add_argument("--modes", nargs="+", default=["communicate", "cold", "prewarm", "reuse"],
+                        choices=["communicate", "cold", "prewarm", "reuse"])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--gap-ms", type=float, default=100.0,
+                        help="요청 사이 간격 (가사 줄 사이 재생 시간 흉내, 풀 보충 시간)")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--max-lifetime", type=float, default=30.0)
+    parser.add_argument("--handshake-ms", type=float, default=100.0,
+                        help="대역 서버의 연결(TLS + 업그레이드) 지연")
+    parser.add_argument("--first-audio-ms", type=float, default=20.0,
+                        help="대역 서버의 합성 지연")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
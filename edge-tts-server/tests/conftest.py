@@ -0,0 +1,16 @@
+"""공용 테스트 fixture"""
+
+import pytest
+
+from app.services import tts_service
+from app.services.memory_cache import MemoryAudioCache
+from app.services.shared_cache import DiskAudioCache
+
+
+@pytest.fixture
+def isolated_caches(monkeypatch, tmp_path) -> DiskAudioCache:
+    """TTS 서비스가 테스트 전용 디스크 캐시를 쓰고 메모리 캐시는 거치지 않도록 바꿉니다."""
+    cache = DiskAudioCache(str(tmp_path), 64 * 1024 * 1024)
+    monkeypatch.setattr(tts_service, "audio_cache", cache)
+    monkeypatch.setattr(tts_service, "memory_cache", MemoryAudioCache(0, 4096, enabled=False))
+    return cache
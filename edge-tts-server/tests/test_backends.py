@@ -0,0 +1,158 @@
+"""합성 백엔드 테스트 (synthetic 엔진 출력, 우선순위 대체, 백엔드별 캐시 키)"""
+
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from app.services import tts_service
+from app.services.audio_formats import AUDIO_FORMATS, DEFAULT_FORMAT
+from app.services.backends import (
+    BackendCapabilities,
+    BackendRouter,
+    BackendUnavailable,
+    LocalBackend,
+    SyntheticBackend,
+)
+from app.services.mp3 import parse_clip
+from app.services.tts_service import TTSService, synthesis_cache_key
+
+TEXT = "백엔드를 바꿔도 같은 길이의 오디오가 나와야 합니다"
+VOICE = "ko-KR-SunHiNeural"
+
+
+class FailingBackend:
+    """첫 오디오 전에, 또는 오디오 일부를 보낸 뒤 실패하는 백엔드"""
+
+    capabilities = BackendCapabilities(
+        formats=frozenset(AUDIO_FORMATS), prosody=True, boundaries=False, offline=True
+    )
+    available = True
+
+    def __init__(self, name: str = "edge", partial: bool = False) -> None:
+        self.name = name
+        self.partial = partial
+        self.calls = 0
+
+    async def synthesize(self, *args: Any) -> AsyncIterator[Dict[str, Any]]:
+        self.calls += 1
+        if self.partial:
+            yield {"type": "audio", "data": b"\xff\xf3"}
+        raise ConnectionError("upstream 연결 실패")
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        raise ConnectionError("upstream 연결 실패")
+
+
+def synthetic() -> SyntheticBackend:
+    return SyntheticBackend(realtime_factor=0, first_audio=0, chunk_frames=7)
+
+
+async def collect(source) -> bytes:
+    return b"".join([bytes(chunk) async for chunk in source])
+
+
+@pytest.fixture
+def service(monkeypatch, isolated_caches):
+    def use(*backends) -> BackendRouter:
+        router = BackendRouter(list(backends), cooldown=60)
+        monkeypatch.setattr(tts_service, "backend_router", router)
+        return router
+
+    return TTSService(), use
+
+
+@pytest.mark.asyncio
+async def test_synthetic_output_is_valid_mp3():
+    backend = synthetic()
+    for name, frame_seconds in (("mp3-48k", 576 / 24000), ("mp3-32k", 576 / 16000)):
+        chunks = [chunk async for chunk in backend.synthesize(
+            TEXT, VOICE, "+0%", "+0%", "+0Hz", AUDIO_FORMATS[name]
+        )]
+        data = b"".join(chunk["data"] for chunk in chunks if chunk["type"] == "audio")
+        clip = parse_clip(data)
+        expected = backend.audio_seconds(TEXT, "+0%")
+        assert clip.frames == round(expected / frame_seconds)
+        assert clip.duration == pytest.approx(expected, abs=frame_seconds)
+        assert clip.audio_bytes == len(data)
+
+        boundaries = [chunk for chunk in chunks if chunk["type"] == "WordBoundary"]
+        assert [chunk["text"] for chunk in boundaries] == TEXT.split()
+        end = boundaries[-1]["offset"] + boundaries[-1]["duration"]
+        assert end / 10_000_000 == pytest.approx(clip.duration, abs=0.01)
+
+    # 빠른 속도는 더 짧은 오디오, 같은 입력은 같은 오디오
+    fast = [chunk async for chunk in backend.synthesize(TEXT, VOICE, "+50%", "+0%", "+0Hz", DEFAULT_FORMAT)]
+    assert backend.audio_seconds(TEXT, "+50%") < backend.audio_seconds(TEXT, "+0%")
+    again = [chunk async for chunk in backend.synthesize(TEXT, VOICE, "+50%", "+0%", "+0Hz", DEFAULT_FORMAT)]
+    assert fast == again
+
+
+@pytest.mark.asyncio
+async def test_synthetic_pacing_follows_realtime_factor():
+    backend = SyntheticBackend(realtime_factor=0.5, first_audio=0.05)
+    text = "짧은 문장"
+    started = time.perf_counter()
+    async for _ in backend.synthesize(text, VOICE, "+0%", "+0%", "+0Hz", DEFAULT_FORMAT):
+        pass
+    elapsed = time.perf_counter() - started
+    assert elapsed >= 0.05 + 0.5 * backend.audio_seconds(text, "+0%") * 0.9
+
+    with pytest.raises(BackendUnavailable):
+        async for _ in backend.synthesize(text, VOICE, "+0%", "+0%", "+0Hz", AUDIO_FORMATS["ogg-opus"]):
+            pass
+
+
+def test_router_skips_unusable_backends():
+    local = LocalBackend(command="no-such-tts-engine")
+    router = BackendRouter([local, synthetic()], cooldown=60)
+    assert not local.available
+    assert [backend.name for backend in router.candidates(DEFAULT_FORMAT)] == ["synthetic"]
+    with pytest.raises(BackendUnavailable):
+        router.candidates(AUDIO_FORMATS["webm-opus"])
+
+
+def test_cache_key_depends_on_backend(service):
+    _, use = service
+    edge_key = synthesis_cache_key(TEXT, VOICE, "+0%", "+0%", "+0Hz", DEFAULT_FORMAT, "edge")
+    synthetic_key = synthesis_cache_key(TEXT, VOICE, "+0%", "+0%", "+0Hz", DEFAULT_FORMAT, "synthetic")
+    assert edge_key != synthetic_key
+    use(synthetic())
+    assert synthesis_cache_key(TEXT, VOICE, "+0%", "+0%", "+0Hz") == synthetic_key
+
+
+@pytest.mark.asyncio
+async def test_failover_before_first_audio(service):
+    service, use = service
+    failing = FailingBackend()
+    router = use(failing, synthetic())
+
+    data = await collect(service.synthesize_text(TEXT, VOICE))
+    assert parse_clip(data).frames > 0
+    assert failing.calls == 1
+    assert router.degraded
+    snapshot = router.snapshot()["backends"]
+    assert snapshot["edge"]["failovers"] == 1 and snapshot["edge"]["failures"] == 1
+    assert snapshot["synthetic"]["served"] == 1
+
+    # 실패한 기본 백엔드는 쿨다운 동안 뒤로 밀리고, 대체 결과는 캐시에서 나감
+    assert await collect(service.synthesize_text(TEXT, VOICE)) == data
+    assert failing.calls == 1
+    assert router.snapshot()["backends"]["synthetic"]["served"] == 1
+
+    # 음성 목록도 쿨다운 중인 백엔드를 건너뛰고 다음 백엔드에서 가져옴
+    voices = await service.get_available_voices()
+    assert "ko-KR" in {voice.locale for voice in voices}
+    assert router.snapshot()["backends"]["edge"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_failover_after_audio_started(service):
+    service, use = service
+    failing = FailingBackend(partial=True)
+    router = use(failing, synthetic())
+
+    with pytest.raises(ConnectionError):
+        await collect(service.synthesize_text(TEXT, VOICE))
+    assert router.snapshot()["backends"]["edge"]["failovers"] == 0
+    assert router.snapshot()["backends"]["synthetic"]["requests"] == 0
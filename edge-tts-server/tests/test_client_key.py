@@ -0,0 +1,57 @@
+"""합성 예산 클라이언트 식별자 테스트 (등록된 API 키, 신뢰하는 프록시)"""
+
+from typing import Dict
+
+import pytest
+from starlette.requests import Request
+
+from app.api.deps import get_client_key
+from app.core.config import settings
+
+
+def request(peer: str, headers: Dict[str, str] = {}) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": (peer, 50000),
+    })
+
+
+@pytest.fixture
+def proxies(monkeypatch):
+    monkeypatch.setattr(settings, "admission_key_budgets", {"partner-key": 3000})
+    monkeypatch.setattr(settings, "trusted_proxies", ["10.0.0.0/8"])
+
+
+def test_only_configured_keys_are_keys(proxies):
+    assert get_client_key(request("203.0.113.5"), "partner-key") == "key:partner-key"
+    # 등록되지 않은 키를 바꿔 보내도 같은 IP 예산
+    assert get_client_key(request("203.0.113.5"), "random-1") == "ip:203.0.113.5"
+    assert get_client_key(request("203.0.113.5"), "random-2") == "ip:203.0.113.5"
+
+
+def test_forwarded_headers_from_trusted_proxy(proxies):
+    assert get_client_key(
+        request("10.0.0.2", {"X-Forwarded-For": "198.51.100.7"}), None
+    ) == "ip:198.51.100.7"
+    # 클라이언트가 앞에 넣은 값은 무시하고 오른쪽부터 처음 나오는 신뢰하지 않는 주소
+    assert get_client_key(
+        request("10.0.0.2", {"X-Forwarded-For": "1.2.3.4, 198.51.100.7, 10.0.0.9"}), None
+    ) == "ip:198.51.100.7"
+    assert get_client_key(request("10.0.0.2", {"X-Real-IP": "198.51.100.8"}), None) == "ip:198.51.100.8"
+    assert get_client_key(request("10.0.0.2"), None) == "ip:10.0.0.2"
+
+
+def test_forwarded_headers_from_untrusted_peer_are_ignored(proxies):
+    assert get_client_key(
+        request("203.0.113.5", {"X-Forwarded-For": "198.51.100.7", "X-Real-IP": "198.51.100.7"}), None
+    ) == "ip:203.0.113.5"
+
+
+def test_no_trusted_proxies_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "trusted_proxies", [])
+    assert get_client_key(
+        request("10.0.0.2", {"X-Forwarded-For": "198.51.100.7"}), None
+    ) == "ip:10.0.0.2"
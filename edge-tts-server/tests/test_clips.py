@@ -0,0 +1,53 @@
+"""짧은 서명 URL 테스트 (token 형식 검사, 서명, SQLite 공유)"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import clips as clips_endpoint
+from app.services.audio_formats import DEFAULT_FORMAT
+from app.services.clips import ClipRegistry
+
+VOICE = "ko-KR-SunHiNeural"
+
+
+async def register(registry: ClipRegistry) -> str:
+    clip = await registry.register("안녕하세요", VOICE, "+0%", "+0%", "+0Hz", DEFAULT_FORMAT)
+    return clip["token"]
+
+
+@pytest.mark.asyncio
+async def test_resolve_signed_token(tmp_path):
+    registry = ClipRegistry(str(tmp_path / "clips.db"), "", 100, 3600)
+    token = await register(registry)
+    assert len(token) == 20
+    assert (await registry.resolve(token))["text"] == "안녕하세요"
+
+    # 같은 파일을 여는 다른 워커도 같은 비밀 키로 서명을 확인
+    other = ClipRegistry(str(tmp_path / "clips.db"), "", 100, 3600)
+    assert (await other.resolve(token))["voice"] == VOICE
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token", ["", "abc", "é" * 20, "éééééééééé", "a" * 12 + "한글서명입니다아", "a" * 19 + "/", "a" * 21])
+async def test_malformed_tokens_are_rejected(token):
+    registry = ClipRegistry(None, "secret", 100, 3600)
+    assert await registry.resolve(token) is None
+    assert registry.bad_signatures == 1
+
+
+@pytest.mark.asyncio
+async def test_tampered_signature_is_rejected():
+    registry = ClipRegistry(None, "secret", 100, 3600)
+    token = await register(registry)
+    tampered = token[:-1] + ("A" if token[-1] != "A" else "B")
+    assert await registry.resolve(tampered) is None
+    assert registry.bad_signatures == 1
+
+
+def test_non_ascii_token_returns_404(monkeypatch):
+    monkeypatch.setattr(clips_endpoint, "clip_registry", ClipRegistry(None, "secret", 100, 3600))
+    app = FastAPI()
+    app.include_router(clips_endpoint.short_router)
+    response = TestClient(app).get("/a/éééééééééé")
+    assert response.status_code == 404
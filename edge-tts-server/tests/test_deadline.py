@@ -0,0 +1,140 @@
+"""요청 데드라인 테스트 (X-Deadline-Ms 해석, 도착 시 504, upstream 대기 중단)"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services import deadline
+from app.services.deadline import (
+    DEADLINE_HEADER,
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    DeadlineStats,
+    bounded,
+    request_deadline,
+)
+
+
+@pytest.fixture
+def stats(monkeypatch) -> DeadlineStats:
+    fresh = DeadlineStats()
+    monkeypatch.setattr(deadline, "deadline_stats", fresh)
+    return fresh
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware)
+    calls = []
+
+    @app.get("/remaining")
+    async def remaining():
+        calls.append(1)
+        return {"remaining": deadline.remaining()}
+
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_header_becomes_request_deadline(client, stats):
+    response = client.get("/remaining", headers={DEADLINE_HEADER: "1500"})
+    assert response.status_code == 200
+    assert 1.0 < response.json()["remaining"] <= 1.5
+    assert stats.requests == 1
+    # 요청이 끝나면 컨텍스트에서 사라짐
+    assert request_deadline.get() is None
+
+
+def test_missing_header_means_no_deadline(client, stats):
+    assert client.get("/remaining").json() == {"remaining": None}
+    assert stats.requests == 0
+
+
+@pytest.mark.parametrize("value", ["abc", "nan", "inf", "-inf", ""])
+def test_invalid_header_is_ignored(client, stats, value):
+    response = client.get("/remaining", headers={DEADLINE_HEADER: value})
+    assert response.json() == {"remaining": None}
+    assert stats.invalid_headers == 1 and stats.requests == 0
+
+
+@pytest.mark.parametrize("value", ["0", "-5", "-0.1"])
+def test_expired_on_arrival_returns_504_without_running(client, stats, value):
+    response = client.get("/remaining", headers={DEADLINE_HEADER: value})
+    assert response.status_code == 504
+    assert response.json()["path"] == "/remaining"
+    assert client.calls == []
+    assert stats.expired_on_arrival == 1
+
+
+class SlowSource:
+    """항목 사이마다 기다리는 가짜 upstream (닫혔는지 기록)"""
+
+    def __init__(self, items: int, delay: float) -> None:
+        self.items = items
+        self.delay = delay
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            for i in range(self.items):
+                await asyncio.sleep(self.delay)
+                yield i
+        finally:
+            self.closed = True
+
+
+async def collect(source, stage: str = "upstream") -> list:
+    return [item async for item in bounded(source, stage)]
+
+
+@pytest.mark.asyncio
+async def test_bounded_without_deadline_passes_through(stats):
+    assert await collect(SlowSource(3, 0)) == [0, 1, 2]
+    assert stats.cancelled == {}
+
+
+@pytest.mark.asyncio
+async def test_bounded_finishes_within_deadline(stats):
+    token = request_deadline.set(time.monotonic() + 10)
+    try:
+        assert await collect(SlowSource(3, 0)) == [0, 1, 2]
+    finally:
+        request_deadline.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_bounded_cancels_overrunning_source(stats):
+    source = SlowSource(100, 0.02)
+    received = []
+    token = request_deadline.set(time.monotonic() + 0.1)
+    try:
+        with pytest.raises(DeadlineExceeded) as e:
+            async for item in bounded(source.__aiter__(), "upstream"):
+                received.append(item)
+    finally:
+        request_deadline.reset(token)
+    assert e.value.stage == "upstream"
+    assert 0 < len(received) < 100
+    # upstream 세션을 반납하도록 source 를 닫음
+    assert source.closed
+    assert stats.cancelled == {"upstream": 1}
+
+
+@pytest.mark.asyncio
+async def test_bounded_keeps_upstream_timeout(stats):
+    async def timing_out():
+        raise asyncio.TimeoutError()
+        yield
+
+    token = request_deadline.set(time.monotonic() + 10)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await collect(timing_out())
+    finally:
+        request_deadline.reset(token)
+    assert stats.cancelled == {}
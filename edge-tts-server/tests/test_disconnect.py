@@ -0,0 +1,177 @@
+"""클라이언트 연결 끊김 처리 테스트 (느린 가짜 upstream)"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import streaming, tts_service
+from app.services.disconnect import DisconnectMetrics
+from app.services.streaming import BufferedAudioStream
+from app.services.tts_service import TTSService, synthesis_cache_key
+
+TEXT = "느린 업스트림으로 합성하는 긴 문장입니다. " * 10
+VOICE = "ko-KR-SunHiNeural"
+CHUNK = b"\xff" * 256
+
+
+class SlowUpstream:
+    """청크 사이마다 잠깐 멈추는 가짜 upstream. 끝까지 보냈는지, 중간에 닫혔는지 기록합니다."""
+
+    def __init__(self, chunks: int, delay: float = 0.01) -> None:
+        self.chunks = chunks
+        self.delay = delay
+        self.sent = 0
+        self.completed = False
+        self.closed_early = False
+
+    async def __call__(self, *args, **kwargs):
+        try:
+            for _ in range(self.chunks):
+                await asyncio.sleep(self.delay)
+                self.sent += 1
+                yield {"type": "audio", "data": CHUNK}
+            self.completed = True
+        finally:
+            # 취소(CancelledError)나 aclose(GeneratorExit)로 중간에 끝남
+            self.closed_early = not self.completed
+
+
+@pytest.fixture
+def upstream(monkeypatch, isolated_caches):
+    fake = SlowUpstream(chunks=40)
+    monkeypatch.setattr(TTSService, "_upstream_chunks", lambda self, *args: fake())
+    monkeypatch.setattr(streaming, "disconnect_metrics", DisconnectMetrics())
+    # 어떤 진행률에서도 백그라운드 완료 여부가 정책만으로 정해지도록 예상 크기를 크게 잡음
+    monkeypatch.setattr(
+        tts_service.cost_model, "estimate", lambda text, rate: {"audio_seconds": 10.0}
+    )
+    return fake
+
+
+def open_stream(**kwargs) -> BufferedAudioStream:
+    source = TTSService().synthesize_text(TEXT, VOICE, "+0%", "+0%", "+0Hz")
+    return BufferedAudioStream(source, "test", **kwargs)
+
+
+async def read_then_leave(stream: BufferedAudioStream, chunks: int) -> None:
+    """청크 몇 개를 받은 뒤 응답을 닫음 (서버가 끊긴 연결의 응답을 취소하는 경우)"""
+    iterator = stream.__aiter__()
+    for _ in range(chunks):
+        await iterator.__anext__()
+    await iterator.aclose()
+
+
+def cached() -> bool:
+    key = synthesis_cache_key(TEXT, VOICE, "+0%", "+0%", "+0Hz")
+    return tts_service.audio_cache.contains(key)
+
+
+@pytest.mark.asyncio
+async def test_cancel_policy_closes_upstream(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "stream_disconnect_policy", "cancel")
+    await read_then_leave(open_stream(), 2)
+    await asyncio.sleep(0.05)
+
+    assert upstream.closed_early and not upstream.completed
+    assert upstream.sent < upstream.chunks
+    snapshot = streaming.disconnect_metrics.snapshot()
+    assert snapshot["abandoned_streams"] == 1
+    assert snapshot["detected"] == {"server": 1}
+    assert snapshot["reclaimed_upstream_sessions"] == 1
+    assert snapshot["background_started"] == 0
+    assert not cached()
+
+
+@pytest.mark.asyncio
+async def test_finish_policy_completes_in_background(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "stream_disconnect_policy", "finish")
+    monkeypatch.setattr(settings, "stream_disconnect_finish_ratio", 0.0)
+    await read_then_leave(open_stream(), 2)
+
+    for _ in range(200):
+        snapshot = streaming.disconnect_metrics.snapshot()
+        if snapshot["background_completed"] and not snapshot["background_active"]:
+            break
+        await asyncio.sleep(0.01)
+
+    assert upstream.completed and not upstream.closed_early
+    snapshot = streaming.disconnect_metrics.snapshot()
+    assert snapshot["abandoned_streams"] == 1
+    assert snapshot["reclaimed_upstream_sessions"] == 0
+    assert snapshot["background_completed"] == 1
+    assert snapshot["background_active"] == 0
+    assert cached()
+
+
+@pytest.mark.asyncio
+async def test_finish_policy_cancels_below_ratio(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "stream_disconnect_policy", "finish")
+    monkeypatch.setattr(settings, "stream_disconnect_finish_ratio", 0.9)
+    await read_then_leave(open_stream(), 2)
+    await asyncio.sleep(0.05)
+
+    assert upstream.closed_early and not upstream.completed
+    assert streaming.disconnect_metrics.reclaimed_upstream_sessions == 1
+    assert not cached()
+
+
+@pytest.mark.asyncio
+async def test_background_cap_cancels(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "stream_disconnect_policy", "finish")
+    monkeypatch.setattr(settings, "stream_disconnect_finish_ratio", 0.0)
+    monkeypatch.setattr(settings, "stream_disconnect_max_background", 0)
+    await read_then_leave(open_stream(), 2)
+    await asyncio.sleep(0.05)
+
+    assert upstream.closed_early
+    snapshot = streaming.disconnect_metrics.snapshot()
+    assert snapshot["background_rejected"] == 1
+    assert snapshot["reclaimed_upstream_sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_detects_disconnect_while_waiting(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "stream_disconnect_policy", "cancel")
+    upstream.delay = 0.05
+    disconnected = asyncio.Event()
+
+    async def is_disconnected() -> bool:
+        return disconnected.is_set()
+
+    stream = open_stream(is_disconnected=is_disconnected, disconnect_poll=0.01)
+    received = 0
+    async for _ in stream:
+        received += 1
+        disconnected.set()
+    await asyncio.sleep(0.1)
+
+    assert received < upstream.chunks
+    assert upstream.closed_early
+    snapshot = streaming.disconnect_metrics.snapshot()
+    assert snapshot["detected"] == {"poll": 1}
+    assert snapshot["reclaimed_upstream_sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_leader_finishes_while_followers_attached(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "stream_disconnect_policy", "cancel")
+    leader = open_stream()
+    iterator = leader.__aiter__()
+    await iterator.__anext__()
+
+    async def follow() -> bytes:
+        source = TTSService().synthesize_text(TEXT, VOICE, "+0%", "+0%", "+0Hz")
+        return b"".join([chunk async for chunk in source])
+
+    follower = asyncio.create_task(follow())
+    await asyncio.sleep(0.03)
+    await iterator.aclose()
+    audio = await asyncio.wait_for(follower, timeout=5)
+
+    assert audio == CHUNK * upstream.chunks
+    assert upstream.completed and not upstream.closed_early
+    snapshot = streaming.disconnect_metrics.snapshot()
+    assert snapshot["finished_for_followers"] == 1
+    assert snapshot["reclaimed_upstream_sessions"] == 0
+    assert cached()
@@ -0,0 +1,179 @@
+"""비동기 합성 작업 API 테스트 (접수, 큐 가득 참, 콜백 호스트 허용 목록, 상태/오디오 조회)"""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import jobs as jobs_endpoint
+from app.core.config import settings
+from app.services import jobs
+from app.services.jobs import JobManager
+from app.services.tts_service import TTSService
+
+PREFIX = f"{settings.api_v1_prefix}/tts"
+CHUNK = b"\xff" * 256
+
+
+class FakeUpstream:
+    def __init__(self, chunks: int = 4) -> None:
+        self.chunks = chunks
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+        for _ in range(self.chunks):
+            await asyncio.sleep(0)
+            yield {"type": "audio", "data": CHUNK}
+
+
+@pytest.fixture
+def upstream(monkeypatch, isolated_caches):
+    fake = FakeUpstream()
+    monkeypatch.setattr(TTSService, "_upstream_chunks", lambda self, *args: fake())
+    monkeypatch.setattr(settings, "job_callback_hosts", ["hooks.example.com"])
+    return fake
+
+
+def use_manager(monkeypatch, tmp_path, **kwargs) -> JobManager:
+    options = {"workers": 1, "queue_size": 10, "ttl": 3600.0, **kwargs}
+    manager = JobManager(str(tmp_path / "jobs"), **options)
+    monkeypatch.setattr(jobs, "job_manager", manager)
+    monkeypatch.setattr(jobs_endpoint, "job_manager", manager)
+    return manager
+
+
+@pytest_asyncio.fixture
+async def client():
+    app = FastAPI()
+    app.include_router(jobs_endpoint.router, prefix=PREFIX)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http:
+        yield http
+    await jobs_endpoint.job_manager.stop()
+
+
+async def submit(client: httpx.AsyncClient, **extra) -> httpx.Response:
+    return await client.post(f"{PREFIX}/jobs", json={"text": "작업으로 합성하는 가사입니다", **extra})
+
+
+async def wait_done(client: httpx.AsyncClient, job_id: str) -> dict:
+    for _ in range(200):
+        body = (await client.get(f"{PREFIX}/jobs/{job_id}")).json()
+        if body["status"] in ("done", "failed"):
+            return body
+        await asyncio.sleep(0.01)
+    raise AssertionError("작업이 끝나지 않음")
+
+
+@pytest.mark.asyncio
+async def test_submit_then_fetch_status_and_audio(upstream, monkeypatch, tmp_path, client):
+    use_manager(monkeypatch, tmp_path)
+    response = await submit(client)
+    assert response.status_code == 202
+    body = response.json()
+    assert response.headers["location"] == body["status_url"]
+    assert body["status"] in ("queued", "running") and body["text_length"] == len("작업으로 합성하는 가사입니다")
+
+    done = await wait_done(client, body["id"])
+    assert done["status"] == "done"
+    assert done["audio_bytes"] == upstream.chunks * len(CHUNK)
+
+    audio = await client.get(body["audio_url"])
+    assert audio.status_code == 200
+    assert audio.content == CHUNK * upstream.chunks
+    assert audio.headers["etag"] == f'"{body["cache_key"]}"'
+    assert "immutable" in audio.headers["cache-control"]
+    # 결과는 디스크 캐시에서 나오므로 다시 합성하지 않음
+    assert upstream.calls == 1
+
+    cached = await client.get(body["audio_url"], headers={"If-None-Match": audio.headers["etag"]})
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_status_is_shared_through_job_directory(upstream, monkeypatch, tmp_path, client):
+    first = use_manager(monkeypatch, tmp_path)
+    job_id = (await submit(client)).json()["id"]
+    await wait_done(client, job_id)
+    await first.stop()
+
+    # 같은 작업 디렉토리를 쓰는 다른 워커도 상태를 조회
+    other = use_manager(monkeypatch, tmp_path)
+    assert (await other.get(job_id)).status == "done"
+    response = await client.get(f"{PREFIX}/jobs/{job_id}")
+    assert response.status_code == 200 and response.json()["status"] == "done"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("job_id", ["0123456789abcdef01234567", "../../etc/passwd"])
+async def test_unknown_job_returns_404(upstream, monkeypatch, tmp_path, client, job_id):
+    use_manager(monkeypatch, tmp_path)
+    assert (await client.get(f"{PREFIX}/jobs/{job_id}")).status_code == 404
+    assert (await client.get(f"{PREFIX}/jobs/{job_id}/audio")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected(upstream, monkeypatch, tmp_path, client):
+    # 워커가 없어 큐에서 꺼내지 않음
+    manager = use_manager(monkeypatch, tmp_path, workers=0, queue_size=1)
+    assert (await submit(client)).status_code == 202
+    response = await submit(client)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    snapshot = manager.snapshot()
+    assert snapshot["submitted"] == 1 and snapshot["rejected"] == 1 and snapshot["queued"] == 1
+    # 거절된 작업은 기록을 남기지 않음
+    assert len(list((tmp_path / "jobs").iterdir())) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "callback_url",
+    [
+        "http://evil.example.com/done",
+        "http://169.254.169.254/latest/meta-data",
+        "ftp://hooks.example.com/done",
+        "http://hooks.example.com.evil.com/done",
+    ],
+)
+async def test_callback_outside_allowlist_is_rejected(upstream, monkeypatch, tmp_path, client, callback_url):
+    manager = use_manager(monkeypatch, tmp_path)
+    response = await submit(client, callback_url=callback_url)
+    assert response.status_code == 400
+    assert manager.snapshot()["submitted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_callback_to_allowed_host_is_posted(upstream, monkeypatch, tmp_path, client):
+    manager = use_manager(monkeypatch, tmp_path)
+    notified = asyncio.Event()
+    posted = []
+
+    async def notify(job) -> None:
+        posted.append((job.callback_url, job.status))
+        notified.set()
+
+    monkeypatch.setattr(manager, "_notify", notify)
+    response = await submit(client, callback_url="https://hooks.example.com/done")
+    assert response.status_code == 202
+    await asyncio.wait_for(notified.wait(), 2)
+    assert posted == [("https://hooks.example.com/done", "done")]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_audio_returns_409(upstream, monkeypatch, tmp_path, client):
+    use_manager(monkeypatch, tmp_path)
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("upstream 오류")
+        yield
+
+    monkeypatch.setattr(TTSService, "_upstream_chunks", lambda self, *args: broken())
+    job_id = (await submit(client)).json()["id"]
+    assert (await wait_done(client, job_id))["status"] == "failed"
+    response = await client.get(f"{PREFIX}/jobs/{job_id}/audio")
+    assert response.status_code == 409
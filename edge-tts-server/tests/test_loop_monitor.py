@@ -0,0 +1,169 @@
+"""이벤트 루프 진단 테스트 (멈춤 스택, wall/on-CPU 시간, 스택 표본 프로파일, 관리자 token)"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import diagnostics
+from app.services.loop_monitor import (
+    BlockingDetector,
+    RequestTimer,
+    collapse_stacks,
+    sample_stacks,
+)
+
+GATEWAY_DIR = Path(__file__).resolve().parents[2] / "mcp-gateway"
+
+
+def busy(seconds: float) -> None:
+    """루프 스레드를 붙잡는 동기 작업"""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+@pytest.mark.skipif(not (GATEWAY_DIR / "loop_monitor.py").exists(), reason="mcp-gateway 소스가 없음")
+def test_gateway_copy_is_identical():
+    server_copy = Path(__file__).resolve().parents[1] / "app" / "services" / "loop_monitor.py"
+    assert (GATEWAY_DIR / "loop_monitor.py").read_bytes() == server_copy.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_blocking_detector_captures_stack():
+    detector = BlockingDetector(threshold=0.05)
+    assert not detector.enabled and detector.stats()["blocked_count"] == 0
+
+    detector.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert detector.stats()["blocked_count"] == 0  # 유휴 루프는 멈춤이 아님
+        busy(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        detector.stop()
+    assert not detector.enabled
+
+    stats = detector.stats()
+    assert stats["blocked_count"] == 1
+    event = stats["recent"][0]
+    assert event["blocked_ms"] >= 150
+    assert any(frame.startswith("busy (tests/test_loop_monitor.py:") for frame in event["stack"])
+    assert stats["top_sites"][0]["site"].startswith("busy ")
+
+
+@pytest.mark.asyncio
+async def test_request_timer_separates_waiting_from_cpu():
+    timer = RequestTimer()
+    loop = asyncio.get_running_loop()
+    factory = loop.get_task_factory()
+
+    async def stream_body() -> None:
+        busy(0.05)
+
+    async def handler() -> str:
+        await asyncio.sleep(0.1)  # upstream 을 기다리는 시간
+        busy(0.05)
+        # 하위 태스크에서 쓴 CPU 도 같은 요청으로 집계
+        await asyncio.create_task(stream_body())
+        return "ok"
+
+    timer.start()
+    try:
+        assert await timer.measure(lambda: "GET /tts", handler()) == "ok"
+        # 요청 밖에서 만든 태스크는 집계하지 않음
+        await asyncio.create_task(stream_body())
+    finally:
+        timer.stop()
+    assert loop.get_task_factory() is factory
+
+    route = timer.stats()["routes"]["GET /tts"]
+    assert route["requests"] == 1
+    assert route["wall_ms_avg"] >= 190
+    assert 90 <= route["cpu_ms_avg"] < 150
+    assert route["cpu_ratio"] < 0.8
+
+
+@pytest.mark.asyncio
+async def test_request_timer_propagates_errors_and_cancellation():
+    timer = RequestTimer()
+
+    async def failing() -> None:
+        await asyncio.sleep(0)
+        raise ValueError("실패")
+
+    with pytest.raises(ValueError):
+        await timer.measure(lambda: "POST /fail", failing())
+
+    task = asyncio.ensure_future(timer.measure(lambda: "GET /slow", asyncio.sleep(10)))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert set(timer.stats()["routes"]) == {"POST /fail", "GET /slow"}
+
+
+def test_sample_stacks_collapsed_output():
+    stop = threading.Event()
+    ready = threading.Event()
+
+    def worker() -> None:
+        ready.set()
+        while not stop.is_set():
+            busy(0.001)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    ready.wait()
+    try:
+        samples = sample_stacks(thread.ident, 0.2, 0.005)
+    finally:
+        stop.set()
+        thread.join()
+
+    folded = collapse_stacks(samples)
+    lines = folded.splitlines()
+    assert lines and sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sum(samples.values())
+    assert all(";" in line.rsplit(" ", 1)[0] for line in lines)
+    assert any("worker (tests/test_loop_monitor.py)" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_debug_endpoints_require_admin_token(monkeypatch):
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        monkeypatch.setattr(settings, "admin_token", "")
+        assert (await client.get("/api/v1/debug/loop")).status_code == 404
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        assert (await client.get("/api/v1/debug/loop")).status_code == 401
+        headers = {"X-Admin-Token": "wrong"}
+        assert (await client.get("/api/v1/debug/profile", headers=headers)).status_code == 401
+
+        headers = {"X-Admin-Token": "secret"}
+        try:
+            response = await client.post(
+                "/api/v1/debug/loop", json={"request_timing": True}, headers=headers
+            )
+            assert response.status_code == 200
+            assert response.json()["request_timing"]["enabled"]
+            await client.get("/health")
+            routes = (await client.get("/api/v1/debug/loop", headers=headers)).json()
+            assert "GET /health" in routes["request_timing"]["routes"]
+        finally:
+            diagnostics.configure(request_timing=False)
+
+        response = await client.get(
+            "/api/v1/debug/profile", params={"seconds": 0.1}, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.text.strip()
+        too_long = {"seconds": settings.profile_max_seconds + 1}
+        response = await client.get("/api/v1/debug/profile", params=too_long, headers=headers)
+        assert response.status_code == 400
@@ -0,0 +1,202 @@
+"""메모리 오디오 캐시 테스트 (슬랩 할당, W-TinyLFU 들임/거절, 페이지 회수, 대여 중 해제 지연)"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from app.services.memory_cache import MemoryAudioCache, SlabArena
+
+PAGE = 16384
+
+
+def key(name) -> str:
+    return hashlib.sha256(str(name).encode()).hexdigest()
+
+
+def clip(name, size: int) -> bytes:
+    return (hashlib.sha256(str(name).encode()).digest() * (size // 32 + 1))[:size]
+
+
+def put(cache: MemoryAudioCache, name, size: int) -> bool:
+    return cache.put(key(name), [clip(name, size)], size)
+
+
+def read(cache: MemoryAudioCache, name) -> bytes:
+    lease = cache.lease(key(name))
+    assert lease is not None
+    try:
+        return bytes(lease.view)
+    finally:
+        lease.release()
+
+
+def test_arena_allocate_and_free():
+    arena = SlabArena(4 * PAGE, PAGE)
+    assert arena.classes[0] == 4096 and arena.classes[-1] == PAGE
+    assert arena.class_of(1) == 0
+    assert arena.class_of(4097) == 1
+    assert arena.class_of(PAGE + 1) is None
+
+    # 4096 칸 4개가 한 페이지를 채움
+    offsets = [arena.allocate(0) for _ in range(4)]
+    assert sorted(offsets) == [0, 4096, 8192, 12288]
+    assert arena.free_pages == 3
+    arena.free(offsets[1])
+    assert arena.allocate(0) == offsets[1]
+
+    # 남은 페이지를 다른 등급이 모두 쓰면 더 잡을 수 없음
+    pages = [arena.allocate(len(arena.classes) - 1) for _ in range(3)]
+    assert None not in pages and arena.free_pages == 0
+    assert arena.allocate(len(arena.classes) - 1) is None
+    assert arena.allocate(1) is None
+
+    # 페이지의 칸이 모두 돌아오면 페이지를 다른 등급이 다시 씀
+    for offset in offsets:
+        arena.free(offset)
+    assert arena.free_pages == 1
+    assert arena.allocate(1) == 0
+
+
+def test_put_and_lease_round_trip():
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+    assert put(cache, "a", 5000)
+    assert cache.contains(key("a"))
+    assert read(cache, "a") == clip("a", 5000)
+    assert cache.lease(key("missing")) is None
+
+    # 페이지보다 큰 클립은 들이지 않음
+    assert not put(cache, "big", PAGE + 1)
+    assert cache.snapshot()["rejected_size"] == 1
+    assert cache.snapshot()["pinned"] == 0
+
+
+def test_cold_candidate_is_rejected_when_full():
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+    for i in range(16):
+        assert put(cache, i, 4000)
+    # 모든 클립을 한 번씩 쓰면 한 번도 조회되지 않은 새 클립은 어느 것도 밀어내지 못함
+    for i in range(16):
+        read(cache, i)
+    assert not put(cache, "cold", 4000)
+    assert cache.snapshot()["rejected_frequency"] == 1
+    assert all(cache.contains(key(i)) for i in range(16))
+
+    # 더 자주 찾은 클립은 덜 쓰인 클립을 밀어내고 들어감
+    for _ in range(2):
+        assert cache.lease(key("hot")) is None
+    assert put(cache, "hot", 4000)
+    assert read(cache, "hot") == clip("hot", 4000)
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_page_reclaim_for_larger_size_class():
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+    for i in range(16):
+        assert put(cache, i, 4000)
+    assert cache.arena.free_pages == 0
+
+    # 다른 등급 칸이 없으므로 덜 쓰인 페이지 하나를 통째로 비워 넘겨받음
+    for _ in range(2):
+        cache.lease(key("page"))
+    assert put(cache, "page", PAGE)
+    snapshot = cache.snapshot()
+    assert snapshot["page_reclaims"] == 1
+    assert snapshot["evictions"] == 4
+    assert snapshot["entries"] == 13
+    assert read(cache, "page") == clip("page", PAGE)
+
+
+def test_leased_clip_is_freed_after_release():
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+    assert put(cache, "leased", 16000)
+    lease = cache.lease(key("leased"))
+    assert lease is not None
+
+    # 대여 중인 클립이 주 영역에서 밀려나도 칸은 대여가 끝날 때까지 그대로
+    put(cache, "b", 5000)
+    cache.lease(key("hot"))
+    put(cache, "c", 6000)
+    cache.lease(key("hot"))
+    put(cache, "d", 6000)
+    put(cache, "hot", 16000)
+    put(cache, "e", 5000)
+    snapshot = cache.snapshot()
+    assert snapshot["deferred_frees"] == 1
+    assert snapshot["pinned"] == 1
+    assert not cache.contains(key("leased"))
+    assert bytes(lease.view) == clip("leased", 16000)
+    free_pages = cache.arena.free_pages
+
+    lease.release()
+    assert cache.snapshot()["pinned"] == 0
+    assert cache.arena.free_pages == free_pages + 1
+    lease.release()  # 두 번 불러도 한 번만 돌려줌
+    assert cache.snapshot()["pinned"] == 0
+
+
+def test_disabled_cache_passes_through():
+    cache = MemoryAudioCache(0, 4096, enabled=False)
+    assert not cache.enabled
+    assert cache.lease(key("a")) is None
+    assert not cache.put(key("a"), [b"x"], 1)
+    assert cache.snapshot() == {"enabled": False}
+
+
+@pytest.mark.asyncio
+async def test_fill_stores_only_complete_streams():
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+
+    async def source(*chunks):
+        for chunk in chunks:
+            yield chunk
+
+    out = [chunk async for chunk in cache.fill(key("a"), source(b"ab", b"cd"))]
+    assert out == [b"ab", b"cd"]
+    assert read(cache, "a") == b"abcd"
+
+    big = [b"x" * PAGE, b"y"]
+    assert [chunk async for chunk in cache.fill(key("big"), source(*big))] == big
+    assert not cache.contains(key("big"))
+
+
+@pytest.mark.asyncio
+async def test_service_hit_lends_the_arena_slice(monkeypatch):
+    from app.services import tts_service
+    from app.services.tts_service import TTSService
+
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+    monkeypatch.setattr(tts_service, "memory_cache", cache)
+    assert put(cache, "a", 5000)
+
+    source = TTSService()._cached(key("a"), None)
+    chunk = await source.__anext__()
+    # 복사 없이 arena 조각을 내보내고, 다음 청크를 요청할 때까지 대여
+    assert isinstance(chunk, memoryview) and chunk.obj is cache.arena._buffer
+    assert bytes(chunk) == clip("a", 5000)
+    assert cache.snapshot()["pinned"] == 1
+    with pytest.raises(StopAsyncIteration):
+        await source.__anext__()
+    assert cache.snapshot()["pinned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_keeps_lease_until_chunk_is_sent(monkeypatch):
+    from app.services import tts_service
+    from app.services.streaming import BufferedAudioStream
+    from app.services.tts_service import TTSService
+
+    cache = MemoryAudioCache(4 * PAGE, PAGE)
+    monkeypatch.setattr(tts_service, "memory_cache", cache)
+    assert put(cache, "a", 5000)
+
+    iterator = BufferedAudioStream(TTSService()._cached(key("a"), None), "test").__aiter__()
+    chunk = await iterator.__anext__()
+    assert isinstance(chunk, memoryview)
+    # 응답이 청크를 보내는 동안(다음 쓰기를 요청하기 전) 읽기 태스크는 대여를 놓지 않음
+    await asyncio.sleep(0.01)
+    assert cache.snapshot()["pinned"] == 1
+    assert bytes(chunk) == clip("a", 5000)
+    with pytest.raises(StopAsyncIteration):
+        await iterator.__anext__()
+    assert cache.snapshot()["pinned"] == 0
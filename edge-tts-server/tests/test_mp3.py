@@ -0,0 +1,189 @@
+"""MP3 프레임 처리와 트랙 조립 테스트 (프레임 수와 재생 시간으로 확인)"""
+
+import asyncio
+
+import pytest
+from hypothesis import given, settings as hypothesis_settings
+from hypothesis import strategies as st
+
+from app.services.mp3 import (
+    Mp3FormatError,
+    iter_frames,
+    parse_clip,
+    parse_header,
+    silence_frames,
+    silent_frame,
+)
+from app.services.tracks import join_clips
+from app.services.tts_service import TTSService
+
+# edge-tts mp3-48k 와 같은 형식: MPEG-2 Layer III, 48 kbps, 24 kHz, mono, CRC 없음
+HEADER = bytes((0xFF, 0xF3, 0x64, 0xC4))
+PADDED_HEADER = bytes((0xFF, 0xF3, 0x66, 0xC4))
+# mp3-32k 형식: 32 kbps, 16 kHz
+HEADER_16K = bytes((0xFF, 0xF3, 0x48, 0xC4))
+FRAME_SECONDS = 576 / 24000
+
+
+def frame(header: bytes = HEADER, seed: int = 0) -> bytes:
+    length = parse_header(header).length
+    # 0xFF 가 나오지 않는 임의의 오디오 데이터
+    return header + bytes((seed + i * 7) % 251 for i in range(length - 4))
+
+
+def clip(frames: int, header: bytes = HEADER, tags: bool = True) -> bytes:
+    audio = b"".join(frame(header, seed=i) for i in range(frames))
+    if not tags:
+        return audio
+    id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x14" + bytes(20)
+    info = header + bytes(9) + b"Info" + bytes(parse_header(header).length - 17)
+    id3v1 = b"TAG" + b"title".ljust(125, b"\x00")
+    return id3v2 + info + audio + id3v1
+
+
+async def collect(source) -> bytes:
+    return b"".join([bytes(chunk) async for chunk in source])
+
+
+async def aiter_list(items):
+    for item in items:
+        yield item
+
+
+def join(clips, gap: float) -> bytes:
+    return asyncio.run(collect(join_clips(aiter_list(clips), gap)))
+
+
+def test_parse_header():
+    header = parse_header(HEADER)
+    assert (header.version, header.layer, header.bitrate, header.sample_rate) == ("2", 3, 48000, 24000)
+    assert header.mono and not header.protected and not header.padding
+    assert header.samples == 576 and header.length == 144
+    assert header.duration == pytest.approx(FRAME_SECONDS)
+    assert parse_header(PADDED_HEADER).length == 145
+    assert parse_header(HEADER_16K).length == 144
+    assert parse_header(HEADER_16K).duration == pytest.approx(0.036)
+    assert parse_header(b"TAG\x00") is None
+    assert parse_header(bytes((0xFF, 0xF3, 0xF4, 0xC4))) is None  # 비트레이트 인덱스 15
+
+
+def test_clip_strips_tags_and_info_frame():
+    data = clip(25)
+    parsed = parse_clip(data)
+    assert parsed.frames == 25
+    assert parsed.audio_bytes == 25 * 144
+    assert parsed.duration == pytest.approx(25 * FRAME_SECONDS)
+    assert len(parsed.segments) == 1
+    audio = b"".join(bytes(chunk) for chunk in parsed.chunks())
+    assert audio == clip(25, tags=False)
+
+
+def test_resync_skips_garbage_between_frames():
+    data = clip(3, tags=False) + b"\xff\x00garbage\xff" + frame(PADDED_HEADER) + clip(2, tags=False)
+    parsed = parse_clip(data)
+    assert parsed.frames == 6
+    assert len(parsed.segments) == 2
+    assert [header.padding for _, header in iter_frames(data)] == [False] * 3 + [True] + [False] * 2
+
+
+def test_truncated_last_frame_is_dropped():
+    data = clip(4, tags=False)
+    assert parse_clip(data[:-10]).frames == 3
+
+
+def test_silent_frame_matches_format():
+    template = parse_header(PADDED_HEADER)
+    silent = silent_frame(template)
+    header = parse_header(silent)
+    assert header.compatible(template) and not header.padding
+    assert len(silent) == header.length == 144
+    assert not any(silent[4:])
+    assert silence_frames(template, 0.3) == 13
+    assert silence_frames(template, 0) == 0
+
+
+def test_join_inserts_gaps_between_lines():
+    gap = 10 * FRAME_SECONDS
+    data = join([None, clip(10), clip(5), None, clip(3), None], gap)
+    parsed = parse_clip(data)
+    # 앞뒤 빈 줄은 무시, 줄 사이 간격 1번 + 빈 줄이 있는 곳은 2번
+    assert parsed.frames == 18 + 10 + 20
+    assert parsed.duration == pytest.approx(48 * FRAME_SECONDS)
+    assert parsed.segments == ((0, len(data)),)
+    assert data.startswith(clip(10, tags=False))
+    assert data.endswith(clip(3, tags=False))
+
+
+def test_join_skips_clips_without_audio():
+    data = join([clip(4), b"", clip(0), clip(2)], 0)
+    assert parse_clip(data).frames == 6
+
+
+def test_join_rejects_mixed_formats():
+    with pytest.raises(Mp3FormatError):
+        join([clip(2), clip(2, header=HEADER_16K)], 0.1)
+
+
+@hypothesis_settings(deadline=None, max_examples=50)
+@given(
+    st.lists(st.one_of(st.none(), st.integers(0, 12)), max_size=8),
+    st.integers(0, 2000),
+)
+def test_join_frame_count_and_duration(lines, gap_ms):
+    clips = [None if frames is None else clip(frames) for frames in lines]
+    data = join(clips, gap_ms / 1000)
+
+    # 오디오가 있는 줄 사이마다 (사이의 빈 줄 수 + 1) 번의 간격
+    audio_frames = sum(frames for frames in lines if frames)
+    gap_frames = int(gap_ms / 1000 / FRAME_SECONDS + 0.5)
+    gaps = 0
+    seen_audio = False
+    blank = 0
+    for frames in lines:
+        if not frames:
+            blank += frames is None
+            continue
+        if seen_audio:
+            gaps += blank + 1
+        seen_audio = True
+        blank = 0
+
+    parsed = parse_clip(data)
+    assert parsed.frames == audio_frames + gaps * gap_frames
+    assert parsed.duration == pytest.approx(parsed.frames * FRAME_SECONDS)
+    assert len(data) == parsed.frames * 144
+
+
+@pytest.fixture
+def upstream(monkeypatch, isolated_caches):
+    """줄 길이만큼 프레임을 만드는 가짜 upstream. 프레임 경계와 무관하게 잘라 보냅니다."""
+    calls = []
+
+    async def fake(self, text, *args):
+        calls.append(text)
+        data = clip(len(text), tags=False)
+        for start in range(0, len(data), 100):
+            await asyncio.sleep(0)
+            yield {"type": "audio", "data": data[start:start + 100]}
+
+    monkeypatch.setattr(TTSService, "_upstream_chunks", fake)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_track_is_assembled_from_cached_clips(upstream):
+    service = TTSService()
+    # 한 줄은 미리 합성해 캐시에 둠
+    await collect(service.synthesize_text("둘째 줄", "ko-KR-SunHiNeural"))
+    assert upstream == ["둘째 줄"]
+
+    lines = ["첫 줄", "둘째 줄", "", "셋째 줄입니다"]
+    data = await collect(service.synthesize_track(lines, "ko-KR-SunHiNeural", gap_ms=240))
+    assert upstream == ["둘째 줄", "첫 줄", "셋째 줄입니다"]
+    parsed = parse_clip(data)
+    assert parsed.frames == (3 + 4 + 7) + 10 + 20
+    assert parsed.duration == pytest.approx(parsed.frames * FRAME_SECONDS)
+
+    # 조립한 트랙은 캐시에서 그대로 내보냄
+    assert await collect(service.synthesize_track(lines, "ko-KR-SunHiNeural", gap_ms=240)) == data
+    assert len(upstream) == 3
@@ -0,0 +1,179 @@
+"""백프레셔 스트리밍 단계 테스트 (watermark 멈춤/재개, stall timeout, 청크 합치기, 정리)"""
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from app.services import streaming
+from app.services.disconnect import DisconnectMetrics
+from app.services.streaming import BufferedAudioStream, StreamingMetrics, StreamStalledError
+
+
+class FakeProducer:
+    """테스트가 넣어 준 청크를 내보내는 가짜 upstream. 몇 개를 가져갔는지, 닫혔는지 기록합니다."""
+
+    def __init__(self, chunks: Optional[List[bytes]] = None) -> None:
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        for chunk in chunks or []:
+            self.queue.put_nowait(chunk)
+        self.pulled = 0
+        self.closed = False
+
+    def feed(self, *chunks: Optional[bytes]) -> None:
+        for chunk in chunks:
+            self.queue.put_nowait(chunk)
+
+    async def __aiter__(self):
+        try:
+            while True:
+                chunk = await self.queue.get()
+                if chunk is None:
+                    return
+                self.pulled += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def metrics(monkeypatch) -> StreamingMetrics:
+    fresh = StreamingMetrics()
+    monkeypatch.setattr(streaming, "streaming_metrics", fresh)
+    monkeypatch.setattr(streaming, "disconnect_metrics", DisconnectMetrics())
+    return fresh
+
+
+def open_stream(producer: FakeProducer, **kwargs) -> BufferedAudioStream:
+    options = {
+        "high_watermark": 300,
+        "low_watermark": 100,
+        "stall_timeout": 5.0,
+        "coalesce_bytes": 100,
+        "coalesce_wait": 0,
+        **kwargs,
+    }
+    return BufferedAudioStream(producer.__aiter__(), "test", **options)
+
+
+async def settle() -> None:
+    """읽기 태스크가 막힐 때까지 이벤트 루프를 몇 바퀴 돌립니다."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_pauses_at_high_watermark_and_resumes_at_low(metrics):
+    producer = FakeProducer([b"a" * 100] * 10)
+    stream = open_stream(producer, high_watermark=400)
+    iterator = stream.__aiter__()
+
+    assert await iterator.__anext__() == b"a" * 100
+    await settle()
+    # 400 바이트가 쌓이면 멈춤 (첫 쓰기 100 바이트를 내보낸 뒤 300 바이트 남음)
+    assert producer.pulled == 4
+    assert stream.stats.paused and stream.stats.buffered_bytes == 300
+    assert metrics.snapshot()["paused_streams"] == 1
+
+    # low watermark 보다 많이 남아 있는 동안은 멈춘 채로
+    await iterator.__anext__()
+    await settle()
+    assert producer.pulled == 4 and stream.stats.paused
+
+    # low watermark(100) 까지 비우면 다시 읽어 high watermark 까지 채움
+    await iterator.__anext__()
+    await settle()
+    assert producer.pulled == 7
+    assert stream.stats.pauses == 2 and stream.stats.peak_buffered_bytes == 400
+
+    producer.feed(None)
+    rest = [chunk async for chunk in iterator]
+    assert len(rest) == 7 and producer.pulled == 10
+    assert metrics.snapshot()["streams_completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stall_timeout_stops_the_stream(metrics):
+    producer = FakeProducer([b"a" * 100] * 10)
+    iterator = open_stream(producer, stall_timeout=0.05).__aiter__()
+    await iterator.__anext__()
+
+    # 클라이언트가 읽지 않아 멈춘 채로 stall timeout 이 지남
+    await asyncio.sleep(0.1)
+    assert producer.closed
+    with pytest.raises(StreamStalledError):
+        await iterator.__anext__()
+    snapshot = metrics.snapshot()
+    assert snapshot["streams_stalled"] == 1 and snapshot["active_streams"] == 0
+
+
+@pytest.mark.asyncio
+async def test_small_chunks_are_coalesced_up_to_target():
+    producer = FakeProducer([b"a" * 10])
+    stream = open_stream(producer, coalesce_bytes=30, coalesce_wait=5.0)
+    iterator = stream.__aiter__()
+
+    # 첫 청크는 기다리지 않고 바로 보냄
+    assert await iterator.__anext__() == b"a" * 10
+
+    pending = asyncio.ensure_future(iterator.__anext__())
+    for part in (b"b" * 10, b"c" * 10):
+        producer.feed(part)
+        await settle()
+        assert not pending.done()
+    producer.feed(b"d" * 10)
+    assert await asyncio.wait_for(pending, 1) == b"b" * 10 + b"c" * 10 + b"d" * 10
+    assert stream.stats.writes_out == 2 and stream.stats.chunks_in == 4
+    producer.feed(None)
+    assert [chunk async for chunk in iterator] == []
+
+
+@pytest.mark.asyncio
+async def test_coalescing_waits_at_most_coalesce_wait():
+    # 첫 청크는 바로 보냄
+    producer = FakeProducer([b"a" * 10, None])
+    iterator = open_stream(producer, coalesce_bytes=1000, coalesce_wait=0.02).__aiter__()
+    assert await iterator.__anext__() == b"a" * 10
+
+    producer = FakeProducer([b"a" * 10])
+    iterator = open_stream(producer, coalesce_bytes=1000, coalesce_wait=0.02).__aiter__()
+    await iterator.__anext__()
+    producer.feed(b"b" * 10)
+    # 목표 크기에 못 미쳐도 coalesce_wait 뒤에는 모인 만큼 보냄
+    assert await asyncio.wait_for(iterator.__anext__(), 1) == b"b" * 10
+    await iterator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_closing_the_response_cleans_up(metrics):
+    producer = FakeProducer([b"a" * 100] * 5)
+    stream = open_stream(producer)
+    iterator = stream.__aiter__()
+    await iterator.__anext__()
+    await settle()
+    assert stream.stats.paused
+
+    # 서버가 응답을 닫음 (클라이언트가 떠남): 읽기 태스크를 취소하고 버퍼를 비움
+    await iterator.aclose()
+    assert producer.closed
+    assert stream._producer.done()
+    assert not stream._chunks and stream.stats.buffered_bytes == 0
+    snapshot = metrics.snapshot()
+    assert snapshot["active_streams"] == 0 and snapshot["streams_cancelled"] == 1
+    # 합성 중이 아니었으므로 upstream 회수 없이 닫기만 함
+    disconnect = streaming.disconnect_metrics.snapshot()
+    assert disconnect["abandoned_streams"] == 1
+    assert disconnect["reclaimed_upstream_sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_producer_error_is_raised_to_the_consumer(metrics):
+    async def failing():
+        yield b"a" * 10
+        raise RuntimeError("upstream 오류")
+
+    iterator = BufferedAudioStream(failing(), "test", coalesce_wait=0).__aiter__()
+    with pytest.raises(RuntimeError):
+        async for _ in iterator:
+            pass
+    assert metrics.snapshot()["streams_cancelled"] == 1
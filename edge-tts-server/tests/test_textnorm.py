@@ -0,0 +1,158 @@
+"""텍스트 정규화 속성 테스트 (게이트웨이와 TTS 서버 공용 textnorm)"""
+
+import sys
+import unicodedata
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from app.services.textnorm import (
+    canonical_hash,
+    normalize_prosody,
+    normalize_romanize_text,
+    normalize_text,
+    normalize_tts_text,
+)
+from app.services.tts_service import synthesis_cache_key
+
+GATEWAY_DIR = Path(__file__).resolve().parents[2] / "mcp-gateway"
+if GATEWAY_DIR.is_dir():
+    sys.path.insert(0, str(GATEWAY_DIR))
+
+needs_gateway = pytest.mark.skipif(
+    not (GATEWAY_DIR / "romanizer.py").exists(), reason="mcp-gateway 소스가 없음"
+)
+
+hangul = st.characters(min_codepoint=0xAC00, max_codepoint=0xD7A3)
+compat_jamo = st.characters(min_codepoint=0x3131, max_codepoint=0x3163)
+printable_ascii = st.characters(min_codepoint=0x20, max_codepoint=0x7E)
+
+# 가사처럼 보이는 텍스트 (완성형 한글, 호환 자모, ASCII, 탭, LF / CRLF 줄바꿈)
+lyrics = st.lists(
+    st.one_of(hangul, compat_jamo, printable_ascii, st.sampled_from(["\t", "\n", "\r\n"])),
+    max_size=60,
+).map("".join)
+
+# 이미 정규형인 텍스트 (줄 끝 공백 없음, CR 없음)
+canonical_line = st.text(st.one_of(hangul, compat_jamo, printable_ascii), max_size=20).map(
+    lambda line: line.rstrip(" ")
+)
+canonical_lyrics = st.lists(canonical_line, max_size=6).map("\n".join)
+
+prosody = st.builds(
+    lambda sign, zeros, amount, unit: f"{sign}{'0' * zeros}{amount}{unit}",
+    st.sampled_from(["", "+", "-"]),
+    st.integers(0, 2),
+    st.integers(0, 200),
+    st.sampled_from(["%", "Hz"]),
+)
+
+
+def to_fullwidth(text: str) -> str:
+    return "".join(chr(ord(ch) + 0xFEE0) if "!" <= ch <= "~" else ch for ch in text)
+
+
+def cosmetic_variant(text: str, data: st.DataObject) -> str:
+    """정규형이 같아야 하는 사소한 변형을 무작위로 적용합니다."""
+    text = text.replace("\r\n", "\n")
+    if data.draw(st.booleans(), label="nfd"):
+        text = unicodedata.normalize("NFD", text)
+    if data.draw(st.booleans(), label="fullwidth"):
+        text = to_fullwidth(text)
+    if data.draw(st.booleans(), label="trailing spaces"):
+        text = "\n".join(line + data.draw(st.sampled_from([" ", "\t", "\u3000"])) for line in text.split("\n"))
+    if data.draw(st.booleans(), label="crlf"):
+        text = text.replace("\n", "\r\n")
+    if data.draw(st.booleans(), label="bom"):
+        text = "\ufeff" + text
+    return text
+
+
+@given(st.text())
+def test_normalize_is_idempotent(text):
+    once = normalize_text(text)
+    assert normalize_text(once) == once
+    assert normalize_tts_text(normalize_tts_text(text)) == normalize_tts_text(text)
+    assert "\r" not in once and "\ufeff" not in once
+    assert unicodedata.is_normalized("NFC", once)
+
+
+@given(prosody)
+def test_prosody_is_idempotent_and_signed(value):
+    canonical = normalize_prosody(value)
+    assert normalize_prosody(canonical) == canonical
+    assert canonical[0] in "+-"
+    assert int(canonical.rstrip("%Hz")) == (-1 if value.startswith("-") else 1) * int(value.strip("+-%Hz"))
+    assert normalize_prosody("0%") == normalize_prosody("-00%") == "+0%"
+
+
+@given(lyrics, st.data())
+def test_cosmetic_variants_share_cache_key(text, data):
+    variant = cosmetic_variant(text, data)
+    assert normalize_text(variant) == normalize_text(text)
+    assert synthesis_cache_key(variant, "ko-KR-SunHiNeural", "0%", "+0%", "0Hz") == (
+        synthesis_cache_key(text, "ko-KR-SunHiNeural", "+0%", "+00%", "+0Hz")
+    )
+
+
+@given(canonical_lyrics)
+def test_canonical_text_reaches_upstream_unchanged(text):
+    # 합성 요청에는 예전과 같은 텍스트(앞뒤 공백만 제거)가 그대로 전달되므로 오디오가 같음
+    assert normalize_tts_text(text) == text.strip()
+    assert synthesis_cache_key(text, "ko-KR-SunHiNeural", "+0%", "+0%", "+0Hz") == canonical_hash(
+        text.strip(), "ko-KR-SunHiNeural", "+0%", "+0%", "+0Hz", "mp3-48k"
+    )
+
+
+@needs_gateway
+@given(st.text().filter(lambda text: "\r" not in text and unicodedata.is_normalized("NFC", text)))
+def test_romanize_single_output_is_unchanged_by_normalization(text):
+    # romanize_single 은 입력을 통째로 변환하므로 공백, 탭, 전각 문자, BOM 까지 결과에 남음
+    from romanizer import korean_to_roman
+
+    assert normalize_romanize_text(text) == text
+    assert korean_to_roman(normalize_romanize_text(text)) == korean_to_roman(text)
+
+
+@needs_gateway
+@given(lyrics)
+def test_romanize_normalization_only_rewrites_line_endings(text):
+    from romanizer import korean_to_roman
+
+    assert korean_to_roman(normalize_romanize_text(text)) == korean_to_roman(text).replace("\r\n", "\n")
+
+
+@needs_gateway
+@given(lyrics)
+def test_decomposed_hangul_romanizes_like_the_original(text):
+    from romanizer import korean_to_roman
+
+    nfd = unicodedata.normalize("NFD", text)
+    assert korean_to_roman(normalize_romanize_text(nfd)) == korean_to_roman(normalize_romanize_text(text))
+
+
+@needs_gateway
+@pytest.mark.parametrize(
+    "text, expected", [("  가  ", "  ka  "), ("가\t", "ka\t"), ("\uff21가", "\uff21ka"), ("\ufeff가", "\ufeffka")]
+)
+def test_romanize_single_keeps_whitespace_and_width(text, expected):
+    from romanizer import korean_to_roman
+
+    assert korean_to_roman(normalize_romanize_text(text)) == expected
+
+
+@needs_gateway
+def test_decomposed_hangul_is_romanized_after_normalization():
+    from romanizer import korean_to_roman
+
+    nfd = unicodedata.normalize("NFD", "안녕하세요")
+    assert korean_to_roman(nfd) == nfd  # 정규화 전에는 자모가 그대로 통과
+    assert korean_to_roman(normalize_romanize_text(nfd)) == korean_to_roman("안녕하세요")
+
+
+@needs_gateway
+def test_gateway_copy_is_identical():
+    server_copy = Path(__file__).resolve().parents[1] / "app" / "services" / "textnorm.py"
+    assert (GATEWAY_DIR / "textnorm.py").read_bytes() == server_copy.read_bytes()
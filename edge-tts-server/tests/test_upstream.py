@@ -0,0 +1,63 @@
+"""upstream 세션 풀 테스트 (연결 실패 시 Communicate 대체)"""
+
+import socket
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+import pytest_asyncio
+
+from app.services import backends
+from app.services.audio_formats import DEFAULT_FORMAT
+from app.services.backends import EdgeBackend
+from app.services.upstream import UpstreamSessionError, UpstreamSessionPool, static_endpoint
+
+VOICE = "ko-KR-SunHiNeural"
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def offline_pool():
+    url = f"ws://127.0.0.1:{closed_port()}/"
+    pool = UpstreamSessionPool(lambda: static_endpoint(url), size=0, connect_timeout=2)
+    await pool.start()
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_raises_session_error(offline_pool):
+    with pytest.raises(UpstreamSessionError):
+        async for _ in offline_pool.synthesize("안녕하세요", VOICE, "+0%", "+0%", "+0Hz", DEFAULT_FORMAT.edge_format):
+            pass
+    snapshot = offline_pool.snapshot()
+    assert snapshot["connect_failures"] == 1
+    assert snapshot["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_edge_backend_falls_back_when_pool_cannot_connect(offline_pool, monkeypatch):
+    calls: List[Dict[str, Any]] = []
+
+    class FakeCommunicate:
+        def __init__(self, **kwargs: Any) -> None:
+            calls.append(kwargs)
+
+        async def stream(self):
+            yield {"type": "audio", "data": b"\xff\xf3"}
+
+    async def fake_module():
+        return SimpleNamespace(Communicate=FakeCommunicate)
+
+    monkeypatch.setattr(backends, "upstream_pool", offline_pool)
+    monkeypatch.setattr(backends, "edge_tts_module", fake_module)
+    chunks = [chunk async for chunk in EdgeBackend().synthesize(
+        "안녕하세요", VOICE, "+0%", "+0%", "+0Hz", DEFAULT_FORMAT
+    )]
+    assert chunks == [{"type": "audio", "data": b"\xff\xf3"}]
+    assert len(calls) == 1
@@ -0,0 +1,154 @@
+"""
+오프라인 edge-tts 대역
+
+``edge_tts.Communicate`` / ``edge_tts.list_voices`` 와 같은 인터페이스로, 네트워크 없이
+설정한 첫 바이트 지연과 비트레이트로 MP3(MPEG-2 Layer III, 24kHz mono) 프레임을 내보냅니다.
+
+환경 변수:
+    FAKE_TTS_FIRST_BYTE_MS   첫 오디오 청크까지의 지연 (기본 150)
+    FAKE_TTS_BITRATE_KBPS    출력 비트레이트 (기본 48, edge-tts 기본값과 동일)
+    FAKE_TTS_MS_PER_CHAR     글자당 오디오 길이 (기본 150)
+    FAKE_TTS_REALTIME_FACTOR 오디오 1초를 만드는 데 걸리는 시간 비율 (기본 0.05, 0이면 즉시)
+    FAKE_TTS_CHUNK_FRAMES    청크당 MP3 프레임 수 (기본 8)
+    FAKE_TTS_COUNT_FILE      지정하면 합성 1건마다 1바이트를 덧붙임 (프로세스 간 upstream 호출 수 집계)
+"""
+
+import asyncio
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, List
+
+# MPEG-2 Layer III 비트레이트 테이블 (kbps, 인덱스 = 헤더 비트레이트 인덱스)
+_MPEG2_L3_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+_SAMPLE_RATE = 24000
+_SAMPLES_PER_FRAME = 576
+FRAME_DURATION_MS = _SAMPLES_PER_FRAME * 1000 / _SAMPLE_RATE  # 24ms
+
+
+@dataclass
+class FakeTTSConfig:
+    """대역 TTS 동작 설정"""
+
+    first_byte_ms: float = 150.0
+    bitrate_kbps: int = 48
+    ms_per_char: float = 150.0
+    realtime_factor: float = 0.05
+    chunk_frames: int = 8
+    count_file: str = ""
+
+    @classmethod
+    def from_env(cls) -> "FakeTTSConfig":
+        return cls(
+            first_byte_ms=float(os.getenv("FAKE_TTS_FIRST_BYTE_MS", cls.first_byte_ms)),
+            bitrate_kbps=int(os.getenv("FAKE_TTS_BITRATE_KBPS", cls.bitrate_kbps)),
+            ms_per_char=float(os.getenv("FAKE_TTS_MS_PER_CHAR", cls.ms_per_char)),
+            realtime_factor=float(
+                os.getenv("FAKE_TTS_REALTIME_FACTOR", cls.realtime_factor)
+            ),
+            chunk_frames=int(os.getenv("FAKE_TTS_CHUNK_FRAMES", cls.chunk_frames)),
+            count_file=os.getenv("FAKE_TTS_COUNT_FILE", cls.count_file),
+        )
+
+
+def silent_frame(bitrate_kbps: int) -> bytes:
+    """지정한 비트레이트에 가장 가까운 무음 MP3 프레임 하나를 만듭니다."""
+    index = min(
+        range(1, len(_MPEG2_L3_BITRATES)),
+        key=lambda i: abs(_MPEG2_L3_BITRATES[i] - bitrate_kbps),
+    )
+    bitrate = _MPEG2_L3_BITRATES[index]
+    # sync(11) + MPEG-2(10) + Layer III(01) + CRC 없음(1)
+    # 24kHz(01), 패딩 없음, mono(11)
+    header = bytes([0xFF, 0xF3, (index << 4) | (0b01 << 2), 0xC0])
+    frame_length = 72 * bitrate * 1000 // _SAMPLE_RATE
+    return header + b"\x00" * (frame_length - len(header))
+
+
+def _rate_factor(rate: str) -> float:
+    """prosody rate("+50%", "-20%")를 재생 속도 배율로 변환합니다."""
+    match = re.fullmatch(r"([+-]?\d+)%", rate.strip())
+    if not match:
+        return 1.0
+    return max(0.1, 1.0 + int(match.group(1)) / 100)
+
+
+class FakeCommunicate:
+    """``edge_tts.Communicate`` 대역"""
+
+    config = FakeTTSConfig()
+
+    def __init__(
+        self,
+        text: str,
+        voice: str = "ko-KR-SunHiNeural",
+        *,
+        rate: str = "+0%",
+        volume: str = "+0%",
+        pitch: str = "+0Hz",
+        **kwargs: Any,
+    ):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+
+    def audio_duration_ms(self) -> float:
+        chars = len(self.text.strip()) or 1
+        return chars * self.config.ms_per_char / _rate_factor(self.rate)
+
+    async def stream(self) -> AsyncGenerator[Dict[str, Any], None]:
+        config = self.config
+        if config.count_file:
+            fd = os.open(config.count_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, b".")
+            finally:
+                os.close(fd)
+        frame = silent_frame(config.bitrate_kbps)
+        frames = max(1, math.ceil(self.audio_duration_ms() / FRAME_DURATION_MS))
+        chunk_delay = (
+            config.chunk_frames * FRAME_DURATION_MS / 1000 * config.realtime_factor
+        )
+
+        await asyncio.sleep(config.first_byte_ms / 1000)
+        sent = 0
+        while sent < frames:
+            count = min(config.chunk_frames, frames - sent)
+            yield {"type": "audio", "data": frame * count}
+            sent += count
+            if sent < frames:
+                await asyncio.sleep(chunk_delay)
+
+
+_VOICES = [
+    ("ko-KR-SunHiNeural", "Female"),
+    ("ko-KR-InJoonNeural", "Male"),
+    ("ko-KR-HyunsuMultilingualNeural", "Male"),
+]
+
+
+async def fake_list_voices(*args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+    """``edge_tts.list_voices`` 대역"""
+    return [
+        {
+            "Name": name,
+            "ShortName": name,
+            "Gender": gender,
+            "Locale": "ko-KR",
+            "VoiceTag": {
+                "ContentCategories": ["General"],
+                "VoicePersonalities": ["Friendly"],
+            },
+        }
+        for name, gender in _VOICES
+    ]
+
+
+def install(config: FakeTTSConfig = None) -> None:
+    """현재 프로세스의 ``edge_tts`` 모듈을 대역으로 교체합니다."""
+    import edge_tts
+
+    FakeCommunicate.config = config or FakeTTSConfig.from_env()
+    edge_tts.Communicate = FakeCommunicate
+    edge_tts.list_voices = fake_list_voices
@@ -0,0 +1,107 @@
+"""
+romanize-service 대역
+
+Spring ``McpController`` 의 ``/mcp/jsonrpc`` 와 ``/mcp/health`` 를 흉내 내는 FastAPI 앱입니다.
+발음 규칙 없이 자모 테이블만으로 변환하며, 설정한 지연을 더해 응답합니다.
+``X-Deadline-Ms`` 헤더(남은 시간)가 있으면 Spring 쪽처럼 이미 늦은 요청은 바로 거절하고,
+지연이 남은 시간보다 길면 데드라인에서 작업을 멈추고 같은 오류로 응답합니다.
+
+환경 변수:
+    FAKE_ROMANIZE_LATENCY_MS   요청당 고정 지연 (기본 5)
+    FAKE_ROMANIZE_PER_LINE_MS  줄(romanize_batch 는 텍스트)당 추가 지연 (기본 0.2)
+
+사용법:
+    uvicorn fakes.fake_romanize:app --app-dir loadtest --port 8080
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, Optional, Union
+
+from fastapi import FastAPI, Header
+from pydantic import BaseModel
+
+LATENCY_MS = float(os.getenv("FAKE_ROMANIZE_LATENCY_MS", "5"))
+PER_LINE_MS = float(os.getenv("FAKE_ROMANIZE_PER_LINE_MS", "0.2"))
+
+_CHO = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_JUNG = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo",
+         "u", "wo", "we", "wi", "yu", "eu", "ui", "i"]
+_JONG = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "p", "l", "l", "p", "l",
+         "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+
+app = FastAPI(title="Fake Romanize Service")
+
+
+class McpRequest(BaseModel):
+    jsonrpc: str = "2.0"
+    id: Optional[Union[str, int]] = None
+    method: str
+    params: Optional[Dict[str, Any]] = None
+
+
+def romanize(text: str) -> str:
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code <= 11171:
+            result.append(_CHO[code // 588] + _JUNG[(code % 588) // 28] + _JONG[code % 28])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+@app.get("/mcp/health")
+async def health() -> str:
+    return "MCP Server is healthy"
+
+
+def deadline_error() -> Dict[str, Any]:
+    return {"code": -32001, "message": "Deadline exceeded", "data": None}
+
+
+@app.post("/mcp/jsonrpc")
+async def jsonrpc(
+    request: McpRequest, x_deadline_ms: Optional[str] = Header(default=None)
+) -> Dict[str, Any]:
+    response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request.id, "result": None, "error": None}
+    budget_ms = float(x_deadline_ms) if x_deadline_ms else None
+    if budget_ms is not None and budget_ms <= 0:
+        response["error"] = deadline_error()
+        return response
+
+    if request.method == "tools/list":
+        response["result"] = {"tools": [{"name": "romanize_single"}, {"name": "romanize_lyrics"},
+                                         {"name": "romanize_batch"}]}
+        return response
+    if request.method != "tools/call":
+        response["error"] = {"code": -32601, "message": "Method not found", "data": None}
+        return response
+
+    params = request.params or {}
+    arguments = params.get("arguments") or {}
+    text = arguments.get("text", "")
+    lines = arguments["texts"] if params.get("name") == "romanize_batch" else text.split("\n")
+    latency_ms = LATENCY_MS + PER_LINE_MS * len(lines)
+    if budget_ms is not None and latency_ms > budget_ms:
+        await asyncio.sleep(budget_ms / 1000)
+        response["error"] = deadline_error()
+        return response
+    await asyncio.sleep(latency_ms / 1000)
+
+    if params.get("name") == "romanize_batch":
+        # executeRomanizeBatch 와 같이 텍스트마다 content 항목 하나 (문자열이 아니면 항목 오류)
+        response["result"] = {"content": [
+            {"type": "text", "text": romanize(t)} if isinstance(t, str)
+            else {"type": "text", "text": "", "isError": True,
+                  "errorMessage": "텍스트는 문자열이어야 합니다"}
+            for t in lines
+        ]}
+        return response
+    if params.get("name") == "romanize_lyrics":
+        # executeRomanizeLyrics 와 같은 한글-로마자-줄바꿈 형식
+        output = "".join(f"{line.strip()}\n{romanize(line.strip())}\n" for line in lines)
+    else:
+        output = romanize(text)
+    response["result"] = {"content": [{"type": "text", "text": output}]}
+    return response
@@ -0,0 +1,17 @@
+"""대역 edge-tts를 설치한 TTS 서버 ASGI 앱 (``uvicorn tts_app:app``)"""
+
+import os
+import sys
+
+FAKES_DIR = os.path.dirname(os.path.abspath(__file__))
+TTS_SERVER_DIR = os.path.abspath(os.path.join(FAKES_DIR, "..", "..", "edge-tts-server"))
+
+for path in (FAKES_DIR, TTS_SERVER_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import fake_edge_tts  # noqa: E402
+
+fake_edge_tts.install()
+
+from app.main import app  # noqa: E402,F401
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+대역 edge-tts로 TTS 서버를 실행합니다.
+
+사용법:
+    python loadtest/fakes/tts_server.py --port 8001
+    python loadtest/fakes/tts_server.py --port 8001 --workers 4
+"""
+
+import argparse
+import os
+import sys
+
+FAKES_DIR = os.path.dirname(os.path.abspath(__file__))
+TTS_SERVER_DIR = os.path.join(FAKES_DIR, "..", "..", "edge-tts-server")
+
+sys.path.insert(0, FAKES_DIR)
+sys.path.insert(0, os.path.abspath(TTS_SERVER_DIR))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대역 edge-tts TTS 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=1, help="워커 프로세스 수")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    # 워커 프로세스마다 tts_app 을 import 하면서 대역을 설치
+    uvicorn.run(
+        "tts_app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
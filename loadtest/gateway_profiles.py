@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+MCP Gateway 런타임 프로필 비교 벤치마크
+
+같은 시나리오를 게이트웨이 런타임 프로필별로 실행하고 처리량과 p50/p99 지연을 비교합니다.
+백엔드는 대역 romanize-service / 대역 edge-tts 를 사용하므로 인터넷이 필요 없습니다.
+
+- default: ``python app.py`` 기본값 (단일 프로세스, asyncio + h11, 접근 로그)
+- production: ``GATEWAY_PROFILE=production`` (CPU 수만큼 워커, uvloop + httptools,
+  접근 로그 끄기, keep-alive / 동시 처리 제한)
+
+사용법:
+    python loadtest/gateway_profiles.py
+    python loadtest/gateway_profiles.py --duration 20 --concurrency 128
+    python loadtest/gateway_profiles.py --set production GATEWAY_WORKERS=2 --output profiles.json
+
+    # 로컬 엔진: 큰 가사를 이벤트 루프에서 변환(inline) vs 프로세스 풀로 오프로드(pooled)
+    python loadtest/gateway_profiles.py --scenario loadtest/scenarios/romanize_offload.json \
+        --profiles inline pooled --per-label \
+        --set inline ROMANIZE_ENGINE=local ROMANIZE_POOL_WORKERS=0 \
+        --set pooled ROMANIZE_ENGINE=local
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Any, Dict, List
+
+import httpx
+
+import run
+
+DEFAULT_SCENARIO = os.path.join(run.LOADTEST_DIR, "scenarios", "gateway_profiles.json")
+
+PROFILES: Dict[str, Dict[str, str]] = {
+    "default": {},
+    "production": {"GATEWAY_PROFILE": "production"},
+}
+
+
+def measure(scenario: Dict[str, Any], name: str, env: Dict[str, str], duration: float,
+            concurrency: int, show_logs: bool) -> Dict[str, Any]:
+    """프로필 하나로 스택을 띄우고 시나리오를 실행합니다."""
+    stack = run.LocalStack(scenario.get("fakes", {}), show_logs, gateway_env=env)
+    stack.start()
+    try:
+        samples = asyncio.run(run.run_load(stack.target, scenario, duration, concurrency))
+        gateway_metrics = _gateway_metrics(stack.target.gateway_url)
+    finally:
+        stack.stop()
+    report = run.build_report(scenario, samples, duration)
+    report["profile"] = name
+    report["env"] = env
+    report["gateway"] = gateway_metrics
+    return report
+
+
+def _gateway_metrics(gateway_url: str) -> Dict[str, Any]:
+    """게이트웨이 /metrics (멀티 워커면 응답한 워커 하나의 값)"""
+    try:
+        return httpx.get(f"{gateway_url}/metrics", timeout=5.0).json()
+    except (httpx.HTTPError, ValueError):
+        return {}
+
+
+def print_table(reports: List[Dict[str, Any]], per_label: bool = False) -> None:
+    base = reports[0]
+    header = (
+        f"{'profile':<12} {'rps':>9} {'vs base':>8} {'p50 ms':>8} {'p99 ms':>8} {'err':>5} "
+        f"{'loop p99':>9} {'loop max':>9}"
+    )
+    print(f"\n⚙️  게이트웨이 런타임 프로필 ({base['scenario']}, CPU {os.cpu_count()}개)")
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        lat = report["latency_ms"]
+        speedup = report["throughput_rps"] / base["throughput_rps"] if base["throughput_rps"] else 0
+        lag = report.get("gateway", {}).get("event_loop", {}).get("lag_ms", {})
+        print(
+            f"{report['profile']:<12} {report['throughput_rps']:>9} {speedup:>7.2f}x "
+            f"{run._fmt(lat['p50'])} {run._fmt(lat['p99'])} {report['errors']:>5} "
+            f"{run._fmt(lag.get('p99'), 9)} {run._fmt(lag.get('max'), 9)}"
+        )
+    if not per_label:
+        return
+
+    header = f"{'profile':<12} {'label':<24} {'req':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print("\n📋 라벨별 지연")
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        for label, row in report["per_label"].items():
+            lat = row["latency_ms"]
+            print(
+                f"{report['profile']:<12} {label:<24} {row['requests']:>6} "
+                f"{run._fmt(lat['p50'])} {run._fmt(lat['p95'])} {run._fmt(lat['p99'])}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MCP Gateway 런타임 프로필 비교")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="시나리오 JSON 파일 경로")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), help="비교할 프로필")
+    parser.add_argument("--set", nargs="+", action="append", default=[],
+                        metavar=("PROFILE", "KEY=VALUE"),
+                        help="프로필 환경 변수 추가/덮어쓰기 (예: --set production GATEWAY_WORKERS=2)")
+    parser.add_argument("--duration", type=float, help="측정 시간 (초, 시나리오 값 덮어쓰기)")
+    parser.add_argument("--concurrency", type=int, help="동시 클라이언트 수 (시나리오 값 덮어쓰기)")
+    parser.add_argument("--per-label", action="store_true", help="라벨별 지연도 출력")
+    parser.add_argument("--show-logs", action="store_true", help="로컬 스택 서비스 로그 출력")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    with open(args.scenario, encoding="utf-8") as f:
+        scenario = json.load(f)
+    duration = args.duration or scenario.get("duration_s", 10)
+    concurrency = args.concurrency or scenario.get("concurrency", 16)
+
+    profiles = {name: dict(env) for name, env in PROFILES.items()}
+    for name, *pairs in args.set:
+        profiles.setdefault(name, {}).update(pair.split("=", 1) for pair in pairs)
+
+    reports = []
+    for name in args.profiles:
+        print(f"🚀 프로필 '{name}' 측정 중 (동시 {concurrency}, {duration}s)...")
+        reports.append(measure(scenario, name, profiles[name], duration, concurrency, args.show_logs))
+    print_table(reports, args.per_label)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+nginx 프록시 프로필 비교 벤치마크 (업스트림 연결 재사용, 지연, 압축)
+
+저장소의 ``nginx.conf`` 를 로컬 스택(대역 romanize-service / 대역 edge-tts / 게이트웨이)에
+맞게 고쳐 nginx 를 띄우고, 같은 시나리오를 두 프로필로 실행합니다.
+
+- production: ``nginx.conf`` 그대로 (업스트림 keepalive 풀, HTTP/1.1 업스트림, HTTP/2,
+  JSON gzip, TTS 스트림 버퍼링 끄기)
+- legacy: 위 설정에서 keepalive / ``proxy_http_version 1.1`` / ``http2`` / gzip 을 뺀 예전 동작
+
+로컬에서 바꾸는 것: upstream 서버 주소, listen 포트, 자체 서명 인증서, 로그/임시 파일 경로.
+``limit_req`` (IP당 10r/s)는 부하 측정이 막히지 않도록 제거합니다.
+
+업스트림 연결 수는 측정 전후 ``/proc/net/tcp`` 에서 각 백엔드 포트에 연결된 소켓
+(ESTABLISHED + TIME_WAIT)의 nginx 쪽 포트 수로 셉니다 (Linux 전용, TIME_WAIT 가 남아 있는
+60초 안의 측정에서 정확). HTTP/2 는 ``h2`` 패키지가 있을 때만 사용합니다.
+
+사용법:
+    python loadtest/nginx_profiles.py
+    python loadtest/nginx_profiles.py --nginx /usr/sbin/nginx --duration 20 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+import run
+
+DEFAULT_SCENARIO = os.path.join(run.LOADTEST_DIR, "scenarios", "nginx_profiles.json")
+NGINX_CONF = os.path.join(run.ROOT_DIR, "nginx.conf")
+
+# legacy 프로필에서 지우는 지시어 (production 에서 추가된 연결 재사용/압축 설정)
+_LEGACY_DROP = re.compile(
+    r"^\s*(keepalive(_requests|_timeout)?\s|proxy_http_version\s|proxy_set_header Connection\s|http2 on;)"
+)
+
+
+def render_config(profile: str, ports: Dict[str, int], workdir: str) -> str:
+    """nginx.conf 를 로컬 스택용으로 바꿉니다."""
+    with open(NGINX_CONF, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+
+    rendered: List[str] = []
+    in_upstream = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("upstream "):
+            in_upstream = True
+        elif in_upstream and stripped == "}":
+            in_upstream = False
+        if stripped.startswith("limit_req"):
+            continue
+        if profile == "legacy":
+            if _LEGACY_DROP.match(line) and (in_upstream or "keepalive" not in stripped):
+                continue
+            if stripped == "gzip on;":
+                line = line.replace("gzip on;", "gzip off;")
+        rendered.append(line)
+    config = "\n".join(rendered)
+
+    replacements = {
+        "server mcp-gateway:8000;": f"server 127.0.0.1:{ports['gateway']};",
+        "server romanize-service:8080;": f"server 127.0.0.1:{ports['romanize']};",
+        "server tts-service:8000;": f"server 127.0.0.1:{ports['tts']};",
+        "listen 80;": f"listen 127.0.0.1:{ports['http']};",
+        "listen 443 ssl;": f"listen 127.0.0.1:{ports['https']} ssl;",
+        "/var/log/nginx/access.log": os.path.join(workdir, "access.log"),
+        "/etc/letsencrypt/live/k-pop-romanizer.duckdns.org/fullchain.pem": os.path.join(workdir, "cert.pem"),
+        "/etc/letsencrypt/live/k-pop-romanizer.duckdns.org/privkey.pem": os.path.join(workdir, "key.pem"),
+    }
+    for old, new in replacements.items():
+        if old not in config:
+            raise RuntimeError(f"nginx.conf 에서 '{old}' 를 찾을 수 없습니다")
+        config = config.replace(old, new)
+
+    temp_paths = "".join(
+        f"    {name}_temp_path {os.path.join(workdir, name)};\n"
+        for name in ("client_body", "proxy", "fastcgi", "uwsgi", "scgi")
+    )
+    return config.replace("http {\n", "http {\n" + temp_paths, 1)
+
+
+def _self_signed_cert(workdir: str) -> None:
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost",
+         "-keyout", os.path.join(workdir, "key.pem"), "-out", os.path.join(workdir, "cert.pem")],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def upstream_sockets(ports: List[int]) -> Set[tuple]:
+    """백엔드 포트에 연결된 nginx 쪽 소켓 (백엔드 포트, nginx 포트) 집합"""
+    sockets = set()
+    with open("/proc/net/tcp") as f:
+        next(f)
+        for row in f:
+            fields = row.split()
+            local_port = int(fields[1].split(":")[1], 16)
+            remote_port = int(fields[2].split(":")[1], 16)
+            state = fields[3]
+            if state not in ("01", "06"):  # ESTABLISHED, TIME_WAIT
+                continue
+            if local_port in ports:
+                sockets.add((local_port, remote_port))
+            elif remote_port in ports:
+                sockets.add((remote_port, local_port))
+    return sockets
+
+
+def _client_options() -> Dict[str, Any]:
+    try:
+        import h2  # noqa: F401
+        return {"verify": False, "http2": True}
+    except ImportError:
+        return {"verify": False}
+
+
+def probe(base_url: str, lyrics: str) -> Dict[str, Any]:
+    """큰 가사 응답 한 번으로 프로토콜과 압축 전/후 전송 크기를 확인합니다."""
+    payload = {
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": "romanize_lyrics", "arguments": {"text": lyrics}},
+    }
+    with httpx.Client(**_client_options(), timeout=30.0) as client:
+        response = client.post(f"{base_url}/mcp", json=payload, headers={"Accept-Encoding": "gzip"})
+        return {
+            "http_version": response.http_version,
+            "content_encoding": response.headers.get("content-encoding", "identity"),
+            "wire_bytes": response.num_bytes_downloaded,
+            "body_bytes": len(response.content),
+        }
+
+
+class Nginx:
+    def __init__(self, binary: str, profile: str, ports: Dict[str, int]):
+        self.binary = binary
+        self.workdir = tempfile.mkdtemp(prefix=f"nginx-{profile}-")
+        self.config_path = os.path.join(self.workdir, "nginx.conf")
+        _self_signed_cert(self.workdir)
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write(render_config(profile, ports, self.workdir))
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self, https_port: int) -> None:
+        directives = f"daemon off; pid {self.workdir}/nginx.pid; error_log {self.workdir}/error.log;"
+        self.process = subprocess.Popen(
+            [self.binary, "-p", self.workdir, "-c", self.config_path, "-g", directives],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"nginx 시작 실패: {self.process.stderr.read().decode()}")
+            try:
+                httpx.get(f"https://127.0.0.1:{https_port}/health", verify=False, timeout=1.0)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        raise RuntimeError("nginx 시작 시간 초과")
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def measure(scenario: Dict[str, Any], profile: str, binary: str, duration: float,
+            concurrency: int, show_logs: bool) -> Dict[str, Any]:
+    """프로필 하나로 스택과 nginx 를 띄우고 시나리오를 실행합니다."""
+    https_port = run._free_port()
+    base_url = f"https://127.0.0.1:{https_port}"
+    stack = run.LocalStack(
+        scenario.get("fakes", {}), show_logs,
+        tts_env={"KEEPALIVE_TIMEOUT": "75"},
+        gateway_env={"TTS_PUBLIC_URL": f"{base_url}/tts"},
+    )
+    ports = {
+        "gateway": stack.gateway_port,
+        "romanize": stack.romanize_port,
+        "tts": stack.tts_port,
+        "http": run._free_port(),
+        "https": https_port,
+    }
+    nginx = Nginx(binary, profile, ports)
+    stack.start()
+    try:
+        nginx.start(https_port)
+        target = run.Target(gateway_url=base_url, tts_url=f"{base_url}/tts")
+        backend_ports = [stack.gateway_port, stack.tts_port]
+        before = upstream_sockets(backend_ports)
+        samples = asyncio.run(
+            run.run_load(target, scenario, duration, concurrency, _client_options())
+        )
+        opened = upstream_sockets(backend_ports) - before
+        with open(os.path.join(run.LOADTEST_DIR, "data", "lyrics_long.txt"), encoding="utf-8") as f:
+            probe_result = probe(base_url, f.read())
+    finally:
+        nginx.stop()
+        stack.stop()
+
+    report = run.build_report(scenario, samples, duration)
+    report["profile"] = profile
+    report["upstream_connections"] = len(opened)
+    report["probe"] = probe_result
+    return report
+
+
+def print_table(reports: List[Dict[str, Any]]) -> None:
+    header = (
+        f"{'profile':<11} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'err':>5} {'req':>7} "
+        f"{'upstream conn':>14} {'req/conn':>9} {'proto':>9} {'lyrics wire/body':>17}"
+    )
+    print(f"\n🌐 nginx 프로필 ({reports[0]['scenario']}, CPU {os.cpu_count()}개)")
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        lat = report["latency_ms"]
+        conns = report["upstream_connections"]
+        per_conn = report["requests"] / conns if conns else float("inf")
+        probe_result = report["probe"]
+        wire = f"{probe_result['wire_bytes']}/{probe_result['body_bytes']}"
+        print(
+            f"{report['profile']:<11} {report['throughput_rps']:>8} {run._fmt(lat['p50'])} "
+            f"{run._fmt(lat['p99'])} {report['errors']:>5} {report['requests']:>7} "
+            f"{conns:>14} {per_conn:>9.1f} {probe_result['http_version']:>9} {wire:>17}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="nginx 프록시 프로필 비교")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="시나리오 JSON 파일 경로")
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "production"],
+                        choices=["legacy", "production"], help="비교할 프로필")
+    parser.add_argument("--nginx", default=os.getenv("NGINX_BIN") or shutil.which("nginx"),
+                        help="nginx 실행 파일 (기본: PATH 또는 NGINX_BIN)")
+    parser.add_argument("--duration", type=float, help="측정 시간 (초, 시나리오 값 덮어쓰기)")
+    parser.add_argument("--concurrency", type=int, help="동시 클라이언트 수 (시나리오 값 덮어쓰기)")
+    parser.add_argument("--print-config", metavar="PROFILE", choices=["legacy", "production"],
+                        help="로컬용으로 바꾼 설정만 출력하고 종료")
+    parser.add_argument("--show-logs", action="store_true", help="로컬 스택 서비스 로그 출력")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if args.print_config:
+        ports = {"gateway": 8001, "romanize": 8080, "tts": 8002, "http": 8080, "https": 8443}
+        print(render_config(args.print_config, ports, tempfile.gettempdir()))
+        return
+    if not args.nginx:
+        print("❌ nginx 실행 파일을 찾을 수 없습니다 (--nginx 또는 NGINX_BIN 지정)", file=sys.stderr)
+        sys.exit(2)
+
+    with open(args.scenario, encoding="utf-8") as f:
+        scenario = json.load(f)
+    duration = args.duration or scenario.get("duration_s", 10)
+    concurrency = args.concurrency or scenario.get("concurrency", 16)
+
+    reports = []
+    for profile in args.profiles:
+        print(f"🚀 프로필 '{profile}' 측정 중 (동시 {concurrency}, {duration}s)...")
+        reports.append(measure(scenario, profile, args.nginx, duration, concurrency, args.show_logs))
+    print_table(reports)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
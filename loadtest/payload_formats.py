@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+romanize_lyrics 응답 형식별 페이로드 크기와 직렬화 시간 비교
+
+게이트웨이 프로세스 안에서 같은 가사의 응답을 형식별로 만들고, 게이트웨이가 실제로 쓰는
+경로로 직렬화한 바이트 수와 시간을 잽니다. legacy 는 예전처럼 dict 를 반환해 FastAPI 의
+``jsonable_encoder`` 를 거치고, 나머지는 ``tool_json_response`` (JSONResponse) 로 바로
+직렬화합니다. 변환 자체는 Python 엔진(romanizer)으로 미리 해 두므로 응답 구성 비용만
+측정합니다.
+
+- legacy: 예전 게이트웨이처럼 백엔드 McpResponse 를 ``str()`` 로 감싼 text
+- text: 백엔드 content 를 그대로 전달 ("한글\\n로마자\\n" 텍스트)
+- compact: 고유 줄 표 + sequence JSON 문자열 (text content)
+- structured: structuredContent 에 줄 배열, text 에는 한 줄 요약만
+- structured_compact: structuredContent 에 고유 줄 표 + sequence
+
+사용법:
+    python loadtest/payload_formats.py
+    python loadtest/payload_formats.py --repeat 2000 --output payloads.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import run
+
+sys.path.insert(0, run.GATEWAY_DIR)
+
+import app as gateway  # noqa: E402
+import romanizer  # noqa: E402
+from lyrics import LineMemo, romanize_lyrics  # noqa: E402
+
+
+async def _romanize_lines(lines: List[str]) -> List[str]:
+    return romanizer.romanize_lines(lines)
+
+
+def load_songs() -> Dict[str, str]:
+    """짧은 곡(앞 8줄), 보통 곡(lyrics_long.txt), 긴 곡(보통 곡 3번 반복)"""
+    with open(os.path.join(run.LOADTEST_DIR, "data", "lyrics_long.txt"), encoding="utf-8") as f:
+        typical = f.read()
+    return {
+        "short": "\n".join(typical.split("\n")[:8]),
+        "typical": typical,
+        "long": "\n".join([typical] * 3),
+    }
+
+
+def build_formats(text: str) -> Dict[str, Callable[[], bytes]]:
+    """형식별로 직렬화된 JSON-RPC 응답을 만드는 함수 (변환 결과는 미리 계산)"""
+    async def variants():
+        results = {}
+        for name, compact, structured in (
+            ("text", False, False),
+            ("compact", True, False),
+            ("structured", False, True),
+            ("structured_compact", True, True),
+        ):
+            results[name] = await romanize_lyrics(
+                text, _romanize_lines, LineMemo(), compact=compact, structured=structured
+            )
+        return results
+
+    results = asyncio.run(variants())
+
+    def tool_result(name: str) -> Dict[str, Any]:
+        body, structured, _ = results[name]
+        result: Dict[str, Any] = {"content": [{"type": "text", "text": body}]}
+        if structured is not None:
+            result["structuredContent"] = structured
+        return result
+
+    def legacy() -> bytes:
+        backend = gateway.McpResponse(id=1, result=tool_result("text"))
+        body = {"jsonrpc": "2.0", "id": 1, "result": {"content": [{"type": "text", "text": str(backend)}]}}
+        return JSONResponse(jsonable_encoder(body)).body
+
+    def unwrapped(name: str) -> Callable[[], bytes]:
+        def build() -> bytes:
+            backend = gateway.McpResponse(id=1, result=tool_result(name))
+            body = {"jsonrpc": "2.0", "id": 1, **gateway.unwrap_tool_response(backend)}
+            return gateway.tool_json_response(body).body
+        return build
+
+    formats: Dict[str, Callable[[], bytes]] = {"legacy": legacy}
+    for name in ("text", "compact", "structured", "structured_compact"):
+        formats[name] = unwrapped(name)
+    return formats
+
+
+def measure(build: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    payload = build()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        build()
+    elapsed = time.perf_counter() - started
+    return {"bytes": len(payload), "serialize_us": round(elapsed / repeat * 1e6, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="romanize_lyrics 응답 형식별 크기/직렬화 시간")
+    parser.add_argument("--repeat", type=int, default=500, help="형식마다 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for song, text in load_songs().items():
+        results[song] = {
+            name: measure(build, args.repeat) for name, build in build_formats(text).items()
+        }
+
+    header = f"{'song':<8} {'format':<20} {'bytes':>8} {'vs legacy':>10} {'serialize µs':>13}"
+    print(f"\n📦 romanize_lyrics 응답 형식 (반복 {args.repeat}회)")
+    print(header)
+    print("-" * len(header))
+    for song, formats in results.items():
+        legacy = formats["legacy"]
+        for name, row in formats.items():
+            ratio = row["bytes"] / legacy["bytes"]
+            print(f"{song:<8} {name:<20} {row['bytes']:>8} {ratio:>9.2f}x {row['serialize_us']:>13}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
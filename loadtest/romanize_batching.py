@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+romanize_single 배치 창 크기별 처리량 / 추가 지연 벤치마크
+
+같은 시나리오를 ``ROMANIZE_BATCH_WINDOW_MS`` 값별로 실행하고 처리량, p50/p99 지연, 백엔드
+호출 수와 평균 배치 크기를 비교합니다. 창 0(배치 끄기)이 기준이며, ``p50 +ms`` 열은 기준 대비
+늘어난 p50 지연입니다. 백엔드는 대역 romanize-service 를 사용합니다.
+
+사용법:
+    python loadtest/romanize_batching.py
+    python loadtest/romanize_batching.py --windows 0 1 2 5 10 20 --concurrency 256
+    python loadtest/romanize_batching.py --max-batch 32 --output batching.json
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+
+import gateway_profiles
+import run
+
+DEFAULT_SCENARIO = os.path.join(run.LOADTEST_DIR, "scenarios", "romanize_batching.json")
+
+
+def backend_calls(report: Dict[str, Any]) -> int:
+    """romanize-service 로 보낸 romanize_single / romanize_batch 호출 수 (응답한 워커 기준)"""
+    batch = report.get("gateway", {}).get("romanize_batch", {})
+    if batch.get("enabled"):
+        return batch.get("batches", 0)
+    return report["requests"]
+
+
+def print_table(reports: List[Dict[str, Any]]) -> None:
+    base = reports[0]
+    base_p50 = base["latency_ms"]["p50"] or 0.0
+    header = (
+        f"{'window ms':>9} {'rps':>9} {'vs base':>8} {'p50 ms':>8} {'p50 +ms':>8} {'p99 ms':>8} "
+        f"{'err':>5} {'backend':>8} {'avg batch':>9}"
+    )
+    print(f"\n📦 배치 창 크기별 처리량 / 지연 ({base['scenario']}, CPU {os.cpu_count()}개)")
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        lat = report["latency_ms"]
+        batch = report.get("gateway", {}).get("romanize_batch", {})
+        speedup = report["throughput_rps"] / base["throughput_rps"] if base["throughput_rps"] else 0
+        added = run._round(lat["p50"] - base_p50) if lat["p50"] is not None else None
+        avg_batch = batch.get("avg_batch_size", 0.0) if batch.get("enabled") else 1.0
+        print(
+            f"{report['window_ms']:>9g} {report['throughput_rps']:>9} {speedup:>7.2f}x "
+            f"{run._fmt(lat['p50'])} {run._fmt(added)} {run._fmt(lat['p99'])} "
+            f"{report['errors']:>5} {backend_calls(report):>8} "
+            f"{avg_batch:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="romanize_single 배치 창 크기별 벤치마크")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="시나리오 JSON 파일 경로")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5, 10],
+                        help="측정할 배치 창 (밀리초, 첫 값이 기준)")
+    parser.add_argument("--max-batch", type=int, default=64, help="배치 하나의 최대 호출 수")
+    parser.add_argument("--duration", type=float, help="측정 시간 (초, 시나리오 값 덮어쓰기)")
+    parser.add_argument("--concurrency", type=int, help="동시 클라이언트 수 (시나리오 값 덮어쓰기)")
+    parser.add_argument("--show-logs", action="store_true", help="로컬 스택 서비스 로그 출력")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    with open(args.scenario, encoding="utf-8") as f:
+        scenario = json.load(f)
+    duration = args.duration or scenario.get("duration_s", 10)
+    concurrency = args.concurrency or scenario.get("concurrency", 16)
+
+    reports = []
+    for window in args.windows:
+        env = {
+            "ROMANIZE_BATCH_WINDOW_MS": f"{window:g}",
+            "ROMANIZE_BATCH_MAX": str(args.max_batch),
+        }
+        print(f"🚀 배치 창 {window:g}ms 측정 중 (동시 {concurrency}, {duration}s)...")
+        report = gateway_profiles.measure(
+            scenario, f"window={window:g}", env, duration, concurrency, args.show_logs
+        )
+        report["window_ms"] = window
+        reports.append(report)
+    print_table(reports)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
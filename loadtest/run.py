@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+비동기 부하 테스트 / 벤치마크 실행기
+
+대역 romanize-service, 대역 edge-tts를 쓰는 TTS 서버, MCP Gateway를 로컬 프로세스로
+띄운 뒤 시나리오 파일에 정의된 요청을 동시에 보내고 처리량, p50/p95/p99 지연,
+첫 오디오 바이트까지의 시간(TTFB)을 보고합니다. 인터넷과 Docker가 필요 없습니다.
+
+사용법:
+    python loadtest/run.py loadtest/scenarios/mixed_tools_call.json
+    python loadtest/run.py loadtest/scenarios/long_lyrics.json --save-baseline
+    python loadtest/run.py loadtest/scenarios/long_lyrics.json --compare --tolerance 0.2
+
+    # 이미 떠 있는 스택을 대상으로 실행
+    python loadtest/run.py SCENARIO --gateway-url http://localhost:8000 --tts-url http://localhost:8001
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(LOADTEST_DIR)
+GATEWAY_DIR = os.path.join(ROOT_DIR, "mcp-gateway")
+BASELINE_DIR = os.path.join(LOADTEST_DIR, "baselines")
+
+_URL_PATTERN = re.compile(r"https?://[^\s'\"\\]+")
+_UNIQUE_IDS = itertools.count(1)
+
+
+@dataclass
+class Sample:
+    """요청 한 건의 측정 결과"""
+
+    label: str
+    ok: bool
+    latency: float
+    ttfb: Optional[float] = None
+    bytes: int = 0
+
+
+@dataclass
+class Target:
+    gateway_url: str
+    tts_url: str
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalStack:
+    """대역 서비스와 게이트웨이를 로컬 프로세스로 실행합니다."""
+
+    def __init__(
+        self,
+        fakes: Dict[str, Dict[str, Any]],
+        show_logs: bool = False,
+        tts_workers: int = 1,
+        tts_env: Optional[Dict[str, str]] = None,
+        gateway_env: Optional[Dict[str, str]] = None,
+    ):
+        self.fakes = fakes
+        self.show_logs = show_logs
+        self.tts_workers = tts_workers
+        self.tts_env = tts_env or {}
+        self.gateway_env = gateway_env or {}
+        self.processes: List[subprocess.Popen] = []
+        self._state_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.romanize_port = _free_port()
+        self.tts_port = _free_port()
+        self.gateway_port = _free_port()
+
+    @property
+    def target(self) -> Target:
+        return Target(
+            gateway_url=f"http://127.0.0.1:{self.gateway_port}",
+            tts_url=f"http://127.0.0.1:{self.tts_port}",
+        )
+
+    def _spawn(self, cmd: List[str], env: Dict[str, str]) -> None:
+        output = None if self.show_logs else subprocess.DEVNULL
+        self.processes.append(
+            subprocess.Popen(
+                cmd, env={**os.environ, **env}, cwd=ROOT_DIR, stdout=output, stderr=output
+            )
+        )
+
+    def start(self) -> None:
+        romanize_env = {
+            f"FAKE_ROMANIZE_{key.upper()}": str(value)
+            for key, value in self.fakes.get("romanize", {}).items()
+        }
+        tts_env = {
+            f"FAKE_TTS_{key.upper()}": str(value)
+            for key, value in self.fakes.get("tts", {}).items()
+        }
+        # 실행마다 빈 캐시/작업 디렉토리에서 시작 (이전 실행의 캐시 적중으로 기준선이 흔들리지 않도록)
+        self._state_dir = tempfile.TemporaryDirectory(prefix="loadtest-tts-")
+        tts_env.update({
+            "LOG_LEVEL": "WARNING",
+            "AUDIO_CACHE_DIR": os.path.join(self._state_dir.name, "cache"),
+            "JOB_DIR": os.path.join(self._state_dir.name, "jobs"),
+            # 대역은 edge_tts.Communicate 만 바꾸므로 실제 upstream 에 연결하는 세션 풀은 끔
+            "UPSTREAM_POOL_SIZE": "0",
+            **self.tts_env,
+        })
+
+        uvicorn = [sys.executable, "-m", "uvicorn", "--log-level", "warning", "--no-access-log"]
+        self._spawn(
+            uvicorn + ["fakes.fake_romanize:app", "--app-dir", LOADTEST_DIR,
+                       "--port", str(self.romanize_port)],
+            romanize_env,
+        )
+        self._spawn(
+            [sys.executable, os.path.join(LOADTEST_DIR, "fakes", "tts_server.py"),
+             "--port", str(self.tts_port), "--workers", str(self.tts_workers)],
+            tts_env,
+        )
+        # 게이트웨이는 Docker 이미지와 같이 app.py 로 실행 (GATEWAY_* 런타임 프로필 적용)
+        self._spawn(
+            [sys.executable, os.path.join(GATEWAY_DIR, "app.py")],
+            {
+                "GATEWAY_HOST": "127.0.0.1",
+                "GATEWAY_PORT": str(self.gateway_port),
+                "ROMANIZE_SERVER_URL": f"http://127.0.0.1:{self.romanize_port}",
+                "TTS_SERVER_URL": f"http://127.0.0.1:{self.tts_port}",
+                "TTS_PUBLIC_URL": f"http://127.0.0.1:{self.tts_port}",
+                **self.gateway_env,
+            },
+        )
+        self._wait_healthy(
+            [
+                f"http://127.0.0.1:{self.romanize_port}/mcp/health",
+                f"http://127.0.0.1:{self.tts_port}/health",
+                f"http://127.0.0.1:{self.gateway_port}/health",
+            ]
+        )
+
+    def _wait_healthy(self, urls: List[str], timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        pending = list(urls)
+        while pending:
+            if time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"서비스 시작 시간 초과: {pending}")
+            try:
+                if httpx.get(pending[0], timeout=1.0).status_code == 200:
+                    pending.pop(0)
+                    continue
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+
+    def stop(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes.clear()
+        if self._state_dir is not None:
+            self._state_dir.cleanup()
+            self._state_dir = None
+
+
+def _load_text(spec: Dict[str, Any]) -> str:
+    if "text_file" in spec:
+        with open(os.path.join(LOADTEST_DIR, spec["text_file"]), encoding="utf-8") as f:
+            text = f.read().strip()
+    else:
+        text = spec.get("text") or spec.get("arguments", {}).get("text", "")
+    repeat = spec.get("repeat", 1)
+    return "\n".join([text] * repeat) if repeat > 1 else text
+
+
+def _prepare(scenario: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """시나리오 요청 정의에 본문 텍스트를 미리 채워 둡니다."""
+    prepared = []
+    for spec in scenario["requests"]:
+        spec = dict(spec)
+        text = _load_text(spec)
+        if spec["kind"] == "mcp" and spec.get("tool"):
+            spec["arguments"] = {**spec.get("arguments", {}), "text": text}
+        else:
+            spec["text"] = text
+        prepared.append(spec)
+    return prepared
+
+
+async def _read_audio(
+    client: httpx.AsyncClient, url: str, params: Optional[Dict[str, str]],
+    spec: Dict[str, Any], start: float,
+) -> Sample:
+    read_delay = spec.get("read_delay_ms", 0) / 1000
+    ttfb = None
+    received = 0
+    async with client.stream("GET", url, params=params) as response:
+        async for chunk in response.aiter_raw():
+            if ttfb is None and chunk:
+                ttfb = time.perf_counter() - start
+            received += len(chunk)
+            if read_delay:
+                await asyncio.sleep(read_delay)
+        ok = response.status_code == 200 and received > 0
+    return Sample(spec["label"], ok, time.perf_counter() - start, ttfb, received)
+
+
+async def execute(client: httpx.AsyncClient, target: Target, spec: Dict[str, Any]) -> Sample:
+    """요청 정의 하나를 실행하고 측정합니다."""
+    start = time.perf_counter()
+    try:
+        if spec["kind"] == "tts":
+            text = spec["text"]
+            if spec.get("unique"):
+                # 매 요청을 캐시 미스로 만듦
+                text = f"{text} {next(_UNIQUE_IDS)}"
+            return await _read_audio(
+                client,
+                f"{target.tts_url}/api/v1/tts/{spec.get('endpoint', 'stream')}",
+                {"text": text, "voice": spec.get("voice", "ko-KR-SunHiNeural")},
+                spec,
+                start,
+            )
+
+        params: Dict[str, Any] = {}
+        if spec.get("tool"):
+            arguments = spec["arguments"]
+            if spec.get("unique_lines"):
+                # 줄마다 고유 번호를 붙여 줄 중복 제거와 메모를 우회
+                request_id = next(_UNIQUE_IDS)
+                arguments = {
+                    **arguments,
+                    "text": "\n".join(
+                        f"{line} {request_id}-{i}"
+                        for i, line in enumerate(arguments["text"].split("\n"))
+                    ),
+                }
+            params = {"name": spec["tool"], "arguments": arguments}
+        payload = {"jsonrpc": "2.0", "id": 1, "method": spec["method"], "params": params}
+        response = await client.post(f"{target.gateway_url}/mcp", json=payload)
+        body = response.json()
+        ok = response.status_code == 200 and not body.get("error")
+
+        if ok and spec.get("follow_audio_url"):
+            match = _URL_PATTERN.search(json.dumps(body["result"], ensure_ascii=False))
+            if not match:
+                return Sample(spec["label"], False, time.perf_counter() - start)
+            return await _read_audio(client, match.group(0), None, spec, start)
+
+        return Sample(spec["label"], ok, time.perf_counter() - start, bytes=len(response.content))
+    except (httpx.HTTPError, ValueError):
+        return Sample(spec["label"], False, time.perf_counter() - start)
+
+
+async def run_load(
+    target: Target,
+    scenario: Dict[str, Any],
+    duration: float,
+    concurrency: int,
+    client_options: Optional[Dict[str, Any]] = None,
+) -> List[Sample]:
+    """
+    ``concurrency`` 개의 클로즈드 루프 워커로 ``duration`` 초 동안 부하를 겁니다.
+
+    client_options 는 httpx.AsyncClient 에 그대로 전달합니다 (예: ``http2``, ``verify``).
+    """
+    specs = _prepare(scenario)
+    weights = [spec.get("weight", 1) for spec in specs]
+    warmup = scenario.get("warmup_s", 0)
+    seed = scenario.get("seed", 0)
+
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    stop_at = measure_from + duration
+    samples: List[Sample] = []
+
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(timeout=60.0, limits=limits, **(client_options or {})) as client:
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed + worker_id)
+            while loop.time() < stop_at:
+                spec = rng.choices(specs, weights)[0]
+                started = loop.time()
+                sample = await execute(client, target, spec)
+                if started >= measure_from:
+                    samples.append(sample)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """nearest-rank 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _summarize(samples: List[Sample], duration: float) -> Dict[str, Any]:
+    latencies = [s.latency * 1000 for s in samples if s.ok]
+    ttfbs = [s.ttfb * 1000 for s in samples if s.ok and s.ttfb is not None]
+    summary: Dict[str, Any] = {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if not s.ok),
+        "error_rate": round(sum(1 for s in samples if not s.ok) / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(latencies) / duration, 2),
+        "latency_ms": {f"p{p}": _round(percentile(latencies, p)) for p in (50, 95, 99)},
+    }
+    if ttfbs:
+        summary["ttfb_ms"] = {f"p{p}": _round(percentile(ttfbs, p)) for p in (50, 95, 99)}
+    received = sum(s.bytes for s in samples)
+    if received:
+        summary["mb_per_s"] = round(received / duration / 1e6, 3)
+    return summary
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def build_report(scenario: Dict[str, Any], samples: List[Sample], duration: float) -> Dict[str, Any]:
+    report = {"scenario": scenario["name"], "duration_s": duration, **_summarize(samples, duration)}
+    labels = sorted({s.label for s in samples})
+    report["per_label"] = {
+        label: _summarize([s for s in samples if s.label == label], duration) for label in labels
+    }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n📊 시나리오: {report['scenario']} ({report['duration_s']}s)")
+    header = f"{'label':<24} {'req':>6} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'ttfb p50':>9} {'ttfb p99':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = [("TOTAL", report)] + list(report["per_label"].items())
+    for label, row in rows:
+        lat = row["latency_ms"]
+        ttfb = row.get("ttfb_ms", {})
+        print(
+            f"{label:<24} {row['requests']:>6} {row['errors']:>5} {row['throughput_rps']:>8} "
+            f"{_fmt(lat['p50'])} {_fmt(lat['p95'])} {_fmt(lat['p99'])} "
+            f"{_fmt(ttfb.get('p50'), 9)} {_fmt(ttfb.get('p99'), 9)}"
+        )
+
+
+def _fmt(value: Optional[float], width: int = 8) -> str:
+    return f"{'-' if value is None else value:>{width}}"
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준선 대비 회귀 항목 목록을 반환합니다. 빈 목록이면 통과입니다."""
+    regressions = []
+
+    def check(path: str, current: Optional[float], base: Optional[float], higher_is_better: bool) -> None:
+        if current is None or base is None or base == 0:
+            return
+        change = (current - base) / base
+        worse = -change if higher_is_better else change
+        status = "❌" if worse > tolerance else "✅"
+        print(f"  {status} {path:<40} {base:>10} → {current:>10} ({change:+.1%})")
+        if worse > tolerance:
+            regressions.append(path)
+
+    sections = [("TOTAL", report, baseline)] + [
+        (label, row, baseline.get("per_label", {}).get(label))
+        for label, row in report["per_label"].items()
+    ]
+    print(f"\n🔍 기준선 비교 (허용 오차 {tolerance:.0%})")
+    for label, current, base in sections:
+        if not base:
+            continue
+        check(f"{label}.throughput_rps", current["throughput_rps"], base["throughput_rps"], True)
+        for metric in ("latency_ms", "ttfb_ms"):
+            for p in ("p50", "p95", "p99"):
+                check(f"{label}.{metric}.{p}", current.get(metric, {}).get(p),
+                      base.get(metric, {}).get(p), False)
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            print(f"  ❌ {label}.error_rate {base['error_rate']} → {current['error_rate']}")
+            regressions.append(f"{label}.error_rate")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MCP Gateway / TTS 부하 테스트")
+    parser.add_argument("scenario", help="시나리오 JSON 파일 경로")
+    parser.add_argument("--duration", type=float, help="측정 시간 (초, 시나리오 값 덮어쓰기)")
+    parser.add_argument("--concurrency", type=int, help="동시 워커 수 (시나리오 값 덮어쓰기)")
+    parser.add_argument("--gateway-url", help="이미 실행 중인 게이트웨이 URL (지정 시 로컬 스택 미실행)")
+    parser.add_argument("--tts-url", help="이미 실행 중인 TTS 서버 URL")
+    parser.add_argument("--show-logs", action="store_true", help="로컬 스택 서비스 로그 출력")
+    parser.add_argument("--tts-workers", type=int, default=1, help="로컬 TTS 서버 워커 프로세스 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준선과 비교 (회귀 시 종료 코드 1)")
+    parser.add_argument("--baseline", help="기준선 파일 경로 (기본: loadtest/baselines/<시나리오>.json)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 회귀 비율 (기본 0.25)")
+    args = parser.parse_args()
+
+    with open(args.scenario, encoding="utf-8") as f:
+        scenario = json.load(f)
+    duration = args.duration or scenario.get("duration_s", 10)
+    concurrency = args.concurrency or scenario.get("concurrency", 16)
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{scenario['name']}.json")
+
+    stack = None
+    if args.gateway_url:
+        target = Target(args.gateway_url, args.tts_url or args.gateway_url)
+    else:
+        stack = LocalStack(scenario.get("fakes", {}), args.show_logs, args.tts_workers)
+        print("🚀 로컬 대역 스택 시작 중...")
+        stack.start()
+        target = stack.target
+
+    try:
+        print(f"🔥 부하 생성: 동시 {concurrency}, {duration}s (+워밍업 {scenario.get('warmup_s', 0)}s)")
+        samples = asyncio.run(run_load(target, scenario, duration, concurrency))
+    finally:
+        if stack:
+            stack.stop()
+
+    report = build_report(scenario, samples, duration)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준선 저장: {baseline_path}")
+    if args.compare:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ 기준선 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
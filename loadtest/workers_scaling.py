@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+TTS 서버 워커 수에 따른 처리량 확장성 벤치마크
+
+같은 시나리오를 TTS 서버 워커 1..N개로 차례로 실행하고 처리량, p50/p99 지연,
+upstream(대역 edge-tts) 합성 횟수를 비교합니다. 실행마다 새 캐시 디렉토리를 쓰며,
+워커 간 단일 비행이 동작하면 upstream 합성 수는 워커 수와 관계없이
+"고유 텍스트 수"와 같아야 합니다.
+
+사용법:
+    python loadtest/workers_scaling.py
+    python loadtest/workers_scaling.py --max-workers 8 --duration 20
+    python loadtest/workers_scaling.py --workers 1 2 4 --output scaling.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+import run
+
+DEFAULT_SCENARIO = os.path.join(run.LOADTEST_DIR, "scenarios", "workers_scaling.json")
+
+
+def measure(scenario: Dict[str, Any], workers: int, duration: float, concurrency: int,
+            show_logs: bool) -> Dict[str, Any]:
+    """워커 수 하나에 대해 스택을 띄우고 시나리오를 실행합니다."""
+    with tempfile.TemporaryDirectory(prefix="tts-scaling-") as tmp:
+        count_file = os.path.join(tmp, "upstream.count")
+        stack = run.LocalStack(
+            {"tts": {**scenario.get("fakes", {}).get("tts", {}), "count_file": count_file}},
+            show_logs,
+            tts_workers=workers,
+            tts_env={"AUDIO_CACHE_DIR": os.path.join(tmp, "cache")},
+        )
+        stack.start()
+        unique_before = next(run._UNIQUE_IDS)
+        try:
+            samples = asyncio.run(run.run_load(stack.target, scenario, duration, concurrency))
+        finally:
+            stack.stop()
+        unique_issued = next(run._UNIQUE_IDS) - unique_before - 1
+
+        try:
+            upstream = os.path.getsize(count_file)
+        except FileNotFoundError:
+            upstream = 0
+
+    report = run.build_report(scenario, samples, duration)
+    distinct_hot = len({
+        spec.get("text") for spec in scenario["requests"]
+        if spec["kind"] == "tts" and not spec.get("unique")
+    })
+    report["workers"] = workers
+    report["upstream_syntheses"] = upstream
+    report["duplicate_syntheses"] = max(0, upstream - unique_issued - distinct_hot)
+    return report
+
+
+def print_table(reports: List[Dict[str, Any]]) -> None:
+    base = reports[0]["throughput_rps"] or 1.0
+    header = (f"{'workers':>7} {'rps':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'err':>5} {'upstream':>9} {'dup':>5}")
+    print(f"\n📈 워커 수별 처리량 ({reports[0]['scenario']}, CPU {os.cpu_count()}개)")
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        lat = report["latency_ms"]
+        print(
+            f"{report['workers']:>7} {report['throughput_rps']:>9} "
+            f"{report['throughput_rps'] / base:>7.2f}x {run._fmt(lat['p50'])} {run._fmt(lat['p99'])} "
+            f"{report['errors']:>5} {report['upstream_syntheses']:>9} {report['duplicate_syntheses']:>5}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TTS 서버 워커 수 확장성 벤치마크")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="시나리오 JSON 파일 경로")
+    parser.add_argument("--workers", type=int, nargs="+", help="측정할 워커 수 목록")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="--workers 미지정 시 1부터 2배씩 늘릴 최대 워커 수 (기본: CPU 수)")
+    parser.add_argument("--duration", type=float, help="측정 시간 (초, 시나리오 값 덮어쓰기)")
+    parser.add_argument("--concurrency", type=int, help="동시 클라이언트 수 (시나리오 값 덮어쓰기)")
+    parser.add_argument("--show-logs", action="store_true", help="로컬 스택 서비스 로그 출력")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    with open(args.scenario, encoding="utf-8") as f:
+        scenario = json.load(f)
+    duration = args.duration or scenario.get("duration_s", 10)
+    concurrency = args.concurrency or scenario.get("concurrency", 16)
+
+    counts = args.workers
+    if not counts:
+        counts = [1]
+        while counts[-1] * 2 <= args.max_workers:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != args.max_workers:
+            counts.append(args.max_workers)
+
+    reports = []
+    for workers in counts:
+        print(f"🚀 워커 {workers}개로 측정 중 (동시 {concurrency}, {duration}s)...")
+        reports.append(measure(scenario, workers, duration, concurrency, args.show_logs))
+    print_table(reports)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    if any(report["duplicate_syntheses"] for report in reports):
+        print("\n⚠️  중복 upstream 합성이 있습니다 (워커 간 단일 비행 확인 필요)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,203 @@ MCP Gateway - 중앙집중형 MCP 서버
 모든 MCP 요청을 받아서 적절한 백엔드 서비스로 라우팅
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Union
 import httpx
 import asyncio
+import atexit
+import hmac
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import threading
+import urllib.parse
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
+from deadline import ToolDeadlineExceeded, ToolDeadlines, parse_header_budget, parse_tool_deadlines
+from loop_monitor import (
+    BlockingDetector,
+    LoopLagMonitor,
+    RequestTimer,
+    RequestTimingMiddleware,
+    collapse_stacks,
+    sample_stacks,
+)
+from lyrics import LineMemo, parse_lyrics_pairs, romanize_lyrics
+from lyrics_session import LyricsSessionError, LyricsSessionStore
+from romanize_batch import RomanizeBatcher
+from romanize_pool import RomanizeOffloader
+from textnorm import canonical_hash, normalize_prosody, normalize_romanize_text, normalize_tts_text
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    레코드를 큐에 넣기만 하는 핸들러.
+
+    큐가 가득 차면 ``handleError``(stderr 에 traceback 출력) 대신 레코드를 버리고
+    ``dropped`` 를 증가시킵니다 (TTS 서버의 ``NonBlockingQueueHandler`` 와 같은 방식).
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# 로깅 설정: 이벤트 루프에서는 큐에 넣기만 하고 stdout 쓰기는 리스너 스레드가 담당
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=10000)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.StreamHandler(), respect_handler_level=True
+)
+_log_handler = DroppingQueueHandler(_log_queue)
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# 백엔드 서비스 URL (로컬 부하 테스트에서는 환경 변수로 대역 서버를 지정)
+ROMANIZE_SERVER_URL = os.getenv("ROMANIZE_SERVER_URL", "http://romanize-service:8080")
+TTS_SERVER_URL = os.getenv("TTS_SERVER_URL", "http://tts-service:8000")  # 컨테이너 내부에서는 8000 포트 사용
+# MCP 클라이언트에게 돌려주는 TTS 공개 URL
+TTS_PUBLIC_URL = os.getenv("TTS_PUBLIC_URL", "https://k-pop-romanizer.duckdns.org/tts")
+
+# TTS 도구가 돌려줄 URL: direct(텍스트를 쿼리 문자열에 담은 URL), short(짧은 서명 URL /a/{token}),
+# job(tts_synthesize 를 비동기 작업으로 등록하고 결과 URL)
+TTS_URL_MODE = os.getenv("TTS_URL_MODE", "direct")
+
+# 백엔드 호출용 HTTP 클라이언트 설정 (워커마다 연결 풀 하나를 재사용)
+BACKEND_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", "5.0"))
+BACKEND_MAX_CONNECTIONS = int(os.getenv("BACKEND_MAX_CONNECTIONS", "100"))
+BACKEND_MAX_KEEPALIVE = int(os.getenv("BACKEND_MAX_KEEPALIVE", "20"))
+
+# 도구별 시간 예산 (초, "romanize_lyrics=20,tts_stream=3"), 목록에 없는 도구의 예산,
+# 백엔드에 남은 시간을 넘길 때 빼는 여유분 (밀리초)
+TOOL_DEADLINES = parse_tool_deadlines(os.getenv("TOOL_DEADLINES", ""))
+TOOL_DEADLINE_DEFAULT = float(os.getenv("TOOL_DEADLINE_DEFAULT", "25"))
+DEADLINE_MARGIN_MS = float(os.getenv("DEADLINE_MARGIN_MS", "100"))
+
+# 가사 변환을 게이트웨이에서 줄 단위 중복 제거로 처리할지 여부와 줄 메모 크기
+LYRICS_DEDUP = os.getenv("LYRICS_DEDUP", "true").lower() in ("1", "true", "yes", "on")
+LYRICS_MEMO_SIZE = int(os.getenv("LYRICS_MEMO_SIZE", "10000"))
+
+
+def _gateway_workers() -> int:
+    """uvicorn 워커 수 (GATEWAY_WORKERS, 없으면 프로필 기본값: production 이면 CPU 수)"""
+    default = (os.cpu_count() or 1) if os.getenv("GATEWAY_PROFILE", "default") == "production" else 1
+    return int(os.getenv("GATEWAY_WORKERS", default))
+
+
+# 가사 편집 세션을 워커 간에 공유할 디렉토리 (워커가 여럿이면 기본으로 임시 디렉토리, 비우면 워커 메모리)
+LYRICS_SESSION_DIR = os.getenv(
+    "LYRICS_SESSION_DIR",
+    os.path.join(tempfile.gettempdir(), "mcp-gateway-lyrics") if _gateway_workers() > 1 else "",
+)
+
+# 로마자 변환 엔진: backend(romanize-service 호출) 또는 local(게이트웨이 내 Python 엔진)
+ROMANIZE_ENGINE = os.getenv("ROMANIZE_ENGINE", "backend")
+# local 엔진에서 임계값(글자 수)을 넘는 요청은 줄 단위 청크로 프로세스 풀에서 변환
+# (풀은 게이트웨이 워커마다 하나라 기본 크기는 CPU 수를 워커 수로 나눈 값)
+ROMANIZE_POOL_WORKERS = int(
+    os.getenv("ROMANIZE_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // _gateway_workers())))
+)
+ROMANIZE_OFFLOAD_THRESHOLD = int(os.getenv("ROMANIZE_OFFLOAD_THRESHOLD", "2000"))
+ROMANIZE_CHUNK_LINES = int(os.getenv("ROMANIZE_CHUNK_LINES", "256"))
+# backend 엔진에서 이 시간(밀리초) 안에 들어온 romanize_single 호출을 romanize_batch 한 번으로
+# 모아 보냄 (0 이면 끄기), 배치 하나의 최대 호출 수
+ROMANIZE_BATCH_WINDOW_MS = float(os.getenv("ROMANIZE_BATCH_WINDOW_MS", "0"))
+ROMANIZE_BATCH_MAX = int(os.getenv("ROMANIZE_BATCH_MAX", "64"))
+
+# 이벤트 루프 진단: /debug 엔드포인트의 관리자 token (비우면 엔드포인트를 막음), 시작할 때부터
+# 루프 멈춤 감지(스택 기록)와 요청별 wall/on-CPU 시간 집계를 켤지, 스택 표본 프로파일 최대 시간
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+LOOP_BLOCKING_DETECTION = os.getenv("LOOP_BLOCKING_DETECTION", "false").lower() in ("1", "true", "yes", "on")
+LOOP_BLOCKING_THRESHOLD_MS = float(os.getenv("LOOP_BLOCKING_THRESHOLD_MS", "100"))
+REQUEST_TIMING = os.getenv("REQUEST_TIMING", "false").lower() in ("1", "true", "yes", "on")
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+_http_client: Optional[httpx.AsyncClient] = None
+_offloader = RomanizeOffloader(
+    ROMANIZE_POOL_WORKERS, ROMANIZE_OFFLOAD_THRESHOLD, ROMANIZE_CHUNK_LINES
+)
+_deadlines = ToolDeadlines(TOOL_DEADLINES, TOOL_DEADLINE_DEFAULT, DEADLINE_MARGIN_MS / 1000)
+_loop_monitor = LoopLagMonitor(interval=float(os.getenv("LOOP_LAG_INTERVAL_MS", "50")) / 1000)
+_blocking_detector = BlockingDetector(threshold=LOOP_BLOCKING_THRESHOLD_MS / 1000)
+_request_timer = RequestTimer()
+_profile_lock = asyncio.Lock()
+# romanize_single 묶음 전송 (romanize_batch_via_backend 는 아래에 정의)
+_romanize_batcher = RomanizeBatcher(
+    lambda texts, remaining: romanize_batch_via_backend(texts, remaining),
+    ROMANIZE_BATCH_WINDOW_MS / 1000,
+    ROMANIZE_BATCH_MAX,
+)
+_line_memo = LineMemo(LYRICS_MEMO_SIZE)
+# 합성 조건 → 짧은 URL 경로 (TTS_URL_MODE=short, 같은 조건은 TTS 서버에 다시 등록하지 않음)
+_short_url_memo = LineMemo(int(os.getenv("TTS_SHORT_URL_MEMO_SIZE", "10000")))
+# 가사 편집기용 증분 변환 세션 (LYRICS_SESSION_DIR 이 있으면 워커 간 공유, 줄 메모 공유)
+_lyrics_sessions = LyricsSessionStore(
+    _line_memo,
+    max_documents=int(os.getenv("LYRICS_SESSION_MAX_DOCUMENTS", "1000")),
+    ttl=float(os.getenv("LYRICS_SESSION_TTL", "3600")),
+    context_lines=int(os.getenv("LYRICS_EDIT_CONTEXT_LINES", "0")),
+    directory=LYRICS_SESSION_DIR or None,
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """백엔드 호출용 공유 HTTP 클라이언트 (lifespan 밖에서 호출되면 새로 생성)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=BACKEND_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=BACKEND_MAX_KEEPALIVE,
+            ),
+        )
+    return _http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """워커 시작 시 공유 상태를 미리 준비하고, 종료(SIGTERM 드레인 완료) 시 정리"""
+    get_http_client()
+    if ROMANIZE_ENGINE == "local":
+        await _offloader.start()
+    _loop_monitor.start()
+    if LOOP_BLOCKING_DETECTION:
+        _blocking_detector.start()
+    if REQUEST_TIMING:
+        _request_timer.start()
+    logger.info(
+        "MCP Gateway 워커 시작 (pid=%s, 도구 %d개, 로마자 엔진 %s, 배치 창 %gms)",
+        os.getpid(), len(ALL_TOOLS), ROMANIZE_ENGINE, _romanize_batcher.window * 1000
+    )
+    yield
+    logger.info("MCP Gateway 워커 종료: 백엔드 연결 정리 (pid=%s)", os.getpid())
+    _request_timer.stop()
+    _blocking_detector.stop()
+    await _loop_monitor.stop()
+    _offloader.shutdown()
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
 app = FastAPI(
     title="MCP Gateway",
     description="중앙집중형 MCP 서버 - 모든 MCP 요청을 백엔드 서비스로 라우팅",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -30,10 +211,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-# 백엔드 서비스 URL
-ROMANIZE_SERVER_URL = "http://romanize-service:8080"
-TTS_SERVER_URL = "http://tts-service:8000"  # 컨테이너 내부에서는 8000 포트 사용
+# 요청별 wall/on-CPU 시간 (REQUEST_TIMING 또는 POST /debug/loop 로 켰을 때만 측정)
+app.add_middleware(RequestTimingMiddleware, timer=_request_timer)
 
 # MCP 요청/응답 모델
 class McpRequest(BaseModel):
@@ -48,6 +227,11 @@ class McpResponse(BaseModel):
     result: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None
     error: Optional[Dict[str, Any]] = None
 
+# 이벤트 루프 진단 설정 변경 (생략한 항목은 그대로)
+class LoopDiagnosticsUpdate(BaseModel):
+    blocking: Optional[bool] = None
+    request_timing: Optional[bool] = None
+
 # MCP 도구 정의
 def get_romanize_tools() -> List[Dict[str, Any]]:
     """로마자 변환 도구 목록"""
@@ -61,6 +245,11 @@ def get_romanize_tools() -> List[Dict[str, Any]]:
                     "text": {
                         "type": "string",
                         "description": "변환할 한국어 텍스트 (단문)"
+                    },
+                    "structured": {
+                        "type": "boolean",
+                        "description": "true 이면 structuredContent 에 {text, romanized} 를 함께 반환합니다.",
+                        "default": False
                     }
                 },
                 "required": ["text"]
@@ -75,10 +264,62 @@ def get_romanize_tools() -> List[Dict[str, Any]]:
                     "text": {
                         "type": "string",
                         "description": "변환할 한국어 가사 텍스트 (여러 줄 가능)"
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "true 이면 고유 줄 표(lines, romanized)와 줄 순서(sequence)를 담은 JSON으로 반환합니다. 후렴이 많은 가사의 응답 크기를 줄입니다.",
+                        "default": False
+                    },
+                    "structured": {
+                        "type": "boolean",
+                        "description": "true 이면 한글/로마자 줄 배열(lines, romanized)을 structuredContent 로 반환하고, text 에는 한 줄 요약만 담습니다. compact 와 함께 쓰면 고유 줄 표와 sequence 를 반환합니다.",
+                        "default": False
                     }
                 },
                 "required": ["text"]
             }
+        },
+        {
+            "name": "romanize_lyrics_edit",
+            "description": "가사 편집기용 증분 로마자 변환입니다. document_id 와 text 로 문서를 연 뒤에는 줄 단위 편집(edits)과 마지막으로 받은 version 만 보내면 바뀐 줄의 로마자만 돌려줍니다. unknown_document 나 version_conflict 오류를 받으면 text 로 다시 여세요.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "document_id": {
+                        "type": "string",
+                        "description": "편집 중인 가사 문서 id"
+                    },
+                    "text": {
+                        "type": "string",
+                        "description": "문서 전체 텍스트. 지정하면 문서를 새로 열고 모든 줄을 반환합니다."
+                    },
+                    "edits": {
+                        "type": "array",
+                        "description": "순서대로 적용할 줄 편집. insert: {op, at, lines}, delete: {op, start, end}, replace: {op, start, end, lines}. 줄 번호는 0부터, end 는 포함하지 않으며 앞선 편집을 적용한 문서 기준입니다.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "op": {"type": "string", "enum": ["insert", "delete", "replace"]},
+                                "at": {"type": "integer"},
+                                "start": {"type": "integer"},
+                                "end": {"type": "integer"},
+                                "lines": {"type": "array", "items": {"type": "string"}}
+                            },
+                            "required": ["op"]
+                        }
+                    },
+                    "version": {
+                        "type": "integer",
+                        "description": "클라이언트가 마지막으로 받은 문서 버전 (편집에 필수). 다르면 version_conflict 오류를 반환합니다."
+                    },
+                    "close": {
+                        "type": "boolean",
+                        "description": "true 이면 문서 세션을 닫습니다.",
+                        "default": False
+                    }
+                },
+                "required": ["document_id"]
+            }
         }
     ]
 
@@ -114,6 +355,11 @@ def get_tts_tools() -> List[Dict[str, Any]]:
                         "type": "string",
                         "description": "음높이",
                         "default": "+0Hz"
+                    },
+                    "output_format": {
+                        "type": "string",
+                        "description": "출력 포맷 (mp3-48k: 기본, mp3-32k/webm-opus/ogg-opus: 모바일용 저용량)",
+                        "enum": ["mp3-48k", "mp3-32k", "webm-opus", "ogg-opus"]
                     }
                 },
                 "required": ["text"]
@@ -133,6 +379,11 @@ def get_tts_tools() -> List[Dict[str, Any]]:
                         "type": "string",
                         "description": "음성 선택",
                         "default": "ko-KR-SunHiNeural"
+                    },
+                    "output_format": {
+                        "type": "string",
+                        "description": "출력 포맷 (mp3-48k: 기본, mp3-32k/webm-opus/ogg-opus: 모바일용 저용량)",
+                        "enum": ["mp3-48k", "mp3-32k", "webm-opus", "ogg-opus"]
                     }
                 },
                 "required": ["text"]
@@ -140,16 +391,95 @@ def get_tts_tools() -> List[Dict[str, Any]]:
         }
     ]
 
+# 도구 목록은 요청마다 만들지 않고 시작 시 한 번만 생성
+ALL_TOOLS = get_romanize_tools() + get_tts_tools()
+
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
     return {"status": "healthy", "service": "MCP Gateway"}
 
+@app.get("/metrics")
+async def metrics():
+    """워커 런타임 지표 (이벤트 루프 지연, 로마자 오프로드/배치, 줄 메모, 편집 세션, 데드라인)"""
+    return {
+        "pid": os.getpid(),
+        "romanize_engine": ROMANIZE_ENGINE,
+        "event_loop": _loop_monitor.stats(),
+        "romanize_offload": _offloader.stats(),
+        "romanize_batch": _romanize_batcher.stats(),
+        "line_memo": _line_memo.stats(),
+        "lyrics_sessions": _lyrics_sessions.stats(),
+        "tts_url_mode": TTS_URL_MODE,
+        "short_url_memo": _short_url_memo.stats(),
+        "deadlines": _deadlines.stats(),
+        "log_records_dropped": _log_handler.dropped,
+    }
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """진단 엔드포인트 관리자 token 확인 (ADMIN_TOKEN 이 없으면 404 로 숨김, 다르면 401)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="관리자 token 이 필요합니다")
+
+def loop_diagnostics() -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "event_loop": _loop_monitor.stats(),
+        "blocking": _blocking_detector.stats(),
+        "request_timing": _request_timer.stats(),
+    }
+
+@app.get("/debug/loop", dependencies=[Depends(require_admin)])
+async def get_loop_diagnostics():
+    """이 워커의 루프 지연, 최근 루프 멈춤과 그 순간의 스택, 경로별 wall/on-CPU 시간"""
+    return loop_diagnostics()
+
+@app.post("/debug/loop", dependencies=[Depends(require_admin)])
+async def update_loop_diagnostics(update: LoopDiagnosticsUpdate):
+    """이 워커의 루프 멈춤 감지와 요청 시간 집계를 켜거나 끔 (켜면 요청 시간 집계를 초기화)"""
+    if update.blocking is True:
+        _blocking_detector.start()
+    elif update.blocking is False:
+        _blocking_detector.stop()
+    if update.request_timing is True:
+        _request_timer.reset()
+        _request_timer.start()
+    elif update.request_timing is False:
+        _request_timer.stop()
+    logger.info(
+        "이벤트 루프 진단 설정 변경 (멈춤 감지 %s, 요청 시간 %s)",
+        _blocking_detector.enabled, _request_timer.enabled
+    )
+    return loop_diagnostics()
+
+@app.get("/debug/profile", dependencies=[Depends(require_admin)], response_class=PlainTextResponse)
+async def get_profile(
+    seconds: float = Query(5.0, gt=0), interval_ms: float = Query(10.0, ge=1, le=1000)
+):
+    """
+    이 워커의 이벤트 루프 스레드 스택을 seconds 동안 표본 추출해 collapsed stack 형식으로 반환
+    (flamegraph.pl / speedscope 입력)
+    """
+    if seconds > PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"프로파일 시간은 최대 {PROFILE_MAX_SECONDS:g}초입니다")
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="이 워커에서 이미 프로파일을 수집하는 중입니다")
+    async with _profile_lock:
+        logger.info("스택 표본 프로파일 시작 (%.1f초, 간격 %.0fms)", seconds, interval_ms)
+        samples = await asyncio.to_thread(
+            sample_stacks, threading.get_ident(), seconds, interval_ms / 1000
+        )
+    return PlainTextResponse(collapse_stacks(samples), headers={"X-Worker-Pid": str(os.getpid())})
+
 @app.post("/mcp")
-async def handle_mcp_post_request(request: McpRequest):
+async def handle_mcp_post_request(
+    request: McpRequest, x_deadline_ms: Optional[str] = Header(default=None)
+):
     """MCP POST 요청 처리 (JSON-RPC 2.0)"""
     try:
-        logger.info(f"MCP 요청 수신: {request.method}")
+        logger.info("MCP 요청 수신: %s", request.method)
         
         if request.method == "initialize":
             # MCP 초기화 응답 (JSON-RPC 2.0 형식)
@@ -175,33 +505,29 @@ async def handle_mcp_post_request(request: McpRequest):
         
         elif request.method == "tools/list":
             # 모든 도구 목록 통합 (JSON-RPC 2.0 형식)
-            all_tools = get_romanize_tools() + get_tts_tools()
             return {
                 "jsonrpc": "2.0", 
                 "id": request.id,
-                "result": {"tools": all_tools}
+                "result": {"tools": ALL_TOOLS}
             }
         
         elif request.method == "tools/call":
             tool_name = request.params.get("name")
-            logger.info(f"도구 호출: {tool_name}")
+            logger.info("도구 호출: %s", tool_name)
+            normalize_tool_arguments(request)
             
             # 로마자 변환 도구
             if tool_name.startswith("romanize_"):
-                result = await call_romanize_server(request)
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.id,
-                    "result": {"content": [{"type": "text", "text": str(result)}]}
-                }
+                result = await call_with_deadline(call_romanize_server, request, x_deadline_ms)
+                return tool_json_response(
+                    {"jsonrpc": "2.0", "id": request.id, **unwrap_tool_response(result)}
+                )
             # TTS 도구
             elif tool_name.startswith("tts_"):
-                result = await call_tts_server(request)
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.id,
-                    "result": {"content": [{"type": "text", "text": str(result)}]}
-                }
+                result = await call_with_deadline(call_tts_server, request, x_deadline_ms)
+                return tool_json_response(
+                    {"jsonrpc": "2.0", "id": request.id, **unwrap_tool_response(result)}
+                )
             else:
                 return {
                     "jsonrpc": "2.0",
@@ -217,7 +543,7 @@ async def handle_mcp_post_request(request: McpRequest):
             }
     
     except Exception as e:
-        logger.error(f"MCP 요청 처리 오류: {str(e)}")
+        logger.error("MCP 요청 처리 오류: %s", e)
         return {
             "jsonrpc": "2.0",
             "id": getattr(request, 'id', 'unknown'),
@@ -228,25 +554,25 @@ async def handle_mcp_post_request(request: McpRequest):
 async def handle_mcp_get_request_simple():
     """MCP GET 요청 처리 (PlayMCP 호환성) - 간단한 경로"""
     # 모든 도구 목록 반환 (MCP 표준 형식)
-    all_tools = get_romanize_tools() + get_tts_tools()
     return {
-        "tools": all_tools
+        "tools": ALL_TOOLS
     }
 
 @app.get("/mcp/jsonrpc")
 async def handle_mcp_get_request():
     """MCP GET 요청 처리 (PlayMCP 호환성)"""
     # 모든 도구 목록 반환 (MCP 표준 형식)
-    all_tools = get_romanize_tools() + get_tts_tools()
     return {
-        "tools": all_tools
+        "tools": ALL_TOOLS
     }
 
 @app.post("/mcp/jsonrpc")
-async def handle_mcp_request(request: McpRequest):
+async def handle_mcp_request(
+    request: McpRequest, x_deadline_ms: Optional[str] = Header(default=None)
+):
     """MCP JSON-RPC 요청 처리"""
     try:
-        logger.info(f"MCP 요청 수신: {request.method}")
+        logger.info("MCP 요청 수신: %s", request.method)
         
         if request.method == "initialize":
             # MCP 초기화 응답
@@ -263,8 +589,7 @@ async def handle_mcp_request(request: McpRequest):
         
         elif request.method == "tools/list":
             # 모든 도구 목록 통합 (MCP Inspector 호환)
-            all_tools = get_romanize_tools() + get_tts_tools()
-            return {"tools": all_tools}
+            return {"tools": ALL_TOOLS}
         
         elif request.method == "tools/call":
             tool_name = request.params.get("name")
@@ -272,34 +597,302 @@ async def handle_mcp_request(request: McpRequest):
             
             if tool_name.startswith("romanize_"):
                 # 로마자 변환 서버로 전달
-                result = await call_romanize_server(request)
-                return {"content": [{"type": "text", "text": str(result)}]}
+                result = await call_with_deadline(call_romanize_server, request, x_deadline_ms)
             elif tool_name.startswith("tts_"):
                 # TTS 서버로 전달
-                result = await call_tts_server(request)
-                return {"content": [{"type": "text", "text": str(result)}]}
+                result = await call_with_deadline(call_tts_server, request, x_deadline_ms)
             else:
                 return {"error": f"알 수 없는 도구: {tool_name}"}
+            body = unwrap_tool_response(result)
+            return tool_json_response(body.get("result", body))
         
         else:
             return {"error": f"지원하지 않는 메서드: {request.method}"}
     
     except Exception as e:
-        logger.error(f"MCP 요청 처리 중 오류: {str(e)}")
+        logger.error("MCP 요청 처리 중 오류: %s", e)
         return {"error": f"Internal error: {str(e)}"}
 
+async def call_with_deadline(
+    call: Callable[[McpRequest], Awaitable[McpResponse]],
+    request: McpRequest,
+    x_deadline_ms: Optional[str],
+) -> McpResponse:
+    """
+    도구별 시간 예산 안에서 도구를 호출합니다 (deadline.py).
+
+    예산을 넘기면 진행 중인 백엔드 호출을 취소하고 JSON-RPC 오류(-32001)로 응답합니다.
+    """
+    tool_name = request.params.get("name")
+    try:
+        return await _deadlines.run(tool_name, call(request), parse_header_budget(x_deadline_ms))
+    except ToolDeadlineExceeded as e:
+        logger.warning("도구 호출 제한 시간 초과: %s (예산 %.1f초)", tool_name, e.budget)
+        return McpResponse(
+            id=request.id,
+            error={
+                "code": -32001,
+                "message": "요청 제한 시간 초과",
+                "data": {"tool": tool_name, "budget_ms": round(e.budget * 1000)}
+            }
+        )
+
+
+def normalize_tool_arguments(request: McpRequest) -> None:
+    """
+    도구 인자의 텍스트와 운율 값을 정규형으로 바꿉니다 (textnorm.py).
+
+    TTS 도구는 TTS 서버와 같은 정규형을 써서 CRLF/LF, NFC/NFD 한글, 전각 문장부호처럼 사소하게
+    다른 입력이 짧은 URL 메모와 TTS 서버 캐시에서 같은 요청이 되도록 합니다. 로마자 변환 도구는
+    결과가 원문과 같도록 줄바꿈과 NFC 만 정규화합니다.
+    """
+    tool_name = request.params.get("name") or ""
+    arguments = request.params.get("arguments")
+    if not isinstance(arguments, dict):
+        return
+    text = arguments.get("text")
+    if isinstance(text, str):
+        arguments["text"] = normalize_tts_text(text) if tool_name.startswith("tts_") else normalize_romanize_text(text)
+    if tool_name.startswith("tts_"):
+        for key in ("rate", "volume", "pitch"):
+            if isinstance(arguments.get(key), str):
+                arguments[key] = normalize_prosody(arguments[key])
+
+
+def unwrap_tool_response(result: McpResponse) -> Dict[str, Any]:
+    """
+    도구 호출 결과(McpResponse)에서 JSON-RPC 본문을 꺼냅니다.
+
+    백엔드의 content / structuredContent 를 그대로 result 로 쓰고, 오류는 JSON-RPC error 로
+    전달합니다 (응답 모델을 문자열로 감싸 다시 싣지 않음).
+    """
+    if result.error is not None:
+        return {"error": result.error}
+    return {"result": result.result}
+
+
+def tool_json_response(body: Dict[str, Any]) -> JSONResponse:
+    """
+    도구 응답은 이미 JSON 타입(dict/list/str/int)만 담고 있으므로 jsonable_encoder 를
+    거치지 않고 바로 직렬화합니다 (줄 배열이 긴 structuredContent 에서 차이가 큼).
+    """
+    return JSONResponse(body)
+
+
+def backend_text(result: McpResponse) -> str:
+    """백엔드 도구 응답의 첫 번째 text content"""
+    for item in (result.result or {}).get("content", []):
+        if item.get("type") == "text":
+            return item.get("text", "")
+    return ""
+
+
+class BackendToolError(Exception):
+    """백엔드가 JSON-RPC 오류로 응답함 (호출자에게 그대로 전달)"""
+
+    def __init__(self, error: Dict[str, Any]) -> None:
+        super().__init__(error.get("message", "로마자 변환 서버 오류"))
+        self.error = error
+
+
+async def romanize_lines_via_backend(lines: List[str]) -> List[str]:
+    """여러 줄을 romanize_lyrics 한 번으로 변환해 줄 순서대로 로마자를 반환"""
+    with _deadlines.backend_call("romanize"):
+        response = await get_http_client().post(
+            f"{ROMANIZE_SERVER_URL}/mcp/jsonrpc",
+            json={
+                "jsonrpc": "2.0",
+                "id": "lyrics-dedup",
+                "method": "tools/call",
+                "params": {"name": "romanize_lyrics", "arguments": {"text": "\n".join(lines)}},
+            },
+            headers=_deadlines.headers(),
+        )
+    response.raise_for_status()
+    body = response.json()
+    if body.get("error"):
+        raise BackendToolError(body["error"])
+    return parse_lyrics_pairs(body["result"]["content"][0]["text"], len(lines))
+
+
+async def romanize_lines(lines: List[str]) -> List[str]:
+    """설정된 엔진으로 여러 줄을 변환 (local 이면 큰 요청은 프로세스 풀에서)"""
+    if ROMANIZE_ENGINE == "local":
+        with _deadlines.backend_call("romanize_pool"):
+            return await _offloader.romanize_lines(lines)
+    return await romanize_lines_via_backend(lines)
+
+
+async def romanize_batch_via_backend(
+    texts: List[str], remaining: Optional[float]
+) -> List[Union[str, Exception]]:
+    """
+    모은 romanize_single 텍스트를 romanize_batch 한 번으로 변환해 입력 순서대로 반환
+
+    백엔드가 변환하지 못한 텍스트(항목의 ``isError``)는 그 자리에 BackendToolError 를 둡니다.
+    """
+    with _deadlines.backend_call("romanize_batch"):
+        response = await get_http_client().post(
+            f"{ROMANIZE_SERVER_URL}/mcp/jsonrpc",
+            json={
+                "jsonrpc": "2.0",
+                "id": "romanize-batch",
+                "method": "tools/call",
+                "params": {"name": "romanize_batch", "arguments": {"texts": texts}},
+            },
+            headers=_deadlines.headers_for(remaining),
+        )
+    response.raise_for_status()
+    body = response.json()
+    if body.get("error"):
+        raise BackendToolError(body["error"])
+    # 텍스트마다 content 항목 하나
+    return [
+        BackendToolError({
+            "code": -32603,
+            "message": "로마자 변환 서버 오류",
+            "data": item.get("errorMessage"),
+        })
+        if item.get("isError") else item["text"]
+        for item in body["result"]["content"]
+    ]
+
+
+async def call_romanize_lyrics(request: McpRequest) -> McpResponse:
+    """가사 변환: 같은 줄은 한 번만 변환하고 워커 공용 줄 메모를 재사용"""
+    arguments = request.params.get("arguments", {})
+    try:
+        text, structured, stats = await romanize_lyrics(
+            arguments.get("text", ""),
+            romanize_lines,
+            _line_memo,
+            compact=bool(arguments.get("compact", False)),
+            structured=bool(arguments.get("structured", False)),
+        )
+        logger.info(
+            "가사 변환: 전체 %d줄, 고유 %d줄, 백엔드 변환 %d줄 (메모 %d줄)",
+            stats["lines"], stats["unique_lines"], stats["backend_lines"], len(_line_memo)
+        )
+        result: Dict[str, Any] = {"content": [{"type": "text", "text": text}]}
+        if structured is not None:
+            result["structuredContent"] = structured
+        return McpResponse(id=request.id, result=result)
+    except BackendToolError as e:
+        return McpResponse(id=request.id, error=e.error)
+    except Exception as e:
+        logger.error("가사 변환 실패: %s", e)
+        return McpResponse(
+            id=request.id,
+            error={
+                "code": -32603,
+                "message": "로마자 변환 서버 오류",
+                "data": str(e)
+            }
+        )
+
+
+async def call_romanize_lyrics_edit(request: McpRequest) -> McpResponse:
+    """가사 편집기 증분 변환: 바뀐 줄만 다시 계산해서 반환"""
+    arguments = request.params.get("arguments", {})
+    document_id = str(arguments.get("document_id", ""))
+    try:
+        if not document_id:
+            raise LyricsSessionError("document_id 가 필요합니다", "invalid_edit")
+        if arguments.get("close"):
+            closed = await _lyrics_sessions.close(document_id)
+            result: Dict[str, Any] = {"document_id": document_id, "closed": closed}
+        elif arguments.get("text") is not None:
+            result = await _lyrics_sessions.open(
+                document_id, arguments["text"], romanize_lines
+            )
+        else:
+            result = await _lyrics_sessions.apply(
+                document_id,
+                arguments.get("edits") or [],
+                romanize_lines,
+                base_version=arguments.get("version"),
+            )
+            logger.info(
+                "가사 증분 변환: %s v%d, 변경 %d줄 / 전체 %d줄",
+                document_id, result["version"], len(result["changed"]), result["line_count"]
+            )
+        return McpResponse(
+            id=request.id,
+            result={"content": [{
+                "type": "text",
+                "text": json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+            }]}
+        )
+    except LyricsSessionError as e:
+        return McpResponse(
+            id=request.id,
+            error={"code": -32602, "message": str(e), "data": {"reason": e.code}}
+        )
+    except BackendToolError as e:
+        return McpResponse(id=request.id, error=e.error)
+    except Exception as e:
+        logger.error("가사 증분 변환 실패: %s", e)
+        return McpResponse(
+            id=request.id,
+            error={
+                "code": -32603,
+                "message": "로마자 변환 서버 오류",
+                "data": str(e)
+            }
+        )
+
+
 async def call_romanize_server(request: McpRequest) -> McpResponse:
     """로마자 변환 서버 호출"""
+    tool_name = request.params.get("name")
+    if tool_name == "romanize_lyrics_edit":
+        return await call_romanize_lyrics_edit(request)
+    arguments = request.params.get("arguments", {})
+    structured = bool(arguments.get("structured", False))
+    if tool_name == "romanize_single" and not isinstance(arguments.get("text", ""), str):
+        # 배치에 넣으면 백엔드에서 배치 전체가 실패하므로 미리 거절
+        return McpResponse(
+            id=request.id,
+            error={"code": -32602, "message": "Invalid params", "data": "text 는 문자열이어야 합니다"}
+        )
+    if tool_name == "romanize_lyrics" and (LYRICS_DEDUP or ROMANIZE_ENGINE == "local" or structured):
+        return await call_romanize_lyrics(request)
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{ROMANIZE_SERVER_URL}/mcp/jsonrpc",
-                json=request.dict()
+        if ROMANIZE_ENGINE == "local" and tool_name == "romanize_single":
+            text = arguments.get("text", "")
+            with _deadlines.backend_call("romanize_pool"):
+                romanized = await _offloader.romanize_text(text)
+            result = McpResponse(
+                id=request.id,
+                result={"content": [{"type": "text", "text": romanized}]}
+            )
+        elif _romanize_batcher.enabled and tool_name == "romanize_single":
+            romanized = await _romanize_batcher.romanize(
+                arguments.get("text", ""), _deadlines.remaining()
             )
+            result = McpResponse(
+                id=request.id,
+                result={"content": [{"type": "text", "text": romanized}]}
+            )
+        else:
+            with _deadlines.backend_call("romanize"):
+                response = await get_http_client().post(
+                    f"{ROMANIZE_SERVER_URL}/mcp/jsonrpc",
+                    json=request.dict(),
+                    headers=_deadlines.headers()
+                )
             response.raise_for_status()
-            return McpResponse(**response.json())
+            result = McpResponse(**response.json())
+        if structured and tool_name == "romanize_single" and result.error is None:
+            result.result["structuredContent"] = {
+                "text": arguments.get("text", ""),
+                "romanized": backend_text(result),
+            }
+        return result
+    except BackendToolError as e:
+        return McpResponse(id=request.id, error=e.error)
     except Exception as e:
-        logger.error(f"로마자 변환 서버 호출 실패: {str(e)}")
+        logger.error("로마자 변환 서버 호출 실패: %s", e)
         return McpResponse(
             id=request.id,
             error={
@@ -309,32 +902,104 @@ async def call_romanize_server(request: McpRequest) -> McpResponse:
             }
         )
 
+async def create_tts_job(arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    TTS 서버에 비동기 합성 작업을 등록합니다.
+
+    긴 텍스트도 합성이 백그라운드에서 진행되므로 클라이언트는 결과 URL 을 바로 받고,
+    결과 URL 은 내용이 바뀌지 않아 캐시할 수 있습니다. 작업 등록에 실패하면 None 을
+    돌려주며 호출자는 기존 synthesize URL 로 대체합니다.
+    """
+    payload = {
+        key: arguments[key]
+        for key in ("text", "voice", "rate", "volume", "pitch", "output_format")
+        if arguments.get(key) is not None
+    }
+    try:
+        with _deadlines.backend_call("tts"):
+            response = await get_http_client().post(
+                f"{TTS_SERVER_URL}/api/v1/tts/jobs", json=payload, headers=_deadlines.headers()
+            )
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning("TTS 작업 등록 실패, synthesize URL 로 대체: %s", e)
+        return None
+
+
+def direct_tts_url(endpoint: str, arguments: Dict[str, Any], default_text: str) -> str:
+    """텍스트와 모든 파라미터를 쿼리 문자열에 담은 GET URL"""
+    params = {
+        "text": arguments.get("text", default_text),
+        "voice": arguments.get("voice", "ko-KR-SunHiNeural"),
+        "rate": arguments.get("rate", "+0%"),
+        "volume": arguments.get("volume", "+0%"),
+        "pitch": arguments.get("pitch", "+0Hz"),
+    }
+    if arguments.get("output_format"):
+        params["output_format"] = arguments["output_format"]
+    return f"{TTS_PUBLIC_URL}/api/v1/tts/{endpoint}?{urllib.parse.urlencode(params, quote_via=urllib.parse.quote)}"
+
+
+async def short_tts_url(arguments: Dict[str, Any], download: bool) -> Optional[str]:
+    """
+    합성 조건을 TTS 서버의 클립 레지스트리에 등록하고 짧은 서명 URL(/a/{token})을 만듭니다.
+
+    같은 조건은 같은 URL 이 되므로 게이트웨이에서도 등록 결과를 메모해 두고 다시 묻지
+    않습니다. 등록에 실패하면 None 을 돌려주며 호출자는 쿼리 문자열 URL 로 대체합니다.
+    """
+    payload = {
+        key: arguments[key]
+        for key in ("text", "voice", "rate", "volume", "pitch", "output_format")
+        if arguments.get(key) is not None
+    }
+    memo_key = canonical_hash(*(f"{key}={payload[key]}" for key in sorted(payload)))
+    found, _ = _short_url_memo.lookup([memo_key])
+    path = found.get(memo_key)
+    if path is None:
+        try:
+            with _deadlines.backend_call("tts"):
+                response = await get_http_client().post(
+                    f"{TTS_SERVER_URL}/api/v1/tts/clips", json=payload, headers=_deadlines.headers()
+                )
+            response.raise_for_status()
+            path = response.json()["path"]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning("짧은 TTS URL 등록 실패, 쿼리 문자열 URL 로 대체: %s", e)
+            return None
+        _short_url_memo.store(memo_key, path)
+    return f"{TTS_PUBLIC_URL}{path}{'?dl=1' if download else ''}"
+
+
 async def call_tts_server(request: McpRequest) -> McpResponse:
     """TTS 서버 호출"""
     try:
         tool_name = request.params.get("name")
         arguments = request.params.get("arguments", {})
         
+        if tool_name == "tts_synthesize" and TTS_URL_MODE == "job":
+            job = await create_tts_job(arguments)
+            if job is not None:
+                return McpResponse(
+                    id=request.id,
+                    result={
+                        "content": [{
+                            "type": "text",
+                            "text": f"""💾 **TTS 다운로드 URL**
+                                    {TTS_PUBLIC_URL}{job["audio_url"]}
+                                    ⏳ 합성 상태: {TTS_PUBLIC_URL}{job["status_url"]}
+                                    💡 합성이 끝나기 전에 열어도 만들어지는 대로 재생되며, 같은 URL 은 다시 합성하지 않습니다."""
+                        }]
+                    }
+                )
+
         if tool_name == "tts_synthesize":
             # GET 방식 TTS 다운로드: 브라우저에서 바로 다운로드 가능
-            import urllib.parse
-            
-            # 파라미터 추출
-            text = arguments.get("text", "변환할 텍스트를 주세요")
-            voice = arguments.get("voice", "ko-KR-SunHiNeural")
-            rate = arguments.get("rate", "+0%")
-            volume = arguments.get("volume", "+0%")
-            pitch = arguments.get("pitch", "+0Hz")
-            
-            # URL 인코딩 (모든 파라미터)
-            encoded_text = urllib.parse.quote(text)
-            encoded_voice = urllib.parse.quote(voice)
-            encoded_rate = urllib.parse.quote(rate)
-            encoded_volume = urllib.parse.quote(volume)
-            encoded_pitch = urllib.parse.quote(pitch)
-            
-            # 완성된 GET URL 생성
-            download_url = f"https://k-pop-romanizer.duckdns.org/tts/api/v1/tts/synthesize?text={encoded_text}&voice={encoded_voice}&rate={encoded_rate}&volume={encoded_volume}&pitch={encoded_pitch}"
+            download_url = None
+            if TTS_URL_MODE == "short":
+                download_url = await short_tts_url(arguments, download=True)
+            if download_url is None:
+                download_url = direct_tts_url("synthesize", arguments, "변환할 텍스트를 주세요")
             
             return McpResponse(
                 id=request.id,
@@ -350,24 +1015,11 @@ async def call_tts_server(request: McpRequest) -> McpResponse:
         
         elif tool_name == "tts_stream":
             # GET 방식 TTS 스트리밍: 브라우저 주소창에서 바로 재생 가능
-            import urllib.parse
-            
-            # 파라미터 추출
-            text = arguments.get("text", "안녕하세요")
-            voice = arguments.get("voice", "ko-KR-SunHiNeural")
-            rate = arguments.get("rate", "+0%")
-            volume = arguments.get("volume", "+0%")
-            pitch = arguments.get("pitch", "+0Hz")
-            
-            # URL 인코딩 (모든 파라미터)
-            encoded_text = urllib.parse.quote(text)
-            encoded_voice = urllib.parse.quote(voice)
-            encoded_rate = urllib.parse.quote(rate)
-            encoded_volume = urllib.parse.quote(volume)
-            encoded_pitch = urllib.parse.quote(pitch)
-            
-            # 완성된 GET URL 생성
-            stream_url = f"https://k-pop-romanizer.duckdns.org/tts/api/v1/tts/stream?text={encoded_text}&voice={encoded_voice}&rate={encoded_rate}&volume={encoded_volume}&pitch={encoded_pitch}"
+            stream_url = None
+            if TTS_URL_MODE == "short":
+                stream_url = await short_tts_url(arguments, download=False)
+            if stream_url is None:
+                stream_url = direct_tts_url("stream", arguments, "안녕하세요")
             
             return McpResponse(
                 id=request.id,
@@ -385,7 +1037,7 @@ async def call_tts_server(request: McpRequest) -> McpResponse:
             raise HTTPException(status_code=400, detail=f"알 수 없는 TTS 도구: {tool_name}")
     
     except Exception as e:
-        logger.error(f"TTS 서버 호출 실패: {str(e)}")
+        logger.error("TTS 서버 호출 실패: %s", e)
         return McpResponse(
             id=request.id,
             error={
@@ -395,6 +1047,55 @@ async def call_tts_server(request: McpRequest) -> McpResponse:
             }
         )
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_runtime_options() -> Dict[str, Any]:
+    """
+    uvicorn 실행 옵션을 환경 변수로 구성합니다.
+
+    GATEWAY_PROFILE=production 이면 CPU 수만큼의 워커, uvloop + httptools, 접근 로그 끄기,
+    keep-alive / 동시 처리 제한, SIGTERM 시 진행 중 요청 드레인을 기본값으로 사용합니다.
+    개별 GATEWAY_* 변수는 프로필 기본값을 덮어씁니다.
+    """
+    production = os.getenv("GATEWAY_PROFILE", "default") == "production"
+    defaults: Dict[str, Any] = {
+        "loop": "uvloop" if production else "auto",
+        "http": "httptools" if production else "auto",
+        "access_log": not production,
+        "timeout_keep_alive": 75 if production else 5,
+        "limit_concurrency": 1024 if production else None,
+        "backlog": 2048,
+        "timeout_graceful_shutdown": 30 if production else None,
+    }
+    limit_concurrency = os.getenv("GATEWAY_LIMIT_CONCURRENCY")
+    graceful_timeout = os.getenv("GATEWAY_GRACEFUL_TIMEOUT")
+    return {
+        "host": os.getenv("GATEWAY_HOST", "0.0.0.0"),
+        "port": int(os.getenv("GATEWAY_PORT", "8000")),
+        "workers": _gateway_workers(),
+        "loop": os.getenv("GATEWAY_LOOP", defaults["loop"]),
+        "http": os.getenv("GATEWAY_HTTP", defaults["http"]),
+        "access_log": _env_bool("GATEWAY_ACCESS_LOG", defaults["access_log"]),
+        "timeout_keep_alive": int(
+            os.getenv("GATEWAY_KEEPALIVE_TIMEOUT", defaults["timeout_keep_alive"])
+        ),
+        "limit_concurrency": int(limit_concurrency) if limit_concurrency
+        else defaults["limit_concurrency"],
+        "backlog": int(os.getenv("GATEWAY_BACKLOG", defaults["backlog"])),
+        "timeout_graceful_shutdown": int(graceful_timeout) if graceful_timeout
+        else defaults["timeout_graceful_shutdown"],
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    options = get_runtime_options()
+    logger.info("MCP Gateway 실행 옵션: %s", options)
+    # 멀티 워커는 각 워커가 모듈을 직접 import 해야 하므로 import 문자열로 전달
+    uvicorn.run(app if options["workers"] == 1 else "app:app", **options)
@@ -0,0 +1,157 @@
+"""
+도구별 시간 예산과 데드라인 전파
+
+``tools/call`` 은 nginx(30초), 게이트웨이, 백엔드를 차례로 거칩니다. 예전에는 바깥쪽이
+포기한 뒤에도 안쪽 작업이 계속 돌았습니다. 여기서는
+
+- 도구마다 시간 예산을 정하고(``TOOL_DEADLINES``), 요청에 ``X-Deadline-Ms`` 헤더가 있으면
+  (nginx 가 남은 시간을 넣어 줌) 둘 중 짧은 쪽을 이 요청의 데드라인으로 삼습니다.
+- 백엔드 호출에는 남은 시간(밀리초, 여유분을 뺀 값)을 같은 헤더로 넘깁니다. 컨테이너마다
+  시계가 다를 수 있어 절대 시각이 아니라 남은 시간을 넘깁니다.
+- 데드라인이 지나면 진행 중인 백엔드 호출(HTTP 요청, 프로세스 풀 대기열의 청크)을 취소하고
+  JSON-RPC 오류로 응답합니다. 백엔드도 헤더를 보고 이미 늦은 작업은 시작하지 않습니다.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Iterator, Optional, TypeVar
+
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+# 기본 도구별 예산 (초). nginx proxy_read_timeout(30초)보다 짧게 잡음
+DEFAULT_TOOL_DEADLINES: Dict[str, float] = {
+    "romanize_single": 5.0,
+    "romanize_lyrics": 20.0,
+    "romanize_lyrics_edit": 10.0,
+    "tts_synthesize": 5.0,
+    "tts_stream": 5.0,
+}
+
+T = TypeVar("T")
+
+# 현재 도구 호출의 데드라인 (time.monotonic 기준, 없으면 None)
+_deadline: ContextVar[Optional[float]] = ContextVar("tool_deadline", default=None)
+
+
+class ToolDeadlineExceeded(Exception):
+    """도구 호출이 시간 예산 안에 끝나지 않음"""
+
+    def __init__(self, tool: str, budget: float) -> None:
+        super().__init__(f"도구 호출 제한 시간({budget:.1f}초)을 넘었습니다: {tool}")
+        self.tool = tool
+        self.budget = budget
+
+
+def parse_tool_deadlines(spec: str) -> Dict[str, float]:
+    """``romanize_lyrics=20,tts_stream=3`` 형식의 도구별 예산 (초)"""
+    budgets: Dict[str, float] = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            budgets[name.strip()] = float(value)
+    return budgets
+
+
+def parse_header_budget(value: Optional[str]) -> Optional[float]:
+    """헤더의 남은 시간(밀리초)을 초로 바꿉니다. 없거나 잘못된 값이면 None."""
+    if not value:
+        return None
+    try:
+        budget = float(value) / 1000
+    except ValueError:
+        return None
+    return budget if math.isfinite(budget) else None
+
+
+class ToolDeadlines:
+    """
+    Args:
+        budgets: 도구별 예산 (초, ``DEFAULT_TOOL_DEADLINES`` 를 덮어씀)
+        default: 목록에 없는 도구의 예산 (초)
+        margin: 백엔드에 넘길 때 빼는 여유분 (초, 응답이 돌아올 시간)
+    """
+
+    def __init__(self, budgets: Dict[str, float], default: float = 25.0, margin: float = 0.1):
+        self.budgets = {**DEFAULT_TOOL_DEADLINES, **budgets}
+        self.default = default
+        self.margin = margin
+        self.calls = 0
+        self.inflight_backend_calls = 0
+        self.expired: Dict[str, int] = {}
+        self.expired_on_arrival = 0
+        self.cancelled_backend_calls: Dict[str, int] = {}
+
+    def budget(self, tool: str, header_budget: Optional[float] = None) -> float:
+        """이 호출의 예산: 도구 예산과 바깥에서 받은 남은 시간 중 짧은 쪽"""
+        budget = self.budgets.get(tool, self.default)
+        if header_budget is not None:
+            budget = min(budget, header_budget)
+        return budget
+
+    async def run(self, tool: str, call: Awaitable[T], header_budget: Optional[float] = None) -> T:
+        """
+        예산 안에서 도구 호출을 실행합니다. 넘으면 진행 중인 백엔드 호출을 모두 취소합니다.
+
+        Raises:
+            ToolDeadlineExceeded: 예산 초과 (도착했을 때 이미 남은 시간이 없던 경우 포함)
+        """
+        self.calls += 1
+        budget = self.budget(tool, header_budget)
+        if budget <= 0:
+            self.expired_on_arrival += 1
+            if asyncio.iscoroutine(call):
+                call.close()
+            raise ToolDeadlineExceeded(tool, budget)
+        token = _deadline.set(time.monotonic() + budget)
+        try:
+            async with asyncio.timeout(budget) as scope:
+                return await call
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            self.expired[tool] = self.expired.get(tool, 0) + 1
+            raise ToolDeadlineExceeded(tool, budget) from None
+        finally:
+            _deadline.reset(token)
+
+    def remaining(self) -> Optional[float]:
+        """현재 도구 호출의 남은 시간 (초, 데드라인 밖이면 None)"""
+        deadline = _deadline.get()
+        return None if deadline is None else deadline - time.monotonic()
+
+    def headers(self) -> Dict[str, str]:
+        """백엔드 호출에 붙일 데드라인 헤더 (데드라인 밖이면 빈 dict)"""
+        return self.headers_for(self.remaining())
+
+    def headers_for(self, remaining: Optional[float]) -> Dict[str, str]:
+        """남은 시간(초)을 직접 정한 백엔드 호출의 데드라인 헤더 (여러 호출을 모은 배치 등)"""
+        if remaining is None:
+            return {}
+        return {DEADLINE_HEADER: str(max(0, int((remaining - self.margin) * 1000)))}
+
+    @contextmanager
+    def backend_call(self, backend: str) -> Iterator[None]:
+        """진행 중인 백엔드 호출 수와 끝나기 전에 취소된 호출 수(대부분 데드라인)를 집계합니다."""
+        self.inflight_backend_calls += 1
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.cancelled_backend_calls[backend] = self.cancelled_backend_calls.get(backend, 0) + 1
+            raise
+        finally:
+            self.inflight_backend_calls -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "header": DEADLINE_HEADER,
+            "budgets_s": self.budgets,
+            "default_s": self.default,
+            "calls": self.calls,
+            "expired": dict(self.expired),
+            "expired_on_arrival": self.expired_on_arrival,
+            "inflight_backend_calls": self.inflight_backend_calls,
+            "cancelled_backend_calls": dict(self.cancelled_backend_calls),
+        }
@@ -0,0 +1,403 @@
+"""
+이벤트 루프 상태 측정과 프로파일링 (게이트웨이와 TTS 서버 공용)
+
+``mcp-gateway/loop_monitor.py`` 와 ``edge-tts-server/app/services/loop_monitor.py`` 는 같은
+파일입니다 (``textnorm.py`` 와 같은 방식, ``edge-tts-server/tests/test_loop_monitor.py`` 와
+``mcp-gateway/tests/test_shared_copies.py`` 가 확인).
+표준 라이브러리만 쓰며 asyncio 기본 루프와 uvloop 모두에서 동작합니다.
+
+- ``LoopLagMonitor``: 일정 간격으로 잠들었다 깨어나는 태스크가 예정보다 얼마나 늦게
+  깨어났는지를 기록합니다. 루프를 오래 붙잡는 작업이 있으면 지연이 커집니다.
+- ``BlockingDetector``: 루프가 ``threshold`` 이상 멈추면 감시 스레드가 그 순간 루프 스레드의
+  스택을 기록합니다 (느린 콜백을 붙잡고 있는 코드 위치).
+- ``RequestTimer`` / ``RequestTimingMiddleware``: 요청마다 경과 시간(wall)과 루프 스레드에서
+  실제로 CPU 를 쓴 시간(on-CPU)을 나눠 집계합니다. 요청이 만든 하위 태스크(스트리밍 본문 등)의
+  CPU 시간도 포함합니다.
+- ``sample_stacks`` / ``collapse_stacks``: 정해진 시간 동안 루프 스레드 스택을 표본 추출해
+  flamegraph 도구(flamegraph.pl, speedscope)가 읽는 collapsed stack 형식으로 만듭니다.
+
+지연 측정 외의 기능은 켜기 전에는 태스크, 스레드, 훅을 만들지 않습니다.
+"""
+
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+import types
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Coroutine, Deque, Dict, List, Optional
+
+_SITE_PACKAGES = os.sep + "site-packages" + os.sep
+_STDLIB = os.path.dirname(os.__file__) + os.sep
+
+
+class LoopLagMonitor:
+    """
+    Args:
+        interval: 측정 간격 (초)
+        window: 백분위수 계산에 쓰는 최근 측정 수
+        slow_threshold: 이 값(초)을 넘는 지연을 느린 구간으로 집계
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 1200, slow_threshold: float = 0.05):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.max_lag = 0.0
+        self.slow_count = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.slow_threshold:
+                self.slow_count += 1
+
+    def _percentile(self, ordered: list, pct: float) -> float:
+        index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"samples": 0}
+        return {
+            "samples": len(ordered),
+            "interval_ms": self.interval * 1000,
+            "lag_ms": {
+                "p50": round(self._percentile(ordered, 50) * 1000, 2),
+                "p99": round(self._percentile(ordered, 99) * 1000, 2),
+                "max_window": round(ordered[-1] * 1000, 2),
+                "max": round(self.max_lag * 1000, 2),
+            },
+            "slow_count": self.slow_count,
+            "slow_threshold_ms": self.slow_threshold * 1000,
+        }
+
+
+def _frame_label(frame: types.FrameType, lines: bool) -> str:
+    """``함수 (파일:줄)``, 파일은 site-packages, 표준 라이브러리, 작업 디렉토리 기준 상대 경로"""
+    filename = frame.f_code.co_filename
+    if _SITE_PACKAGES in filename:
+        filename = filename.rsplit(_SITE_PACKAGES, 1)[1]
+    elif filename.startswith(_STDLIB):
+        filename = filename[len(_STDLIB):]
+    else:
+        cwd = os.getcwd() + os.sep
+        if filename.startswith(cwd):
+            filename = filename[len(cwd):]
+    if lines:
+        filename = f"{filename}:{frame.f_lineno}"
+    return f"{frame.f_code.co_name} ({filename})"
+
+
+def _stack(frame: Optional[types.FrameType], limit: int, lines: bool = True) -> List[str]:
+    """바깥쪽부터 안쪽 순서의 프레임 이름 (안쪽 ``limit`` 개)"""
+    labels = []
+    while frame is not None and len(labels) < limit:
+        labels.append(_frame_label(frame, lines))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class BlockingDetector:
+    """
+    루프가 멈춘 순간의 스택을 기록하는 감시 스레드.
+
+    루프에서는 ``threshold / 4`` 간격으로 심장 박동 시각만 갱신하고, 감시 스레드가 박동이
+    ``threshold`` 이상 끊긴 것을 보면 ``sys._current_frames()`` 로 루프 스레드의 현재 스택을
+    읽습니다. 멈춤 하나에 스택은 한 번만 기록하고, 멈춘 시간은 박동이 다시 올 때까지 늘려 갑니다.
+
+    Args:
+        threshold: 멈춤으로 볼 최소 시간 (초)
+        max_events: 보관하는 최근 멈춤 수
+        stack_depth: 기록하는 스택 깊이 (안쪽부터)
+    """
+
+    def __init__(self, threshold: float = 0.1, max_events: int = 50, stack_depth: int = 40):
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.blocked_count = 0
+        self.blocked_seconds = 0.0
+        self.sites: Counter = Counter()  # 멈춘 위치(가장 안쪽 프레임)별 횟수
+        self._lock = threading.Lock()  # 감시 스레드와 루프 스레드가 같이 읽고 쓰는 집계
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread = 0
+        self._beat = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._watchdog is not None
+
+    def start(self) -> None:
+        """루프 스레드에서 호출합니다."""
+        if self._watchdog is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._heartbeat()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-blocking-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._watchdog is None:
+            return
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+
+    def _heartbeat(self) -> None:
+        self._beat = time.perf_counter()
+        self._timer = self._loop.call_later(self.threshold / 4, self._heartbeat)
+
+    def _watch(self) -> None:
+        current: Optional[Dict[str, Any]] = None
+        current_beat = 0.0
+        while not self._stop.wait(self.threshold / 4):
+            beat = self._beat
+            stalled = time.perf_counter() - beat
+            if current is not None and beat != current_beat:
+                current = None  # 루프가 다시 돌기 시작함
+            if stalled < self.threshold:
+                continue
+            if current is None:
+                frame = sys._current_frames().get(self._loop_thread)
+                stack = _stack(frame, self.stack_depth)
+                del frame
+                current = {
+                    "at": time.time(),
+                    "blocked_ms": 0.0,
+                    "stack": stack,
+                }
+                current_beat = beat
+                with self._lock:
+                    self.events.append(current)
+                    self.blocked_count += 1
+                    if stack:
+                        self.sites[stack[-1]] += 1
+            # 감시 간격 단위로 늘려 가는 근사값 (박동 간격만큼 짧게 잡힘)
+            with self._lock:
+                self.blocked_seconds += stalled - current["blocked_ms"] / 1000
+                current["blocked_ms"] = round(stalled * 1000, 1)
+
+    def stats(self, stacks: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = {
+                "enabled": self.enabled,
+                "threshold_ms": self.threshold * 1000,
+                "blocked_count": self.blocked_count,
+                "blocked_ms": round(self.blocked_seconds * 1000, 1),
+                "top_sites": [
+                    {"site": site, "count": count} for site, count in self.sites.most_common(10)
+                ],
+            }
+            if stacks:
+                snapshot["recent"] = [dict(event) for event in self.events]
+        return snapshot
+
+
+class _RequestTiming:
+    __slots__ = ("cpu",)
+
+    def __init__(self) -> None:
+        self.cpu = 0.0
+
+
+# 현재 요청의 CPU 시간 누적 대상 (요청이 만든 태스크는 컨텍스트를 복사하므로 같은 객체를 봄)
+_request_timing: contextvars.ContextVar[Optional[_RequestTiming]] = contextvars.ContextVar(
+    "request_timing", default=None
+)
+
+
+@types.coroutine
+def _on_cpu(coro: Coroutine[Any, Any, Any], timing: _RequestTiming) -> Any:
+    """``coro`` 를 한 단계씩 실행하며 단계마다 쓴 스레드 CPU 시간을 ``timing`` 에 더합니다."""
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        started = time.thread_time()
+        try:
+            if error is None:
+                future = coro.send(value)
+            else:
+                future = coro.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            timing.cpu += time.thread_time() - started
+        value, error = None, None
+        try:
+            value = yield future
+        except BaseException as e:
+            error = e
+
+
+async def _timed(coro: Coroutine[Any, Any, Any], timing: _RequestTiming) -> Any:
+    return await _on_cpu(coro, timing)
+
+
+class RequestTimer:
+    """
+    경로별 요청 경과 시간(wall)과 on-CPU 시간.
+
+    켜면 루프의 task factory 를 바꿔, 요청 처리 중에 만든 태스크도 같은 요청의 CPU 시간으로
+    집계합니다. wall 과 on-CPU 의 차이는 upstream 응답, 다른 요청에 루프를 내준 시간 등
+    기다린 시간입니다.
+
+    Args:
+        max_routes: 따로 집계하는 최대 경로 수 (넘으면 ``other``)
+    """
+
+    def __init__(self, max_routes: int = 100) -> None:
+        self.max_routes = max_routes
+        self.enabled = False
+        self.routes: Dict[str, Dict[str, float]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous_factory: Optional[Callable[..., Any]] = None
+
+    def start(self) -> None:
+        """루프 스레드에서 호출합니다."""
+        if self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        self.enabled = True
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._loop.set_task_factory(self._previous_factory)
+        self._previous_factory = None
+
+    def _task_factory(
+        self, loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, Any], **kwargs: Any
+    ) -> "asyncio.Future[Any]":
+        timing = _request_timing.get()
+        if timing is not None:
+            coro = _timed(coro, timing)
+        if self._previous_factory is not None:
+            return self._previous_factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    async def measure(self, route: Callable[[], str], call: Awaitable[Any]) -> Any:
+        """``call`` 을 실행하고 끝나면 ``route()`` 이름으로 wall/on-CPU 시간을 기록합니다."""
+        timing = _RequestTiming()
+        token = _request_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            return await _on_cpu(call, timing)
+        finally:
+            _request_timing.reset(token)
+            self.record(route(), time.perf_counter() - started, timing.cpu)
+
+    def record(self, route: str, wall: float, cpu: float) -> None:
+        if route not in self.routes and len(self.routes) >= self.max_routes:
+            route = "other"
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = {
+                "requests": 0, "wall": 0.0, "cpu": 0.0, "wall_max": 0.0, "cpu_max": 0.0,
+            }
+        stats["requests"] += 1
+        stats["wall"] += wall
+        stats["cpu"] += cpu
+        stats["wall_max"] = max(stats["wall_max"], wall)
+        stats["cpu_max"] = max(stats["cpu_max"], cpu)
+
+    def reset(self) -> None:
+        self.routes = {}
+
+    def stats(self) -> Dict[str, Any]:
+        routes = {}
+        for route, stats in sorted(self.routes.items(), key=lambda item: -item[1]["cpu"]):
+            count = stats["requests"]
+            routes[route] = {
+                "requests": count,
+                "wall_ms_avg": round(stats["wall"] / count * 1000, 2),
+                "cpu_ms_avg": round(stats["cpu"] / count * 1000, 2),
+                "wall_ms_max": round(stats["wall_max"] * 1000, 2),
+                "cpu_ms_max": round(stats["cpu_max"] * 1000, 2),
+                "cpu_ratio": round(stats["cpu"] / stats["wall"], 3) if stats["wall"] else 0.0,
+            }
+        return {"enabled": self.enabled, "routes": routes}
+
+
+def _route_name(scope: Dict[str, Any]) -> str:
+    """라우팅이 끝난 scope 의 경로 템플릿 (``/a/{token}`` 처럼 값이 아니라 패턴으로 묶음)"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope.get('method', '')} {path}"
+
+
+class RequestTimingMiddleware:
+    """``RequestTimer`` 가 켜져 있을 때만 HTTP 요청의 wall/on-CPU 시간을 재는 ASGI 미들웨어"""
+
+    def __init__(self, app: Callable[..., Awaitable[None]], timer: RequestTimer) -> None:
+        self.app = app
+        self.timer = timer
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if not self.timer.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.timer.measure(lambda: _route_name(scope), self.app(scope, receive, send))
+
+
+def sample_stacks(
+    thread_id: int, seconds: float, interval: float = 0.01, depth: int = 100
+) -> Counter:
+    """
+    ``seconds`` 동안 ``interval`` 간격으로 ``thread_id`` 스레드의 스택을 표본 추출합니다.
+
+    다른 스레드(``asyncio.to_thread``)에서 실행해야 루프 스레드를 볼 수 있습니다.
+
+    Returns:
+        Counter: ``;`` 로 이은 스택(바깥쪽부터) → 표본 수
+    """
+    samples: Counter = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        samples[";".join(_stack(frame, depth, lines=False))] += 1
+        del frame
+        time.sleep(interval)
+    return samples
+
+
+def collapse_stacks(samples: Counter) -> str:
+    """flamegraph.pl / speedscope 가 읽는 collapsed stack 형식 (``스택 표본수`` 한 줄씩)"""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
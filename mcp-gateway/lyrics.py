@@ -0,0 +1,211 @@
+"""
+가사 로마자 변환 (게이트웨이 측 줄 단위 중복 제거)
+
+K-pop 가사는 후렴이 여러 번 반복되므로 다음 세 단계로 처리합니다.
+
+1. 앞뒤 공백을 제거한 줄을 인터닝해 고유 줄 목록과 인덱스 시퀀스를 만듭니다.
+2. 고유 줄마다 워커 공용 줄 메모를 확인하고, 없는 줄만 모아 백엔드에 한 번 요청합니다.
+3. 인덱스 시퀀스를 따라 원래 순서로 펼칩니다.
+
+펼친 결과는 romanize-service 의 executeRomanizeLyrics 와 같은 "한글\\n로마자\\n" 형식이고,
+compact 형식은 고유 줄 표와 인덱스 시퀀스만 담아 후렴이 많은 곡의 응답 크기를 줄입니다.
+structured 형식은 같은 내용을 MCP ``structuredContent`` 용 JSON 배열로 돌려줍니다.
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# 백엔드에 여러 줄을 한 번에 변환 요청하는 함수 (입력 순서대로 로마자 반환)
+LineRomanizer = Callable[[List[str]], Awaitable[List[str]]]
+
+
+def java_trim(line: str) -> str:
+    """Java ``String.trim()`` 과 같이 U+0020 이하 문자만 앞뒤에서 제거합니다."""
+    start, end = 0, len(line)
+    while start < end and line[start] <= " ":
+        start += 1
+    while end > start and line[end - 1] <= " ":
+        end -= 1
+    return line[start:end]
+
+
+def split_lines(text: str) -> List[str]:
+    """
+    RomanizeService.romanizeLyrics 와 같은 규칙으로 줄을 나눕니다.
+
+    Java ``split("\\n")`` 처럼 끝의 빈 문자열은 버리고(입력이 빈 문자열이면 한 줄),
+    각 줄은 ``trim()`` 합니다.
+    """
+    if not text:
+        return [""]
+    parts = text.split("\n")
+    while parts and parts[-1] == "":
+        parts.pop()
+    return [java_trim(part) for part in parts]
+
+
+def parse_lyrics_pairs(output: str, count: int) -> List[str]:
+    """
+    executeRomanizeLyrics 응답("한글\n로마자\n" 쌍의 반복)에서 로마자 ``count`` 줄을 꺼냅니다.
+
+    Raises:
+        ValueError: 응답의 줄 쌍이 요청한 줄 수보다 적음
+    """
+    parts = output.split("\n")
+    romanized = parts[1:2 * count:2]
+    if len(romanized) != count:
+        raise ValueError(f"백엔드 응답 줄 수 불일치: 요청 {count}줄, 응답 {len(romanized)}줄")
+    return romanized
+
+
+@dataclass
+class InternedLyrics:
+    """고유 줄 표와 원래 순서를 나타내는 인덱스 시퀀스"""
+
+    unique: List[str]
+    sequence: List[int]
+
+
+def intern_lines(lines: List[str]) -> InternedLyrics:
+    """같은 줄을 하나로 모읍니다."""
+    index: Dict[str, int] = {}
+    unique: List[str] = []
+    sequence: List[int] = []
+    for line in lines:
+        position = index.get(line)
+        if position is None:
+            position = index[line] = len(unique)
+            unique.append(line)
+        sequence.append(position)
+    return InternedLyrics(unique, sequence)
+
+
+class LineMemo:
+    """줄 → 로마자 LRU 메모 (워커 프로세스 안에서 요청 간 공유)"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, lines: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """메모에 있는 줄의 결과와 없는 줄 목록을 반환합니다."""
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        for line in lines:
+            romanized = self._entries.get(line)
+            if romanized is None:
+                missing.append(line)
+                self.misses += 1
+            else:
+                self._entries.move_to_end(line)
+                found[line] = romanized
+                self.hits += 1
+        return found, missing
+
+    def store(self, line: str, romanized: str) -> None:
+        self._entries[line] = romanized
+        self._entries.move_to_end(line)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+async def romanize_unique(
+    unique: List[str], romanize_lines: LineRomanizer, memo: LineMemo
+) -> Tuple[List[str], int]:
+    """
+    고유 줄을 메모 또는 백엔드 한 번 호출로 변환합니다. 빈 줄은 빈 문자열입니다.
+
+    Returns:
+        (고유 줄 순서의 로마자 목록, 백엔드로 보낸 줄 수)
+    """
+    found, missing = memo.lookup([line for line in unique if line])
+    if missing:
+        romanized = await romanize_lines(missing)
+        if len(romanized) != len(missing):
+            raise ValueError(
+                f"백엔드 응답 줄 수 불일치: 요청 {len(missing)}줄, 응답 {len(romanized)}줄"
+            )
+        for line, value in zip(missing, romanized):
+            memo.store(line, value)
+            found[line] = value
+    return [found[line] if line else "" for line in unique], len(missing)
+
+
+def render_lyrics(interned: InternedLyrics, romanized: List[str]) -> str:
+    """executeRomanizeLyrics 와 같은 "한글\\n로마자\\n" 형식으로 펼칩니다."""
+    parts = []
+    for position in interned.sequence:
+        parts.append(interned.unique[position])
+        parts.append("\n")
+        parts.append(romanized[position])
+        parts.append("\n")
+    return "".join(parts)
+
+
+def compact_lyrics(interned: InternedLyrics, romanized: List[str]) -> Dict[str, Any]:
+    """고유 줄 표 + 인덱스 시퀀스"""
+    return {
+        "format": "compact",
+        "lines": interned.unique,
+        "romanized": romanized,
+        "sequence": interned.sequence,
+    }
+
+
+def expanded_lyrics(interned: InternedLyrics, romanized: List[str]) -> Dict[str, Any]:
+    """원래 순서의 한글 줄 배열과 로마자 줄 배열"""
+    return {
+        "format": "lines",
+        "lines": [interned.unique[position] for position in interned.sequence],
+        "romanized": [romanized[position] for position in interned.sequence],
+    }
+
+
+def render_compact(interned: InternedLyrics, romanized: List[str]) -> str:
+    """고유 줄 표 + 인덱스 시퀀스 형식의 JSON 문자열을 만듭니다."""
+    return json.dumps(
+        compact_lyrics(interned, romanized), ensure_ascii=False, separators=(",", ":")
+    )
+
+
+async def romanize_lyrics(
+    text: str,
+    romanize_lines: LineRomanizer,
+    memo: LineMemo,
+    compact: bool = False,
+    structured: bool = False,
+) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, int]]:
+    """
+    가사를 줄 단위 중복 제거로 변환합니다.
+
+    structured 이면 줄 배열(compact 이면 고유 줄 표 + 시퀀스)을 ``structuredContent`` 로
+    돌려주고, 응답 텍스트는 한 줄 요약만 담습니다 (같은 내용을 두 번 싣지 않음).
+
+    Returns:
+        (응답 텍스트, structuredContent 또는 None, 통계) — 통계는 전체/고유 줄 수와
+        백엔드로 보낸 줄 수
+    """
+    interned = intern_lines(split_lines(text))
+    romanized, backend_lines = await romanize_unique(interned.unique, romanize_lines, memo)
+    stats = {
+        "lines": len(interned.sequence),
+        "unique_lines": len(interned.unique),
+        "backend_lines": backend_lines,
+    }
+    if structured:
+        content = compact_lyrics(interned, romanized) if compact else expanded_lyrics(interned, romanized)
+        summary = f"가사 {stats['lines']}줄 변환 결과는 structuredContent 에 있습니다 ({content['format']})"
+        return summary, content, stats
+    if compact:
+        return render_compact(interned, romanized), None, stats
+    return render_lyrics(interned, romanized), None, stats
@@ -0,0 +1,371 @@
+"""
+가사 편집기를 위한 세션 단위 증분 로마자 변환
+
+편집기는 문서 id로 가사를 한 번 열고, 이후에는 줄 단위 편집(insert / delete / replace)만
+보냅니다. 게이트웨이는 문서별 줄 목록과 줄별 로마자 결과를 기억하고 있다가, 바뀐 줄
+(및 ``context_lines`` 만큼의 이웃 줄)만 다시 계산해 바뀐 줄만 돌려줍니다.
+
+romanize-service 는 가사를 줄마다 독립적으로 변환하므로 현재 이웃 줄 재계산은 필요 없고
+(기본 0), 줄 경계를 넘는 규칙이 생기면 ``context_lines`` 로 범위를 넓힐 수 있습니다.
+
+문서는 기본적으로 워커 프로세스 메모리에 있습니다. ``directory`` 를 주면 문서를 그 디렉토리의
+JSON 파일(문서마다 하나)에 두고, 편집 결과는 ``flock`` 을 잡은 채 버전을 다시 확인한 뒤 기록하므로
+같은 디렉토리를 쓰는 워커들이 문서를 공유합니다 (sticky routing 불필요). 메모리 모드에서도
+결과가 틀리지는 않도록, 편집에는 버전이 반드시 필요하고 버전은 열 때마다 무작위 값에서
+시작합니다. 다른 워커에 남은 예전 사본은 버전이 달라 version_conflict(없으면
+unknown_document)로 응답하고, 클라이언트는 전체 텍스트로 다시 엽니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from lyrics import LineMemo, LineRomanizer, java_trim, romanize_unique, split_lines
+from textnorm import normalize_romanize_text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# 공유 디렉토리에서 만료된 문서를 훑는 최소 간격 (초)
+_SWEEP_INTERVAL = 60.0
+
+
+class LyricsSessionError(ValueError):
+    """잘못된 편집 요청 또는 버전 불일치"""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass
+class LyricsDocument:
+    """편집 중인 가사 문서"""
+
+    document_id: str
+    lines: List[str] = field(default_factory=list)
+    romanized: List[str] = field(default_factory=list)
+    version: int = 0
+    # 메모리 모드는 time.monotonic(), 공유 디렉토리 모드는 파일 mtime 으로 만료를 판단
+    last_access: float = field(default_factory=time.monotonic)
+
+
+def _edit_lines(edit: Dict[str, Any]) -> List[str]:
+    lines = edit.get("lines") or []
+    if not isinstance(lines, list):
+        raise LyricsSessionError("lines 는 문자열 배열이어야 합니다", "invalid_edit")
+    result = []
+    for line in lines:
+        if isinstance(line, str):
+            # 문서 전체 텍스트와 같은 정규형 (CR 은 줄바꿈이 되므로 끝의 CR 은 먼저 잘라냄)
+            line = java_trim(normalize_romanize_text(java_trim(line)))
+        if not isinstance(line, str) or "\n" in line:
+            raise LyricsSessionError("lines 의 각 항목은 줄바꿈 없는 문자열이어야 합니다", "invalid_edit")
+        result.append(line)
+    return result
+
+
+def normalize_edit(edit: Dict[str, Any], line_count: int) -> Tuple[int, int, List[str]]:
+    """
+    편집 하나를 ``[start, end)`` 범위를 ``lines`` 로 바꾸는 형태로 정규화합니다.
+
+    - insert: ``{"op": "insert", "at": i, "lines": [...]}``
+    - delete: ``{"op": "delete", "start": i, "end": j}``
+    - replace: ``{"op": "replace", "start": i, "end": j, "lines": [...]}``
+    """
+    op = edit.get("op")
+    try:
+        if op == "insert":
+            start = end = int(edit["at"])
+            lines = _edit_lines(edit)
+        elif op == "delete":
+            start, end = int(edit["start"]), int(edit["end"])
+            lines = []
+        elif op == "replace":
+            start, end = int(edit["start"]), int(edit["end"])
+            lines = _edit_lines(edit)
+        else:
+            raise LyricsSessionError(f"알 수 없는 편집 종류: {op}", "invalid_edit")
+    except (KeyError, TypeError, ValueError) as e:
+        if isinstance(e, LyricsSessionError):
+            raise
+        raise LyricsSessionError(f"잘못된 편집 요청: {edit}", "invalid_edit")
+
+    if not 0 <= start <= end <= line_count:
+        raise LyricsSessionError(
+            f"편집 범위가 문서를 벗어났습니다: [{start}, {end}) / {line_count}줄", "invalid_range"
+        )
+    return start, end, lines
+
+
+class LyricsSessionStore:
+    """
+    문서별 줄 단위 로마자 결과 저장소 (워커 메모리 LRU 또는 워커 간 공유 디렉토리, 유휴 만료)
+
+    Args:
+        memo: 줄 → 로마자 공용 메모
+        max_documents: 보관할 최대 문서 수
+        ttl: 마지막 접근 후 문서를 보관하는 시간 (초)
+        context_lines: 바뀐 줄 앞뒤로 함께 재계산할 줄 수
+        directory: 워커 간에 공유할 문서 디렉토리 (없거나 ``fcntl`` 이 없으면 메모리 모드)
+    """
+
+    def __init__(
+        self,
+        memo: LineMemo,
+        max_documents: int = 1000,
+        ttl: float = 3600.0,
+        context_lines: int = 0,
+        directory: Optional[str] = None,
+    ):
+        self.memo = memo
+        self.max_documents = max_documents
+        self.ttl = ttl
+        self.context_lines = context_lines
+        self._documents: "OrderedDict[str, LyricsDocument]" = OrderedDict()
+        self.directory = directory if directory and fcntl is not None else None
+        if directory and self.directory is None:
+            logger.warning("fcntl 이 없어 가사 세션을 워커 메모리에 둡니다")
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self._last_sweep = 0.0
+        self._shared_documents = 0
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._documents:
+            oldest = next(iter(self._documents.values()))
+            if now - oldest.last_access <= self.ttl and len(self._documents) <= self.max_documents:
+                break
+            self._documents.popitem(last=False)
+
+    def _get(self, document_id: str) -> Optional[LyricsDocument]:
+        document = self._documents.get(document_id)
+        if document is not None:
+            document.last_access = time.monotonic()
+            self._documents.move_to_end(document_id)
+        return document
+
+    # 공유 디렉토리 모드: 아래 함수들은 파일 I/O 를 하므로 asyncio.to_thread 로 호출
+
+    def _file(self, document_id: str, suffix: str = ".json") -> str:
+        name = hashlib.sha256(document_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    def _read(self, document_id: str) -> Optional[LyricsDocument]:
+        path = self._file(document_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() - mtime > self.ttl:
+            return None
+        return LyricsDocument(**data, last_access=mtime)
+
+    def _write(self, document: LyricsDocument) -> None:
+        path = self._file(document.document_id)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        data = asdict(document)
+        data.pop("last_access")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _locked(self, document_id: str, action):
+        """문서의 ``.lock`` 에 배타 ``flock`` 을 잡고 ``action()`` 을 실행합니다 (워커 간 직렬화)."""
+        fd = os.open(self._file(document_id, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return action()
+        finally:
+            os.close(fd)
+
+    def _commit_shared(self, document: LyricsDocument, expected_version: int) -> bool:
+        def commit() -> bool:
+            current = self._read(document.document_id)
+            if current is None or current.version != expected_version:
+                return False
+            self._write(document)
+            return True
+
+        return self._locked(document.document_id, commit)
+
+    def _remove_shared(self, document_id: str) -> bool:
+        def remove() -> bool:
+            try:
+                os.unlink(self._file(document_id))
+                return True
+            except FileNotFoundError:
+                return False
+
+        return self._locked(document_id, remove)
+
+    def _sweep(self) -> None:
+        """만료된 문서와 ``max_documents`` 를 넘는 오래된 문서를 지웁니다."""
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        documents = []
+        for entry in os.scandir(self.directory):
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(".json"):
+                documents.append((mtime, entry.path))
+            elif now - mtime > self.ttl:
+                # 남은 .lock / 중단된 .tmp
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+        documents.sort(reverse=True)
+        kept = 0
+        for mtime, path in documents:
+            if kept < self.max_documents and now - mtime <= self.ttl:
+                kept += 1
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        self._shared_documents = kept
+
+    async def open(
+        self, document_id: str, text: str, romanize_lines: LineRomanizer
+    ) -> Dict[str, Any]:
+        """전체 텍스트로 문서를 (다시) 엽니다. 모든 줄을 반환합니다."""
+        lines = split_lines(text)
+        romanized, backend_lines = await self._romanize(lines, romanize_lines)
+        # 다른 워커가 같은 문서를 따로 열어도 버전이 겹치지 않도록 무작위 값에서 시작
+        document = LyricsDocument(document_id, lines, romanized, version=random.randrange(1, 2 ** 31))
+        if self.directory:
+            await asyncio.to_thread(self._locked, document_id, lambda: self._write(document))
+            await asyncio.to_thread(self._sweep)
+        else:
+            self._documents.pop(document_id, None)
+            self._documents[document_id] = document
+            self._expire()
+        return self._result(document, list(range(len(lines))), backend_lines)
+
+    async def apply(
+        self,
+        document_id: str,
+        edits: List[Dict[str, Any]],
+        romanize_lines: LineRomanizer,
+        base_version: Any,
+    ) -> Dict[str, Any]:
+        """
+        편집을 순서대로 적용하고 바뀐 줄만 반환합니다.
+
+        각 편집의 줄 번호는 앞선 편집을 적용한 뒤의 문서 기준입니다. ``base_version`` 은
+        클라이언트가 마지막으로 받은 버전이며 반드시 있어야 합니다.
+
+        Raises:
+            LyricsSessionError: 문서 없음(unknown_document), 버전 불일치(version_conflict),
+                잘못된 편집(invalid_edit / invalid_range)
+        """
+        if isinstance(base_version, bool) or not isinstance(base_version, int):
+            raise LyricsSessionError("편집에는 정수 version 이 필요합니다", "invalid_edit")
+        if self.directory:
+            document = await asyncio.to_thread(self._read, document_id)
+        else:
+            self._expire()
+            document = self._get(document_id)
+        if document is None:
+            raise LyricsSessionError(
+                f"문서를 찾을 수 없습니다: {document_id} (text 로 다시 열어 주세요)",
+                "unknown_document",
+            )
+        if base_version != document.version:
+            raise LyricsSessionError(
+                f"문서 버전 불일치: 요청 {base_version}, 현재 {document.version}",
+                "version_conflict",
+            )
+
+        # 편집을 먼저 모두 검증/적용한 사본을 만들고, 바뀐 줄 위치를 추적
+        lines = list(document.lines)
+        romanized = list(document.romanized)
+        stale: List[bool] = [False] * len(lines)
+        for edit in edits:
+            start, end, new_lines = normalize_edit(edit, len(lines))
+            lines[start:end] = new_lines
+            romanized[start:end] = [""] * len(new_lines)
+            stale[start:end] = [True] * len(new_lines)
+            if self.context_lines:
+                lo = max(0, start - self.context_lines)
+                hi = min(len(lines), start + len(new_lines) + self.context_lines)
+                for i in range(lo, hi):
+                    stale[i] = True
+
+        changed = [i for i, is_stale in enumerate(stale) if is_stale]
+        version = document.version
+        fresh, backend_lines = await self._romanize(
+            [lines[i] for i in changed], romanize_lines
+        )
+        for i, value in zip(changed, fresh):
+            romanized[i] = value
+
+        updated = LyricsDocument(document_id, lines, romanized, version=version + 1)
+        if self.directory:
+            committed = await asyncio.to_thread(self._commit_shared, updated, version)
+        else:
+            committed = document.version == version and self._documents.get(document_id) is document
+            if committed:
+                document.lines = lines
+                document.romanized = romanized
+                document.version += 1
+        if not committed:
+            # 백엔드를 기다리는 동안 같은 문서에 다른 편집(다른 워커 포함)이 먼저 적용됨
+            raise LyricsSessionError(
+                f"문서 버전 불일치: 요청 {version}, 현재 문서가 바뀌었습니다",
+                "version_conflict",
+            )
+        return self._result(updated, changed, backend_lines)
+
+    async def _romanize(
+        self, lines: List[str], romanize_lines: LineRomanizer
+    ) -> Tuple[List[str], int]:
+        unique = list(dict.fromkeys(lines))
+        values, backend_lines = await romanize_unique(unique, romanize_lines, self.memo)
+        by_line = dict(zip(unique, values))
+        return [by_line[line] for line in lines], backend_lines
+
+    async def close(self, document_id: str) -> bool:
+        if self.directory:
+            return await asyncio.to_thread(self._remove_shared, document_id)
+        return self._documents.pop(document_id, None) is not None
+
+    def _result(
+        self, document: LyricsDocument, changed: List[int], backend_lines: int
+    ) -> Dict[str, Any]:
+        return {
+            "document_id": document.document_id,
+            "version": document.version,
+            "line_count": len(document.lines),
+            "changed": [
+                {"index": i, "korean": document.lines[i], "romanized": document.romanized[i]}
+                for i in changed
+            ],
+            "backend_lines": backend_lines,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        if self.directory:
+            # 마지막으로 디렉토리를 훑었을 때의 문서 수 (모든 워커 합계)
+            return {"documents": self._shared_documents, "shared": True}
+        return {"documents": len(self._documents)}
@@ -0,0 +1,158 @@
+"""
+romanize_single 호출 모으기 (micro-batching)
+
+몰리는 시간대에는 짧은 ``romanize_single`` 호출이 초당 수백 건씩 들어와 건마다 게이트웨이 →
+romanize-service HTTP 왕복을 한 번씩 씁니다. 여기서는
+
+- 짧은 시간 창(``window``) 동안 들어온 텍스트를 모아 백엔드 ``romanize_batch`` 한 번으로 보내고,
+  결과를 입력 순서대로 각 호출자에게 나눠 줍니다.
+- 창이 끝나기 전에 ``max_batch`` 건이 모이면 바로 보냅니다. 같은 배치 안의 같은 텍스트는 한 번만
+  보냅니다.
+- 배치 요청의 데드라인은 배치에 든 호출 중 가장 늦은 데드라인입니다. 호출자 하나가 취소돼도
+  (데드라인 초과) 배치는 계속되고, 배치의 호출자가 모두 취소되면 백엔드 호출도 취소합니다.
+- 배치가 실패하면 그 배치의 호출자 모두에게 같은 예외를 돌려줍니다. 백엔드가 텍스트 하나만
+  변환하지 못했으면(결과 자리에 예외) 그 텍스트의 호출자에게만 예외를 돌려줍니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+# (텍스트 목록, 남은 시간(초) 또는 None) → 입력 순서대로의 로마자 (변환하지 못한 텍스트는 예외)
+BatchSender = Callable[[List[str], Optional[float]], Awaitable[List[Union[str, Exception]]]]
+
+
+class _Pending:
+    __slots__ = ("text", "future", "deadline", "queued_at")
+
+    def __init__(self, text: str, future: "asyncio.Future[str]", deadline: Optional[float]) -> None:
+        self.text = text
+        self.future = future
+        self.deadline = deadline
+        self.queued_at = time.monotonic()
+
+
+class RomanizeBatcher:
+    """
+    Args:
+        send: 텍스트 여러 개를 백엔드 한 번으로 변환하는 함수
+        window: 첫 호출 뒤 다른 호출을 기다리는 시간 (초, 0 이면 모으지 않음)
+        max_batch: 배치 하나에 담는 최대 호출 수
+    """
+
+    def __init__(self, send: BatchSender, window: float, max_batch: int = 64):
+        self.send = send
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._pending: List[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set["asyncio.Task[None]"] = set()
+        self.requests = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.full_flushes = 0
+        self.failed_batches = 0
+        self.cancelled_batches = 0
+        self.max_batch_seen = 0
+        self.queue_wait_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    async def romanize(self, text: str, remaining: Optional[float] = None) -> str:
+        """
+        텍스트 하나를 다음 배치에 넣고 결과를 기다립니다.
+
+        Args:
+            text: 변환할 텍스트
+            remaining: 이 호출의 남은 시간 (초, 데드라인 밖이면 None)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if remaining is None else time.monotonic() + remaining
+        entry = _Pending(text, loop.create_future(), deadline)
+        self.requests += 1
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_batch:
+            self.full_flushes += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await entry.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [entry for entry in self._pending if not entry.future.done()]
+        self._pending = []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        for entry in batch:
+            entry.future.add_done_callback(lambda _, b=batch, t=task: self._abandon(b, t))
+
+    def _abandon(self, batch: List[_Pending], task: "asyncio.Task[None]") -> None:
+        """배치의 호출자가 모두 취소됐으면 백엔드 호출도 취소 (호출자마다 불리므로 한 번만)"""
+        if (
+            not task.done()
+            and not task.cancelling()
+            and all(entry.future.cancelled() for entry in batch)
+        ):
+            self.cancelled_batches += 1
+            task.cancel()
+
+    async def _send_batch(self, batch: List[_Pending]) -> None:
+        now = time.monotonic()
+        deadlines = [entry.deadline for entry in batch]
+        remaining = None if None in deadlines else max(deadlines) - now
+        self.batches += 1
+        self.batched_texts += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        self.queue_wait_seconds += sum(now - entry.queued_at for entry in batch)
+        try:
+            texts = list(dict.fromkeys(entry.text for entry in batch))
+            results = await self.send(texts, remaining)
+            if len(results) != len(texts):
+                raise RuntimeError(
+                    f"배치 응답 개수가 요청과 다릅니다 (요청 {len(texts)}, 응답 {len(results)})"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed_batches += 1
+            for entry in batch:
+                if not entry.future.done():
+                    entry.future.set_exception(e)
+            return
+        romanized = dict(zip(texts, results))
+        for entry in batch:
+            if entry.future.done():
+                continue
+            result = romanized[entry.text]
+            if isinstance(result, Exception):
+                entry.future.set_exception(result)
+            else:
+                entry.future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+            "full_flushes": self.full_flushes,
+            "failed_batches": self.failed_batches,
+            "cancelled_batches": self.cancelled_batches,
+            "avg_queue_wait_ms": (
+                round(self.queue_wait_seconds / self.batched_texts * 1000, 3)
+                if self.batched_texts else 0.0
+            ),
+            "pending": len(self._pending),
+            "inflight_batches": len(self._inflight),
+        }
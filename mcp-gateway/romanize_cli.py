@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+로마자 변환 명령줄 도구 (오프라인 대량 처리)
+
+자막 파일이나 가사 덤프처럼 큰 텍스트를 HTTP/JSON 왕복 없이 Python 엔진(romanizer)으로
+바로 변환합니다. 입력은 줄 경계에서 자른 큰 블록 단위로 읽고, 블록마다 변환해 바로
+출력하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+
+- plain: 줄마다 로마자만 출력 (한국어가 없는 줄은 그대로)
+- lyrics: romanize-service 의 executeRomanizeLyrics 와 같은 "한글\\n로마자\\n" 형식
+  (줄 앞뒤 공백 제거, 입력 끝의 빈 줄은 버림)
+
+사용법:
+    python mcp-gateway/romanize_cli.py lyrics.txt > romanized.txt
+    cat subtitles.srt | python mcp-gateway/romanize_cli.py --format lyrics -o out.txt
+    python mcp-gateway/romanize_cli.py --mmap --jobs 4 corpus.txt -o corpus.roman.txt
+
+처리량(MB/s)은 표준 에러로 출력합니다 (``--quiet`` 로 끄기).
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Deque, Iterator, Tuple
+
+import romanizer
+from lyrics import java_trim
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def romanize_block(data: bytes, lyrics: bool) -> Tuple[bytes, int]:
+    """
+    줄 경계로 끝나는 블록 하나를 변환합니다 (프로세스 풀 작업 단위).
+
+    UTF-8 에서 줄바꿈 바이트는 다른 문자의 일부가 될 수 없으므로 블록마다 따로
+    디코딩해도 안전합니다.
+
+    Returns:
+        (출력 바이트, lyrics 형식에서 출력을 미룬 끝쪽 빈 줄 수)
+    """
+    text = data.decode("utf-8")
+    if not lyrics:
+        return "\n".join(romanizer.romanize_line(line) for line in text.split("\n")).encode("utf-8"), 0
+
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    # 입력 끝의 빈 줄은 버려야 하므로 블록 끝쪽 빈 줄은 다음 블록을 볼 때까지 미룸
+    # (Java split 은 완전히 빈 줄만 버리고, 공백만 있는 줄은 남긴 뒤 trim 함)
+    trailing = 0
+    while len(lines) > trailing and lines[-1 - trailing] == "":
+        trailing += 1
+    parts = []
+    for line in lines[:len(lines) - trailing]:
+        line = java_trim(line)
+        parts.append(line)
+        parts.append("\n")
+        parts.append(romanizer.romanize_line(line))
+        parts.append("\n")
+    return "".join(parts).encode("utf-8"), trailing
+
+
+def iter_stream_blocks(stream: BinaryIO, block_size: int) -> Iterator[bytes]:
+    """스트림을 block_size 씩 읽어 마지막 줄바꿈에서 자른 블록을 만듭니다."""
+    carry = b""
+    while True:
+        chunk = stream.read(block_size)
+        if not chunk:
+            break
+        chunk = carry + chunk
+        cut = chunk.rfind(b"\n") + 1
+        if cut == 0:
+            carry = chunk  # 블록보다 긴 줄
+            continue
+        carry = chunk[cut:]
+        yield chunk[:cut]
+    if carry:
+        yield carry
+
+
+def iter_mmap_blocks(path: str, block_size: int) -> Iterator[bytes]:
+    """파일을 메모리 매핑해 줄 경계에서 자른 블록을 만듭니다 (읽기 버퍼 복사 없음)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            size = len(mapped)
+            start = 0
+            while start < size:
+                end = min(start + block_size, size)
+                if end < size:
+                    cut = mapped.rfind(b"\n", start, end)
+                    if cut == -1:
+                        cut = mapped.find(b"\n", end)  # 블록보다 긴 줄
+                    end = size if cut == -1 else cut + 1
+                yield mapped[start:end]
+                start = end
+
+
+class BlockWriter:
+    """변환된 블록을 순서대로 출력하고 lyrics 형식의 미룬 빈 줄을 처리합니다."""
+
+    def __init__(self, output: BinaryIO, lyrics: bool):
+        self.output = output
+        self.lyrics = lyrics
+        self.pending_empty = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.blocks = 0
+
+    def write(self, result: Tuple[bytes, int]) -> None:
+        data, trailing = result
+        if data:
+            if self.pending_empty:
+                self._emit(b"\n\n" * self.pending_empty)
+                self.pending_empty = 0
+            self._emit(data)
+        self.pending_empty += trailing
+        self.blocks += 1
+
+    def finish(self) -> None:
+        if self.lyrics and self.bytes_in == 0:
+            self._emit(b"\n\n")  # 빈 입력은 빈 줄 하나로 취급 (Java split 규칙)
+        self.output.flush()
+
+    def _emit(self, data: bytes) -> None:
+        self.output.write(data)
+        self.bytes_out += len(data)
+
+
+def run(blocks: Iterator[bytes], writer: BlockWriter, jobs: int) -> None:
+    """블록을 변환해 출력합니다. jobs > 1 이면 프로세스 풀에서 병렬 변환합니다."""
+    if jobs <= 1:
+        for block in blocks:
+            writer.bytes_in += len(block)
+            writer.write(romanize_block(block, writer.lyrics))
+        return
+
+    # 출력 순서를 지키면서 메모리에 올라가는 블록 수를 제한
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        in_flight: Deque["Future[Tuple[bytes, int]]"] = deque()
+        for block in blocks:
+            writer.bytes_in += len(block)
+            in_flight.append(pool.submit(romanize_block, block, writer.lyrics))
+            if len(in_flight) >= jobs * 2:
+                writer.write(in_flight.popleft().result())
+        while in_flight:
+            writer.write(in_flight.popleft().result())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="한국어 로마자 변환 (파일/표준 입력 스트리밍)")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="입력 파일 (기본: 표준 입력, '-')")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: 표준 출력)")
+    parser.add_argument("--format", choices=["plain", "lyrics"], default="plain",
+                        help="plain: 로마자만, lyrics: 한글/로마자 줄 번갈아 출력")
+    parser.add_argument("--mmap", action="store_true", help="입력 파일을 메모리 매핑해 읽기")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="병렬 변환 프로세스 수")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f"읽기 블록 크기 (바이트, 기본 {DEFAULT_BLOCK_SIZE})")
+    parser.add_argument("--quiet", "-q", action="store_true", help="처리량 보고 끄기")
+    args = parser.parse_args()
+
+    if args.mmap and "-" in args.inputs:
+        parser.error("--mmap 은 표준 입력에 쓸 수 없습니다")
+
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    writer = BlockWriter(output, lyrics=args.format == "lyrics")
+    started = time.perf_counter()
+    try:
+        for path in args.inputs:
+            if path == "-":
+                blocks = iter_stream_blocks(sys.stdin.buffer, args.block_size)
+                run(blocks, writer, args.jobs)
+            elif args.mmap:
+                run(iter_mmap_blocks(path, args.block_size), writer, args.jobs)
+            else:
+                with open(path, "rb", buffering=0) as f:
+                    run(iter_stream_blocks(f, args.block_size), writer, args.jobs)
+        writer.finish()
+    except BrokenPipeError:
+        return 1
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    if not args.quiet:
+        mb_in = writer.bytes_in / 1e6
+        print(
+            f"📈 입력 {mb_in:.2f} MB → 출력 {writer.bytes_out / 1e6:.2f} MB, "
+            f"블록 {writer.blocks}개, {elapsed:.2f}s, {mb_in / elapsed if elapsed else 0:.2f} MB/s "
+            f"(jobs {args.jobs})",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
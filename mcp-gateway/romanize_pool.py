@@ -0,0 +1,116 @@
+"""
+로컬 로마자 변환 오프로드
+
+게이트웨이 안에서 Python 엔진(romanizer)으로 변환할 때, 큰 요청이 이벤트 루프를
+붙잡지 않도록 합니다.
+
+- 전체 글자 수가 임계값 이하인 요청은 이벤트 루프에서 바로 변환
+- 임계값을 넘으면 줄 단위 청크로 나눠 프로세스 풀에 보내고, 결과는 원래 순서대로 합침
+- 풀 워커는 시작할 때 romanizer 를 import 해 조회 표를 미리 만들어 둠
+- 호출자가 취소하면(데드라인 초과) 아직 시작하지 않은 청크는 풀 대기열에서 빠짐
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import romanizer
+
+
+def _warm_worker() -> Dict[str, int]:
+    """풀 워커 준비 확인 (romanizer 조회 표는 import 시 생성됨)"""
+    return romanizer.table_sizes()
+
+
+class RomanizeOffloader:
+    """
+    크기 기준으로 인라인 변환과 프로세스 풀 변환을 나눕니다.
+
+    Args:
+        workers: 프로세스 풀 크기 (0 이면 항상 인라인)
+        threshold_chars: 이 글자 수를 넘는 요청만 풀로 보냄
+        chunk_lines: 풀 작업 하나에 담을 최대 줄 수
+    """
+
+    def __init__(self, workers: int, threshold_chars: int = 2000, chunk_lines: int = 256):
+        self.workers = workers
+        self.threshold_chars = threshold_chars
+        self.chunk_lines = max(1, chunk_lines)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.inline_requests = 0
+        self.offloaded_requests = 0
+        self.offloaded_chunks = 0
+        self.offloaded_lines = 0
+        self.offload_seconds = 0.0
+        self.cancelled_requests = 0
+
+    async def start(self) -> None:
+        """풀을 만들고 워커마다 준비 작업을 한 번씩 실행합니다."""
+        if self.workers <= 0 or self._pool is not None:
+            return
+        # 로그 리스너 스레드가 있는 프로세스를 fork 하지 않도록 spawn 사용
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._pool, _warm_worker) for _ in range(self.workers))
+        )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def romanize_lines(self, lines: List[str]) -> List[str]:
+        """줄 목록을 순서대로 변환합니다."""
+        if self._pool is None or sum(len(line) for line in lines) <= self.threshold_chars:
+            self.inline_requests += 1
+            return romanizer.romanize_lines(lines)
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        chunks = [
+            lines[i:i + self.chunk_lines] for i in range(0, len(lines), self.chunk_lines)
+        ]
+        try:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(self._pool, romanizer.romanize_lines, chunk) for chunk in chunks)
+            )
+        except asyncio.CancelledError:
+            self.cancelled_requests += 1
+            raise
+        self.offloaded_requests += 1
+        self.offloaded_chunks += len(chunks)
+        self.offloaded_lines += len(lines)
+        self.offload_seconds += time.perf_counter() - started
+        return [value for chunk in results for value in chunk]
+
+    async def romanize_text(self, text: str) -> str:
+        """단문 하나를 변환합니다. 아주 긴 단문만 풀로 보냅니다."""
+        if self._pool is None or len(text) <= self.threshold_chars:
+            self.inline_requests += 1
+            return romanizer.korean_to_roman(text)
+        started = time.perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._pool, romanizer.korean_to_roman, text
+        )
+        self.offloaded_requests += 1
+        self.offloaded_chunks += 1
+        self.offload_seconds += time.perf_counter() - started
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers if self._pool is not None else 0,
+            "threshold_chars": self.threshold_chars,
+            "chunk_lines": self.chunk_lines,
+            "inline_requests": self.inline_requests,
+            "offloaded_requests": self.offloaded_requests,
+            "offloaded_chunks": self.offloaded_chunks,
+            "offloaded_lines": self.offloaded_lines,
+            "offload_seconds": round(self.offload_seconds, 3),
+            "cancelled_requests": self.cancelled_requests,
+        }
@@ -0,0 +1,197 @@
+"""
+한국어 로마자 변환 엔진 (Python)
+
+romanize-service 의 KoreanPronunciationService / RomanizerService 를 그대로 옮긴
+구현입니다. 발음 규칙(ㅎ 탈락·격음화, 자음군 단순화, 구개음화, 비음화, 유음화,
+받침 연음)을 적용한 뒤 자모별 로마자 표로 변환하며, 결과는 Java 구현과 같습니다.
+
+조회 표는 모듈 import 시 한 번 만들어 두므로 프로세스 풀 워커도 시작할 때 한 번만
+준비합니다.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+CHO = ["ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+JUNG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅘ", "ㅙ", "ㅚ", "ㅛ", "ㅜ", "ㅝ", "ㅞ", "ㅟ", "ㅠ", "ㅡ", "ㅢ", "ㅣ"]
+JONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+ROMA_CHO = {
+    "ㄱ": "k", "ㄲ": "kk", "ㄴ": "n", "ㄷ": "d", "ㄸ": "tt", "ㄹ": "r", "ㅁ": "m", "ㅂ": "b",
+    "ㅃ": "pp", "ㅅ": "s", "ㅆ": "ss", "ㅇ": "", "ㅈ": "j", "ㅉ": "jj", "ㅊ": "ch", "ㅋ": "k",
+    "ㅌ": "t", "ㅍ": "p", "ㅎ": "h",
+}
+ROMA_JUNG = {
+    "ㅏ": "a", "ㅐ": "ae", "ㅑ": "ya", "ㅒ": "yae", "ㅓ": "eo", "ㅔ": "e", "ㅕ": "yeo", "ㅖ": "ye",
+    "ㅗ": "o", "ㅘ": "wa", "ㅙ": "wae", "ㅚ": "oe", "ㅛ": "yo", "ㅜ": "u", "ㅝ": "wo", "ㅞ": "we",
+    "ㅟ": "wi", "ㅠ": "yu", "ㅡ": "eu", "ㅢ": "ui", "ㅣ": "i",
+}
+ROMA_JONG = {
+    "": "", "ㄱ": "k", "ㄲ": "k", "ㄳ": "k", "ㄴ": "n", "ㄵ": "n", "ㄶ": "n", "ㄷ": "t", "ㄹ": "l",
+    "ㄺ": "k", "ㄻ": "m", "ㄼ": "p", "ㄽ": "l", "ㄾ": "l", "ㄿ": "p", "ㅀ": "l", "ㅁ": "m", "ㅂ": "p",
+    "ㅄ": "p", "ㅅ": "t", "ㅆ": "t", "ㅇ": "ng", "ㅈ": "t", "ㅊ": "t", "ㅋ": "k", "ㅌ": "t", "ㅍ": "p",
+    "ㅎ": "t",
+}
+
+# 자음군 단순화 (겹받침 → 대표음)
+_SIMPLIFY = {"ㄳ": "ㄱ", "ㄵ": "ㄴ", "ㄺ": "ㄱ", "ㄻ": "ㅁ", "ㄼ": "ㅂ", "ㄽ": "ㄹ", "ㄾ": "ㄹ", "ㄿ": "ㅂ", "ㅄ": "ㅂ"}
+_H_JONG = {"ㅎ": "", "ㄶ": "ㄴ", "ㅀ": "ㄹ"}
+_ASPIRATE = {"ㄱ": "ㅋ", "ㄷ": "ㅌ", "ㅂ": "ㅍ"}
+_NASALIZE = {"ㄱ": "ㅇ", "ㄷ": "ㄴ", "ㅂ": "ㅁ"}
+_PALATALIZE = {"ㄷ": "ㅈ", "ㅌ": "ㅊ"}
+
+# RomanizerService.KOREAN_PATTERN 과 같음 ('|' 도 문자 클래스에 포함됨)
+KOREAN_PATTERN = re.compile("[ㄱ-ㅎ|ㅏ-ㅣ|가-힣]")
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+# 음절 코드 → (초성, 중성, 종성) 분해 표 (11172개, 시작 시 한 번 생성)
+_DECOMPOSED = [
+    (CHO[base // 588], JUNG[(base % 588) // 28], JONG[base % 28])
+    for base in range(_HANGUL_LAST - _HANGUL_BASE + 1)
+]
+_CHO_INDEX = {cho: i for i, cho in enumerate(CHO)}
+_JUNG_INDEX = {jung: i for i, jung in enumerate(JUNG)}
+_JONG_INDEX = {jong: i for i, jong in enumerate(JONG)}
+
+
+def java_trim_is_empty(text: str) -> bool:
+    """Java ``text.trim().isEmpty()`` 와 같습니다."""
+    return all(ch <= " " for ch in text)
+
+
+def _decompose(text: str) -> List[List[Optional[str]]]:
+    """문자마다 [초성, 중성, 종성, 한글 아님 여부, 적용 규칙] 을 만듭니다."""
+    syllables: List[List[Optional[str]]] = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            cho, jung, jong = _DECOMPOSED[code - _HANGUL_BASE]
+            syllables.append([cho, jung, jong, None, None])
+        else:
+            # 한글이 아닌 문자는 중성 자리에 원문을 보관
+            syllables.append(["", ch, "", True, None])
+    return syllables
+
+
+def apply_pronunciation_rules(syllables: List[List[Optional[str]]]) -> List[List[Optional[str]]]:
+    """KoreanPronunciationService.applyPronunciationRules 와 같은 순서로 발음 규칙을 적용합니다."""
+    count = len(syllables)
+    for i in range(count):
+        current = syllables[i]
+        if current[3]:
+            continue  # 공백/특수문자는 건너뜀
+        nxt = syllables[i + 1] if i + 1 < count else None
+        has_next = nxt is not None and not nxt[3]
+
+        # (1) ㅎ 관련 규칙 (ㅎ, ㄶ, ㅀ)
+        if current[2] in _H_JONG and has_next:
+            if nxt[0] == "ㅇ":
+                current[2] = _H_JONG[current[2]]
+                current[4] = "ㅎ탈락"
+            elif nxt[0] in _ASPIRATE:
+                nxt[0] = _ASPIRATE[nxt[0]]
+                current[2] = _H_JONG[current[2]]
+                current[4] = "ㅎ+자음격음화"
+
+        # (2) 자음군 단순화
+        if current[4] is None and current[2] in _SIMPLIFY:
+            current[2] = _SIMPLIFY[current[2]]
+
+        # (3) 구개음화 (받침 ㄷ/ㅌ + '이')
+        if current[2] in _PALATALIZE and has_next and nxt[0] == "ㅇ" and nxt[1] == "ㅣ":
+            nxt[0] = _PALATALIZE[current[2]]
+            current[2] = ""
+            current[4] = "구개음화"
+
+        # (4) 비음화 (받침 ㄱ/ㄷ/ㅂ + ㄴ/ㅁ)
+        if current[2] in _NASALIZE and has_next and nxt[0] in ("ㄴ", "ㅁ"):
+            current[2] = _NASALIZE[current[2]]
+            current[4] = "비음화"
+
+        # (4-1) 받침 ㅂ + ㄷ → [ㅁ+ㄸ]
+        if current[2] == "ㅂ" and has_next and nxt[0] == "ㄷ":
+            current[2] = "ㅁ"
+            nxt[0] = "ㄸ"
+            current[4] = "ㅂ+ㄷ변형"
+
+        # (5) 유음화 (ㄴ+ㄹ, ㄹ+ㄴ)
+        if current[2] == "ㄴ" and has_next and nxt[0] == "ㄹ":
+            current[2] = "ㄹ"
+            current[4] = "유음화"
+        if current[2] == "ㄹ" and has_next and nxt[0] == "ㄴ":
+            nxt[0] = "ㄹ"
+            current[4] = "유음화"
+
+        # (6) 받침 연음
+        if current[2] and has_next and nxt[0] == "ㅇ":
+            nxt[0] = current[2]
+            current[2] = ""
+            current[4] = "받침연음"
+    return syllables
+
+
+def _is_composable(syllable: List[Optional[str]]) -> bool:
+    """KoreanPronunciationService.composeHangul 이 빈 문자열을 돌려주는 경우를 걸러냅니다."""
+    return (
+        syllable[0] in _CHO_INDEX
+        and syllable[1] in _JUNG_INDEX
+        and syllable[2] in _JONG_INDEX
+    )
+
+
+def korean_to_pronounced(text: str) -> str:
+    """발음 규칙을 적용한 한글 문자열을 반환합니다."""
+    parts = []
+    for syllable in apply_pronunciation_rules(_decompose(text)):
+        if syllable[3]:
+            parts.append(syllable[1])
+        elif _is_composable(syllable):
+            parts.append(chr(
+                _HANGUL_BASE
+                + _CHO_INDEX[syllable[0]] * 588
+                + _JUNG_INDEX[syllable[1]] * 28
+                + _JONG_INDEX[syllable[2]]
+            ))
+    return "".join(parts)
+
+
+def korean_to_roman(text: Optional[str]) -> str:
+    """RomanizerService.koreanToRoman 과 같은 결과를 반환합니다."""
+    if text is None or java_trim_is_empty(text):
+        return ""
+    parts = []
+    # 발음 규칙 적용 결과를 다시 합성/분해하지 않고 자모에서 바로 로마자로 변환
+    for syllable in apply_pronunciation_rules(_decompose(text)):
+        if syllable[3]:
+            parts.append(syllable[1])
+        elif _is_composable(syllable):
+            parts.append(ROMA_CHO[syllable[0]])
+            parts.append(ROMA_JUNG[syllable[1]])
+            parts.append(ROMA_JONG[syllable[2]])
+    return "".join(parts)
+
+
+def contains_korean(text: Optional[str]) -> bool:
+    """RomanizerService.containsKorean 과 같습니다."""
+    if text is None or java_trim_is_empty(text):
+        return False
+    return KOREAN_PATTERN.search(text) is not None
+
+
+def romanize_line(line: str) -> str:
+    """RomanizeService.romanizeLyrics 의 줄 하나 변환 (한국어가 없으면 원문 그대로)"""
+    if not line:
+        return ""
+    return korean_to_roman(line) if contains_korean(line) else line
+
+
+def romanize_lines(lines: List[str]) -> List[str]:
+    """여러 줄을 순서대로 변환합니다. 프로세스 풀 작업 단위로도 쓰입니다."""
+    return [romanize_line(line) for line in lines]
+
+
+def table_sizes() -> Dict[str, int]:
+    """미리 만든 조회 표 크기 (프로세스 풀 워커 준비 확인용)"""
+    return {"syllables": len(_DECOMPOSED), "cho": len(CHO), "jung": len(JUNG), "jong": len(JONG)}
@@ -0,0 +1,8 @@
+"""게이트웨이 테스트 공통 설정 (게이트웨이 모듈은 패키지가 아니라 mcp-gateway 디렉토리의 평면 모듈)"""
+
+import sys
+from pathlib import Path
+
+GATEWAY_DIR = Path(__file__).resolve().parents[1]
+if str(GATEWAY_DIR) not in sys.path:
+    sys.path.insert(0, str(GATEWAY_DIR))
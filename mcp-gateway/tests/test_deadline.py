@@ -0,0 +1,142 @@
+"""도구별 시간 예산: 헤더 해석, 예산 초과 시 취소, 백엔드로 넘기는 남은 시간"""
+
+import asyncio
+
+import pytest
+
+from deadline import (
+    DEADLINE_HEADER,
+    ToolDeadlineExceeded,
+    ToolDeadlines,
+    parse_header_budget,
+    parse_tool_deadlines,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("", None),
+        ("abc", None),
+        ("nan", None),
+        ("inf", None),
+        ("1500", 1.5),
+        ("250.5", 0.2505),
+        ("0", 0.0),
+        ("-20", -0.02),
+    ],
+)
+def test_parse_header_budget(value, expected):
+    assert parse_header_budget(value) == expected
+
+
+def test_parse_tool_deadlines():
+    assert parse_tool_deadlines("romanize_lyrics=20, tts_stream = 3,,bad=") == {
+        "romanize_lyrics": 20.0,
+        "tts_stream": 3.0,
+    }
+
+
+def test_budget_is_the_shorter_of_tool_and_header():
+    deadlines = ToolDeadlines({"romanize_single": 2.0}, default=25.0)
+    assert deadlines.budget("romanize_single") == 2.0
+    assert deadlines.budget("romanize_single", 0.5) == 0.5
+    assert deadlines.budget("romanize_single", 10.0) == 2.0
+    assert deadlines.budget("unknown_tool") == 25.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("header_budget", [0.0, -0.02])
+async def test_expired_on_arrival_does_not_start_the_call(header_budget):
+    deadlines = ToolDeadlines({})
+    started = False
+
+    async def call() -> str:
+        nonlocal started
+        started = True
+        return "ok"
+
+    with pytest.raises(ToolDeadlineExceeded):
+        await deadlines.run("romanize_single", call(), header_budget)
+    assert not started
+    assert deadlines.stats()["expired_on_arrival"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overrunning_call_is_cancelled():
+    deadlines = ToolDeadlines({"romanize_lyrics": 0.05})
+    cancelled = asyncio.Event()
+
+    async def call() -> str:
+        with deadlines.backend_call("romanize"):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return "late"
+
+    with pytest.raises(ToolDeadlineExceeded) as e:
+        await deadlines.run("romanize_lyrics", call())
+    assert e.value.budget == 0.05
+    assert cancelled.is_set()
+    stats = deadlines.stats()
+    assert stats["expired"] == {"romanize_lyrics": 1}
+    assert stats["cancelled_backend_calls"] == {"romanize": 1}
+    assert stats["inflight_backend_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backend_timeout_is_not_reported_as_deadline():
+    deadlines = ToolDeadlines({})
+
+    async def call() -> str:
+        raise TimeoutError("백엔드 자체의 시간 초과")
+
+    with pytest.raises(TimeoutError):
+        await deadlines.run("romanize_single", call())
+    assert deadlines.stats()["expired"] == {}
+
+
+@pytest.mark.asyncio
+async def test_remaining_budget_is_forwarded_minus_margin():
+    deadlines = ToolDeadlines({"tts_stream": 5.0}, margin=0.1)
+    assert deadlines.remaining() is None and deadlines.headers() == {}
+
+    async def call():
+        return deadlines.remaining(), deadlines.headers()
+
+    remaining, headers = await deadlines.run("tts_stream", call(), header_budget=1.0)
+    assert 0.9 < remaining <= 1.0
+    assert 800 <= int(headers[DEADLINE_HEADER]) <= 900
+    # 데드라인 밖에서는 다시 헤더를 붙이지 않음
+    assert deadlines.headers() == {}
+    assert deadlines.headers_for(0.05) == {DEADLINE_HEADER: "0"}
+
+
+@pytest.mark.asyncio
+async def test_call_with_deadline_returns_json_rpc_error(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "_deadlines", ToolDeadlines({"romanize_single": 5.0}, margin=0.1))
+    request = app.McpRequest(id=7, method="tools/call", params={"name": "romanize_single", "arguments": {}})
+    forwarded = []
+
+    async def slow(request):
+        forwarded.append(app._deadlines.headers()[DEADLINE_HEADER])
+        await asyncio.sleep(10)
+
+    # 헤더의 남은 시간(50ms)이 도구 예산(5초)보다 짧음
+    response = await asyncio.wait_for(app.call_with_deadline(slow, request, "50"), 1)
+    assert response.id == 7
+    assert response.error["code"] == -32001
+    assert response.error["data"] == {"tool": "romanize_single", "budget_ms": 50}
+    assert forwarded == ["0"]  # 여유분(100ms)을 빼면 남은 시간이 없음
+
+    # 잘못된 헤더는 무시하고 도구 예산을 씀
+    async def fast(request):
+        return app.McpResponse(id=request.id, result={"forwarded": app._deadlines.headers()})
+
+    response = await app.call_with_deadline(fast, request, "abc")
+    assert 4800 <= int(response.result["forwarded"][DEADLINE_HEADER]) <= 4900
@@ -0,0 +1,25 @@
+"""게이트웨이 로깅 핸들러: 큐가 가득 차면 막거나 traceback 을 찍지 않고 버림"""
+
+import logging
+import queue
+
+import pytest
+
+
+def test_full_queue_drops_records(monkeypatch):
+    from app import DroppingQueueHandler
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    monkeypatch.setattr(handler, "handleError", lambda record: pytest.fail("handleError 호출됨"))
+    logger = logging.getLogger("test_gateway_log_drop")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("레코드 %d", i)
+    finally:
+        logger.removeHandler(handler)
+
+    assert log_queue.qsize() == 2 and handler.dropped == 3
+    assert log_queue.get_nowait().getMessage() == "레코드 0"
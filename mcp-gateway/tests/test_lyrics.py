@@ -0,0 +1,142 @@
+"""가사 줄 중복 제거, 줄 메모, 응답 형식이 romanize-service 출력과 줄 단위로 맞는지"""
+
+import json
+from typing import List
+
+import pytest
+
+from lyrics import (
+    LineMemo,
+    intern_lines,
+    java_trim,
+    parse_lyrics_pairs,
+    romanize_lyrics,
+    split_lines,
+)
+
+
+def fake_roman(line: str) -> str:
+    return f"<{line}>"
+
+
+def java_lyrics_output(text: str) -> str:
+    """RomanizeService.romanizeLyrics + executeRomanizeLyrics 와 같은 출력"""
+    parts = text.split("\n") if text else [""]
+    while parts and parts[-1] == "":
+        parts.pop()
+    out = []
+    for part in parts:
+        line = java_trim(part)
+        out.append(f"{line}\n{fake_roman(line) if line else ''}\n")
+    return "".join(out)
+
+
+class FakeBackend:
+    """romanize_lyrics 한 번으로 여러 줄을 변환하는 백엔드 (응답을 app 과 같은 방식으로 해석)"""
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    async def __call__(self, lines: List[str]) -> List[str]:
+        self.calls.append(list(lines))
+        return parse_lyrics_pairs(java_lyrics_output("\n".join(lines)), len(lines))
+
+
+LYRICS = "\n".join([
+    "너의 이름을",
+    "  불러보는 밤 ",
+    "",
+    "너의 이름을",
+    "\t너의 이름을",
+    "",
+    "마지막 줄",
+    "",
+    "",
+])
+
+
+def test_split_lines_matches_java_split_and_trim():
+    assert split_lines("") == [""]
+    assert split_lines("가\n\n 나 \n\n\n") == ["가", "", "나"]
+    # 공백만 있는 줄은 버리지 않고 빈 줄로 남음 (Java 는 정확히 빈 끝 줄만 버림)
+    assert split_lines("가\n   \n") == ["가", ""]
+    assert java_trim("\x00 가 \x1f") == "가"
+    assert java_trim("　가　") == "　가　"  # U+0020 보다 큰 공백은 남김
+
+
+@pytest.mark.asyncio
+async def test_expanded_output_matches_backend_lyrics_output():
+    backend = FakeBackend()
+    text, structured, stats = await romanize_lyrics(LYRICS, backend, LineMemo())
+
+    assert text == java_lyrics_output(LYRICS)
+    assert structured is None
+    assert stats == {"lines": 7, "unique_lines": 4, "backend_lines": 3}
+    # 빈 줄은 보내지 않고, 반복·앞뒤 공백만 다른 줄은 한 번만 보냄
+    assert backend.calls == [["너의 이름을", "불러보는 밤", "마지막 줄"]]
+
+
+@pytest.mark.asyncio
+async def test_line_memo_is_shared_between_requests():
+    backend = FakeBackend()
+    memo = LineMemo(max_size=10)
+    await romanize_lyrics("가\n나", backend, memo)
+    text, _, stats = await romanize_lyrics("나\n다\n가", backend, memo)
+
+    assert text == java_lyrics_output("나\n다\n가")
+    assert stats["backend_lines"] == 1
+    assert backend.calls[-1] == ["다"]
+    assert memo.stats() == {"size": 3, "hits": 2, "misses": 3}
+
+
+def test_line_memo_evicts_least_recently_used():
+    memo = LineMemo(max_size=2)
+    memo.store("가", "ga")
+    memo.store("나", "na")
+    memo.lookup(["가"])
+    memo.store("다", "da")
+    found, missing = memo.lookup(["가", "나", "다"])
+    assert found == {"가": "ga", "다": "da"} and missing == ["나"]
+
+
+@pytest.mark.asyncio
+async def test_compact_and_structured_formats_expand_to_same_lines():
+    expected = [line for line in java_lyrics_output(LYRICS).split("\n")[:-1]]
+    korean, roman = expected[0::2], expected[1::2]
+
+    text, _, _ = await romanize_lyrics(LYRICS, FakeBackend(), LineMemo(), compact=True)
+    compact = json.loads(text)
+    assert compact["format"] == "compact"
+    assert [compact["lines"][i] for i in compact["sequence"]] == korean
+    assert [compact["romanized"][i] for i in compact["sequence"]] == roman
+
+    summary, lines, _ = await romanize_lyrics(LYRICS, FakeBackend(), LineMemo(), structured=True)
+    assert lines == {"format": "lines", "lines": korean, "romanized": roman}
+    assert "structuredContent" in summary
+
+    _, table, _ = await romanize_lyrics(
+        LYRICS, FakeBackend(), LineMemo(), compact=True, structured=True
+    )
+    assert table == compact
+
+
+def test_intern_lines_keeps_order():
+    interned = intern_lines(["a", "b", "a", "", "b"])
+    assert interned.unique == ["a", "b", ""]
+    assert interned.sequence == [0, 1, 0, 2, 1]
+
+
+def test_parse_lyrics_pairs_alignment():
+    # 로마자가 빈 문자열인 줄(한글이 아닌 기호만 있는 줄 등)도 자리를 지킴
+    assert parse_lyrics_pairs("가\nga\n!!\n\n나\nna\n", 3) == ["ga", "", "na"]
+    with pytest.raises(ValueError):
+        parse_lyrics_pairs("가\nga\n", 2)
+
+
+@pytest.mark.asyncio
+async def test_backend_line_count_mismatch_raises():
+    async def short_backend(lines: List[str]) -> List[str]:
+        return [fake_roman(line) for line in lines[:-1]]
+
+    with pytest.raises(ValueError):
+        await romanize_lyrics("가\n나", short_backend, LineMemo())
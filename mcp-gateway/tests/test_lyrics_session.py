@@ -0,0 +1,206 @@
+"""가사 편집기 세션: 바뀐 줄만 다시 계산, 버전 확인, 잘못된 편집"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from lyrics import LineMemo
+from lyrics_session import LyricsSessionError, LyricsSessionStore
+
+
+class FakeBackend:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    async def __call__(self, lines: List[str]) -> List[str]:
+        self.calls.append(list(lines))
+        return [f"<{line}>" for line in lines]
+
+
+def lines_of(result) -> List[tuple]:
+    return [(c["index"], c["korean"], c["romanized"]) for c in result["changed"]]
+
+
+@pytest.mark.asyncio
+async def test_open_then_apply_returns_only_changed_lines():
+    backend = FakeBackend()
+    store = LyricsSessionStore(LineMemo())
+    opened = await store.open("doc", "가\n\n 나 ", backend)
+    version = opened["version"]
+    assert opened["line_count"] == 3
+    assert lines_of(opened) == [(0, "가", "<가>"), (1, "", ""), (2, "나", "<나>")]
+
+    result = await store.apply(
+        "doc",
+        [
+            {"op": "replace", "start": 2, "end": 3, "lines": ["  다  "]},
+            {"op": "insert", "at": 0, "lines": ["라", "가"]},
+        ],
+        backend,
+        base_version=version,
+    )
+    assert result["version"] == version + 1 and result["line_count"] == 5
+    # 두 번째 편집은 첫 번째 편집을 적용한 뒤의 줄 번호 기준
+    assert lines_of(result) == [(0, "라", "<라>"), (1, "가", "<가>"), (4, "다", "<다>")]
+    # 메모에 있던 "가" 는 다시 보내지 않음
+    assert backend.calls[-1] == ["라", "다"]
+
+    result = await store.apply(
+        "doc", [{"op": "delete", "start": 0, "end": 2}], backend, base_version=version + 1
+    )
+    assert result["version"] == version + 2
+    assert result["line_count"] == 3 and result["changed"] == []
+
+
+@pytest.mark.asyncio
+async def test_stale_version_and_unknown_document():
+    backend = FakeBackend()
+    store = LyricsSessionStore(LineMemo())
+    version = (await store.open("doc", "가", backend))["version"]
+
+    with pytest.raises(LyricsSessionError) as e:
+        await store.apply("doc", [{"op": "insert", "at": 0, "lines": ["나"]}], backend, base_version=version - 1)
+    assert e.value.code == "version_conflict"
+
+    with pytest.raises(LyricsSessionError) as e:
+        await store.apply("missing", [], backend, base_version=version)
+    assert e.value.code == "unknown_document"
+
+    # 다시 열면 새 버전이 되므로 예전 버전의 편집은 거절됨
+    assert (await store.open("doc", "가\n나", backend))["version"] != version
+    with pytest.raises(LyricsSessionError) as e:
+        await store.apply("doc", [], backend, base_version=version)
+    assert e.value.code == "version_conflict"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version", [None, "1", 1.0, True])
+async def test_edit_requires_integer_version(version):
+    backend = FakeBackend()
+    store = LyricsSessionStore(LineMemo())
+    await store.open("doc", "가", backend)
+    with pytest.raises(LyricsSessionError) as e:
+        await store.apply("doc", [{"op": "delete", "start": 0, "end": 1}], backend, base_version=version)
+    assert e.value.code == "invalid_edit"
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_on_another_worker_is_rejected():
+    # 워커 A 와 B 가 같은 문서를 따로 열었고, 클라이언트는 B 의 결과를 들고 있음
+    backend = FakeBackend()
+    worker_a, worker_b = LyricsSessionStore(LineMemo()), LyricsSessionStore(LineMemo())
+    await worker_a.open("doc", "예전 가사", backend)
+    version = (await worker_b.open("doc", "새 가사", backend))["version"]
+    with pytest.raises(LyricsSessionError) as e:
+        await worker_a.apply("doc", [{"op": "insert", "at": 1, "lines": ["가"]}], backend, base_version=version)
+    assert e.value.code == "version_conflict"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_edit_while_waiting_for_backend_conflicts():
+    store = LyricsSessionStore(LineMemo())
+    version = (await store.open("doc", "가", FakeBackend()))["version"]
+    release = asyncio.Event()
+
+    async def slow_backend(lines: List[str]) -> List[str]:
+        await release.wait()
+        return [f"<{line}>" for line in lines]
+
+    slow = asyncio.ensure_future(
+        store.apply("doc", [{"op": "insert", "at": 0, "lines": ["느림"]}], slow_backend, base_version=version)
+    )
+    await asyncio.sleep(0)
+    fast = await store.apply(
+        "doc", [{"op": "insert", "at": 1, "lines": ["나"]}], FakeBackend(), base_version=version
+    )
+    assert fast["version"] == version + 1
+    release.set()
+    with pytest.raises(LyricsSessionError) as e:
+        await slow
+    assert e.value.code == "version_conflict"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "edit, code",
+    [
+        ({"op": "move", "start": 0, "end": 1}, "invalid_edit"),
+        ({"op": "insert", "lines": ["가"]}, "invalid_edit"),
+        ({"op": "insert", "at": 0, "lines": ["가\n나"]}, "invalid_edit"),
+        ({"op": "replace", "start": 0, "end": 1, "lines": "가"}, "invalid_edit"),
+        ({"op": "delete", "start": 1, "end": 0}, "invalid_range"),
+        ({"op": "insert", "at": 5, "lines": ["가"]}, "invalid_range"),
+    ],
+)
+async def test_invalid_edits_leave_document_unchanged(edit, code):
+    backend = FakeBackend()
+    store = LyricsSessionStore(LineMemo())
+    version = (await store.open("doc", "가\n나", backend))["version"]
+    with pytest.raises(LyricsSessionError) as e:
+        await store.apply("doc", [edit], backend, base_version=version)
+    assert e.value.code == code
+    result = await store.apply("doc", [], backend, base_version=version)
+    assert result["version"] == version + 1 and result["line_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_documents_expire_by_count():
+    backend = FakeBackend()
+    store = LyricsSessionStore(LineMemo(), max_documents=1)
+    await store.open("a", "가", backend)
+    await store.open("b", "나", backend)
+    assert store.stats() == {"documents": 1}
+    with pytest.raises(LyricsSessionError):
+        await store.apply("a", [], backend, base_version=1)
+
+
+@pytest.mark.asyncio
+async def test_shared_directory_serves_edits_on_any_worker(tmp_path):
+    # 같은 디렉토리를 쓰는 두 워커: A 에서 열고 B, A 를 번갈아 편집
+    backend = FakeBackend()
+    worker_a = LyricsSessionStore(LineMemo(), directory=str(tmp_path))
+    worker_b = LyricsSessionStore(LineMemo(), directory=str(tmp_path))
+    version = (await worker_a.open("doc", "가\n나", backend))["version"]
+
+    result = await worker_b.apply(
+        "doc", [{"op": "replace", "start": 1, "end": 2, "lines": ["다"]}], backend, base_version=version
+    )
+    assert lines_of(result) == [(1, "다", "<다>")]
+    result = await worker_a.apply(
+        "doc", [{"op": "insert", "at": 2, "lines": ["라"]}], backend, base_version=result["version"]
+    )
+    assert result["version"] == version + 2 and result["line_count"] == 3
+    assert backend.calls == [["가", "나"], ["다"], ["라"]]
+
+    assert await worker_b.close("doc")
+    with pytest.raises(LyricsSessionError) as e:
+        await worker_a.apply("doc", [], backend, base_version=result["version"])
+    assert e.value.code == "unknown_document"
+
+
+@pytest.mark.asyncio
+async def test_shared_directory_rejects_concurrent_edit_from_another_worker(tmp_path):
+    worker_a = LyricsSessionStore(LineMemo(), directory=str(tmp_path))
+    worker_b = LyricsSessionStore(LineMemo(), directory=str(tmp_path))
+    version = (await worker_a.open("doc", "가", FakeBackend()))["version"]
+    release = asyncio.Event()
+
+    async def slow_backend(lines: List[str]) -> List[str]:
+        await release.wait()
+        return [f"<{line}>" for line in lines]
+
+    slow = asyncio.ensure_future(
+        worker_a.apply("doc", [{"op": "insert", "at": 0, "lines": ["느림"]}], slow_backend, base_version=version)
+    )
+    await asyncio.sleep(0.01)
+    fast = await worker_b.apply(
+        "doc", [{"op": "insert", "at": 1, "lines": ["나"]}], FakeBackend(), base_version=version
+    )
+    release.set()
+    with pytest.raises(LyricsSessionError) as e:
+        await slow
+    assert e.value.code == "version_conflict"
+    # 먼저 기록된 B 의 편집이 남음
+    result = await worker_a.apply("doc", [], FakeBackend(), base_version=fast["version"])
+    assert result["line_count"] == 2
@@ -0,0 +1,183 @@
+"""romanize_single 묶음 전송 테스트 (순서, 중복 제거, 취소, 백엔드 오류)"""
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from romanize_batch import RomanizeBatcher
+
+
+class FakeBackend:
+    """받은 배치를 기록하고 텍스트를 대문자로 바꾸는 가짜 romanize_batch"""
+
+    def __init__(self, delay: float = 0.0, error: Optional[Exception] = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.batches: List[List[str]] = []
+        self.remaining: List[Optional[float]] = []
+        self.cancelled = False
+
+    async def __call__(self, texts: List[str], remaining: Optional[float]):
+        self.batches.append(list(texts))
+        self.remaining.append(remaining)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return [
+            ValueError(f"변환 실패: {text}") if text.startswith("!") else text.upper()
+            for text in texts
+        ]
+
+
+@pytest.mark.asyncio
+async def test_results_fan_out_in_order():
+    backend = FakeBackend()
+    batcher = RomanizeBatcher(backend, window=0.01)
+    texts = ["a", "b", "c", "d"]
+    results = await asyncio.gather(*(batcher.romanize(text) for text in texts))
+    assert results == ["A", "B", "C", "D"]
+    assert backend.batches == [texts]
+    assert batcher.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_texts_are_sent_once():
+    backend = FakeBackend()
+    batcher = RomanizeBatcher(backend, window=0.01)
+    results = await asyncio.gather(*(batcher.romanize(text) for text in ["x", "y", "x", "x"]))
+    assert results == ["X", "Y", "X", "X"]
+    assert backend.batches == [["x", "y"]]
+    assert batcher.stats()["avg_batch_size"] == 4
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_before_window_ends():
+    backend = FakeBackend()
+    batcher = RomanizeBatcher(backend, window=10, max_batch=2)
+    assert await asyncio.wait_for(
+        asyncio.gather(batcher.romanize("a"), batcher.romanize("b")), 1
+    ) == ["A", "B"]
+    assert batcher.stats()["full_flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_one_cancelled_caller_does_not_cancel_batch():
+    backend = FakeBackend(delay=0.05)
+    batcher = RomanizeBatcher(backend, window=0.01)
+    early = asyncio.ensure_future(batcher.romanize("a", remaining=0.02))
+    late = asyncio.ensure_future(batcher.romanize("b", remaining=5))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(early, 0.03)
+    assert await late == "B"
+    assert not backend.cancelled
+    # 배치 데드라인은 가장 늦은 호출 기준
+    assert backend.remaining[0] == pytest.approx(5, abs=0.1)
+    assert batcher.stats()["cancelled_batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_all_callers_cancelled_cancels_backend_call():
+    backend = FakeBackend(delay=1)
+    batcher = RomanizeBatcher(backend, window=0.01)
+    callers = [asyncio.ensure_future(batcher.romanize(text)) for text in ["a", "b"]]
+    await asyncio.sleep(0.03)
+    assert backend.batches == [["a", "b"]]
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert backend.cancelled
+    stats = batcher.stats()
+    assert stats["cancelled_batches"] == 1
+    assert stats["inflight_batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backend_error_reaches_every_caller():
+    backend = FakeBackend(error=RuntimeError("백엔드 오류"))
+    batcher = RomanizeBatcher(backend, window=0.01)
+    results = await asyncio.gather(
+        batcher.romanize("a"), batcher.romanize("b"), return_exceptions=True
+    )
+    assert [str(result) for result in results] == ["백엔드 오류", "백엔드 오류"]
+    assert batcher.stats()["failed_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_item_error_reaches_only_its_callers():
+    backend = FakeBackend()
+    batcher = RomanizeBatcher(backend, window=0.01)
+    results = await asyncio.gather(
+        batcher.romanize("a"), batcher.romanize("!bad"), batcher.romanize("!bad"),
+        return_exceptions=True,
+    )
+    assert results[0] == "A"
+    assert all(isinstance(result, ValueError) for result in results[1:])
+    assert batcher.stats()["failed_batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unhashable_text_fails_instead_of_hanging():
+    backend = FakeBackend()
+    batcher = RomanizeBatcher(backend, window=0.01)
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.romanize(["a"]), batcher.romanize("b"), return_exceptions=True), 1
+    )
+    assert all(isinstance(result, TypeError) for result in results)
+    assert backend.batches == []
+
+
+@pytest.mark.asyncio
+async def test_mismatched_response_length_is_an_error():
+    async def short(texts, remaining):
+        return texts[:-1]
+
+    batcher = RomanizeBatcher(short, window=0.01)
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(batcher.romanize("a"), batcher.romanize("b"))
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """romanize_batch 응답을 고정한 가짜 백엔드를 쓰는 게이트웨이 모듈"""
+    import httpx
+
+    import app
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # 배치 항목 중 두 번째 텍스트만 변환 실패
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": "romanize-batch", "result": {
+            "content": [
+                {"type": "text", "text": "annyeong"},
+                {"type": "text", "text": "", "isError": True, "errorMessage": "변환 실패"},
+            ],
+        }})
+
+    monkeypatch.setattr(app, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(app._romanize_batcher, "window", 0.01)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_backend_item_errors_become_tool_errors(gateway):
+    results = await gateway.romanize_batch_via_backend(["안녕", "?"], None)
+    assert results[0] == "annyeong"
+    assert isinstance(results[1], gateway.BackendToolError)
+    assert results[1].error["code"] == -32603
+    assert results[1].error["data"] == "변환 실패"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text", [None, 42, ["안녕"], {"a": 1}])
+async def test_non_string_single_text_is_rejected(gateway, text):
+    request = gateway.McpRequest(
+        id=1, method="tools/call", params={"name": "romanize_single", "arguments": {"text": text}}
+    )
+    response = await asyncio.wait_for(gateway.call_romanize_server(request), 1)
+    assert response.error["code"] == -32602
+    assert gateway._romanize_batcher.stats()["pending"] == 0
@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+import romanizer
+from lyrics import split_lines
+from romanize_cli import BlockWriter, iter_stream_blocks, run
+
+
+def convert(text: str, block_size: int = 4, jobs: int = 1) -> str:
+    output = io.BytesIO()
+    writer = BlockWriter(output, lyrics=True)
+    run(iter_stream_blocks(io.BytesIO(text.encode("utf-8")), block_size), writer, jobs)
+    writer.finish()
+    return output.getvalue().decode("utf-8")
+
+
+def expected_lyrics(text: str) -> str:
+    # executeRomanizeLyrics 형식
+    return "".join(f"{line}\n{romanizer.romanize_line(line)}\n" for line in split_lines(text))
+
+
+def test_whitespace_only_trailing_line_is_kept():
+    assert convert("가\n   \n") == "가\nka\n\n\n"
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "가",
+    "가\n",
+    "가\n\n\n",
+    "가\n \n\n",
+    "가\n\n나\n\n",
+    "\n\n가",
+    " 사랑해 \n\t\nOh yeah\n  \n",
+])
+@pytest.mark.parametrize("block_size", [1, 4, 4096])
+def test_lyrics_format_matches_backend(text, block_size):
+    assert convert(text, block_size) == expected_lyrics(text)
@@ -0,0 +1,72 @@
+"""Python 엔진(romanizer.py)이 romanize-service Java 구현과 같은 결과를 내는지"""
+
+from pathlib import Path
+
+import pytest
+
+import romanizer
+from lyrics import split_lines
+
+PARITY_FILE = (
+    Path(__file__).resolve().parents[2] / "mcp-server" / "src" / "test" / "resources" / "romanize_parity.tsv"
+)
+
+
+def parity_cases():
+    if not PARITY_FILE.exists():
+        return []
+    rows = []
+    for line in PARITY_FILE.read_text(encoding="utf-8").split("\n"):
+        if not line or line.startswith("#"):
+            continue
+        source, expected = line.split("\t")
+        rows.append((source, expected))
+    return rows
+
+
+@pytest.mark.skipif(not PARITY_FILE.exists(), reason="mcp-server 소스가 없음")
+@pytest.mark.parametrize("source, expected", parity_cases())
+def test_korean_to_roman_matches_java_cases(source, expected):
+    # RomanizeParityTest 가 같은 파일로 RomanizerService.koreanToRoman 을 확인함
+    assert romanizer.korean_to_roman(source) == expected
+
+
+def test_java_unit_test_cases():
+    # RomanizerServiceTest
+    assert romanizer.korean_to_roman("안녕하세요")
+    assert romanizer.korean_to_roman("") == ""
+    assert romanizer.korean_to_roman(None) == ""
+    assert romanizer.contains_korean("안녕하세요")
+    assert romanizer.contains_korean("Hello 안녕")
+    assert romanizer.contains_korean("ㅎㅏㅣ")
+    assert not romanizer.contains_korean("Hello World")
+    assert not romanizer.contains_korean("123456")
+    assert not romanizer.contains_korean("")
+    assert not romanizer.contains_korean(None)
+    # KoreanPronunciationServiceTest
+    assert romanizer.korean_to_pronounced("안녕하세요") == "안녕하세요"
+
+
+def test_pronounced_form_follows_rules():
+    assert romanizer.korean_to_pronounced("좋아요 같이 국물") == "조아요 가치 궁물"
+
+
+def test_lyrics_lines_keep_non_korean_lines():
+    # RomanizeService.romanizeLyrics: 빈 줄은 빈 문자열, 한국어가 없는 줄은 그대로
+    lines = split_lines("사랑해\n\nOh yeah!\n 꽃잎 ")
+    assert romanizer.romanize_lines(lines) == ["saranghae", "", "Oh yeah!", "kkochip"]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("  가  ", "  ka  "), ("가\t", "ka\t"), ("Ａ가", "Ａka"), ("가\r\n나", "ka\nna"), ("가", "ka")],
+)
+def test_romanize_single_arguments_keep_output(text, expected):
+    # 게이트웨이는 romanize_single 입력에 줄바꿈과 NFC 정규화만 적용 (공백, 탭, 전각 문자는 그대로)
+    import app
+
+    request = app.McpRequest(
+        id=1, method="tools/call", params={"name": "romanize_single", "arguments": {"text": text}}
+    )
+    app.normalize_tool_arguments(request)
+    assert romanizer.korean_to_roman(request.params["arguments"]["text"]) == expected
@@ -0,0 +1,15 @@
+"""TTS 서버와 같은 파일이어야 하는 공용 모듈 (컨테이너 빌드 컨텍스트가 달라 복사해 둠)"""
+
+from pathlib import Path
+
+import pytest
+
+GATEWAY_DIR = Path(__file__).resolve().parents[1]
+SERVER_SERVICES = GATEWAY_DIR.parent / "edge-tts-server" / "app" / "services"
+
+
+@pytest.mark.skipif(not SERVER_SERVICES.is_dir(), reason="edge-tts-server 소스가 없음")
+@pytest.mark.parametrize("name", ["textnorm.py", "loop_monitor.py"])
+def test_copy_matches_tts_server(name):
+    # 한쪽만 고쳤다면 다른 쪽에도 같은 변경을 복사하세요
+    assert (GATEWAY_DIR / name).read_bytes() == (SERVER_SERVICES / name).read_bytes()
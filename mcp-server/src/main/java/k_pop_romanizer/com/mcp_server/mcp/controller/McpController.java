@@ -12,6 +12,7 @@ import org.springframework.web.bind.annotation.*;
 
 import java.util.List;
 import java.util.Map;
+import java.util.concurrent.atomic.AtomicLong;
 
 @Slf4j
 @RestController
@@ -19,13 +20,34 @@ import java.util.Map;
 @RequiredArgsConstructor
 public class McpController {
 
+    // 게이트웨이가 넘기는 남은 시간 (밀리초). 0 이하면 호출자가 이미 포기한 요청
+    static final String DEADLINE_HEADER = "X-Deadline-Ms";
+
     private final McpServerService mcpServerService;
 
+    private final AtomicLong deadlineRequests = new AtomicLong();
+    private final AtomicLong deadlineRejected = new AtomicLong();
+
     @PostMapping("/jsonrpc")
-    public ResponseEntity<McpResponse> handleJsonRpc(@RequestBody McpRequest request) {
+    public ResponseEntity<McpResponse> handleJsonRpc(
+            @RequestBody McpRequest request,
+            @RequestHeader(value = DEADLINE_HEADER, required = false) Long deadlineMs) {
         try {
             McpResponse response = new McpResponse();
             response.setId(request.getId());
+
+            if (deadlineMs != null) {
+                deadlineRequests.incrementAndGet();
+                if (deadlineMs <= 0) {
+                    // 늦게 도착한 요청은 변환하지 않고 바로 거절
+                    deadlineRejected.incrementAndGet();
+                    McpResponse.McpError error = new McpResponse.McpError();
+                    error.setCode(-32001);
+                    error.setMessage("Deadline exceeded");
+                    response.setError(error);
+                    return ResponseEntity.ok(response);
+                }
+            }
             
             switch (request.getMethod()) {
                 case "tools/list":
@@ -84,6 +106,14 @@ public class McpController {
         }
     }
 
+    @GetMapping("/metrics")
+    public ResponseEntity<Map<String, Long>> metrics() {
+        return ResponseEntity.ok(Map.of(
+                "deadline_requests", deadlineRequests.get(),
+                "deadline_rejected", deadlineRejected.get()
+        ));
+    }
+
     @GetMapping("/health")
     public ResponseEntity<String> health() {
         return ResponseEntity.ok("MCP Server is healthy");
@@ -47,6 +47,21 @@ public class McpServerService {
                     ),
                     "required", Arrays.asList("text")
                 ))
+                .build(),
+            McpTool.builder()
+                .name("romanize_batch")
+                .description("여러 단문을 한 번에 로마자로 변환합니다. 각 텍스트는 romanize_single 과 같이 변환되며, 결과는 입력 순서대로 content 항목 하나씩입니다. 변환하지 못한 텍스트의 항목은 isError 와 errorMessage 를 가집니다.")
+                .inputSchema(Map.of(
+                    "type", "object",
+                    "properties", Map.of(
+                        "texts", Map.of(
+                            "type", "array",
+                            "items", Map.of("type", "string"),
+                            "description", "변환할 한국어 텍스트 목록"
+                        )
+                    ),
+                    "required", Arrays.asList("texts")
+                ))
                 .build()
         );
     }
@@ -58,6 +73,8 @@ public class McpServerService {
                     return executeRomanizeSingle(arguments);
                 case "romanize_lyrics":
                     return executeRomanizeLyrics(arguments);
+                case "romanize_batch":
+                    return executeRomanizeBatch(arguments);
                 default:
                     return McpToolResult.builder()
                             .isError(true)
@@ -114,4 +131,46 @@ public class McpServerService {
                 .isError(false)
                 .build();
     }
+
+    private McpToolResult executeRomanizeBatch(Map<String, Object> arguments) {
+        List<?> texts = (List<?>) arguments.get("texts");
+
+        // 게이트웨이가 짧은 시간 동안 모은 romanize_single 호출들: 입력 순서대로 항목 하나씩
+        // (텍스트 하나가 실패해도 배치 전체를 실패시키지 않고 그 항목만 오류로 표시)
+        List<Map<String, Object>> content = new ArrayList<>(texts.size());
+        for (Object text : texts) {
+            if (!(text instanceof String)) {
+                content.add(batchItemError("텍스트는 문자열이어야 합니다"));
+                continue;
+            }
+            try {
+                RomanizeRequest request = new RomanizeRequest();
+                request.setKoreanText((String) text);
+                request.setMode(RomanizeRequest.RomanizeMode.SINGLE);
+
+                RomanizeResponse response = romanizeService.romanize(request);
+                content.add(Map.of(
+                        "type", "text",
+                        "text", response.getRomanizedText()
+                ));
+            } catch (Exception e) {
+                log.warn("배치 항목 변환 중 오류 발생", e);
+                content.add(batchItemError("변환 중 오류가 발생했습니다: " + e.getMessage()));
+            }
+        }
+
+        return McpToolResult.builder()
+                .content(content)
+                .isError(false)
+                .build();
+    }
+
+    private static Map<String, Object> batchItemError(String message) {
+        return Map.of(
+                "type", "text",
+                "text", "",
+                "isError", true,
+                "errorMessage", message
+        );
+    }
 }
@@ -0,0 +1,64 @@
+package k_pop_romanizer.com.mcp_server.mcp.service;
+
+import k_pop_romanizer.com.mcp_server.mcp.dto.McpToolResult;
+import k_pop_romanizer.com.mcp_server.romanize.service.KoreanPronunciationService;
+import k_pop_romanizer.com.mcp_server.romanize.service.RomanizeService;
+import k_pop_romanizer.com.mcp_server.romanize.service.RomanizerService;
+import org.junit.jupiter.api.BeforeEach;
+import org.junit.jupiter.api.Test;
+
+import java.util.Arrays;
+import java.util.List;
+import java.util.Map;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class McpServerServiceTest {
+
+    private McpServerService mcpServerService;
+
+    @BeforeEach
+    void setUp() {
+        RomanizerService romanizerService = new RomanizerService(new KoreanPronunciationService());
+        mcpServerService = new McpServerService(new RomanizeService(romanizerService));
+    }
+
+    @Test
+    void testRomanizeBatchMatchesSingle() {
+        // 배치 결과는 입력 순서대로, 각각 romanize_single 과 같아야 함
+        List<String> texts = Arrays.asList("안녕하세요", " 너의 이름을 ", "Hello 세상", "안녕하세요");
+
+        McpToolResult batch = mcpServerService.executeTool("romanize_batch", Map.of("texts", texts));
+        assertFalse(batch.isError());
+        assertEquals(texts.size(), batch.getContent().size());
+
+        for (int i = 0; i < texts.size(); i++) {
+            McpToolResult single = mcpServerService.executeTool("romanize_single", Map.of("text", texts.get(i)));
+            assertEquals(single.getContent().get(0).get("text"), batch.getContent().get(i).get("text"));
+        }
+    }
+
+    @Test
+    void testRomanizeBatchReportsItemErrors() {
+        // 문자열이 아닌 항목은 그 항목만 오류, 나머지는 그대로 변환
+        List<Object> texts = Arrays.asList("안녕하세요", null, 42, "세상");
+
+        McpToolResult batch = mcpServerService.executeTool("romanize_batch", Map.of("texts", texts));
+        assertFalse(batch.isError());
+        assertEquals(texts.size(), batch.getContent().size());
+
+        assertEquals("annyeonghaseyo", batch.getContent().get(0).get("text"));
+        assertEquals(true, batch.getContent().get(1).get("isError"));
+        assertEquals(true, batch.getContent().get(2).get("isError"));
+        assertNotNull(batch.getContent().get(2).get("errorMessage"));
+        assertEquals("sesang", batch.getContent().get(3).get("text"));
+        assertNull(batch.getContent().get(3).get("isError"));
+    }
+
+    @Test
+    void testRomanizeBatchEmpty() {
+        McpToolResult batch = mcpServerService.executeTool("romanize_batch", Map.of("texts", List.of()));
+        assertFalse(batch.isError());
+        assertTrue(batch.getContent().isEmpty());
+    }
+}
@@ -0,0 +1,47 @@
+package k_pop_romanizer.com.mcp_server.romanize.service;
+
+import org.junit.jupiter.api.BeforeEach;
+import org.junit.jupiter.api.Test;
+
+import java.io.BufferedReader;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.List;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+/**
+ * romanize_parity.tsv 의 기대값 확인 (게이트웨이 Python 엔진도 같은 파일로 확인)
+ */
+class RomanizeParityTest {
+
+    private RomanizerService romanizerService;
+
+    @BeforeEach
+    void setUp() {
+        romanizerService = new RomanizerService(new KoreanPronunciationService());
+    }
+
+    @Test
+    void testParityCases() throws Exception {
+        List<String[]> cases = new ArrayList<>();
+        try (InputStream in = getClass().getResourceAsStream("/romanize_parity.tsv");
+             BufferedReader reader = new BufferedReader(new InputStreamReader(in, StandardCharsets.UTF_8))) {
+            String line;
+            while ((line = reader.readLine()) != null) {
+                if (line.startsWith("#")) {
+                    continue;
+                }
+                cases.add(line.split("\t", -1));
+            }
+        }
+        assertFalse(cases.isEmpty());
+
+        for (String[] row : cases) {
+            assertEquals(2, row.length, "잘못된 줄: " + String.join("\\t", row));
+            assertEquals(row[1], romanizerService.koreanToRoman(row[0]), "입력: [" + row[0] + "]");
+        }
+    }
+}